@@ -2,7 +2,7 @@
 import argparse
 from pathlib import Path
 from pyshell import PyShell, PyShellOptions, KeepGoing, PermitCleanup, \
-    NativeBackend, MultiFileLogger, CommandFlags
+    IncrementalExecutor, NativeBackend, MultiFileLogger, CommandFlags
 from pyshell.modules import Doxygen, Shell
 import sys
 
@@ -49,6 +49,9 @@ LOGS_DIR = ".logs"
 # Path to the doxygen configuration file
 DOXYFILE_PATH = SCRIPT_DIR.joinpath("doxygen", "doxyfile")
 
+# Path to the directory containing the sources that doxygen documents
+SOURCE_DIR = SCRIPT_DIR.joinpath("source")
+
 # Path to the directory that Doxygen will generate documentation in
 DOCS_DIR = SCRIPT_DIR.joinpath(".docs")
 
@@ -68,7 +71,11 @@ pyshell = PyShell(
         print_cmd_header=True,
         print_cmd_footer=True
     ),
-    executor=PermitCleanup(),
+    # Doxygen is only rerun if the sources or the doxyfile changed
+    executor=IncrementalExecutor(
+        DOCS_DIR.joinpath(".pyshell-index.json"),
+        PermitCleanup()
+    ),
     error_handler=KeepGoing(),
     options=PyShellOptions(
         verbose=args.verbose
@@ -104,7 +111,11 @@ if args.publish:
 
 # Generate the documentation
 # Note that this must be done in the current branch, not in the gh-pages branch.
-Doxygen.generate_docs(DOXYFILE_PATH)
+Doxygen.generate_docs(
+    DOXYFILE_PATH,
+    inputs=sorted(SOURCE_DIR.rglob("*.py")),
+    outputs=[DOXYGEN_HTML_DIR]
+)
 
 # If the --publish flag was specified, copy the doxygen documentation to the
 #   gh-pages branch and push it.
@@ -1,22 +1,89 @@
 # pyright: reportUnusedImport=false
-from .backends.backend import IBackend
-from .backends.docker_backend import DockerBackend
-from .backends.native_backend import NativeBackend
-from .commands.command_flags import CommandFlags
-from .commands.command_helpers import enable_if
-from .core.pyshell import PyShell
-from .core.pyshell_options import PyShellOptions
-from .error.abort_on_failure import AbortOnFailure
-from .error.error_handler import IErrorHandler
-from .error.keep_going import KeepGoing
-from .executors.allow_all import AllowAll
-from .executors.executor import IExecutor
-from .executors.permit_cleanup import PermitCleanup
-from .logging.console_logger import ConsoleLogger
-from .logging.logger import ILogger
-from .logging.null_logger import NullLogger
-from .logging.multi_file_logger import MultiFileLogger
-from .logging.single_file_logger import SingleFileLogger
+import importlib
+from typing import Any, Dict, List, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .backends.backend import IBackend
+    from .backends.docker_backend import DockerBackend
+    from .backends.native_backend import NativeBackend
+    from .commands.command_flags import CommandFlags
+    from .commands.command_helpers import enable_if
+    from .commands.command_phase import CommandPhase
+    from .core.command_history import CommandHistory
+    from .core.pyshell import PyShell
+    from .core.pyshell_options import PyShellOptions
+    from .error.abort_on_failure import AbortOnFailure
+    from .error.error_handler import IErrorHandler
+    from .error.keep_going import KeepGoing
+    from .executors.allow_all import AllowAll
+    from .executors.caching_executor import CachingExecutor
+    from .executors.executor import IExecutor
+    from .executors.incremental_executor import IncrementalExecutor
+    from .executors.permit_cleanup import PermitCleanup
+    from .logging.chrome_trace_logger import ChromeTraceLogger
+    from .logging.console_logger import ConsoleLogger
+    from .logging.logger import ILogger
+    from .logging.null_logger import NullLogger
+    from .logging.multi_file_logger import MultiFileLogger
+    from .logging.single_file_logger import SingleFileLogger
+    from .metrics.openmetrics_exporter import OpenMetricsExporter
+
+# Module that defines each name exported by this package. Names are imported
+#   the first time they're accessed (PEP 562) so that scripts only pay for the
+#   subsystems that they use.
+_EXPORTS: Dict[str, str] = {
+    "IBackend": ".backends.backend",
+    "DockerBackend": ".backends.docker_backend",
+    "NativeBackend": ".backends.native_backend",
+    "CommandFlags": ".commands.command_flags",
+    "enable_if": ".commands.command_helpers",
+    "CommandPhase": ".commands.command_phase",
+    "CommandHistory": ".core.command_history",
+    "PyShell": ".core.pyshell",
+    "PyShellOptions": ".core.pyshell_options",
+    "AbortOnFailure": ".error.abort_on_failure",
+    "IErrorHandler": ".error.error_handler",
+    "KeepGoing": ".error.keep_going",
+    "AllowAll": ".executors.allow_all",
+    "CachingExecutor": ".executors.caching_executor",
+    "IExecutor": ".executors.executor",
+    "IncrementalExecutor": ".executors.incremental_executor",
+    "PermitCleanup": ".executors.permit_cleanup",
+    "ChromeTraceLogger": ".logging.chrome_trace_logger",
+    "ConsoleLogger": ".logging.console_logger",
+    "ILogger": ".logging.logger",
+    "NullLogger": ".logging.null_logger",
+    "MultiFileLogger": ".logging.multi_file_logger",
+    "SingleFileLogger": ".logging.single_file_logger",
+    "OpenMetricsExporter": ".metrics.openmetrics_exporter",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    """
+    Imports an exported name the first time it's accessed.
+    @param name The name being accessed.
+    @throws AttributeError If the name isn't exported by this package.
+    @return The value of the exported name.
+    """
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+
+    # Cache the value so that later accesses don't go through this function
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    """
+    Lists the names available in this package, including names that haven't
+      been imported yet.
+    """
+    return sorted(set(globals()) | set(__all__))
 
 ## @package pyshell
 # Root namespace for all PyShell classes.
@@ -0,0 +1,31 @@
+from abc import abstractmethod
+from pathlib import Path
+from pyshell.commands.command_metadata import CommandMetadata
+from pyshell.commands.command_result import CommandResult
+from pyshell.core.pyshell_component import IPyShellComponent
+from pyshell.logging.command_logger import ICommandLogger
+
+class IAsyncBackend(IPyShellComponent):
+    """
+    Represents a backend that can execute PyShell commands from an event loop.
+    Backends that implement this interface are used by `PyShell.run_async()`
+      to run commands without blocking the event loop. Commands run via
+      backends that don't implement this interface are run on a worker thread
+      instead.
+    @ingroup backends
+    """
+    @abstractmethod
+    async def run_async(self,
+        metadata: CommandMetadata,
+        cwd: Path,
+        logger: ICommandLogger) -> CommandResult:
+        """
+        Runs the specified command on the backend.
+        @param metadata Metadata for the command to run.
+        @param cwd The working directory to use for the command. Will always be
+          an absolute path.
+        @param logger The logger to use for the command. The backend will invoke
+          `logger.log()` but will not invoke `logger.log_results()`.
+        @return The output of the command.
+        """
+        raise NotImplementedError()
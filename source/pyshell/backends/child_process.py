@@ -0,0 +1,147 @@
+import os
+from pyshell.commands.resource_usage import ResourceUsage
+import subprocess
+from typing import IO, Optional
+
+class ChildProcess:
+    """
+    Handle to a process started by a spawn strategy.
+    The process is reaped via `os.wait4()` regardless of how it was started.
+    @ingroup backends
+    """
+    def __init__(self,
+        pid: int,
+        stdout: Optional[IO[bytes]],
+        stderr: Optional[IO[bytes]],
+        spawn_duration: float,
+        popen: Optional[subprocess.Popen] = None):
+        """
+        Initializes the handle.
+        @param pid The process ID of the child process.
+        @param stdout Read end of the pipe connected to the process's stdout, or
+          `None` if stdout was connected to another descriptor (e.g. the next
+          command in a pipeline).
+        @param stderr Read end of the pipe connected to the process's stderr, or
+          `None` if stderr was redirected to stdout.
+        @param spawn_duration Time taken to start the process, in seconds.
+        @param popen The `Popen` instance that started the process, if any. The
+          instance will be marked as finished once the process has been
+          reaped so that it never tries to reap the process itself.
+        """
+        self._pid = pid
+        self._stdout = stdout
+        self._stderr = stderr
+        self._spawn_duration = spawn_duration
+        self._popen = popen
+        self._exit_code: Optional[int] = None
+        self._rusage: Optional[ResourceUsage] = None
+
+
+    @property
+    def pid(self) -> int:
+        """
+        The process ID of the child process.
+        """
+        return self._pid
+
+
+    @property
+    def stdout(self) -> Optional[IO[bytes]]:
+        """
+        Read end of the pipe connected to the process's stdout, or `None` if
+          stdout was connected to another descriptor.
+        """
+        return self._stdout
+
+
+    @property
+    def stderr(self) -> Optional[IO[bytes]]:
+        """
+        Read end of the pipe connected to the process's stderr, or `None` if
+          stderr was redirected to stdout.
+        """
+        return self._stderr
+
+
+    @property
+    def spawn_duration(self) -> float:
+        """
+        Time taken to start the process, in seconds.
+        """
+        return self._spawn_duration
+
+
+    @property
+    def exit_code(self) -> Optional[int]:
+        """
+        The exit code of the process, or `None` if the process hasn't been
+          waited on yet.
+        If the process was terminated by a signal, this will be the negated
+          signal number, which matches `subprocess.Popen.returncode`.
+        """
+        return self._exit_code
+
+
+    @property
+    def rusage(self) -> Optional[ResourceUsage]:
+        """
+        Resources used by the process, or `None` if the process hasn't been
+          waited on yet.
+        """
+        return self._rusage
+
+
+    def poll(self) -> Optional[int]:
+        """
+        Checks whether the process has exited without blocking.
+        @return The exit code of the process, or `None` if the process is still
+          running.
+        """
+        if self._exit_code is None:
+            self._reap(os.WNOHANG)
+        return self._exit_code
+
+
+    def signal_group(self, sig: int) -> None:
+        """
+        Sends a signal to every process in the process's process group.
+        This should only be used if the process was started in its own
+          process group.
+        @param sig The signal to send.
+        """
+        try:
+            os.killpg(self._pid, sig)
+        except ProcessLookupError:
+            # Every process in the group has already exited
+            pass
+
+
+    def wait(self) -> int:
+        """
+        Closes the process's pipes and waits for the process to exit.
+        @return The exit code of the process.
+        """
+        if self._stdout:
+            self._stdout.close()
+        if self._stderr:
+            self._stderr.close()
+
+        if self._exit_code is None:
+            self._reap(0)
+        assert self._exit_code is not None
+        return self._exit_code
+
+
+    def _reap(self, options: int) -> None:
+        """
+        Reaps the process via `os.wait4()` if it has exited.
+        @param options Options to pass to `os.wait4()`.
+        """
+        pid, status, rusage = os.wait4(self._pid, options)
+        if pid == 0:
+            return
+
+        self._exit_code = os.waitstatus_to_exitcode(status)
+        self._rusage = ResourceUsage.from_rusage(rusage)
+        if self._popen:
+            self._popen.returncode = self._exit_code
@@ -1,6 +1,9 @@
 from datetime import datetime
+import os
 from pathlib import Path
 from pyshell.backends.backend import IBackend
+from pyshell.backends.input_feeder import InputFeeder
+from pyshell.backends.output_pump import OutputPump
 from pyshell.commands.command_flags import CommandFlags
 from pyshell.commands.command_metadata import CommandMetadata
 from pyshell.commands.command_result import CommandResult
@@ -15,6 +18,8 @@ from typing import Optional, Sequence
 class DockerBackend(IBackend):
     """
     Backend that executes commands in a docker container.
+    Command limits are not supported by this backend, since the commands run
+      in the container rather than as child processes of the host process.
     @ingroup backends
     """
     def __init__(self,
@@ -132,8 +137,16 @@ class DockerBackend(IBackend):
           an absolute path.
         @param logger The logger to use for the command. The backend will invoke
           `logger.log()` but will not invoke `logger.log_results()`.
+        @throws ValueError If the command has limits.
         @return The output of the command.
         """
+        # Limits must not be silently ignored, including default limits set
+        #   via the PyShell instance's options
+        if metadata.limits:
+            raise ValueError(
+                "Command limits are not supported by the docker backend."
+            )
+
         # Determine how stderr should be handled
         if logger.stream_config == StreamConfig.SPLIT_STREAMS:
             process_stderr = subprocess.PIPE
@@ -146,37 +159,57 @@ class DockerBackend(IBackend):
         #   command as a single string plus an args array, it's easier and
         #   significantly less error prone to just invoke the docker exec
         #   command directly.
+        # Commands given input are run via `docker exec -i` so that docker
+        #   forwards its stdin to the command.
         start_time = datetime.utcnow()
-        process = subprocess.Popen(
-            (["sudo"] if self._use_sudo else []) +
-            [
-                "docker",
-                "exec",
-                self._docker_container_id,
-                metadata.command,
-                *metadata.args
-            ],
-            stdout=subprocess.PIPE,
-            stderr=process_stderr,
-            cwd=cwd,
-            universal_newlines=True
-        )
-
-        # The process's stderr is allowed to be null since it could be
-        #   redirected, but the process's stdout must always be valid
-        assert process.stdout
-
-        # Process all output from the process
-        while process.poll() is None:
-            logger.log(process.stdout, process.stderr)
-
-        # Process any remaining output from the process
-        logger.log(process.stdout, process.stderr)
+        stdin, feeder = InputFeeder.open(metadata.stdin)
+        try:
+            process = subprocess.Popen(
+                (["sudo"] if self._use_sudo else []) +
+                [
+                    "docker",
+                    "exec",
+                    *(["-i"] if metadata.stdin else []),
+                    self._docker_container_id,
+                    metadata.command,
+                    *metadata.args
+                ],
+                stdin=stdin,
+                stdout=subprocess.PIPE,
+                stderr=process_stderr,
+                cwd=cwd
+            )
+        except BaseException:
+            if feeder:
+                feeder.close()
+            raise
+        finally:
+            if stdin is not None:
+                os.close(stdin)
+
+        with process:
+            # The process's stderr is allowed to be null since it could be
+            #   redirected, but the process's stdout must always be valid
+            assert process.stdout
+
+            # Process all output from the process
+            try:
+                OutputPump(
+                    logger,
+                    binary=bool(metadata.flags & CommandFlags.BINARY_OUTPUT),
+                    stdin=feeder
+                ).pump(
+                    process.stdout.fileno(),
+                    process.stderr.fileno() if process.stderr else None
+                )
+            finally:
+                if feeder:
+                    feeder.close()
 
         # Make sure the returned output always ends with a newline
-        output = logger.output
+        output = logger.output_buffer
         if not output.endswith("\n"):
-            output += "\n"
+            output.append("\n")
 
         backend = f"Docker container '{self.container_id}'"
         if self._container_name:
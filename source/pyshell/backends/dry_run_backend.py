@@ -1,11 +1,13 @@
 from datetime import datetime
 from pathlib import Path
 from pyshell.backends.backend import IBackend
+from pyshell.backends.pipeline_backend import IPipelineBackend
 from pyshell.commands.command_metadata import CommandMetadata
 from pyshell.commands.command_result import CommandResult
 from pyshell.logging.command_logger import ICommandLogger
+from typing import List, Sequence
 
-class DryRunBackend(IBackend):
+class DryRunBackend(IBackend, IPipelineBackend):
     """
     Backend that prints commands without executing them.
     @ingroup backends
@@ -36,3 +38,19 @@ class DryRunBackend(IBackend):
             end_time=datetime.utcnow(),
             backend="Dry Run backend"
         )
+
+
+    def run_pipeline(self,
+        metadata: Sequence[CommandMetadata],
+        cwd: Path,
+        loggers: Sequence[ICommandLogger]) -> List[CommandResult]:
+        """
+        Runs the specified commands as a pipeline on the backend.
+        @param metadata Metadata for each command in the pipeline, in order.
+        @param cwd The working directory to use for the commands. Will always
+          be an absolute path.
+        @param loggers The logger to use for each command, in the same order as
+          `metadata`.
+        @return The result of each command, in the same order as `metadata`.
+        """
+        return [self.run(m, cwd, l) for m, l in zip(metadata, loggers)]
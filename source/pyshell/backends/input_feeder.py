@@ -0,0 +1,111 @@
+from __future__ import annotations
+import os
+from pyshell.commands.command_input import CommandInput
+from typing import Iterator, Optional, Tuple
+
+class InputFeeder:
+    """
+    Writes input to a child process's stdin pipe without blocking.
+    The pipe is switched to non-blocking mode so that the feeder can be driven
+      by the same selector loop that reads the child process's output. Each
+      call to `write()` writes as much input as the pipe can hold and returns
+      as soon as the pipe is full, so a child that stops reading its input
+      can't deadlock with a child that is blocked on writing its output.
+    The next chunk of input is only requested once the previous chunk has been
+      written completely, which applies backpressure to lazily produced input.
+    @ingroup backends
+    """
+    def __init__(self, fd: int, chunks: Iterator[bytes]):
+        """
+        Initializes the feeder.
+        @param fd Write end of the pipe connected to the child process's stdin.
+          The feeder takes ownership of the descriptor and closes it once all
+          input has been written.
+        @param chunks The input to write to the pipe.
+        """
+        os.set_blocking(fd, False)
+        self._fd = fd
+        self._chunks = chunks
+        self._closed = False
+
+        # Part of the current chunk that hasn't been written yet
+        self._pending = memoryview(b"")
+
+
+    @staticmethod
+    def open(stdin: Optional[CommandInput]) \
+        -> Tuple[Optional[int], Optional[InputFeeder]]:
+        """
+        Opens the descriptor to connect to a command's stdin.
+        @param stdin The command's input, if any.
+        @throws OSError If the command's input file could not be opened.
+        @return The descriptor to connect to the command's stdin, which the
+          caller must close once the command has been started, and the feeder
+          used to write input to it. Both will be `None` if the command has no
+          input. The feeder will be `None` if the input is a file, since files
+          are connected to the command's stdin directly.
+        """
+        if not stdin:
+            return None, None
+        if stdin.path:
+            return os.open(stdin.path, os.O_RDONLY), None
+
+        read_fd, write_fd = os.pipe()
+        return read_fd, InputFeeder(write_fd, stdin.iter_chunks())
+
+
+    @property
+    def fd(self) -> int:
+        """
+        Write end of the pipe connected to the child process's stdin.
+        """
+        return self._fd
+
+
+    @property
+    def closed(self) -> bool:
+        """
+        Whether the pipe has been closed.
+        """
+        return self._closed
+
+
+    def write(self) -> bool:
+        """
+        Writes input to the pipe until the pipe is full or all input has been
+          written.
+        Once all input has been written, the pipe is closed so that the child
+          process sees the end of its input. If the child process closes its
+          end of the pipe, the remaining input is discarded.
+        @return True if the pipe has been closed, or False if the pipe is full
+          and more input remains to be written.
+        """
+        while not self._closed:
+            if not self._pending:
+                chunk = next(self._chunks, None)
+                if chunk is None:
+                    self.close()
+                    break
+                self._pending = memoryview(chunk)
+                continue
+
+            try:
+                written = os.write(self._fd, self._pending)
+            except BlockingIOError:
+                return False
+            except BrokenPipeError:
+                # The child process doesn't want any more input
+                self.close()
+                break
+            self._pending = self._pending[written:]
+        return True
+
+
+    def close(self) -> None:
+        """
+        Closes the pipe without writing any remaining input.
+        """
+        if not self._closed:
+            self._closed = True
+            self._pending = memoryview(b"")
+            os.close(self._fd)
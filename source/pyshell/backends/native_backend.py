@@ -1,17 +1,56 @@
+from __future__ import annotations
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from io import StringIO
+import os
 from pathlib import Path
+from pyshell.backends.async_backend import IAsyncBackend
 from pyshell.backends.backend import IBackend
+from pyshell.backends.child_process import ChildProcess
+from pyshell.backends.input_feeder import InputFeeder
+from pyshell.backends.output_pump import OutputPump
+from pyshell.backends.output_stream import OutputStream
+from pyshell.backends.pipeline_backend import IPipelineBackend
+from pyshell.backends.popen_spawn_strategy import PopenSpawnStrategy
+from pyshell.backends.spawn_strategy import ISpawnStrategy
+from pyshell.commands.command_emulator import ICommandEmulator
+from pyshell.commands.command_flags import CommandFlags
 from pyshell.commands.command_metadata import CommandMetadata
 from pyshell.commands.command_result import CommandResult
+from pyshell.commands.resource_usage import ResourceUsage
 from pyshell.logging.command_logger import ICommandLogger
 from pyshell.logging.stream_config import StreamConfig
-import subprocess
+import signal
+import time
+from typing import Awaitable, List, Optional, Sequence
 
-class NativeBackend(IBackend):
+class NativeBackend(IBackend, IAsyncBackend, IPipelineBackend):
     """
     Backend that executes commands directly.
     @ingroup backends
     """
+    # Interval at which a process is checked while waiting for it to exit
+    _STOP_POLL_INTERVAL = 0.01
+
+    # Maximum time to wait for output after a process has been killed
+    _DRAIN_TIMEOUT = 1.0
+
+    def __init__(self,
+        emulate_commands: bool = False,
+        spawn_strategy: Optional[ISpawnStrategy] = None):
+        """
+        Initializes the backend.
+        @param emulate_commands Whether commands that provide an emulator (e.g.
+          `cp`, `rm`, `ls`, and `echo`) should be performed in-process instead
+          of by starting their executables. Emulated commands are logged and
+          return results just like commands that run their executables.
+        @param spawn_strategy Strategy used to start the process for each
+          command. If not specified, processes will be started via
+          `subprocess.Popen`.
+        """
+        self._emulate_commands = emulate_commands
+        self._spawn_strategy = spawn_strategy or PopenSpawnStrategy()
+
 
     def run(self,
         metadata: CommandMetadata,
@@ -26,46 +65,610 @@ class NativeBackend(IBackend):
           `logger.log()` but will not invoke `logger.log_results()`.
         @return The output of the command.
         """
-        # Determine how stderr should be handled
-        if logger.stream_config == StreamConfig.SPLIT_STREAMS:
-            process_stderr = subprocess.PIPE
-        else: # logger.stream_config == StreamConfig.MERGE_STREAMS:
-            process_stderr = subprocess.STDOUT
+        # Emulators can't read input, so commands given input always run their
+        #   executables
+        if self._emulate_commands and metadata.emulator and not metadata.stdin:
+            return self._emulate(metadata, metadata.emulator, cwd, logger)
 
         # Start the process
+        # Output is read as raw bytes and decoded by the output pump so that
+        #   each chunk can be forwarded to the logger as soon as it arrives.
         start_time = datetime.utcnow()
-        process = subprocess.Popen(
-            [metadata.command] + list(metadata.args),
-            stdout=subprocess.PIPE,
-            stderr=process_stderr,
-            cwd=str(cwd),
-            universal_newlines=True
+        stdin, feeder = InputFeeder.open(metadata.stdin)
+        try:
+            process = self._spawn_strategy.spawn(
+                metadata,
+                cwd,
+                logger.stream_config == StreamConfig.MERGE_STREAMS,
+                stdin
+            )
+        except BaseException:
+            if feeder:
+                feeder.close()
+            raise
+        finally:
+            # The child process holds its own copy of its stdin
+            if stdin is not None:
+                os.close(stdin)
+        return self._finish_process(
+            process,
+            metadata,
+            cwd,
+            logger,
+            start_time,
+            feeder
+        )
+
+
+    def run_pipeline(self,
+        metadata: Sequence[CommandMetadata],
+        cwd: Path,
+        loggers: Sequence[ICommandLogger]) -> List[CommandResult]:
+        """
+        Runs the specified commands as a pipeline on the backend.
+        Each command's stdout is connected to the next command's stdin via an
+          OS pipe, so the data passed between commands never goes through the
+          PyShell process. Commands in a pipeline are always run via their
+          executables, even if commands are being emulated. Only the first
+          command in the pipeline may be given input.
+        @param metadata Metadata for each command in the pipeline, in order.
+        @param cwd The working directory to use for the commands. Will always
+          be an absolute path.
+        @param loggers The logger to use for each command, in the same order as
+          `metadata`.
+        @throws ValueError If the number of loggers doesn't match the number of
+          commands or if a command other than the first command has input.
+        @return The result of each command, in the same order as `metadata`.
+        """
+        if len(metadata) != len(loggers):
+            raise ValueError("Each command must have exactly one logger.")
+        if any(m.stdin for m in metadata[1:]):
+            raise ValueError(
+                "Only the first command in a pipeline may be given input."
+            )
+
+        # Start every process before any output is read, since each command
+        #   can only make progress once the next command is reading its output
+        start_time = datetime.utcnow()
+        processes: List[ChildProcess] = []
+        stdin, feeder = InputFeeder.open(metadata[0].stdin)
+        try:
+            for i, (stage, logger) in enumerate(zip(metadata, loggers)):
+                stdout_read: Optional[int] = None
+                stdout_write: Optional[int] = None
+                if i < len(metadata) - 1:
+                    stdout_read, stdout_write = os.pipe()
+                try:
+                    processes.append(self._spawn_strategy.spawn(
+                        stage,
+                        cwd,
+                        logger.stream_config == StreamConfig.MERGE_STREAMS,
+                        stdin,
+                        stdout_write
+                    ))
+                except BaseException:
+                    if stdout_read is not None:
+                        os.close(stdout_read)
+                    raise
+                finally:
+                    # The child processes hold their own copies of the pipe
+                    #   ends that they use
+                    if stdin is not None:
+                        os.close(stdin)
+                    if stdout_write is not None:
+                        os.close(stdout_write)
+                stdin = stdout_read
+        except BaseException:
+            # Don't leave the commands that were already started running
+            if feeder:
+                feeder.close()
+            for process in processes:
+                try:
+                    os.kill(process.pid, signal.SIGKILL)
+                except ProcessLookupError:
+                    pass
+                process.wait()
+            raise
+
+        # Each command's output is forwarded on its own thread, except for the
+        #   last command's output, which is forwarded on the calling thread
+        with ThreadPoolExecutor(max_workers=max(len(processes) - 1, 1)) as pool:
+            futures = [
+                pool.submit(
+                    self._finish_process,
+                    process,
+                    stage,
+                    cwd,
+                    logger,
+                    start_time,
+                    feeder if i == 0 else None
+                )
+                for i, (process, stage, logger) in
+                    enumerate(list(zip(processes, metadata, loggers))[:-1])
+            ]
+            last_result = self._finish_process(
+                processes[-1],
+                metadata[-1],
+                cwd,
+                loggers[-1],
+                start_time,
+                feeder if len(processes) == 1 else None
+            )
+            return [f.result() for f in futures] + [last_result]
+
+
+    async def run_async(self,
+        metadata: CommandMetadata,
+        cwd: Path,
+        logger: ICommandLogger) -> CommandResult:
+        """
+        Runs the specified command on the backend.
+        If the calling task is cancelled, the process will be killed.
+        @param metadata Metadata for the command to run.
+        @param cwd The working directory to use for the command. Will always be
+          an absolute path.
+        @param logger The logger to use for the command. The backend will invoke
+          `logger.log()` but will not invoke `logger.log_results()`.
+        @return The output of the command.
+        """
+        # asyncio is slow to import, so it's only imported by scripts that run
+        #   commands asynchronously
+        import asyncio
+
+        # Emulated commands never block for long, so they're run directly
+        if self._emulate_commands and metadata.emulator and not metadata.stdin:
+            return self._emulate(metadata, metadata.emulator, cwd, logger)
+
+        # Start the process
+        # The process is started by the spawn strategy rather than by asyncio
+        #   so that it can be reaped via `os.wait4()`, which reports the
+        #   resources it used. Its pipes are read by the event loop.
+        start_time = datetime.utcnow()
+        stdin, feeder = InputFeeder.open(metadata.stdin)
+        try:
+            process = self._spawn_strategy.spawn(
+                metadata,
+                cwd,
+                logger.stream_config == StreamConfig.MERGE_STREAMS,
+                stdin
+            )
+        except BaseException:
+            if feeder:
+                feeder.close()
+            raise
+        finally:
+            # The child process holds its own copy of its stdin
+            if stdin is not None:
+                os.close(stdin)
+
+        limits = metadata.limits
+        timeout = limits.timeout if limits else None
+        timed_out = False
+        try:
+            try:
+                # A process may close its pipes long before it exits, so the
+                #   timeout also applies to waiting for the process to exit
+                await asyncio.wait_for(
+                    self._communicate_async(
+                        process,
+                        OutputPump(
+                            logger,
+                            binary=bool(
+                                metadata.flags & CommandFlags.BINARY_OUTPUT
+                            )
+                        ),
+                        feeder
+                    ),
+                    timeout
+                )
+            except asyncio.TimeoutError:
+                assert limits
+                timed_out = True
+                await self._stop_process_async(
+                    process,
+                    limits.kill_grace_period
+                )
+        except BaseException:
+            # Don't leave the process running if the caller gave up on it
+            if process.poll() is None:
+                os.kill(process.pid, signal.SIGKILL)
+            raise
+        finally:
+            if feeder:
+                feeder.close()
+            exit_code = process.wait()
+
+        return self._create_result(
+            metadata,
+            cwd,
+            logger,
+            exit_code,
+            start_time,
+            process.spawn_duration,
+            timed_out,
+            self._is_limit_exceeded(metadata, process, timed_out),
+            process.rusage
+        )
+
+
+    def _finish_process(self,
+        process: ChildProcess,
+        metadata: CommandMetadata,
+        cwd: Path,
+        logger: ICommandLogger,
+        start_time: datetime,
+        feeder: Optional[InputFeeder] = None) -> CommandResult:
+        """
+        Forwards a started process's output to its logger until it exits.
+        @param process The process to finish.
+        @param metadata Metadata for the command that the process was started
+          for.
+        @param cwd The working directory the command was run in.
+        @param logger The logger to forward the process's output to.
+        @param start_time The time at which the command was started.
+        @param feeder Feeder used to write the command's input to its stdin
+          pipe, if any.
+        @return The result of the command.
+        """
+        stdout_fd = process.stdout.fileno() if process.stdout else None
+        stderr_fd = process.stderr.fileno() if process.stderr else None
+        limits = metadata.limits
+        timeout = limits.timeout if limits else None
+        deadline = None if timeout is None else time.monotonic() + timeout
+        timed_out = False
+        try:
+            # Process all output from the process
+            # A process may close its pipes long before it exits, so the
+            #   timeout also applies to waiting for the process to exit
+            pump = OutputPump(
+                logger,
+                binary=bool(metadata.flags & CommandFlags.BINARY_OUTPUT),
+                stdin=feeder
+            )
+            if not pump.pump(stdout_fd, stderr_fd, timeout) or \
+                not self._wait_for_exit(process, deadline):
+                assert limits
+                timed_out = True
+                self._stop_process(
+                    process,
+                    pump,
+                    stdout_fd,
+                    stderr_fd,
+                    limits.kill_grace_period
+                )
+        finally:
+            # The process would never see the end of its input if the pump
+            #   stopped early (e.g. because the input iterator threw)
+            if feeder:
+                feeder.close()
+            exit_code = process.wait()
+
+        return self._create_result(
+            metadata,
+            cwd,
+            logger,
+            exit_code,
+            start_time,
+            process.spawn_duration,
+            timed_out,
+            self._is_limit_exceeded(metadata, process, timed_out),
+            process.rusage
         )
 
-        # The process's stderr is allowed to be null since it could be
-        #   redirected, but the process's stdout must always be valid
-        assert process.stdout
 
-        # Process all output from the process
+    @staticmethod
+    def _is_limit_exceeded(metadata: CommandMetadata,
+        process: ChildProcess,
+        timed_out: bool) -> bool:
+        """
+        Checks whether a process was stopped because it exceeded a resource
+          limit.
+        @param metadata Metadata for the command that the process was started
+          for.
+        @param process The process, which must have been waited on.
+        @param timed_out Whether the process was stopped because it exceeded
+          its timeout.
+        @return True if the process exceeded its CPU time limit.
+        """
+        # A process that runs out of CPU time receives `SIGXCPU` and is then
+        #   killed once it reaches the hard limit
+        limits = metadata.limits
+        if not limits or limits.cpu_time is None or timed_out:
+            return False
+        rusage = process.rusage
+        return process.exit_code == -signal.SIGXCPU or (
+            process.exit_code == -signal.SIGKILL and rusage is not None and
+            rusage.cpu_time >= limits.cpu_time
+        )
+
+
+    def _emulate(self,
+        metadata: CommandMetadata,
+        emulator: ICommandEmulator,
+        cwd: Path,
+        logger: ICommandLogger) -> CommandResult:
+        """
+        Performs a command in-process using the command's emulator.
+        @param metadata Metadata for the command to run.
+        @param emulator The emulator to perform the command with.
+        @param cwd The working directory to use for the command.
+        @param logger The logger to use for the command.
+        @return The output of the command.
+        """
+        start_time = datetime.utcnow()
+        stdout = StringIO()
+        if logger.stream_config == StreamConfig.SPLIT_STREAMS:
+            stderr = StringIO()
+        else: # logger.stream_config == StreamConfig.MERGE_STREAMS:
+            stderr = stdout
+        exit_code = emulator.run(cwd, stdout, stderr)
+
+        # Forward the output to the logger in a single chunk
+        stdout.seek(0)
+        if stderr is stdout:
+            logger.log(stdout, None)
+        else:
+            stderr.seek(0)
+            logger.log(stdout, stderr)
+
+        return self._create_result(
+            metadata,
+            cwd,
+            logger,
+            exit_code,
+            start_time
+        )
+
+
+    @staticmethod
+    def _wait_for_exit(process: ChildProcess,
+        deadline: Optional[float]) -> bool:
+        """
+        Waits for a process that has closed its pipes to exit.
+        @param process The process to wait for.
+        @param deadline Value of `time.monotonic()` after which to stop waiting,
+          or `None` to leave waiting to `ChildProcess.wait()`.
+        @return True if the process exited, or False if the deadline passed.
+        """
+        if deadline is None:
+            return True
+
+        # Most processes exit right after closing their pipes, so the poll
+        #   interval starts small to avoid delaying every command
+        interval = NativeBackend._STOP_POLL_INTERVAL / 10
         while process.poll() is None:
-            logger.log(process.stdout, process.stderr)
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(interval, remaining))
+            interval = min(interval * 2, NativeBackend._STOP_POLL_INTERVAL)
+        return True
+
+
+    @staticmethod
+    def _stop_process(process: ChildProcess,
+        pump: OutputPump,
+        stdout_fd: Optional[int],
+        stderr_fd: Optional[int],
+        grace_period: float) -> None:
+        """
+        Stops a process that exceeded its timeout.
+        The process's group is sent `SIGTERM` and then `SIGKILL` once the grace
+          period has elapsed. Any output that the process writes in the
+          meantime is still forwarded to the logger.
+        @param process The process to stop.
+        @param pump The output pump used for the process.
+        @param stdout_fd File descriptor of the process's stdout pipe, if any.
+        @param stderr_fd File descriptor of the process's stderr pipe, if any.
+        @param grace_period Time given to the process to exit after it has been
+          sent `SIGTERM`, in seconds.
+        """
+        deadline = time.monotonic() + grace_period
+        process.signal_group(signal.SIGTERM)
+        pump.pump(stdout_fd, stderr_fd, grace_period)
+
+        # The process may have closed its pipes without exiting
+        while process.poll() is None and time.monotonic() < deadline:
+            time.sleep(NativeBackend._STOP_POLL_INTERVAL)
+
+        # Make sure that no process in the group outlives the command, then
+        #   collect any output that's still buffered in the pipes. Processes
+        #   that moved to another process group may keep the pipes open, so
+        #   this doesn't wait for the pipes to be closed indefinitely.
+        process.signal_group(signal.SIGKILL)
+        pump.pump(stdout_fd, stderr_fd, NativeBackend._DRAIN_TIMEOUT)
+
+
+    @staticmethod
+    async def _stop_process_async(process: ChildProcess,
+        grace_period: float) -> None:
+        """
+        Stops a process that exceeded its timeout.
+        The process's group is sent `SIGTERM` and then `SIGKILL` once the grace
+          period has elapsed.
+        @param process The process to stop.
+        @param grace_period Time given to the process to exit after it has been
+          sent `SIGTERM`, in seconds.
+        """
+        import asyncio
+        for sig in (signal.SIGTERM, signal.SIGKILL):
+            process.signal_group(sig)
+            try:
+                await asyncio.wait_for(
+                    NativeBackend._wait_for_exit_async(process),
+                    grace_period
+                )
+                return
+            except asyncio.TimeoutError:
+                pass
+        await NativeBackend._wait_for_exit_async(process)
 
-        # Process any remaining output from the process
-        logger.log(process.stdout, process.stderr)
 
+    @staticmethod
+    async def _communicate_async(process: ChildProcess,
+        pump: OutputPump,
+        feeder: Optional[InputFeeder]) -> None:
+        """
+        Forwards a process's input and output until the process exits.
+        Both streams are read concurrently for the same reason that the output
+          pump waits on both pipes at once. The process is not reaped by this
+          method.
+        @param process The process to communicate with.
+        @param pump The output pump to forward the process's output to.
+        @param feeder Feeder used to write the process's input to its stdin
+          pipe, if any.
+        """
+        import asyncio
+        tasks: List[Awaitable[None]] = []
+        if process.stdout:
+            tasks.append(NativeBackend._pump_async(
+                pump,
+                process.stdout.fileno(),
+                OutputStream.STDOUT
+            ))
+        if process.stderr:
+            tasks.append(NativeBackend._pump_async(
+                pump,
+                process.stderr.fileno(),
+                OutputStream.STDERR
+            ))
+        if feeder:
+            tasks.append(NativeBackend._feed_async(feeder))
+        await asyncio.gather(*tasks)
+        await NativeBackend._wait_for_exit_async(process)
+
+
+    @staticmethod
+    async def _pump_async(pump: OutputPump,
+        fd: int,
+        stream: OutputStream) -> None:
+        """
+        Forwards output from one of a process's pipes to an output pump.
+        @param pump The output pump to forward the output to.
+        @param fd File descriptor of the pipe to read output from.
+        @param stream Which of the process's streams is being read.
+        """
+        while True:
+            await NativeBackend._wait_for_fd_async(fd, False)
+            data = os.read(fd, OutputPump.DEFAULT_CHUNK_SIZE)
+            pump.feed(data, stream)
+            if not data:
+                break
+
+
+    @staticmethod
+    async def _feed_async(feeder: InputFeeder) -> None:
+        """
+        Writes a process's input to its stdin pipe.
+        @param feeder Feeder used to write the process's input.
+        """
+        while not feeder.write():
+            await NativeBackend._wait_for_fd_async(feeder.fd, True)
+
+
+    @staticmethod
+    async def _wait_for_exit_async(process: ChildProcess) -> None:
+        """
+        Waits for a process to exit without reaping it.
+        @param process The process to wait for.
+        """
+        import asyncio
+
+        # A pidfd becomes readable once the process exits. It isn't available
+        #   on every platform, in which case the process is polled instead.
+        try:
+            pidfd = os.pidfd_open(process.pid)
+        except (AttributeError, OSError):
+            pidfd = None
+        try:
+            interval = NativeBackend._STOP_POLL_INTERVAL / 10
+            while process.poll() is None:
+                if pidfd is not None:
+                    await NativeBackend._wait_for_fd_async(pidfd, False)
+                else:
+                    await asyncio.sleep(interval)
+                    interval = min(
+                        interval * 2,
+                        NativeBackend._STOP_POLL_INTERVAL
+                    )
+        finally:
+            if pidfd is not None:
+                os.close(pidfd)
+
+
+    @staticmethod
+    async def _wait_for_fd_async(fd: int, writable: bool) -> None:
+        """
+        Waits for a file descriptor to become readable or writable.
+        @param fd The file descriptor to wait for.
+        @param writable Whether to wait for the descriptor to become writable
+          instead of readable.
+        """
+        import asyncio
+        loop = asyncio.get_running_loop()
+        ready = loop.create_future()
+        def on_ready() -> None:
+            # The callback may run again before the waiting task resumes
+            if not ready.done():
+                ready.set_result(None)
+
+        if writable:
+            loop.add_writer(fd, on_ready)
+        else:
+            loop.add_reader(fd, on_ready)
+        try:
+            await ready
+        finally:
+            if writable:
+                loop.remove_writer(fd)
+            else:
+                loop.remove_reader(fd)
+
+
+    @staticmethod
+    def _create_result(metadata: CommandMetadata,
+        cwd: Path,
+        logger: ICommandLogger,
+        exit_code: int,
+        start_time: datetime,
+        spawn_duration: Optional[float] = None,
+        timed_out: bool = False,
+        limit_exceeded: bool = False,
+        resource_usage: Optional[ResourceUsage] = None) -> CommandResult:
+        """
+        Creates the result for a command that finished running.
+        @param metadata Metadata for the command that was run.
+        @param cwd The working directory the command was run in.
+        @param logger The logger that was used for the command.
+        @param exit_code The exit code of the command.
+        @param start_time The time at which the command was started.
+        @param spawn_duration Time taken to start the command's process, in
+          seconds, if a process was started.
+        @param timed_out Whether the command was stopped because it exceeded
+          its timeout.
+        @param limit_exceeded Whether the command was stopped because it
+          exceeded a resource limit.
+        @param resource_usage Resources used by the command's process, if
+          known.
+        @return The result of the command.
+        """
         # Make sure the returned output always ends with a newline
-        output = logger.output
+        output = logger.output_buffer
         if not output.endswith("\n"):
-            output += "\n"
+            output.append("\n")
 
         return CommandResult(
             command=metadata.command,
             args=metadata.args,
             cwd=str(cwd),
             output=output,
-            exit_code=process.returncode,
+            exit_code=exit_code,
             skipped=False,
             start_time=start_time,
             end_time=datetime.utcnow(),
-            backend="Host"
+            backend="Host",
+            spawn_duration=spawn_duration,
+            timed_out=timed_out,
+            limit_exceeded=limit_exceeded,
+            resource_usage=resource_usage
         )
@@ -0,0 +1,63 @@
+from pyshell.backends.output_stream import OutputStream
+
+class OutputChunk:
+    """
+    Struct-type class that stores a single chunk of output read from a command.
+    @ingroup backends
+    """
+    def __init__(self,
+        stream: OutputStream,
+        sequence: int,
+        timestamp_ns: int,
+        text: str | bytes):
+        """
+        Initializes the object.
+        @param stream The stream that the chunk was read from.
+        @param sequence Sequence number of the chunk. Sequence numbers are
+          shared by all streams of a command and start at 0, so they can be
+          used to recover the order in which output was written across streams.
+        @param timestamp_ns Time that the chunk was read at, as returned by
+          `time.perf_counter_ns()`.
+        @param text The output contained in the chunk. This will be the raw
+          bytes read from the pipe if the command captures binary output.
+        """
+        self._stream = stream
+        self._sequence = sequence
+        self._timestamp_ns = timestamp_ns
+        self._text = text
+
+
+    @property
+    def stream(self) -> OutputStream:
+        """
+        The stream that the chunk was read from.
+        """
+        return self._stream
+
+
+    @property
+    def sequence(self) -> int:
+        """
+        Sequence number of the chunk.
+        Sequence numbers are shared by all streams of a command, so sorting
+          chunks by sequence number recovers the order in which they were read.
+        """
+        return self._sequence
+
+
+    @property
+    def timestamp_ns(self) -> int:
+        """
+        Time that the chunk was read at, as returned by `time.perf_counter_ns()`.
+        """
+        return self._timestamp_ns
+
+
+    @property
+    def text(self) -> str | bytes:
+        """
+        The output contained in the chunk.
+        This will be the raw bytes read from the pipe if the command captures
+          binary output.
+        """
+        return self._text
@@ -0,0 +1,225 @@
+import codecs
+from io import IncrementalNewlineDecoder, StringIO
+import locale
+import os
+from pyshell.backends.input_feeder import InputFeeder
+from pyshell.backends.output_chunk import OutputChunk
+from pyshell.backends.output_stream import OutputStream
+from pyshell.logging.command_logger import ICommandLogger
+from pyshell.logging.stream_config import StreamConfig
+import selectors
+import time
+from typing import Any, Callable, Dict, Optional, Set
+
+class OutputPump:
+    """
+    Forwards output from a child process's pipes to a command logger.
+    The pump waits on the child process's pipes using the most efficient
+      selector available on the platform (e.g. epoll on Linux) and forwards
+      each chunk of output to the logger as soon as it has been read. While the
+      child process is not writing any output, the pump blocks instead of
+      polling the pipes.
+    When stdout and stderr are split, both pipes are drained concurrently, so
+      a child that fills one pipe while the other is idle can never deadlock.
+      At most `chunk_size` bytes are read from a pipe before the chunk is
+      forwarded, which bounds the amount of output held by the pump.
+    If the child process is given input via a pipe, the pump also writes the
+      input to the pipe whenever the pipe has room for more input, so input
+      and output are handled at the same time without the risk of a deadlock.
+    @ingroup backends
+    """
+    ## Maximum number of bytes read from a pipe in a single read.
+    DEFAULT_CHUNK_SIZE = 64 * 1024
+
+    def __init__(self,
+        logger: ICommandLogger,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        on_chunk: Optional[Callable[[OutputChunk], Any]] = None,
+        binary: bool = False,
+        stdin: Optional[InputFeeder] = None):
+        """
+        Initializes the pump.
+        @param logger The logger to forward output to.
+        @param chunk_size Maximum number of bytes to read from a pipe at once.
+        @param on_chunk Optional callback invoked with each chunk of output
+          after the chunk has been forwarded to the logger. Any return value
+          will be ignored. If not specified, chunks are passed to the logger's
+          `log_chunk()` method if the logger accepts chunks.
+        @param binary Whether the command captures binary output. If set, raw
+          output is forwarded to loggers that accept bytes without being
+          decoded. For other loggers, the output is decoded without failing on
+          invalid input.
+        @param stdin Feeder used to write input to the child process's stdin
+          pipe, if any.
+        """
+        self._logger = logger
+        self._chunk_size = chunk_size
+        if on_chunk is None and logger.accepts_chunks:
+            on_chunk = logger.log_chunk
+        self._on_chunk = on_chunk
+        self._binary = binary
+        self._stdin = stdin
+
+        # Sequence number to assign to the next chunk of output
+        self._sequence = 0
+
+        # Output is decoded the same way that `subprocess` decodes output when
+        #   `universal_newlines=True` is used
+        self._encoding = locale.getpreferredencoding(False)
+        self._decoders: Dict[OutputStream, IncrementalNewlineDecoder] = {}
+
+        # Pipes that have already been closed
+        self._closed_fds: Set[int] = set()
+
+
+    @property
+    def chunk_count(self) -> int:
+        """
+        The number of chunks that have been forwarded to the logger.
+        """
+        return self._sequence
+
+
+    def pump(self,
+        stdout_fd: Optional[int],
+        stderr_fd: Optional[int],
+        timeout: Optional[float] = None) -> bool:
+        """
+        Forwards output to the logger until all pipes have been closed.
+        The output pipes will not be closed by this method, but the stdin pipe
+          is closed once all input has been written to it. If the timeout elapses
+          before all pipes have been closed, this method may be invoked again
+          to continue forwarding output.
+        @param stdout_fd File descriptor of the child process's stdout pipe, or
+          `None` if stdout isn't connected to a pipe (e.g. for a command whose
+          output is piped to another command).
+        @param stderr_fd File descriptor of the child process's stderr pipe, or
+          `None` if stderr was redirected to stdout.
+        @param timeout Maximum time to wait for the pipes to be closed, in
+          seconds. If not specified, this method will wait indefinitely.
+        @return True if all pipes were closed, or False if the timeout elapsed.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with selectors.DefaultSelector() as selector:
+            for fd, stream in (
+                (stdout_fd, OutputStream.STDOUT),
+                (stderr_fd, OutputStream.STDERR)):
+                if fd is not None and fd not in self._closed_fds:
+                    selector.register(fd, selectors.EVENT_READ, stream)
+            if self._stdin and not self._stdin.closed:
+                selector.register(self._stdin.fd, selectors.EVENT_WRITE, None)
+
+            while selector.get_map():
+                remaining = None
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return False
+
+                for key, _ in selector.select(remaining):
+                    # The stdin pipe is the only pipe registered without a
+                    #   stream. The feeder closes the pipe once it's done.
+                    if key.data is None:
+                        assert self._stdin
+                        if self._stdin.write():
+                            selector.unregister(key.fd)
+                        continue
+
+                    # The selector only returns pipes that are ready to be
+                    #   read from, so this will not block
+                    data = os.read(key.fd, self._chunk_size)
+                    if not data:
+                        # An empty read means that the pipe was closed
+                        selector.unregister(key.fd)
+                        self._closed_fds.add(key.fd)
+                    self.feed(data, key.data)
+        return True
+
+
+    def feed(self, data: bytes, stream: OutputStream) -> None:
+        """
+        Decodes raw output read from a pipe and forwards it to the logger.
+        This allows callers that read from the pipes themselves (e.g. via
+          asyncio) to share the pump's decoding and dispatching logic.
+        @param data The bytes read from the pipe. An empty bytes object
+          indicates that the pipe was closed.
+        @param stream The stream that the data was read from.
+        """
+        if self._binary and self._logger.accepts_bytes:
+            if data:
+                self._dispatch_bytes(data, stream)
+            return
+
+        # Each pipe gets its own decoder since a multi-byte character may be
+        #   split across two reads
+        decoder = self._decoders.get(stream)
+        if decoder is None:
+            decoder = IncrementalNewlineDecoder(
+                codecs.getincrementaldecoder(self._encoding)(
+                    "replace" if self._binary else "strict"
+                ),
+                translate=True
+            )
+            self._decoders[stream] = decoder
+
+        text = decoder.decode(data, final=not data)
+        if text:
+            self._dispatch(text, stream)
+
+
+    def _dispatch(self, text: str, stream: OutputStream) -> None:
+        """
+        Forwards a chunk of output to the logger.
+        @param text The chunk of output to forward.
+        @param stream The stream that the chunk was read from.
+        """
+        # Chunks are only built if they're used since this is called for every
+        #   read from the command's pipes
+        chunk = None
+        if self._on_chunk:
+            chunk = OutputChunk(
+                stream,
+                self._sequence,
+                time.perf_counter_ns(),
+                text
+            )
+        self._sequence += 1
+
+        if self._logger.stream_config == StreamConfig.MERGE_STREAMS:
+            self._logger.log(StringIO(text), None)
+        elif stream == OutputStream.STDERR:
+            self._logger.log(StringIO(), StringIO(text))
+        else:
+            self._logger.log(StringIO(text), StringIO())
+
+        if self._on_chunk and chunk:
+            self._on_chunk(chunk)
+
+
+    def _dispatch_bytes(self, data: bytes, stream: OutputStream) -> None:
+        """
+        Forwards a chunk of raw output to the logger.
+        @param data The chunk of output to forward.
+        @param stream The stream that the chunk was read from.
+        """
+        # Chunks are only built if they're used since this is called for every
+        #   read from the command's pipes
+        chunk = None
+        if self._on_chunk:
+            chunk = OutputChunk(
+                stream,
+                self._sequence,
+                time.perf_counter_ns(),
+                data
+            )
+        self._sequence += 1
+
+        if self._logger.stream_config == StreamConfig.MERGE_STREAMS:
+            self._logger.log_bytes(data, None)
+        elif stream == OutputStream.STDERR:
+            self._logger.log_bytes(b"", data)
+        else:
+            self._logger.log_bytes(data, b"")
+
+        if self._on_chunk and chunk:
+            self._on_chunk(chunk)
@@ -0,0 +1,14 @@
+from enum import Enum
+
+class OutputStream(Enum):
+    """
+    Identifies the stream that a chunk of command output was written to.
+    @ingroup backends
+    """
+    ## The command's stdout stream.
+    # If the logger requested that the streams be merged, all output will be
+    #   reported as stdout output.
+    STDOUT = 0
+
+    ## The command's stderr stream.
+    STDERR = 1
@@ -0,0 +1,406 @@
+from datetime import datetime
+import errno
+import os
+from pathlib import Path
+from pyshell.backends.backend import IBackend
+from pyshell.backends.output_pump import OutputPump
+from pyshell.backends.output_stream import OutputStream
+from pyshell.commands.command_flags import CommandFlags
+from pyshell.commands.command_metadata import CommandMetadata
+from pyshell.commands.command_result import CommandResult
+from pyshell.logging.command_logger import ICommandLogger
+from pyshell.logging.stream_config import StreamConfig
+import re
+import selectors
+import shlex
+import signal
+import subprocess
+import threading
+import time
+from typing import Dict, List, Optional
+import uuid
+
+class PersistentShellBackend(IBackend):
+    """
+    Backend that runs all commands via a single long-lived shell process.
+    Each command is written to the shell's stdin and run in a subshell, so the
+      shell interpreter only needs to be started once instead of once per
+      command. The end of each command's output is detected via a sentinel
+      that the shell writes to its stdout and stderr after the command exits.
+    Each command runs with the same working directory and environment that it
+      would get from `NativeBackend`: the command's working directory is
+      changed to explicitly, and any changes made to `os.environ` since the
+      shell was started are applied to the command's environment. Neither
+      leaks into the shell or into later commands.
+    Commands run by this backend can't read from stdin, since the shell's
+      stdin is used to send commands to the shell. Commands are run one at a
+      time; commands run from multiple threads will wait for each other.
+    Command limits are enforced as they are by `NativeBackend`. CPU time and
+      address space limits are set via `ulimit` in the command's subshell. If
+      a command exceeds its timeout, the shell's process group (which
+      includes the command) is sent `SIGTERM` and then `SIGKILL`, and a new
+      shell is started for the next command. Commands with an explicit
+      executable require a shell that supports `exec -a` (e.g. bash, zsh or
+      ksh).
+    @ingroup backends
+    """
+    # Matches environment variable names that the shell can assign to
+    _ENV_NAME_REGEX = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+    # Maximum time to wait for output after the shell has been killed
+    _DRAIN_TIMEOUT = 1.0
+
+    def __init__(self, shell: str = "bash"):
+        """
+        Initializes the backend.
+        The shell process is started when the first command is run.
+        @param shell The POSIX-compatible shell to run commands with.
+        """
+        self._shell = shell
+        self._process: Optional[subprocess.Popen] = None
+        self._lock = threading.Lock()
+
+        # Environment that the shell process was started with
+        self._shell_env: Dict[str, str] = {}
+
+        # Prefix used for each sentinel. Each sentinel also includes the number
+        #   of commands run so far so that output from one command can never
+        #   be mistaken for the sentinel of another command.
+        self._sentinel_prefix = f"__pyshell_{uuid.uuid4().hex}_"
+        self._cmd_count = 0
+
+
+    @property
+    def shell_pid(self) -> Optional[int]:
+        """
+        The process ID of the shell process, or `None` if it isn't running.
+        """
+        return self._process.pid if self._process else None
+
+
+    def run(self,
+        metadata: CommandMetadata,
+        cwd: Path,
+        logger: ICommandLogger) -> CommandResult:
+        """
+        Runs the specified command on the backend.
+        @param metadata Metadata for the command to run.
+        @param cwd The working directory to use for the command. Will always be
+          an absolute path.
+        @param logger The logger to use for the command. The backend will invoke
+          `logger.log()` but will not invoke `logger.log_results()`.
+        @throws FileNotFoundError If the working directory doesn't exist.
+        @throws NotADirectoryError If the working directory isn't a directory.
+        @throws RuntimeError If the shell process exits unexpectedly.
+        @throws ValueError If the command was given input.
+        @return The output of the command.
+        """
+        if metadata.stdin:
+            raise ValueError(
+                "Commands run via the persistent shell backend can't be " +
+                "given input."
+            )
+
+        # The shell can only report a failure to change to the working
+        #   directory as an exit code, so the directory is checked here to
+        #   raise the same errors that `NativeBackend` raises
+        if not cwd.is_dir():
+            code = errno.ENOTDIR if cwd.exists() else errno.ENOENT
+            raise OSError(code, os.strerror(code), str(cwd))
+
+        limits = metadata.limits
+        timed_out = False
+        with self._lock:
+            process = self._start_shell()
+            assert process.stdin and process.stdout and process.stderr
+
+            self._cmd_count += 1
+            sentinel = f"{self._sentinel_prefix}{self._cmd_count}__"
+            merge_streams = logger.stream_config == StreamConfig.MERGE_STREAMS
+
+            start_time = datetime.utcnow()
+            process.stdin.write(
+                self._build_script(metadata, cwd, sentinel, merge_streams)
+            )
+            process.stdin.flush()
+
+            pump = OutputPump(
+                logger,
+                binary=bool(metadata.flags & CommandFlags.BINARY_OUTPUT)
+            )
+            try:
+                exit_code = self._read_output(
+                    process,
+                    pump,
+                    sentinel.encode(),
+                    limits.timeout if limits else None
+                )
+                if exit_code is None:
+                    assert limits
+                    timed_out = True
+                    exit_code = self._stop_command(
+                        process,
+                        pump,
+                        limits.kill_grace_period
+                    )
+            except BaseException:
+                # Don't leave the command running if the caller gave up on it
+                if self._process:
+                    self._signal_shell(signal.SIGKILL)
+                    self._stop_shell()
+                raise
+
+        # Make sure the returned output always ends with a newline
+        output = logger.output_buffer
+        if not output.endswith("\n"):
+            output.append("\n")
+
+        return CommandResult(
+            command=metadata.command,
+            args=metadata.args,
+            cwd=str(cwd),
+            output=output,
+            exit_code=exit_code,
+            skipped=False,
+            start_time=start_time,
+            end_time=datetime.utcnow(),
+            backend="Host",
+            timed_out=timed_out,
+            limit_exceeded=limits is not None and
+                limits.cpu_time is not None and
+                exit_code == -signal.SIGXCPU
+        )
+
+
+    def stop(self) -> None:
+        """
+        Stops the shell process.
+        If another command is run after this, a new shell process is started.
+        """
+        with self._lock:
+            self._stop_shell()
+
+
+    def _start_shell(self) -> subprocess.Popen:
+        """
+        Starts the shell process if it isn't already running.
+        @return The shell process.
+        """
+        if self._process and self._process.poll() is None:
+            return self._process
+
+        # The shell is started in a new session so that the shell and the
+        #   command it's running can be stopped together
+        self._shell_env = dict(os.environ)
+        self._process = subprocess.Popen(
+            [self._shell],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            start_new_session=True
+        )
+        return self._process
+
+
+    def _stop_shell(self) -> None:
+        """
+        Stops the shell process if it's running.
+        """
+        if not self._process:
+            return
+
+        assert self._process.stdin
+        try:
+            self._process.stdin.close()
+        except BrokenPipeError:
+            pass
+        self._process.wait()
+        if self._process.stdout:
+            self._process.stdout.close()
+        if self._process.stderr:
+            self._process.stderr.close()
+        self._process = None
+
+
+    def _signal_shell(self, sig: int) -> None:
+        """
+        Sends a signal to the shell and every process in its process group.
+        @param sig The signal to send.
+        """
+        assert self._process
+        try:
+            os.killpg(self._process.pid, sig)
+        except ProcessLookupError:
+            # Every process in the group has already exited
+            pass
+
+
+    def _stop_command(self,
+        process: subprocess.Popen,
+        pump: OutputPump,
+        grace_period: float) -> int:
+        """
+        Stops a command that exceeded its timeout along with the shell.
+        The shell's process group is sent `SIGTERM` and then `SIGKILL` once the
+          grace period has elapsed. Any output that the command writes in the
+          meantime is still forwarded to the logger. A new shell is started
+          when the next command is run.
+        @param process The shell process.
+        @param pump The output pump used for the command.
+        @param grace_period Time given to the command to exit after it has been
+          sent `SIGTERM`, in seconds.
+        @return The exit code to report for the command.
+        """
+        assert process.stdout and process.stderr
+        stdout_fd = process.stdout.fileno()
+        stderr_fd = process.stderr.fileno()
+
+        # The pipes are closed once both the shell and the command have exited
+        exit_code = -signal.SIGTERM
+        self._signal_shell(signal.SIGTERM)
+        if not pump.pump(stdout_fd, stderr_fd, grace_period):
+            exit_code = -signal.SIGKILL
+            self._signal_shell(signal.SIGKILL)
+            pump.pump(stdout_fd, stderr_fd, self._DRAIN_TIMEOUT)
+        self._stop_shell()
+        return exit_code
+
+
+    def _build_script(self,
+        metadata: CommandMetadata,
+        cwd: Path,
+        sentinel: str,
+        merge_streams: bool) -> bytes:
+        """
+        Builds the shell script that runs a command.
+        @param metadata Metadata for the command to run.
+        @param cwd The working directory to use for the command.
+        @param sentinel Sentinel to write once the command exits.
+        @param merge_streams Whether the command's stderr should be redirected
+          to its stdout.
+        @return The script to send to the shell.
+        """
+        # Commands are run in a subshell so that changes to the cwd and the
+        #   environment only apply to the command being run
+        statements: List[str] = [f"cd -- {shlex.quote(str(cwd))} || exit"]
+        for name, value in os.environ.items():
+            if self._shell_env.get(name) != value and \
+                self._ENV_NAME_REGEX.match(name):
+                statements.append(f"export {name}={shlex.quote(value)}")
+        for name in self._shell_env:
+            if name not in os.environ and self._ENV_NAME_REGEX.match(name):
+                statements.append(f"unset {name}")
+        limits = metadata.limits
+        if limits and limits.cpu_time is not None:
+            # The hard limit is one second past the soft limit so that the
+            #   command receives `SIGXCPU` before it's killed
+            statements.append(f"ulimit -H -t {limits.cpu_time + 1}")
+            statements.append(f"ulimit -S -t {limits.cpu_time}")
+        if limits and limits.address_space is not None:
+            statements.append(f"ulimit -v {limits.address_space // 1024}")
+
+        # The command keeps its name as `argv[0]` if it's run via an explicit
+        #   executable, as it does when it's run by `NativeBackend`
+        if metadata.executable:
+            command = [
+                "exec", "-a", metadata.command, metadata.executable
+            ] + list(metadata.args)
+        else:
+            command = ["exec", metadata.command] + list(metadata.args)
+        statements.append(" ".join(shlex.quote(a) for a in command))
+
+        redirect = " 2>&1" if merge_streams else ""
+        return (
+            f"( {'; '.join(statements)} ) </dev/null{redirect}\n" +
+            f"printf '%s:%d\\n' {sentinel} $?\n" +
+            f"printf '%s\\n' {sentinel} >&2\n"
+        ).encode()
+
+
+    def _read_output(self,
+        process: subprocess.Popen,
+        pump: OutputPump,
+        sentinel: bytes,
+        timeout: Optional[float]) -> Optional[int]:
+        """
+        Forwards a command's output to the pump until the sentinels are read.
+        @param process The shell process.
+        @param pump The output pump to forward output to.
+        @param sentinel The sentinel written by the shell once the command has
+          exited.
+        @param timeout Maximum time to wait for the command to exit, in
+          seconds. If not specified, this method will wait indefinitely.
+        @throws RuntimeError If the shell process exits unexpectedly.
+        @return The exit code of the command, or `None` if the timeout elapsed.
+          Commands that were killed by a signal report the negated signal
+          number, as they do when run by `NativeBackend`.
+        """
+        assert process.stdout and process.stderr
+        streams = {
+            process.stdout.fileno(): OutputStream.STDOUT,
+            process.stderr.fileno(): OutputStream.STDERR
+        }
+
+        # Output that has been read but not forwarded yet since it could be
+        #   the start of the sentinel
+        pending = {fd: b"" for fd in streams}
+        exit_code: Optional[int] = None
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        with selectors.DefaultSelector() as selector:
+            for fd in streams:
+                selector.register(fd, selectors.EVENT_READ)
+
+            while selector.get_map():
+                remaining = None
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        # Output held back in case it was the start of a
+                        #   sentinel won't be followed by the sentinel
+                        for fd, data in pending.items():
+                            if data:
+                                pump.feed(data, streams[fd])
+                        return None
+
+                for key, _ in selector.select(remaining):
+                    data = os.read(key.fd, OutputPump.DEFAULT_CHUNK_SIZE)
+                    if not data:
+                        self._stop_shell()
+                        raise RuntimeError(
+                            f"Shell process '{self._shell}' exited " +
+                            "unexpectedly."
+                        )
+                    buffer = pending[key.fd] + data
+
+                    index = buffer.find(sentinel)
+                    if index < 0:
+                        # Hold back anything that could be part of the sentinel
+                        split = max(len(buffer) - len(sentinel) + 1, 0)
+                        pending[key.fd] = buffer[split:]
+                        if split:
+                            pump.feed(buffer[:split], streams[key.fd])
+                        continue
+
+                    # The stdout sentinel is followed by the exit code
+                    line_end = buffer.find(b"\n", index)
+                    if line_end < 0:
+                        pending[key.fd] = buffer
+                        continue
+                    if streams[key.fd] == OutputStream.STDOUT:
+                        exit_code = int(
+                            buffer[index + len(sentinel) + 1:line_end]
+                        )
+
+                    pending[key.fd] = b""
+                    if index:
+                        pump.feed(buffer[:index], streams[key.fd])
+                    pump.feed(b"", streams[key.fd])
+                    selector.unregister(key.fd)
+
+        # The shell reports commands that were killed by a signal as 128 plus
+        #   the signal number
+        assert exit_code is not None
+        if exit_code > 128:
+            return 128 - exit_code
+        return exit_code
@@ -0,0 +1,36 @@
+from abc import abstractmethod
+from pathlib import Path
+from pyshell.commands.command_metadata import CommandMetadata
+from pyshell.commands.command_result import CommandResult
+from pyshell.core.pyshell_component import IPyShellComponent
+from pyshell.logging.command_logger import ICommandLogger
+from typing import List, Sequence
+
+class IPipelineBackend(IPyShellComponent):
+    """
+    Represents a backend that can connect commands into a pipeline.
+    Backends that implement this interface are used by `PyShell.run_pipeline()`
+      to run commands with the stdout of each command connected to the stdin of
+      the next command.
+    @ingroup backends
+    """
+    @abstractmethod
+    def run_pipeline(self,
+        metadata: Sequence[CommandMetadata],
+        cwd: Path,
+        loggers: Sequence[ICommandLogger]) -> List[CommandResult]:
+        """
+        Runs the specified commands as a pipeline on the backend.
+        All commands in the pipeline run at the same time. The stdout of each
+          command is connected to the stdin of the next command, so only the
+          stdout of the last command is forwarded to its logger. The stderr of
+          every command is forwarded to that command's logger.
+        @param metadata Metadata for each command in the pipeline, in order.
+        @param cwd The working directory to use for the commands. Will always
+          be an absolute path.
+        @param loggers The logger to use for each command, in the same order as
+          `metadata`. The backend will invoke `logger.log()` but will not
+          invoke `logger.log_results()`.
+        @return The result of each command, in the same order as `metadata`.
+        """
+        raise NotImplementedError()
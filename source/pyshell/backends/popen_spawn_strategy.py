@@ -0,0 +1,81 @@
+from pathlib import Path
+from pyshell.backends.child_process import ChildProcess
+from pyshell.backends.spawn_strategy import ISpawnStrategy
+from pyshell.commands.command_metadata import CommandMetadata
+import subprocess
+import time
+from typing import Optional
+
+class PopenSpawnStrategy(ISpawnStrategy):
+    """
+    Starts processes via `subprocess.Popen`.
+    This strategy supports every option that `Popen` supports and is used by
+      default.
+    @ingroup backends
+    """
+    def __init__(self, close_fds: bool = True):
+        """
+        Initializes the strategy.
+        @param close_fds Whether all file descriptors other than stdin, stdout
+          and stderr should be closed in the child process. Python creates
+          file descriptors as non-inheritable by default, so this can be
+          disabled to skip closing each descriptor in the child unless the
+          script explicitly makes descriptors inheritable.
+        """
+        self._close_fds = close_fds
+
+
+    def spawn(self,
+        metadata: CommandMetadata,
+        cwd: Path,
+        merge_stderr: bool,
+        stdin: Optional[int] = None,
+        stdout: Optional[int] = None) -> ChildProcess:
+        """
+        Starts the process for a command.
+        @param metadata Metadata for the command to start.
+        @param cwd The working directory to use for the command.
+        @param merge_stderr Whether the process's stderr should be redirected
+          to its stdout. Ignored if `stdout` is specified.
+        @param stdin File descriptor to use as the process's stdin, if any.
+        @param stdout File descriptor to connect the process's stdout to, if
+          any.
+        @throws OSError If the process could not be started or its limits
+          could not be applied.
+        @return A handle to the started process.
+        """
+        # Commands with a timeout are started in a new session so that the
+        #   command and all of its children can be stopped together
+        limits = metadata.limits
+        start_time = time.perf_counter()
+        process = subprocess.Popen(
+            [metadata.command] + list(metadata.args),
+            executable=metadata.executable,
+            stdin=stdin,
+            stdout=subprocess.PIPE if stdout is None else stdout,
+            stderr=subprocess.STDOUT if merge_stderr and stdout is None \
+                else subprocess.PIPE,
+            cwd=str(cwd),
+            close_fds=self._close_fds,
+            start_new_session=bool(limits and limits.timeout is not None)
+        )
+        if limits:
+            try:
+                limits.apply(process.pid)
+            except BaseException:
+                # The command must not keep running without its limits
+                process.kill()
+                process.wait()
+                for pipe in (process.stdout, process.stderr):
+                    if pipe:
+                        pipe.close()
+                raise
+        spawn_duration = time.perf_counter() - start_time
+
+        return ChildProcess(
+            process.pid,
+            process.stdout,
+            process.stderr,
+            spawn_duration,
+            process
+        )
@@ -0,0 +1,144 @@
+import os
+from pathlib import Path
+from pyshell.backends.child_process import ChildProcess
+from pyshell.backends.popen_spawn_strategy import PopenSpawnStrategy
+from pyshell.backends.spawn_strategy import ISpawnStrategy
+from pyshell.commands.command_metadata import CommandMetadata
+import signal
+import time
+from typing import Optional
+
+class PosixSpawnStrategy(ISpawnStrategy):
+    """
+    Starts processes via `os.posix_spawn()`.
+    `posix_spawn()` lets the C library start the process using the cheapest
+      mechanism available (e.g. `vfork()` or `clone(CLONE_VM)` on Linux), so
+      the cost of starting a process does not grow with the memory used by
+      the PyShell process. It also skips most of the work that `Popen` does
+      in Python before and after starting the process.
+    `posix_spawn()` cannot change the working directory of the new process, so
+      commands that run in a directory other than the PyShell process's
+      working directory are started via `Popen` instead.
+    @ingroup backends
+    """
+    def __init__(self):
+        """
+        Initializes the strategy.
+        @throws RuntimeError If the platform does not support `posix_spawn()`.
+        """
+        if not hasattr(os, "posix_spawn"):
+            raise RuntimeError("posix_spawn() is not supported on this platform.")
+
+        # Python creates file descriptors as non-inheritable by default, so
+        #   there's no need to close descriptors in the fallback child either
+        self._fallback = PopenSpawnStrategy(close_fds=False)
+
+
+    def spawn(self,
+        metadata: CommandMetadata,
+        cwd: Path,
+        merge_stderr: bool,
+        stdin: Optional[int] = None,
+        stdout: Optional[int] = None) -> ChildProcess:
+        """
+        Starts the process for a command.
+        @param metadata Metadata for the command to start.
+        @param cwd The working directory to use for the command.
+        @param merge_stderr Whether the process's stderr should be redirected
+          to its stdout. Ignored if `stdout` is specified.
+        @param stdin File descriptor to use as the process's stdin, if any.
+        @param stdout File descriptor to connect the process's stdout to, if
+          any.
+        @throws OSError If the process could not be started or its limits
+          could not be applied.
+        @return A handle to the started process.
+        """
+        # Python doesn't expose a file action that changes the child's working
+        #   directory (`posix_spawn_file_actions_addchdir_np()`), and changing
+        #   the PyShell process's working directory would affect every thread.
+        #   Commands run in another directory are therefore started via `Popen`,
+        #   which changes the directory in the child before running the command.
+        if cwd != Path.cwd():
+            return self._fallback.spawn(
+                metadata,
+                cwd,
+                merge_stderr,
+                stdin,
+                stdout
+            )
+
+        start_time = time.perf_counter()
+        stdout_read: Optional[int] = None
+        if stdout is None:
+            stdout_read, stdout_write = os.pipe()
+        else:
+            stdout_write = stdout
+        if merge_stderr and stdout is None:
+            stderr_read, stderr_write = None, stdout_write
+        else:
+            stderr_read, stderr_write = os.pipe()
+
+        # The pipes are non-inheritable, but `dup2()` clears the close-on-exec
+        #   flag of the target descriptor
+        file_actions = [
+            (os.POSIX_SPAWN_DUP2, stdout_write, 1),
+            (os.POSIX_SPAWN_DUP2, stderr_write, 2)
+        ]
+        if stdin is not None:
+            file_actions.insert(0, (os.POSIX_SPAWN_DUP2, stdin, 0))
+        argv = [metadata.command] + list(metadata.args)
+
+        # Commands with a timeout are started in a new session so that the
+        #   command and all of its children can be stopped together
+        limits = metadata.limits
+        setsid = bool(limits and limits.timeout is not None)
+        try:
+            if metadata.executable:
+                pid = os.posix_spawn(
+                    metadata.executable,
+                    argv,
+                    os.environ,
+                    file_actions=file_actions,
+                    setsid=setsid
+                )
+            else:
+                pid = os.posix_spawnp(
+                    metadata.command,
+                    argv,
+                    os.environ,
+                    file_actions=file_actions,
+                    setsid=setsid
+                )
+        except OSError:
+            for fd in (stdout_read, stderr_read):
+                if fd is not None:
+                    os.close(fd)
+            raise
+        finally:
+            # The write ends are only needed by the child process. Descriptors
+            #   passed in by the caller are left open.
+            if stdout_read is not None:
+                os.close(stdout_write)
+            if stderr_read is not None:
+                os.close(stderr_write)
+        if limits:
+            try:
+                limits.apply(pid)
+            except BaseException:
+                # The command must not keep running without its limits
+                os.kill(pid, signal.SIGKILL)
+                os.waitpid(pid, 0)
+                for fd in (stdout_read, stderr_read):
+                    if fd is not None:
+                        os.close(fd)
+                raise
+        spawn_duration = time.perf_counter() - start_time
+
+        return ChildProcess(
+            pid,
+            open(stdout_read, "rb", buffering=0) \
+                if stdout_read is not None else None,
+            open(stderr_read, "rb", buffering=0) \
+                if stderr_read is not None else None,
+            spawn_duration
+        )
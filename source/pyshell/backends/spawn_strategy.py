@@ -0,0 +1,45 @@
+from abc import ABC, abstractmethod
+from pathlib import Path
+from pyshell.backends.child_process import ChildProcess
+from pyshell.commands.command_metadata import CommandMetadata
+from typing import Optional
+
+class ISpawnStrategy(ABC):
+    """
+    Determines how `NativeBackend` starts the process for a command.
+    @ingroup backends
+    """
+    @abstractmethod
+    def spawn(self,
+        metadata: CommandMetadata,
+        cwd: Path,
+        merge_stderr: bool,
+        stdin: Optional[int] = None,
+        stdout: Optional[int] = None) -> ChildProcess:
+        """
+        Starts the process for a command.
+        The process's stdout (and stderr, unless it's merged into stdout) must
+          be connected to pipes that are readable via the returned handle. The
+          process inherits the environment of the PyShell process, along with
+          its stdin unless another stdin is specified.
+        @param metadata Metadata for the command to start. If the metadata has
+          a pre-resolved executable, it will be used instead of searching the
+          PATH for the command.
+        @param cwd The working directory to use for the command. Will always be
+          an absolute path.
+        @param merge_stderr Whether the process's stderr should be redirected
+          to its stdout. Ignored if `stdout` is specified.
+        @param stdin File descriptor to use as the process's stdin. If not
+          specified, the process inherits the stdin of the PyShell process. The
+          descriptor will not be closed.
+        @param stdout File descriptor to connect the process's stdout to (e.g.
+          the write end of a pipe to another process). If specified, the
+          process's stdout is not readable via the returned handle and its
+          stderr is always connected to its own pipe. The descriptor will not
+          be closed.
+        @throws OSError If the process could not be started or its limits
+          could not be applied. The process is not left running if its limits
+          could not be applied.
+        @return A handle to the started process.
+        """
+        raise NotImplementedError()
@@ -1,7 +1,9 @@
 from abc import ABC, abstractmethod
 from pathlib import Path
+from pyshell.commands.command_emulator import ICommandEmulator
 from pyshell.commands.command_metadata import CommandMetadata
 from pyshell.commands.command_result import CommandResult
+from pyshell.core.command_stream import CommandStream
 from pyshell.core.pyshell import PyShell
 from pyshell.scanners.scanner import IScanner
 from pyshell.tracing.caller_info import CallerInfo
@@ -71,6 +73,16 @@ class ICommand(ABC):
         return None
 
 
+    @property
+    def emulator(self) -> Optional[ICommandEmulator]:
+        """
+        The emulator to use for the command.
+        @return The emulator that can perform the command in-process, or None
+          if the command can only be run via its executable.
+        """
+        return None
+
+
     @abstractmethod
     def __call__(self,
         pyshell: Optional[PyShell] = None,
@@ -84,6 +96,46 @@ class ICommand(ABC):
         raise NotImplementedError()
 
 
+    async def run_async(self,
+        pyshell: Optional[PyShell] = None,
+        cwd: str | Path | None = None) -> CommandResult:
+        """
+        Runs the command on the specified backend without blocking the event
+          loop.
+        Commands that can't be awaited natively are run on a worker thread.
+        @param pyshell PyShell instance to execute the command via.
+        @param cwd The current working directory to use for the command. If this
+          is not provided, the pyshell instance's cwd will be used.
+        """
+        import asyncio
+        pyshell = self._resolve_pyshell_instance(pyshell)
+        return await asyncio.get_running_loop().run_in_executor(
+            None,
+            self.__call__,
+            pyshell,
+            cwd
+        )
+
+
+    def stream(self,
+        pyshell: Optional[PyShell] = None,
+        cwd: str | Path | None = None,
+        max_buffered_lines: int = CommandStream.DEFAULT_MAX_BUFFERED_LINES) \
+        -> CommandStream:
+        """
+        Runs the command while yielding each line of its output as it's written.
+        @param pyshell PyShell instance to execute the command via.
+        @param cwd The current working directory to use for the command. If this
+          is not provided, the pyshell instance's cwd will be used.
+        @param max_buffered_lines Maximum number of lines that may be waiting
+          to be consumed before the command is blocked from writing more output.
+        @return A stream that yields each line of the command's output and
+          provides the command's result once iteration ends.
+        """
+        pyshell = self._resolve_pyshell_instance(pyshell)
+        return pyshell.stream(self, cwd, max_buffered_lines)
+
+
     def _resolve_pyshell_instance(self,
         pyshell: Optional[PyShell] = None) -> PyShell:
         """
@@ -0,0 +1,29 @@
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import TextIO
+
+class ICommandEmulator(ABC):
+    """
+    Performs the work of a command without running an external executable.
+    Emulators are provided by commands that can be run in-process, which
+      avoids the cost of starting a new process for simple commands. Backends
+      that support emulation (e.g. `NativeBackend` with `emulate_commands`
+      enabled) will use a command's emulator instead of running the command's
+      executable.
+    Emulators must behave like the executable they replace, including the
+      output they write and the exit code they return.
+    @ingroup commands
+    """
+    @abstractmethod
+    def run(self, cwd: Path, stdout: TextIO, stderr: TextIO) -> int:
+        """
+        Performs the command's work.
+        @param cwd The working directory of the command. Relative paths used
+          by the command must be resolved relative to this directory. Will
+          always be an absolute path.
+        @param stdout Stream to write the command's standard output to.
+        @param stderr Stream to write the command's error output to. This may
+          be the same stream as `stdout`.
+        @return The exit code of the emulated command.
+        """
+        raise NotImplementedError()
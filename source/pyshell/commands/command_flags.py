@@ -18,6 +18,13 @@ class CommandFlags(IntEnum):
     ## Command is a command that should be run even if a failure occurs.
     CLEANUP = 0x4
 
+    ## The command's result may be reused from a previous run.
+    # Cacheable commands must be deterministic given their command line,
+    #   working directory, selected environment variables and declared input
+    #   files. Results are only reused if the executor supports caching (e.g.
+    #   `CachingExecutor`).
+    CACHEABLE = 0x8
+
     ## Don't log the command's output to any source.
     QUIET = 0x10
 
@@ -26,3 +33,9 @@ class CommandFlags(IntEnum):
 
     ## Don't log the command's output to a file.
     NO_FILE = 0x40
+
+    ## Capture the command's output as raw bytes.
+    # The output is only decoded if it's read as text (e.g. via
+    #   `CommandResult.output`), and bytes that aren't valid in the output
+    #   encoding never cause the command to fail.
+    BINARY_OUTPUT = 0x80
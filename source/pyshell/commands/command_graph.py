@@ -0,0 +1,99 @@
+from pyshell.commands.command import ICommand
+from typing import Dict, List, Optional, Sequence, TypeVar
+
+# Type of command added to a graph
+T = TypeVar("T", bound=ICommand)
+
+class CommandGraph:
+    """
+    Set of commands along with the order that the commands must run in.
+    Each command may depend on any number of other commands in the graph. When
+      the graph is run via `PyShell.run_graph()`, a command is only started
+      once all of its dependencies have finished, and commands that don't
+      depend on each other may run at the same time.
+    Dependencies may only refer to commands that were already added to the
+      graph, which guarantees that the graph never contains a cycle.
+    @ingroup commands
+    """
+    def __init__(self):
+        """
+        Initializes the graph.
+        """
+        # Stores each command in the order it was added
+        self._commands: List[ICommand] = []
+
+        # Maps each command to the commands it depends on and to the commands
+        #   that depend on it
+        self._dependencies: Dict[ICommand, List[ICommand]] = {}
+        self._dependents: Dict[ICommand, List[ICommand]] = {}
+
+
+    def __len__(self) -> int:
+        """
+        Returns the number of commands in the graph.
+        """
+        return len(self._commands)
+
+
+    def __contains__(self, command: ICommand) -> bool:
+        """
+        Returns whether the command has been added to the graph.
+        """
+        return command in self._dependencies
+
+
+    @property
+    def commands(self) -> Sequence[ICommand]:
+        """
+        All commands in the graph, in the order they were added.
+        """
+        return self._commands
+
+
+    def add(self,
+        command: T,
+        after: Optional[Sequence[ICommand]] = None) -> T:
+        """
+        Adds a command to the graph.
+        @param command The command to add.
+        @param after Commands that must finish before this command is started.
+          Each command must have already been added to the graph.
+        @throws ValueError If the command was already added to the graph or if
+          a dependency has not been added to the graph.
+        @return The command that was added. This allows the command to be
+          constructed, added, and used as a dependency in a single statement.
+        """
+        if command in self._dependencies:
+            raise ValueError("Command was already added to the graph.")
+        after = list(after) if after else []
+        for dependency in after:
+            if dependency not in self._dependencies:
+                raise ValueError(
+                    "Dependencies must be added to the graph before the " +
+                    "commands that depend on them."
+                )
+
+        self._commands.append(command)
+        self._dependencies[command] = after
+        self._dependents[command] = []
+        for dependency in after:
+            self._dependents[dependency].append(command)
+        return command
+
+
+    def dependencies(self, command: ICommand) -> Sequence[ICommand]:
+        """
+        Gets the commands that must finish before a command is started.
+        @param command A command in the graph.
+        @throws KeyError If the command has not been added to the graph.
+        """
+        return self._dependencies[command]
+
+
+    def dependents(self, command: ICommand) -> Sequence[ICommand]:
+        """
+        Gets the commands that can't be started until a command finishes.
+        @param command A command in the graph.
+        @throws KeyError If the command has not been added to the graph.
+        """
+        return self._dependents[command]
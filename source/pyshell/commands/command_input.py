@@ -0,0 +1,80 @@
+import locale
+import os
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+class CommandInput:
+    """
+    Data to write to a command's stdin.
+    Input may be provided as bytes or a string, as a path to a file, or as an
+      iterable (e.g. a generator) that yields chunks of bytes or strings.
+      Files are connected to the command's stdin directly, so their contents
+      are never read by the PyShell process. All other input is written to a
+      pipe while the command's output is being read; the next chunk is only
+      taken from the iterable once the pipe has room for it, so input that is
+      produced lazily is never held in memory all at once.
+    Strings are encoded using the same encoding that is used to decode the
+      output of commands.
+    @ingroup commands
+    """
+    def __init__(self,
+        source: bytes | str | os.PathLike | Iterable[bytes | str]):
+        """
+        Initializes the object.
+        @param source The input to write to the command's stdin. Iterators and
+          generators can only be consumed once, so a command given one of them
+          as its input should only be run once.
+        @throws TypeError If the source is not a supported type of input.
+        """
+        self._data: Optional[bytes] = None
+        self._path: Optional[Path] = None
+        self._chunks: Optional[Iterable[bytes | str]] = None
+
+        if isinstance(source, bytes):
+            self._data = source
+        elif isinstance(source, str):
+            self._data = self._encode(source)
+        elif isinstance(source, os.PathLike):
+            self._path = Path(source)
+        elif isinstance(source, Iterable):
+            self._chunks = source
+        else:
+            raise TypeError(
+                f"Unsupported command input type '{type(source).__name__}'."
+            )
+
+
+    @property
+    def path(self) -> Optional[Path]:
+        """
+        Path to the file to use as the command's stdin, if the input is a file.
+        """
+        return self._path
+
+
+    def iter_chunks(self) -> Iterator[bytes]:
+        """
+        Iterates over the input.
+        @throws ValueError If the input is a file, which must be connected to
+          the command's stdin directly instead.
+        @return An iterator yielding consecutive chunks of the input.
+        """
+        if self._path is not None:
+            raise ValueError("File input must be opened instead of iterated.")
+        if self._data is not None:
+            yield self._data
+            return
+
+        assert self._chunks is not None
+        for chunk in self._chunks:
+            yield self._encode(chunk) if isinstance(chunk, str) else chunk
+
+
+    @staticmethod
+    def _encode(text: str) -> bytes:
+        """
+        Encodes text to write to a command's stdin.
+        @param text The text to encode.
+        @return The encoded text.
+        """
+        return text.encode(locale.getpreferredencoding(False))
@@ -0,0 +1,150 @@
+from __future__ import annotations
+from typing import Optional
+
+class CommandLimits:
+    """
+    Limits on the time and resources that a command may use.
+    Commands that exceed their timeout are stopped by sending `SIGTERM` to the
+      command's process group, followed by `SIGKILL` if the command is still
+      running once the grace period has elapsed. CPU time and address space
+      limits are enforced by the OS via resource limits (`RLIMIT_CPU` and
+      `RLIMIT_AS`).
+    Any limit that is `None` is not enforced.
+    Limits are enforced by `NativeBackend` and `PersistentShellBackend`.
+      `DockerBackend` doesn't support limits and raises an error when it's
+      asked to run a command that has limits.
+    @ingroup commands
+    """
+    ## Default time given to a command to exit after receiving `SIGTERM`.
+    DEFAULT_KILL_GRACE_PERIOD = 5.0
+
+    def __init__(self,
+        timeout: Optional[float] = None,
+        cpu_time: Optional[int] = None,
+        address_space: Optional[int] = None,
+        kill_grace_period: Optional[float] = None):
+        """
+        Initializes the object.
+        @param timeout Maximum wall-clock time the command may run for, in
+          seconds.
+        @param cpu_time Maximum CPU time the command may use, in seconds.
+        @param address_space Maximum size of the command's virtual memory, in
+          bytes.
+        @param kill_grace_period Time given to a command to exit after it has
+          been sent `SIGTERM`, in seconds. If not specified, the default grace
+          period will be used.
+        @throws ValueError If any of the limits is not positive.
+        """
+        for name, value in (
+            ("timeout", timeout),
+            ("cpu_time", cpu_time),
+            ("address_space", address_space),
+            ("kill_grace_period", kill_grace_period)):
+            if value is not None and value <= 0:
+                raise ValueError(f"{name} must be positive.")
+
+        self._timeout = timeout
+        self._cpu_time = cpu_time
+        self._address_space = address_space
+        self._kill_grace_period = kill_grace_period
+
+
+    @property
+    def timeout(self) -> Optional[float]:
+        """
+        Maximum wall-clock time the command may run for, in seconds.
+        """
+        return self._timeout
+
+
+    @property
+    def cpu_time(self) -> Optional[int]:
+        """
+        Maximum CPU time the command may use, in seconds.
+        """
+        return self._cpu_time
+
+
+    @property
+    def address_space(self) -> Optional[int]:
+        """
+        Maximum size of the command's virtual memory, in bytes.
+        """
+        return self._address_space
+
+
+    @property
+    def kill_grace_period(self) -> float:
+        """
+        Time given to a command to exit after it has been sent `SIGTERM`, in
+          seconds.
+        """
+        if self._kill_grace_period is None:
+            return CommandLimits.DEFAULT_KILL_GRACE_PERIOD
+        return self._kill_grace_period
+
+
+    @property
+    def has_resource_limits(self) -> bool:
+        """
+        Whether any limit that is enforced via resource limits is set.
+        """
+        return self._cpu_time is not None or self._address_space is not None
+
+
+    def apply(self, pid: int) -> None:
+        """
+        Applies the resource limits to a running process.
+        Limits are applied via `prlimit()` right after the process has been
+          started, since setting them in the child before `exec()` would
+          require running Python code in the child, which is not safe while
+          other threads are running commands. Limits can only be lowered, so
+          any limit above the process's current hard limit is capped to it.
+        @param pid The process to apply the limits to.
+        @throws RuntimeError If the platform does not support `prlimit()`.
+        """
+        if not self.has_resource_limits:
+            return
+
+        # `resource` is only available on Unix platforms
+        import resource
+        if not hasattr(resource, "prlimit"):
+            raise RuntimeError( # pragma: no cover
+                "Resource limits are not supported on this platform."
+            )
+
+        # The hard CPU limit is set one second past the soft limit so that the
+        #   process receives `SIGXCPU` before it's killed
+        for limit, soft, hard in (
+            (resource.RLIMIT_CPU, self._cpu_time,
+                self._cpu_time + 1 if self._cpu_time else None),
+            (resource.RLIMIT_AS, self._address_space, self._address_space)):
+            if soft is None or hard is None:
+                continue
+            _, current_hard = resource.prlimit(pid, limit)
+            if current_hard != resource.RLIM_INFINITY:
+                soft = min(soft, current_hard)
+                hard = min(hard, current_hard)
+            resource.prlimit(pid, limit, (soft, hard))
+
+
+    def merge(self, defaults: Optional[CommandLimits]) -> CommandLimits:
+        """
+        Combines these limits with a set of default limits.
+        @param defaults The limits to use for any limit not set on this
+          instance.
+        @return Limits that use the value from this instance for each limit
+          that is set and the value from `defaults` otherwise.
+        """
+        if not defaults:
+            return self
+
+        return CommandLimits(
+            self._timeout if self._timeout is not None else defaults._timeout,
+            self._cpu_time if self._cpu_time is not None \
+                else defaults._cpu_time,
+            self._address_space if self._address_space is not None \
+                else defaults._address_space,
+            self._kill_grace_period if self._kill_grace_period is not None \
+                else defaults._kill_grace_period
+        )
@@ -1,4 +1,10 @@
+from __future__ import annotations
+import copy
+from pathlib import Path
+from pyshell.commands.command_emulator import ICommandEmulator
 from pyshell.commands.command_flags import CommandFlags
+from pyshell.commands.command_input import CommandInput
+from pyshell.commands.command_limits import CommandLimits
 from pyshell.scanners.scanner import IScanner
 from typing import Optional, Sequence
 
@@ -12,18 +18,47 @@ class CommandMetadata:
         command: str,
         args: Sequence[str],
         flags: int = CommandFlags.STANDARD,
-        scanner: Optional[IScanner] = None):
+        scanner: Optional[IScanner] = None,
+        emulator: Optional[ICommandEmulator] = None,
+        executable: Optional[str] = None,
+        limits: Optional[CommandLimits] = None,
+        stdin: Optional[CommandInput] = None,
+        inputs: Sequence[Path] = (),
+        outputs: Sequence[Path] = ()):
         """
         Initializes the object.
         @param command Command to run.
         @param args Arguments to pass to the command.
         @param flags Flags for the command.
         @param scanner Scanner to use for the command, if any.
+        @param emulator Emulator that can perform the command in-process, if
+          any.
+        @param executable Absolute path to the executable to run for the
+          command, if it has already been resolved. Backends that run the
+          command on the host may use this path instead of searching the PATH
+          for the command.
+        @param limits Limits on the time and resources the command may use, if
+          any.
+        @param stdin Input to write to the command's stdin. If not specified,
+          the command inherits the stdin of the PyShell process.
+        @param inputs Files and directories that the command reads. These are
+          used to determine whether a cached result of the command is still
+          valid or whether the command's outputs are up to date. Should be
+          absolute paths.
+        @param outputs Files and directories that the command produces. Used to
+          determine whether the command's outputs are up to date. Should be
+          absolute paths.
         """
         self._command = command
         self._args = args
         self._flags = flags
         self._scanner = scanner
+        self._emulator = emulator
+        self._executable = executable
+        self._limits = limits
+        self._stdin = stdin
+        self._inputs = inputs
+        self._outputs = outputs
 
 
     @property
@@ -42,6 +77,14 @@ class CommandMetadata:
         return self._args
 
 
+    @property
+    def executable(self) -> Optional[str]:
+        """
+        Returns the pre-resolved path to the command's executable, if any.
+        """
+        return self._executable
+
+
     @property
     def full_command(self) -> str:
         """
@@ -82,9 +125,69 @@ class CommandMetadata:
         return self._flags & CommandFlags.CLEANUP != 0
 
 
+    @property
+    def is_cacheable(self) -> bool:
+        """
+        Returns True if the command's result may be reused from a previous run.
+        """
+        return self._flags & CommandFlags.CACHEABLE != 0
+
+
     @property
     def scanner(self) -> Optional[IScanner]:
         """
         Returns the scanner to use for the command, if any.
         """
         return self._scanner
+
+
+    @property
+    def emulator(self) -> Optional[ICommandEmulator]:
+        """
+        Returns the emulator that can perform the command in-process, if any.
+        """
+        return self._emulator
+
+
+    @property
+    def limits(self) -> Optional[CommandLimits]:
+        """
+        Returns the limits on the time and resources the command may use, if
+          any.
+        """
+        return self._limits
+
+
+    @property
+    def stdin(self) -> Optional[CommandInput]:
+        """
+        Returns the input to write to the command's stdin, if any.
+        """
+        return self._stdin
+
+
+    @property
+    def inputs(self) -> Sequence[Path]:
+        """
+        Returns the files and directories that the command reads.
+        """
+        return self._inputs
+
+
+    @property
+    def outputs(self) -> Sequence[Path]:
+        """
+        Returns the files and directories that the command produces.
+        """
+        return self._outputs
+
+
+    def with_limits(self, limits: Optional[CommandLimits]) -> CommandMetadata:
+        """
+        Creates a copy of this metadata with different limits.
+        @param limits The limits to use for the copy.
+        @return A copy of this metadata that uses the specified limits.
+        """
+        metadata = copy.copy(self)
+        metadata._limits = limits
+        return metadata
@@ -0,0 +1,35 @@
+from enum import Enum
+
+class CommandPhase(Enum):
+    """
+    Identifies a step that PyShell performs while running a command.
+    @ingroup commands
+    """
+    ## Asking the executor whether the command should be run.
+    EXECUTOR = 0
+
+    ## Constructing the command's logger.
+    LOGGER = 1
+
+    ## Broadcasting the command started event.
+    STARTED_EVENT = 2
+
+    ## Looking up and storing the command's result in the result cache.
+    CACHE = 3
+
+    ## Running the command on the backend.
+    # This includes starting the command's process, waiting for it to exit and
+    #   forwarding its output to the logger.
+    BACKEND = 4
+
+    ## Scanning the command's output with the command's scanner.
+    SCAN = 5
+
+    ## Logging the command's results.
+    LOG_RESULTS = 6
+
+    ## Broadcasting the command finished or command failed event.
+    FINISHED_EVENT = 7
+
+    ## Passing a failed command to the error handler.
+    ERROR_HANDLER = 8
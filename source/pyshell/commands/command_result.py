@@ -1,6 +1,11 @@
+from __future__ import annotations
+import copy
 from datetime import datetime
-from dateutil import tz
-from typing import Optional, Sequence
+from pathlib import Path
+from pyshell.commands.command_timings import CommandTimings
+from pyshell.commands.output_buffer import OutputBuffer
+from pyshell.commands.resource_usage import ResourceUsage
+from typing import Iterator, List, Optional, Sequence
 
 class CommandResult:
     """
@@ -11,18 +16,27 @@ class CommandResult:
         command: str,
         args: Sequence[str],
         cwd: str,
-        output: str,
+        output: str | OutputBuffer,
         exit_code: int,
         skipped: bool,
         start_time: datetime,
         end_time: datetime,
-        backend: Optional[str] = None):
+        backend: Optional[str] = None,
+        spawn_duration: Optional[float] = None,
+        timed_out: bool = False,
+        limit_exceeded: bool = False,
+        resource_usage: Optional[ResourceUsage] = None,
+        cached: bool = False,
+        timings: Optional[CommandTimings] = None,
+        outputs: Sequence[Path] = ()):
         """
         Initializes the object.
         @param command Name of the command/executable that was run.
         @param args Arguments passed to the command.
         @param cwd Working directory used for the command.
-        @param output Merged output from stdout and stderr.
+        @param output Merged output from stdout and stderr. If a buffer is
+          passed, the output is only converted to a string once `output` is
+          accessed.
         @param exit_code Exit code from the command. If the command was skipped,
           this may be any value.
         @param skipped Whether the command was skipped.
@@ -30,16 +44,45 @@ class CommandResult:
         @param end_time The time the command ended. Should be in UTC time.
         @param backend Information about the backend that executed the command.
           The exact format of this string is backend-specific.
+        @param spawn_duration Time taken to start the command's process, in
+          seconds, if the backend measured it.
+        @param timed_out Whether the command was stopped because it exceeded
+          its timeout.
+        @param limit_exceeded Whether the command was stopped because it
+          exceeded a resource limit.
+        @param resource_usage Resources used by the command's process, if the
+          backend collected them.
+        @param cached Whether the result was reused from a previous run of the
+          command instead of running the command.
+        @param timings Time spent in each phase of running the command. If not
+          specified, an empty instance is created that PyShell records the
+          command's timings in.
+        @param outputs The files and directories that the command declared as
+          its outputs.
         """
         self._command = command
         self._args = args
         self._cwd = cwd
-        self._output = output
+        # The output is stored in a buffer so that it can be read line by line
+        #   without building the full string
+        if isinstance(output, str):
+            self._output_buffer = OutputBuffer(None, output)
+            self._output: Optional[str] = output
+        else:
+            self._output_buffer = output
+            self._output = None
         self._exit_code = exit_code
         self._skipped = skipped
         self._start_time = start_time
         self._end_time = end_time
         self._backend = backend
+        self._spawn_duration = spawn_duration
+        self._timed_out = timed_out
+        self._limit_exceeded = limit_exceeded
+        self._resource_usage = resource_usage
+        self._cached = cached
+        self._timings = timings if timings is not None else CommandTimings()
+        self._outputs = outputs
 
 
     @property
@@ -70,10 +113,52 @@ class CommandResult:
     def output(self) -> str:
         """
         Merged output from stdout and stderr.
+        For commands with large amounts of output, prefer `iter_lines()` or
+          `tail()`, which don't require the full output to be held in memory.
         """
+        if self._output is None:
+            self._output = self._output_buffer.getvalue()
         return self._output
 
 
+    @property
+    def output_bytes(self) -> bytes:
+        """
+        Merged output from stdout and stderr as bytes.
+        For commands that capture binary output (`CommandFlags.BINARY_OUTPUT`),
+          this is exactly the output written by the command. Otherwise, this is
+          the output encoded as UTF-8.
+        """
+        return self._output_buffer.getbytes()
+
+
+    @property
+    def output_buffer(self) -> OutputBuffer:
+        """
+        Buffer that holds the merged output from stdout and stderr.
+        """
+        return self._output_buffer
+
+
+    def iter_lines(self) -> Iterator[str]:
+        """
+        Iterates over each line of the command's output.
+        @return An iterator yielding each line of the output. Each line
+          includes its trailing newline, if any.
+        """
+        return self._output_buffer.iter_lines()
+
+
+    def tail(self, line_count: int) -> List[str]:
+        """
+        Gets the last lines of the command's output.
+        @param line_count The maximum number of lines to get.
+        @return The last `line_count` lines of the output, in order. Each line
+          includes its trailing newline, if any.
+        """
+        return self._output_buffer.tail(line_count)
+
+
     @property
     def exit_code(self) -> int:
         """
@@ -109,6 +194,81 @@ class CommandResult:
         return self._skipped
 
 
+    @property
+    def timed_out(self) -> bool:
+        """
+        Whether the command was stopped because it exceeded its timeout.
+        """
+        return self._timed_out
+
+
+    @property
+    def limit_exceeded(self) -> bool:
+        """
+        Whether the command was stopped because it exceeded a resource limit.
+        This is only detected for CPU time limits. Commands that exceed their
+          address space limit have their allocations fail instead of being
+          stopped, so how that's reported is up to the command (typically via
+          a failed exit code).
+        """
+        return self._limit_exceeded
+
+
+    @property
+    def cached(self) -> bool:
+        """
+        Whether the result was reused from a previous run of the command.
+        Cached results replay the output and exit code of the previous run, but
+          the command was not run again.
+        """
+        return self._cached
+
+
+    @property
+    def outputs(self) -> Sequence[Path]:
+        """
+        The files and directories that the command declared as its outputs.
+        """
+        return self._outputs
+
+
+    @property
+    def resource_usage(self) -> Optional[ResourceUsage]:
+        """
+        Resources used by the command's process.
+        This is only collected by backends that wait on the command's process
+          directly, so it will be `None` for skipped commands, emulated
+          commands and commands run by other backends.
+        """
+        return self._resource_usage
+
+
+    @property
+    def user_time(self) -> Optional[float]:
+        """
+        CPU time the command spent in user mode, in seconds, if known.
+        """
+        return self._resource_usage.user_time if self._resource_usage \
+            else None
+
+
+    @property
+    def system_time(self) -> Optional[float]:
+        """
+        CPU time the command spent in kernel mode, in seconds, if known.
+        """
+        return self._resource_usage.system_time if self._resource_usage \
+            else None
+
+
+    @property
+    def max_rss(self) -> Optional[int]:
+        """
+        Maximum resident set size of the command, in bytes, if known.
+        """
+        return self._resource_usage.max_rss if self._resource_usage else None
+
+
     @property
     def full_command(self) -> str:
         """
@@ -122,6 +282,8 @@ class CommandResult:
         """
         The time the command started.
         """
+        # dateutil is slow to import, so it is only imported when needed
+        from dateutil import tz
         return self._start_time.astimezone(tz.tzutc())
 
 
@@ -130,6 +292,7 @@ class CommandResult:
         """
         The time the command started, in local time.
         """
+        from dateutil import tz
         return self.start_time_utc.astimezone(tz.tzlocal())
 
 
@@ -138,6 +301,7 @@ class CommandResult:
         """
         The time the command ended.
         """
+        from dateutil import tz
         return self._end_time.astimezone(tz.tzutc())
 
 
@@ -146,6 +310,7 @@ class CommandResult:
         """
         The time the command ended, in local time.
         """
+        from dateutil import tz
         return self.end_time_utc.astimezone(tz.tzlocal())
 
 
@@ -173,6 +338,41 @@ class CommandResult:
         return self.duration_seconds / 60
 
 
+    @property
+    def spawn_duration_milliseconds(self) -> Optional[float]:
+        """
+        Time taken to start the command's process, in milliseconds.
+        This will be `None` if no process was started for the command (e.g.
+          the command was skipped or emulated) or if the backend does not
+          measure it. This time is included in the command's duration.
+        """
+        if self._spawn_duration is None:
+            return None
+        return self._spawn_duration * 1000
+
+
+    @property
+    def spawn_duration_seconds(self) -> Optional[float]:
+        """
+        Time taken to start the command's process, in seconds.
+        This will be `None` if no process was started for the command (e.g.
+          the command was skipped or emulated) or if the backend does not
+          measure it. This time is included in the command's duration.
+        """
+        return self._spawn_duration
+
+
+    @property
+    def timings(self) -> CommandTimings:
+        """
+        Time spent in each phase of running the command.
+        Phases are recorded by the PyShell instance that ran the command, so
+          the timings are only complete once the command has been handled by
+          the error handler.
+        """
+        return self._timings
+
+
     @property
     def backend(self) -> Optional[str]:
         """
@@ -182,6 +382,18 @@ class CommandResult:
         return self._backend
 
 
+    def with_outputs(self, outputs: Sequence[Path]) -> CommandResult:
+        """
+        Creates a copy of this result with different declared outputs.
+        The copy shares this result's output and timings.
+        @param outputs The outputs to use for the copy.
+        @return A copy of this result that uses the specified outputs.
+        """
+        result = copy.copy(self)
+        result._outputs = outputs
+        return result
+
+
     def __bool__(self) -> bool:
         """
         Whether the command was successful.
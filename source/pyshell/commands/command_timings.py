@@ -0,0 +1,114 @@
+from __future__ import annotations
+from pyshell.commands.command_phase import CommandPhase
+import time
+from typing import Dict, Iterator, Tuple
+
+class CommandTimings:
+    """
+    Time spent in each phase of running a command.
+    Timings are measured with `time.perf_counter_ns()`. The backend phase
+      covers the command's process, so the time spent in every other phase is
+      PyShell's own overhead for the command.
+    @ingroup commands
+    """
+    def __init__(self):
+        """
+        Initializes the object.
+        """
+        self._durations: Dict[CommandPhase, int] = {}
+
+        # Time that the phase currently being measured started at
+        self._mark_ns = 0
+
+
+    @property
+    def total_ns(self) -> int:
+        """
+        Total time spent in every recorded phase, in nanoseconds.
+        """
+        return sum(self._durations.values())
+
+
+    @property
+    def overhead_ns(self) -> int:
+        """
+        Time spent in every recorded phase except the backend phase, in
+          nanoseconds.
+        """
+        return self.total_ns - self.get_ns(CommandPhase.BACKEND)
+
+
+    def get_ns(self, phase: CommandPhase) -> int:
+        """
+        Gets the time spent in a phase.
+        @param phase The phase to get the time of.
+        @return The time spent in the phase in nanoseconds, or 0 if the phase
+          wasn't recorded.
+        """
+        return self._durations.get(phase, 0)
+
+
+    def record(self, phase: CommandPhase, duration_ns: int) -> None:
+        """
+        Records time spent in a phase.
+        If the phase was already recorded, the time is added to the phase's
+          existing time.
+        @param phase The phase that the time was spent in.
+        @param duration_ns The time spent in the phase, in nanoseconds.
+        """
+        self._durations[phase] = self._durations.get(phase, 0) + duration_ns
+
+
+    def mark(self) -> None:
+        """
+        Starts measuring a phase.
+        """
+        self._mark_ns = time.perf_counter_ns()
+
+
+    def lap(self, phase: CommandPhase) -> None:
+        """
+        Records the time since the last call to `mark()` or `lap()` as time
+          spent in a phase, and starts measuring the next phase.
+        @param phase The phase that just finished.
+        """
+        now_ns = time.perf_counter_ns()
+        self.record(phase, now_ns - self._mark_ns)
+        self._mark_ns = now_ns
+
+
+    def update(self, other: CommandTimings) -> None:
+        """
+        Adds the time spent in each phase of another instance to this instance.
+        @param other The timings to add.
+        """
+        for phase, duration_ns in other:
+            self.record(phase, duration_ns)
+
+
+    def __contains__(self, phase: CommandPhase) -> bool:
+        """
+        Checks whether a phase was recorded.
+        """
+        return phase in self._durations
+
+
+    def __iter__(self) -> Iterator[Tuple[CommandPhase, int]]:
+        """
+        Iterates over each recorded phase and the time spent in it, in the
+          order that the phases occur.
+        """
+        for phase in CommandPhase:
+            if phase in self._durations:
+                yield phase, self._durations[phase]
+
+
+    def __repr__(self) -> str:
+        """
+        Returns a string representation of the timings.
+        """
+        phases = ", ".join(
+            f"{phase.name.lower()}={duration_ns / 10**6:.3f}ms"
+            for phase, duration_ns in self
+        )
+        return f"CommandTimings({phases})"
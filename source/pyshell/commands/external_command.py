@@ -2,13 +2,16 @@ from datetime import datetime
 from pathlib import Path
 from pyshell.commands.command import ICommand
 from pyshell.commands.command_flags import CommandFlags
+from pyshell.commands.command_input import CommandInput
+from pyshell.commands.command_limits import CommandLimits
 from pyshell.commands.command_metadata import CommandMetadata
 from pyshell.commands.command_result import CommandResult
 from pyshell.core.pyshell import PyShell
 from pyshell.core.platform_statics import PlatformStatics
 from pyshell.tracing.caller_info import CallerInfo
+import os
 import sys
-from typing import Optional, Sequence
+from typing import Iterable, Optional, Sequence
 
 class ExternalCommand(ICommand):
     """
@@ -23,7 +26,11 @@ class ExternalCommand(ICommand):
         name: str | Path,
         args: str | Path | Sequence[str | Path] | None = None,
         locate_executable: bool = True,
-        cmd_flags: int = CommandFlags.STANDARD):
+        cmd_flags: int = CommandFlags.STANDARD,
+        limits: Optional[CommandLimits] = None,
+        stdin: bytes | str | os.PathLike | Iterable[bytes | str] | None = None,
+        inputs: Sequence[str | Path] | None = None,
+        outputs: Sequence[str | Path] | None = None):
         """
         Initializes the command.
         @param name The name of the command being run. This should be the name
@@ -34,6 +41,23 @@ class ExternalCommand(ICommand):
           If this is true, this constructor will throw if the executable cannot
           be found in the PATH.
         @param cmd_flags Flags for the command.
+        @param limits Limits on the time and resources the command may use. Any
+          limit not set here will use the PyShell instance's default limits.
+        @param stdin Input to write to the command's stdin. May be bytes or a
+          string, a path to a file, or an iterable that yields chunks of bytes
+          or strings. Relative paths are resolved relative to the script's
+          current working directory. If not specified, the command inherits
+          the stdin of the PyShell process.
+        @param inputs Files and directories that the command reads. If the
+          command is cacheable (`CommandFlags.CACHEABLE`), its cached result
+          is only reused if none of these have changed. Commands that declare
+          outputs are considered out of date if any of these have changed.
+          Relative paths are resolved relative to the script's current working
+          directory.
+        @param outputs Files and directories that the command produces. Used by
+          executors such as `IncrementalExecutor` to skip the command if its
+          outputs are up to date with its inputs. Relative paths are resolved
+          relative to the script's current working directory.
         """
         # Store arguments in a uniform state regardless of input type
         self._name = str(name)
@@ -43,9 +67,16 @@ class ExternalCommand(ICommand):
             args = []
         self._args = [str(a) for a in args]
         self._flags = cmd_flags
+        self._limits = limits
+        self._stdin = CommandInput(stdin) if stdin is not None else None
+        self._inputs = [Path(i).absolute() for i in inputs] if inputs else []
+        self._outputs = [Path(o).absolute() for o in outputs] if outputs else []
         self._origin = CallerInfo.closest_external_frame()
         self._locate_executable = locate_executable
 
+        # Path to the executable, once it has been located
+        self._executable: Optional[str] = None
+
 
     @property
     def metadata(self) -> CommandMetadata:
@@ -56,7 +87,13 @@ class ExternalCommand(ICommand):
             self._name,
             self._args,
             self._flags,
-            self.scanner
+            self.scanner,
+            self.emulator,
+            self._executable,
+            self._limits,
+            self._stdin,
+            self._inputs,
+            self._outputs
         )
 
 
@@ -106,12 +143,49 @@ class ExternalCommand(ICommand):
           is not provided, the pyshell instance's cwd will be used.
         """
         pyshell = self._resolve_pyshell_instance(pyshell)
+        error_result = self._check_command(pyshell, cwd)
+        if error_result is not None:
+            return error_result
+        return pyshell.run(self.metadata, cwd)
+
 
+    async def run_async(self,
+        pyshell: Optional[PyShell] = None,
+        cwd: str | Path | None = None) -> CommandResult:
+        """
+        Runs the command on the specified backend without blocking the event
+          loop.
+        @param pyshell PyShell instance to execute the command via.
+        @param cwd The current working directory to use for the command. If this
+          is not provided, the pyshell instance's cwd will be used.
+        """
+        pyshell = self._resolve_pyshell_instance(pyshell)
+        error_result = self._check_command(pyshell, cwd)
+        if error_result is not None:
+            return error_result
+        return await pyshell.run_async(self.metadata, cwd)
+
+
+    def _check_command(self,
+        pyshell: PyShell,
+        cwd: str | Path | None) -> Optional[CommandResult]:
+        """
+        Verifies that the command can be run.
+        @param pyshell PyShell instance that the command will be run via.
+        @param cwd The current working directory passed to the command.
+        @returns None if the command can be run, or a failed result describing
+          why the command cannot be run.
+        """
         # Verify that the executable exists in the PATH if requested
         error_msg: Optional[str] = None
         if self._locate_executable:
             try:
                 exe_path = PlatformStatics.resolve_using_path(self._name)
+
+                # Keep the resolved path so that backends don't need to search
+                #   the PATH again when starting the command
+                if exe_path.is_absolute():
+                    self._executable = str(exe_path)
             except FileNotFoundError:
                 error_msg = f"Executable '{self._name}' not found in PATH.\n"
         else:
@@ -119,11 +193,17 @@ class ExternalCommand(ICommand):
             if not Path(exe_path).is_file():
                 error_msg = f"Executable '{exe_path}' not found.\n"
 
-        # If the executable could not be found, print an error message and
-        #   return a failed result
+        # Verify that the input file exists, if any
+        if not error_msg and self._stdin and self._stdin.path and \
+            not self._stdin.path.is_file():
+            error_msg = f"Input file '{self._stdin.path}' not found.\n"
+
+        # If the executable or input could not be found, print an error message
+        #   and return a failed result
         if error_msg:
-            error_msg += "Note: Command was declared at " + \
-                f"{self.origin.file_path}:{self.origin.line_number}"
+            if self.origin.is_known:
+                error_msg += "Note: Command was declared at " + \
+                    f"{self.origin.file_path}:{self.origin.line_number}"
             print(error_msg, file=sys.stderr)
             return CommandResult(
                 self._name,
@@ -150,7 +230,7 @@ class ExternalCommand(ICommand):
                 datetime.now()
             )
 
-        return pyshell.run(self.metadata, cwd)
+        return None
 
 
     def _validate_args(self) -> Optional[str]:
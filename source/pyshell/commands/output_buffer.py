@@ -0,0 +1,436 @@
+import codecs
+from io import IncrementalNewlineDecoder
+import locale
+import tempfile
+from typing import IO, Iterator, List, Optional
+
+class OutputBuffer:
+    """
+    Stores the output of a command without building a single large string.
+    Output is stored as a list of chunks, so appending output takes constant
+      time regardless of how much output has already been stored. Once the
+      chunks held in memory exceed the memory limit, they're moved to an
+      anonymous temporary file, which bounds the amount of memory used by
+      commands that write gigabytes of output.
+    The output can be read back chunk by chunk, line by line or from the end
+      of the output without materializing the whole output as a string.
+    Binary buffers store the raw bytes written by the command and only decode
+      them when the output is read as text. Decoding never fails; bytes that
+      aren't valid in the buffer's encoding are replaced with U+FFFD, and
+      newlines are translated the same way that text output is.
+    @ingroup commands
+    """
+    ## Default maximum number of characters (or bytes for binary buffers) held
+    #    in memory, per buffer.
+    DEFAULT_MEMORY_LIMIT = 16 * 1024 * 1024
+
+    # Number of bytes read from the temporary file at once
+    _READ_SIZE = 1024 * 1024
+
+    # Text buffers store text in the temporary file as UTF-8. Surrogates are
+    #   allowed so that any string (including ones decoded with
+    #   `surrogateescape`) can be round-tripped.
+    _TEXT_ENCODING = "utf-8"
+    _TEXT_ERRORS = "surrogatepass"
+
+    # Maximum number of bytes used to encode a single character
+    _MAX_CHAR_SIZE = 4
+
+    def __init__(self,
+        memory_limit: Optional[int] = DEFAULT_MEMORY_LIMIT,
+        initial_value: str = "",
+        binary: bool = False,
+        encoding: Optional[str] = None):
+        """
+        Initializes the buffer.
+        @param memory_limit Maximum number of characters (or bytes for binary
+          buffers) to hold in memory before moving the output to a temporary
+          file. If `None`, the output is always held in memory.
+        @param initial_value Output to initialize the buffer with.
+        @param binary Whether the buffer stores raw bytes instead of text.
+        @param encoding Encoding used to decode the output of binary buffers.
+          Defaults to the encoding that `subprocess` uses for text output.
+        @throws ValueError If the memory limit is not positive.
+        """
+        if memory_limit is not None and memory_limit <= 0:
+            raise ValueError("The memory limit must be positive.")
+
+        self._memory_limit = memory_limit
+        self._binary = binary
+        if binary:
+            self._encoding = encoding or locale.getpreferredencoding(False)
+            self._errors = "replace"
+        else:
+            self._encoding = self._TEXT_ENCODING
+            self._errors = self._TEXT_ERRORS
+
+        # Chunks of output that haven't been moved to the temporary file yet.
+        #   These always come after any output stored in the temporary file.
+        #   Text buffers store strings and binary buffers store bytes.
+        self._chunks: List[str | bytes] = []
+        self._memory_size = 0
+
+        # Total number of characters (or bytes) stored in the buffer
+        self._length = 0
+
+        # Total number of bytes stored in the buffer. For text buffers, this is
+        #   the length of the text encoded as UTF-8.
+        self._byte_count = 0
+
+        # Temporary file that output is moved to once the memory limit is
+        #   exceeded, along with the number of bytes written to the file
+        self._file: Optional[IO[bytes]] = None
+        self._file_size = 0
+
+        # Last character of the output, which is tracked so that checking how
+        #   the output ends never requires reading the temporary file
+        self._last_char = ""
+
+        if initial_value:
+            self.append(initial_value)
+
+
+    def __len__(self) -> int:
+        """
+        Returns the number of characters (or bytes for binary buffers) stored in
+          the buffer.
+        """
+        return self._length
+
+
+    def __str__(self) -> str:
+        """
+        Returns the full contents of the buffer.
+        """
+        return self.getvalue()
+
+
+    @property
+    def memory_limit(self) -> Optional[int]:
+        """
+        Maximum number of characters (or bytes for binary buffers) to hold in
+          memory, or `None` if the output is always held in memory.
+        """
+        return self._memory_limit
+
+
+    @property
+    def binary(self) -> bool:
+        """
+        Whether the buffer stores raw bytes instead of text.
+        """
+        return self._binary
+
+
+    @property
+    def byte_count(self) -> int:
+        """
+        Number of bytes stored in the buffer.
+        For binary buffers, this is the number of bytes written by the command.
+          Text buffers return the length of their output encoded as UTF-8.
+        """
+        return self._byte_count
+
+
+    @property
+    def spilled(self) -> bool:
+        """
+        Whether any output has been moved to a temporary file.
+        """
+        return self._file is not None
+
+
+    def append(self, data: str | bytes) -> None:
+        """
+        Appends output to the buffer.
+        @param data The output to append. Strings appended to a binary buffer
+          are encoded using the buffer's encoding.
+        @throws TypeError If bytes are appended to a text buffer.
+        """
+        if not data:
+            return
+
+        if isinstance(data, str):
+            if self._binary:
+                data = data.encode(self._encoding, "replace")
+        elif not self._binary:
+            raise TypeError("Bytes can only be appended to binary buffers.")
+        self._last_char = data[-1] if isinstance(data, str) else chr(data[-1])
+
+        self._chunks.append(data)
+        self._memory_size += len(data)
+        self._length += len(data)
+
+        # Checking whether a string is ASCII doesn't require scanning it, so
+        #   most output is counted without being encoded
+        if isinstance(data, bytes) or data.isascii():
+            self._byte_count += len(data)
+        else:
+            self._byte_count += len(self._encode(data))
+
+        if self._memory_limit is not None and \
+            self._memory_size > self._memory_limit:
+            self._spill()
+
+
+    def endswith(self, suffix: str) -> bool:
+        """
+        Checks whether the output ends with a suffix.
+        @param suffix The suffix to check for. Checking for suffixes longer than
+          a single character requires reading the end of the output.
+        @return Whether the output ends with the suffix.
+        """
+        if len(suffix) == 1:
+            return self._last_char == suffix
+        return self.tail_chars(len(suffix)) == suffix
+
+
+    def getvalue(self) -> str:
+        """
+        Gets the full contents of the buffer as a single string.
+        This materializes the whole output in memory. Prefer `iter_chunks()`,
+          `iter_lines()` or `tail()` for output that may be large.
+        @return The output stored in the buffer.
+        """
+        # Joining a single string returns the string itself without copying it
+        return "".join(self.iter_chunks())
+
+
+    def getbytes(self) -> bytes:
+        """
+        Gets the full contents of the buffer as bytes.
+        For binary buffers, this is exactly the output written by the command.
+          Text buffers return their output encoded as UTF-8.
+        @return The output stored in the buffer.
+        """
+        return b"".join(self.iter_bytes())
+
+
+    def iter_chunks(self) -> Iterator[str]:
+        """
+        Iterates over the output in the order it was written.
+        The output must not be appended to while it's being iterated over.
+        @return An iterator yielding consecutive chunks of the output.
+        """
+        # A single decoder is used for the whole output since a character may
+        #   be split across the temporary file and the chunks in memory (or
+        #   across two chunks)
+        decoder = self._create_decoder()
+        if self._file:
+            self._file.seek(0)
+            remaining = self._file_size
+            while remaining > 0:
+                data = self._file.read(min(self._READ_SIZE, remaining))
+                if not data:
+                    break
+                remaining -= len(data)
+                text = decoder.decode(data)
+                if text:
+                    yield text
+            self._file.seek(0, 2)
+
+        for chunk in self._chunks:
+            text = chunk if isinstance(chunk, str) else decoder.decode(chunk)
+            if text:
+                yield text
+        text = decoder.decode(b"", final=True)
+        if text:
+            yield text
+
+
+    def iter_bytes(self) -> Iterator[bytes]:
+        """
+        Iterates over the raw output in the order it was written.
+        The output must not be appended to while it's being iterated over.
+        @return An iterator yielding consecutive chunks of the output. For text
+          buffers, the output is encoded as UTF-8.
+        """
+        if self._file:
+            self._file.seek(0)
+            remaining = self._file_size
+            while remaining > 0:
+                data = self._file.read(min(self._READ_SIZE, remaining))
+                if not data:
+                    break
+                remaining -= len(data)
+                yield data
+            self._file.seek(0, 2)
+
+        for chunk in self._chunks:
+            yield self._encode(chunk)
+
+
+    def iter_lines(self) -> Iterator[str]:
+        """
+        Iterates over each line of the output.
+        Only a single line of output is held in memory at a time, on top of the
+          chunks that the buffer already holds in memory.
+        @return An iterator yielding each line of the output. Each line
+          includes its trailing newline, if any.
+        """
+        # Parts of a line that spans multiple chunks
+        partial: List[str] = []
+        for chunk in self.iter_chunks():
+            start = 0
+            end = chunk.find("\n")
+            while end >= 0:
+                partial.append(chunk[start:end + 1])
+                yield "".join(partial)
+                partial = []
+                start = end + 1
+                end = chunk.find("\n", start)
+            if start < len(chunk):
+                partial.append(chunk[start:])
+        if partial:
+            yield "".join(partial)
+
+
+    def tail(self, line_count: int) -> List[str]:
+        """
+        Gets the last lines of the output.
+        Only the end of the output is read, so this is cheap even if the output
+          has been moved to a temporary file.
+        @param line_count The maximum number of lines to get.
+        @return The last `line_count` lines of the output, in order. Each line
+          includes its trailing newline, if any.
+        """
+        if line_count <= 0:
+            return []
+
+        # Read blocks from the end of the output until enough newlines have
+        #   been found. A trailing newline ends the last line rather than
+        #   starting a new one, so one extra newline is needed in that case.
+        needed = line_count + (1 if self._last_char == "\n" else 0)
+        blocks: List[bytes] = []
+        newlines = 0
+        for block in self._iter_blocks_reversed():
+            blocks.append(block)
+            newlines += block.count(b"\n")
+            if newlines >= needed:
+                break
+
+        # Newlines are always encoded as a single byte, so splitting the bytes
+        #   can't split a character. The first block may start in the middle
+        #   of a character, but that part of the block is never returned since
+        #   it precedes the requested lines.
+        data = b"".join(reversed(blocks))
+        if newlines >= needed:
+            data = data[data.find(b"\n") + 1:]
+        lines = self._decode(data).split("\n")
+
+        # Splitting on the trailing newline leaves an empty string at the end
+        if lines[-1]:
+            lines = [line + "\n" for line in lines[:-1]] + [lines[-1]]
+        else:
+            lines = [line + "\n" for line in lines[:-1]]
+        return lines[-line_count:]
+
+
+    def tail_chars(self, char_count: int) -> str:
+        """
+        Gets the last characters of the output.
+        @param char_count The maximum number of characters to get.
+        @return The last `char_count` characters of the output.
+        """
+        if char_count <= 0:
+            return ""
+
+        # Read enough bytes to hold the requested number of characters
+        needed = char_count * self._MAX_CHAR_SIZE
+        blocks: List[bytes] = []
+        size = 0
+        for block in self._iter_blocks_reversed():
+            blocks.append(block)
+            size += len(block)
+            if size >= needed:
+                break
+        data = b"".join(reversed(blocks))[-needed:]
+
+        # Skip any continuation bytes of a character that was cut off. Text
+        #   buffers always store valid UTF-8, so this can only skip bytes that
+        #   precede the requested characters. Binary buffers never fail to
+        #   decode, so they don't need to do this.
+        start = 0
+        if not self._binary:
+            while start < len(data) and data[start] & 0xC0 == 0x80:
+                start += 1
+        return self._decode(data[start:])[-char_count:]
+
+
+    def close(self) -> None:
+        """
+        Releases the temporary file used by the buffer, if any.
+        The buffer must not be used after it has been closed.
+        """
+        if self._file:
+            self._file.close()
+            self._file = None
+        self._chunks = []
+
+
+    def _create_decoder(self) -> codecs.IncrementalDecoder:
+        """
+        Creates a decoder for the output stored in the buffer.
+        @return A decoder that converts the stored bytes back to text.
+        """
+        decoder = codecs.getincrementaldecoder(self._encoding)(self._errors)
+        if self._binary:
+            return IncrementalNewlineDecoder(decoder, translate=True)
+        return decoder
+
+
+    def _decode(self, data: bytes) -> str:
+        """
+        Decodes a complete block of stored bytes.
+        @param data The bytes to decode.
+        @return The decoded text.
+        """
+        text = data.decode(self._encoding, self._errors)
+        if self._binary:
+            text = text.replace("\r\n", "\n").replace("\r", "\n")
+        return text
+
+
+    def _encode(self, chunk: str | bytes) -> bytes:
+        """
+        Converts a chunk held in memory to the bytes stored in the temporary
+          file.
+        @param chunk The chunk to convert.
+        @return The bytes to store for the chunk.
+        """
+        if isinstance(chunk, bytes):
+            return chunk
+        return chunk.encode(self._encoding, self._errors)
+
+
+    def _spill(self) -> None:
+        """
+        Moves the chunks held in memory to the temporary file.
+        """
+        if not self._file:
+            self._file = tempfile.TemporaryFile()
+        for chunk in self._chunks:
+            data = self._encode(chunk)
+            self._file.write(data)
+            self._file_size += len(data)
+        self._chunks = []
+        self._memory_size = 0
+
+
+    def _iter_blocks_reversed(self) -> Iterator[bytes]:
+        """
+        Iterates over the stored bytes starting from the end of the output.
+        @return An iterator yielding blocks of stored bytes, starting with the
+          last block.
+        """
+        for chunk in reversed(self._chunks):
+            yield self._encode(chunk)
+
+        if self._file:
+            end = self._file_size
+            while end > 0:
+                start = max(end - self._READ_SIZE, 0)
+                self._file.seek(start)
+                yield self._file.read(end - start)
+                end = start
+            self._file.seek(0, 2)
@@ -0,0 +1,72 @@
+from datetime import datetime
+from pathlib import Path
+from pyshell.commands.command_result import CommandResult
+from pyshell.commands.external_command import ExternalCommand
+from pyshell.commands.pipeline_result import PipelineResult
+from pyshell.core.pyshell import PyShell
+from typing import List, Optional, Sequence
+
+class Pipeline:
+    """
+    Set of external commands whose stdout is piped to the next command's stdin.
+    The commands are connected via OS pipes, so the data passed between them
+      never goes through the PyShell process. Each command is still logged and
+      gets its own result, and the error handler and events are used for each
+      command just like for commands run on their own.
+    @ingroup commands
+    """
+    def __init__(self, *commands: ExternalCommand):
+        """
+        Initializes the pipeline.
+        @param commands The commands in the pipeline, in order.
+        @throws ValueError If no commands are provided.
+        """
+        if not commands:
+            raise ValueError("A pipeline must contain at least one command.")
+        self._commands = list(commands)
+
+
+    @property
+    def commands(self) -> Sequence[ExternalCommand]:
+        """
+        The commands in the pipeline, in order.
+        """
+        return self._commands
+
+
+    def __call__(self,
+        pyshell: Optional[PyShell] = None,
+        cwd: str | Path | None = None) -> PipelineResult:
+        """
+        Runs the pipeline.
+        @param pyshell PyShell instance to execute the pipeline via.
+        @param cwd The current working directory to use for the commands. If
+          this is not provided, the pyshell instance's cwd will be used.
+        @return The results of each command in the pipeline. If any command
+          can't be run (e.g. because its executable doesn't exist), no command
+          is run; those commands get a failed result and all other commands
+          are marked as skipped.
+        """
+        if not pyshell:
+            pyshell = PyShell.get_required_active_instance()
+
+        # Make sure that every command can be run before starting any of them
+        error_results = [c._check_command(pyshell, cwd) for c in self._commands]
+        if any(r is not None for r in error_results):
+            results: List[CommandResult] = []
+            for command, error_result in zip(self._commands, error_results):
+                if error_result is None:
+                    error_result = CommandResult(
+                        command.command_name,
+                        command.args,
+                        str(cwd) if cwd else str(pyshell.cwd),
+                        "",
+                        0,
+                        True,
+                        datetime.now(),
+                        datetime.now()
+                    )
+                results.append(error_result)
+            return PipelineResult(results)
+
+        return pyshell.run_pipeline([c.metadata for c in self._commands], cwd)
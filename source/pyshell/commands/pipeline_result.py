@@ -0,0 +1,97 @@
+from pyshell.commands.command_result import CommandResult
+from typing import Sequence
+
+class PipelineResult:
+    """
+    Stores the results of each command in a pipeline.
+    @ingroup commands
+    """
+    def __init__(self, results: Sequence[CommandResult]):
+        """
+        Initializes the object.
+        @param results The result of each command in the pipeline, in order.
+        @throws ValueError If no results are provided.
+        """
+        if not results:
+            raise ValueError("A pipeline must contain at least one command.")
+        self._results = list(results)
+
+
+    def __len__(self) -> int:
+        """
+        Returns the number of commands in the pipeline.
+        """
+        return len(self._results)
+
+
+    def __getitem__(self, index: int) -> CommandResult:
+        """
+        Gets the result of a command in the pipeline.
+        @param index The index of the command in the pipeline.
+        @return The result of the command.
+        """
+        return self._results[index]
+
+
+    def __bool__(self) -> bool:
+        """
+        Whether every command in the pipeline was successful.
+        """
+        return self.success
+
+
+    @property
+    def results(self) -> Sequence[CommandResult]:
+        """
+        The result of each command in the pipeline, in order.
+        """
+        return self._results
+
+
+    @property
+    def output(self) -> str:
+        """
+        Output of the last command in the pipeline.
+        """
+        return self._results[-1].output
+
+
+    @property
+    def exit_code(self) -> int:
+        """
+        Exit code of the pipeline.
+        This is the exit code of the last command that failed, or 0 if every
+          command was successful, which matches the exit code of a shell
+          pipeline run with `set -o pipefail`.
+        @throws RuntimeError If the pipeline was skipped.
+        """
+        if self.skipped:
+            raise RuntimeError("Cannot get exit code for skipped pipeline.")
+        for result in reversed(self._results):
+            if result.exit_code != 0:
+                return result.exit_code
+        return 0
+
+
+    @property
+    def success(self) -> bool:
+        """
+        Whether every command in the pipeline was successful.
+        """
+        return all(r.success for r in self._results)
+
+
+    @property
+    def error(self) -> bool:
+        """
+        Whether any command in the pipeline was not successful.
+        """
+        return any(r.error for r in self._results)
+
+
+    @property
+    def skipped(self) -> bool:
+        """
+        Whether the pipeline was skipped.
+        """
+        return all(r.skipped for r in self._results)
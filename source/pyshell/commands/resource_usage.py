@@ -0,0 +1,130 @@
+from __future__ import annotations
+import sys
+from typing import Any
+
+class ResourceUsage:
+    """
+    Resources used by a command's process.
+    @ingroup commands
+    """
+    def __init__(self,
+        user_time: float,
+        system_time: float,
+        max_rss: int,
+        block_inputs: int,
+        block_outputs: int,
+        voluntary_context_switches: int,
+        involuntary_context_switches: int):
+        """
+        Initializes the object.
+        @param user_time CPU time spent in user mode, in seconds.
+        @param system_time CPU time spent in kernel mode, in seconds.
+        @param max_rss Maximum resident set size of the process, in bytes.
+        @param block_inputs Number of times the filesystem had to read from
+          disk on behalf of the process.
+        @param block_outputs Number of times the filesystem had to write to
+          disk on behalf of the process.
+        @param voluntary_context_switches Number of times the process gave up
+          the CPU before its time slice ended (typically to wait for I/O).
+        @param involuntary_context_switches Number of times the process was
+          preempted because its time slice ended or a higher priority process
+          became runnable.
+        """
+        self._user_time = user_time
+        self._system_time = system_time
+        self._max_rss = max_rss
+        self._block_inputs = block_inputs
+        self._block_outputs = block_outputs
+        self._voluntary_context_switches = voluntary_context_switches
+        self._involuntary_context_switches = involuntary_context_switches
+
+
+    @staticmethod
+    def from_rusage(rusage: Any) -> ResourceUsage:
+        """
+        Creates an instance from the value returned by `os.wait4()` or
+          `resource.getrusage()`.
+        @param rusage The `resource.struct_rusage` instance to convert.
+        @return The resources described by `rusage`.
+        """
+        # Linux reports the maximum RSS in kilobytes while macOS reports it in
+        #   bytes
+        max_rss = rusage.ru_maxrss
+        if sys.platform != "darwin":
+            max_rss *= 1024
+
+        return ResourceUsage(
+            rusage.ru_utime,
+            rusage.ru_stime,
+            max_rss,
+            rusage.ru_inblock,
+            rusage.ru_oublock,
+            rusage.ru_nvcsw,
+            rusage.ru_nivcsw
+        )
+
+
+    @property
+    def user_time(self) -> float:
+        """
+        CPU time spent in user mode, in seconds.
+        """
+        return self._user_time
+
+
+    @property
+    def system_time(self) -> float:
+        """
+        CPU time spent in kernel mode, in seconds.
+        """
+        return self._system_time
+
+
+    @property
+    def cpu_time(self) -> float:
+        """
+        Total CPU time used by the process, in seconds.
+        """
+        return self._user_time + self._system_time
+
+
+    @property
+    def max_rss(self) -> int:
+        """
+        Maximum resident set size of the process, in bytes.
+        """
+        return self._max_rss
+
+
+    @property
+    def block_inputs(self) -> int:
+        """
+        Number of times the filesystem had to read from disk on behalf of the
+          process.
+        """
+        return self._block_inputs
+
+
+    @property
+    def block_outputs(self) -> int:
+        """
+        Number of times the filesystem had to write to disk on behalf of the
+          process.
+        """
+        return self._block_outputs
+
+
+    @property
+    def voluntary_context_switches(self) -> int:
+        """
+        Number of times the process gave up the CPU before its time slice ended.
+        """
+        return self._voluntary_context_switches
+
+
+    @property
+    def involuntary_context_switches(self) -> int:
+        """
+        Number of times the process was preempted.
+        """
+        return self._involuntary_context_switches
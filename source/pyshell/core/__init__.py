@@ -7,3 +7,6 @@
 #   than constructing a PyShell command instance and then executing it. For
 #   PyShell scripts that don't need advanced PyShell features like parallel
 #   execution, modules are the recommended way to invoke PyShell commands.
+
+## @defgroup core Core
+# Classes that make up a PyShell instance and track the commands it runs.
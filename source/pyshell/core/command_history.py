@@ -0,0 +1,320 @@
+from array import array
+import heapq
+import math
+from pyshell.commands.command_result import CommandResult
+from pyshell.core.history_entry import HistoryEntry
+from pyshell.core.pyshell_component import IPyShellComponent
+from pyshell.core.pyshell_events import PyShellEvents
+import threading
+from typing import Dict, Iterator, List, Optional
+
+class CommandHistory(IPyShellComponent):
+    """
+    Records a summary of each command run by a PyShell instance.
+    Each field is stored in its own `array`, one element per command, and
+      command and backend names are stored once and referenced by ID, so each
+      command takes about 50 bytes of history regardless of how much output
+      it produced. Aggregate queries scan the arrays directly in O(n) time
+      without creating an object per command; `HistoryEntry` objects are only
+      created for the commands that a query returns.
+    Commands that were skipped by the executor aren't recorded.
+    This class is thread-safe.
+    @ingroup core
+    """
+    # Bits stored in the flags array for each command
+    _SUCCESS = 0x1
+    _CACHED = 0x2
+    _TIMED_OUT = 0x4
+    _LIMIT_EXCEEDED = 0x8
+
+    def __init__(self):
+        """
+        Initializes the object.
+        """
+        self._lock = threading.Lock()
+
+        # Command and backend names, indexed by ID
+        self._names: List[Optional[str]] = []
+        self._name_ids: Dict[Optional[str], int] = {}
+
+        # Columns of the history. Durations that weren't measured are stored as
+        #   NaN.
+        self._command_ids = array("I")
+        self._backend_ids = array("I")
+        self._exit_codes = array("q")
+        self._flags = array("B")
+        self._durations = array("d")
+        self._spawn_durations = array("d")
+        self._cpu_times = array("d")
+        self._output_sizes = array("Q")
+
+
+    def initialize(self, events: PyShellEvents) -> None:
+        """
+        Initializes the history.
+        @param events `PyShellEvents` instance for the pyshell instance that
+          the history records commands for.
+        """
+        events.on_command_finished += self._on_result
+        events.on_command_failed += self._on_result
+
+
+    @property
+    def memory_usage(self) -> int:
+        """
+        Number of bytes used by the columns of the history.
+        """
+        with self._lock:
+            return sum(column.itemsize * len(column)
+                for column in self._columns())
+
+
+    def record(self, result: CommandResult) -> None:
+        """
+        Adds a command's result to the history.
+        @param result The result of the command.
+        """
+        flags = 0
+        if result.success:
+            flags |= self._SUCCESS
+        if result.cached:
+            flags |= self._CACHED
+        if result.timed_out:
+            flags |= self._TIMED_OUT
+        if result.limit_exceeded:
+            flags |= self._LIMIT_EXCEEDED
+
+        spawn_duration = result.spawn_duration_seconds
+        if result.user_time is not None and result.system_time is not None:
+            cpu_time = result.user_time + result.system_time
+        else:
+            cpu_time = math.nan
+
+        with self._lock:
+            self._command_ids.append(self._intern(result.command))
+            self._backend_ids.append(self._intern(result.backend))
+            self._exit_codes.append(result.exit_code)
+            self._flags.append(flags)
+            self._durations.append(result.duration_seconds)
+            self._spawn_durations.append(
+                math.nan if spawn_duration is None else spawn_duration)
+            self._cpu_times.append(cpu_time)
+            self._output_sizes.append(result.output_buffer.byte_count)
+
+
+    def clear(self) -> None:
+        """
+        Removes every command from the history.
+        """
+        with self._lock:
+            for column in self._columns():
+                del column[:]
+
+
+    def __len__(self) -> int:
+        """
+        Returns the number of commands in the history.
+        """
+        with self._lock:
+            return len(self._durations)
+
+
+    def __getitem__(self, index: int) -> HistoryEntry:
+        """
+        Gets a command from the history.
+        @param index Position of the command in the history. Negative values
+          are relative to the end of the history.
+        @throws IndexError If there is no command at the position.
+        @return The entry for the command.
+        """
+        with self._lock:
+            if index < 0:
+                index += len(self._durations)
+            if not 0 <= index < len(self._durations):
+                raise IndexError("History index out of range.")
+            return self._entry(index)
+
+
+    def __iter__(self) -> Iterator[HistoryEntry]:
+        """
+        Iterates over the commands in the history, in the order they finished.
+        The commands are read when iteration starts, so commands recorded or
+          cleared while iterating don't affect the iteration.
+        """
+        with self._lock:
+            entries = [self._entry(i) for i in range(len(self._durations))]
+        return iter(entries)
+
+
+    def slowest(self, count: int) -> List[HistoryEntry]:
+        """
+        Gets the commands that took the longest to run.
+        @param count Maximum number of commands to return.
+        @return The slowest commands, slowest first.
+        """
+        with self._lock:
+            indices = heapq.nlargest(count,
+                range(len(self._durations)),
+                key=self._durations.__getitem__)
+            return [self._entry(i) for i in indices]
+
+
+    def failures(self) -> List[HistoryEntry]:
+        """
+        Gets every command that failed.
+        @return The failed commands, in the order they finished.
+        """
+        with self._lock:
+            return [self._entry(i) for i, flags in enumerate(self._flags)
+                if not flags & self._SUCCESS]
+
+
+    def failure_rate(self, command: Optional[str] = None) -> float:
+        """
+        Gets the fraction of commands that failed.
+        @param command If specified, only runs of this command are counted.
+        @return The number of failed commands divided by the number of
+          commands, or 0 if no commands were counted.
+        """
+        with self._lock:
+            if command is None:
+                total = len(self._flags)
+                failed = sum(1 for flags in self._flags
+                    if not flags & self._SUCCESS)
+            else:
+                command_id = self._name_ids.get(command)
+                total = 0
+                failed = 0
+                for i, flags in zip(self._command_ids, self._flags):
+                    if i == command_id:
+                        total += 1
+                        if not flags & self._SUCCESS:
+                            failed += 1
+            return failed / total if total else 0.0
+
+
+    def total_duration(self) -> float:
+        """
+        Gets the time taken by every command in the history.
+        @return The sum of the commands' durations, in seconds.
+        """
+        with self._lock:
+            return math.fsum(self._durations)
+
+
+    def duration_by_command(self) -> Dict[str, float]:
+        """
+        Gets the time taken by each command.
+        @return The total duration of each command's runs in seconds, keyed by
+          command name.
+        """
+        with self._lock:
+            return self._sum_by(self._command_ids, self._durations)
+
+
+    def duration_by_backend(self) -> Dict[Optional[str], float]:
+        """
+        Gets the time taken by commands on each backend.
+        @return The total duration of the commands run by each backend in
+          seconds, keyed by the backend information reported by the command
+          results.
+        """
+        with self._lock:
+            return self._sum_by(self._backend_ids, self._durations)
+
+
+    def count_by_command(self) -> Dict[str, int]:
+        """
+        Gets the number of times each command was run.
+        @return The number of runs of each command, keyed by command name.
+        """
+        with self._lock:
+            counts = [0] * len(self._names)
+            for i in self._command_ids:
+                counts[i] += 1
+            return {self._names[i]: c for i, c in enumerate(counts) if c}
+
+
+    def _on_result(self,
+        sender: PyShellEvents,
+        result: CommandResult) -> None:
+        """
+        Callback bound to the on_command_finished and on_command_failed events.
+        @param sender Sender of the event.
+        @param result Result of the command that finished.
+        """
+        self.record(result)
+
+
+    def _columns(self) -> List[array]:
+        """
+        Gets every column of the history.
+        """
+        return [
+            self._command_ids,
+            self._backend_ids,
+            self._exit_codes,
+            self._flags,
+            self._durations,
+            self._spawn_durations,
+            self._cpu_times,
+            self._output_sizes
+        ]
+
+
+    def _intern(self, name: Optional[str]) -> int:
+        """
+        Gets the ID of a command or backend name, assigning one if needed.
+        Must be called with the lock held.
+        @param name The name to get the ID of.
+        @return The ID of the name.
+        """
+        name_id = self._name_ids.get(name)
+        if name_id is None:
+            name_id = len(self._names)
+            self._names.append(name)
+            self._name_ids[name] = name_id
+        return name_id
+
+
+    def _sum_by(self, ids: array, values: array) -> Dict:
+        """
+        Sums the values of a column, grouped by the name IDs in another column.
+        Must be called with the lock held.
+        @param ids The name ID of each command.
+        @param values The value of each command.
+        @return The sum of the values for each name that appears in `ids`.
+        """
+        totals = [0.0] * len(self._names)
+        present = [False] * len(self._names)
+        for i, value in zip(ids, values):
+            totals[i] += value
+            present[i] = True
+        return {self._names[i]: t for i, t in enumerate(totals) if present[i]}
+
+
+    def _entry(self, index: int) -> HistoryEntry:
+        """
+        Creates the entry for a command in the history.
+        Must be called with the lock held.
+        @param index Position of the command in the history.
+        @return The entry for the command.
+        """
+        flags = self._flags[index]
+        spawn_duration = self._spawn_durations[index]
+        cpu_time = self._cpu_times[index]
+        return HistoryEntry(
+            index=index,
+            command=self._names[self._command_ids[index]] or "",
+            backend=self._names[self._backend_ids[index]],
+            exit_code=self._exit_codes[index],
+            success=bool(flags & self._SUCCESS),
+            cached=bool(flags & self._CACHED),
+            timed_out=bool(flags & self._TIMED_OUT),
+            limit_exceeded=bool(flags & self._LIMIT_EXCEEDED),
+            duration=self._durations[index],
+            spawn_duration=None if math.isnan(spawn_duration)
+                else spawn_duration,
+            cpu_time=None if math.isnan(cpu_time) else cpu_time,
+            output_size=self._output_sizes[index]
+        )
@@ -0,0 +1,167 @@
+from __future__ import annotations
+import contextvars
+from pyshell.commands.command_result import CommandResult
+import queue
+import threading
+from typing import Any, Callable, Iterator, Optional
+
+class CommandStream:
+    """
+    Iterates over the output of a command line by line while it runs.
+    The command is started on a worker thread when iteration begins. Lines are
+      passed to the iterating thread through a bounded queue; once the queue is
+      full, the worker stops reading the command's output until the iterating
+      thread catches up, so the command blocks on its pipe instead of the
+      output piling up in memory.
+    Once iteration ends, the command's result is available via `result`. Any
+      exception raised while running the command (e.g. by the error handler)
+      is raised from the iterator once all output before it has been consumed.
+    """
+    ## Default maximum number of lines held before the command is blocked.
+    DEFAULT_MAX_BUFFERED_LINES = 1024
+
+    # Marks the end of the command's output in the queue
+    _END = object()
+
+    def __init__(self,
+        run: Callable[[Callable[[str], Any]], CommandResult],
+        max_buffered_lines: int = DEFAULT_MAX_BUFFERED_LINES):
+        """
+        Initializes the stream.
+        The command is not started until the stream is iterated over.
+        @param run Callable that runs the command and returns its result. It's
+          passed a callback that must be invoked with each line of output.
+        @param max_buffered_lines Maximum number of lines that may be held
+          before the command is blocked from writing more output.
+        @throws ValueError If `max_buffered_lines` is not positive.
+        """
+        if max_buffered_lines <= 0:
+            raise ValueError("max_buffered_lines must be positive.")
+
+        self._run = run
+        self._queue: queue.Queue[Any] = queue.Queue(max_buffered_lines)
+        self._thread: Optional[threading.Thread] = None
+        self._result: Optional[CommandResult] = None
+        self._exception: Optional[BaseException] = None
+        self._finished = False
+
+        # Set once the remaining output should be discarded instead of queued
+        self._closed = threading.Event()
+
+
+    def __iter__(self) -> Iterator[str]:
+        """
+        Returns the stream itself, which yields each line of output.
+        """
+        return self
+
+
+    def __next__(self) -> str:
+        """
+        Gets the next line of output, blocking until it's available.
+        @throws StopIteration Once the command has exited and all output has
+          been consumed.
+        @return The next line of output. Each line includes its trailing
+          newline, except for a final line that the command didn't terminate.
+        """
+        if self._finished:
+            raise StopIteration
+        self._start()
+
+        item = self._queue.get()
+        if item is not CommandStream._END:
+            return item
+
+        assert self._thread
+        self._thread.join()
+        self._finished = True
+        if self._exception:
+            raise self._exception
+        raise StopIteration
+
+
+    def __enter__(self) -> CommandStream:
+        """
+        Returns the stream.
+        """
+        return self
+
+
+    def __exit__(self, *args: Any) -> None:
+        """
+        Closes the stream.
+        """
+        self.close()
+
+
+    @property
+    def result(self) -> CommandResult:
+        """
+        The result of the command.
+        If the command is still running, any output that hasn't been consumed
+          yet is consumed and the command is waited on.
+        @throws Exception Any exception raised while running the command.
+        """
+        for _ in self:
+            pass
+        if self._exception:
+            raise self._exception
+        assert self._result is not None
+        return self._result
+
+
+    def close(self) -> None:
+        """
+        Discards any output that hasn't been consumed and waits for the command
+          to exit.
+        The command's output is still logged, and `result` may still be used
+          after the stream has been closed.
+        """
+        self._closed.set()
+        if not self._thread:
+            return
+
+        # Unblock the worker if it's waiting on a full queue
+        while not self._finished:
+            if self._queue.get() is CommandStream._END:
+                self._thread.join()
+                self._finished = True
+
+
+    def _start(self) -> None:
+        """
+        Starts running the command if it hasn't been started yet.
+        """
+        if self._thread:
+            return
+
+        # The command is run in a copy of the caller's context so that context
+        #   variables (e.g. `PyShell.buffered_output()`) carry over
+        context = contextvars.copy_context()
+        self._thread = threading.Thread(
+            target=context.run,
+            args=(self._run_command,),
+            daemon=True
+        )
+        self._thread.start()
+
+
+    def _run_command(self) -> None:
+        """
+        Runs the command on the worker thread.
+        """
+        try:
+            self._result = self._run(self._on_line)
+        except BaseException as e:
+            self._exception = e
+        finally:
+            self._queue.put(CommandStream._END)
+
+
+    def _on_line(self, line: str) -> None:
+        """
+        Queues a line of output, blocking while the queue is full.
+        @param line The line of output.
+        """
+        if not self._closed.is_set():
+            self._queue.put(line)
@@ -0,0 +1,194 @@
+import os
+from pathlib import Path
+import threading
+import time
+from typing import Dict, List, Optional, Set
+
+class ExecutableIndex:
+    """
+    Index of the files in each directory on the PATH.
+    Searching the PATH for an executable normally requires checking every PATH
+      directory until the executable is found, which gets slow for long PATHs
+      (e.g. in nix or conda environments). The index lists each directory once
+      and maps each filename to the directories that contain it, so a lookup
+      only needs to confirm that the file it found still exists.
+    The index is rebuilt whenever the PATH changes. Directories whose
+      modification time changed are listed again at most once per check
+      interval, or whenever a lookup doesn't find a file, so executables that
+      are installed while a script is running are found immediately.
+    This class is thread-safe.
+    """
+    ## Default number of seconds between checks for modified PATH directories.
+    DEFAULT_CHECK_INTERVAL = 1.0
+
+    # Directories modified less than this many nanoseconds before they were
+    #   listed may have changed again without their modification time changing
+    #   (due to timestamp granularity), so they're always listed again
+    _RACY_WINDOW_NS = 2 * 10**9
+
+    def __init__(self, check_interval: float = DEFAULT_CHECK_INTERVAL):
+        """
+        Initializes the index.
+        @param check_interval Minimum number of seconds between checks for
+          modified PATH directories when lookups find a file.
+        """
+        self._check_interval = check_interval
+        self._lock = threading.Lock()
+
+        # Value of the PATH that the index was built for
+        self._path_var: Optional[str] = None
+
+        # Directories on the PATH, in order
+        self._dirs: List[str] = []
+
+        # Whether the PATH can be indexed. Relative PATH entries depend on the
+        #   current working directory, so PATHs containing them are searched
+        #   without using the index.
+        self._indexable = False
+
+        # Names of the files in each directory, along with the directory's
+        #   modification time and the time it was listed at
+        self._listings: Dict[str, Set[str]] = {}
+        self._mtimes: Dict[str, Optional[int]] = {}
+        self._listed_at: Dict[str, int] = {}
+
+        # Maps each filename to the positions of the directories that contain
+        #   it, in PATH order
+        self._names: Dict[str, List[int]] = {}
+
+        # Time of the last check for modified directories
+        self._last_check = 0.0
+
+
+    def resolve(self, filename: str, path_var: str) -> Optional[Path]:
+        """
+        Finds the first file with the specified name in the PATH directories.
+        @param filename The filename to resolve.
+        @param path_var The value of the PATH environment variable.
+        @return The path to the file, or None if no PATH directory contains a
+          file with that name.
+        """
+        # Files in subdirectories can't be indexed
+        if os.sep in filename or (os.altsep and os.altsep in filename):
+            return self._search(filename, path_var)
+
+        with self._lock:
+            checked = False
+            if path_var != self._path_var:
+                self._rebuild(path_var)
+                checked = True
+            if self._indexable:
+                if not checked and \
+                    time.monotonic() - self._last_check >= self._check_interval:
+                    self._refresh()
+                    checked = True
+
+                exe_path = self._lookup(filename)
+                if exe_path is None and not checked:
+                    # The file may have been added since the last check
+                    self._refresh()
+                    exe_path = self._lookup(filename)
+                return exe_path
+
+        return self._search(filename, path_var)
+
+
+    def invalidate(self) -> None:
+        """
+        Discards the index so that it's rebuilt by the next lookup.
+        """
+        with self._lock:
+            self._path_var = None
+            self._listings.clear()
+            self._mtimes.clear()
+            self._listed_at.clear()
+
+
+    @staticmethod
+    def _search(filename: str, path_var: str) -> Optional[Path]:
+        """
+        Searches the PATH directories for a file without using the index.
+        @param filename The filename to resolve.
+        @param path_var The value of the PATH environment variable.
+        @return The path to the file, or None if it couldn't be found.
+        """
+        for path in path_var.split(os.pathsep):
+            exe_path = Path(path).joinpath(filename)
+            if os.path.isfile(exe_path):
+                return exe_path
+        return None
+
+
+    def _lookup(self, filename: str) -> Optional[Path]:
+        """
+        Looks up a file in the index.
+        Must be called with the lock held.
+        @param filename The filename to resolve.
+        @return The path to the first listed file with that name that is still
+          a file, or None if there is no such file.
+        """
+        for position in self._names.get(filename, []):
+            # Entries with the same name may be directories, or may have been
+            #   removed since the directory was listed
+            exe_path = Path(self._dirs[position]).joinpath(filename)
+            if os.path.isfile(exe_path):
+                return exe_path
+        return None
+
+
+    def _rebuild(self, path_var: str) -> None:
+        """
+        Rebuilds the index for a different PATH.
+        Listings of directories that were already on the PATH are reused if
+          the directories haven't changed.
+        Must be called with the lock held.
+        @param path_var The value of the PATH environment variable.
+        """
+        self._path_var = path_var
+        self._dirs = path_var.split(os.pathsep)
+        self._indexable = all(os.path.isabs(d) for d in self._dirs)
+        if not self._indexable:
+            self._dirs = []
+        for d in set(self._listings) - set(self._dirs):
+            del self._listings[d]
+            del self._mtimes[d]
+            del self._listed_at[d]
+        self._refresh(force=True)
+
+
+    def _refresh(self, force: bool = False) -> None:
+        """
+        Lists any PATH directory that changed since it was last listed.
+        Must be called with the lock held.
+        @param force Whether to rebuild the name map even if no directory
+          changed.
+        """
+        changed = force
+        for d in self._dirs:
+            try:
+                mtime: Optional[int] = os.stat(d).st_mtime_ns
+            except OSError:
+                mtime = None
+
+            if d in self._listings and mtime == self._mtimes[d] and \
+                (mtime is None or
+                    self._listed_at[d] - mtime > self._RACY_WINDOW_NS):
+                continue
+
+            listed_at = time.time_ns()
+            try:
+                names = set(os.listdir(d)) if mtime is not None else set()
+            except OSError:
+                names = set()
+            if names != self._listings.get(d):
+                changed = True
+            self._listings[d] = names
+            self._mtimes[d] = mtime
+            self._listed_at[d] = listed_at
+
+        if changed:
+            self._names = {}
+            for position, d in enumerate(self._dirs):
+                for name in self._listings[d]:
+                    self._names.setdefault(name, []).append(position)
+        self._last_check = time.monotonic()
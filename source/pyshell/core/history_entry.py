@@ -0,0 +1,159 @@
+from typing import Optional
+
+class HistoryEntry:
+    """
+    Summary of a single command recorded by a `CommandHistory`.
+    Entries are only created when a history query returns them, so the history
+      itself never stores one object per command.
+    @ingroup core
+    """
+    def __init__(self,
+        index: int,
+        command: str,
+        backend: Optional[str],
+        exit_code: int,
+        success: bool,
+        cached: bool,
+        timed_out: bool,
+        limit_exceeded: bool,
+        duration: float,
+        spawn_duration: Optional[float],
+        cpu_time: Optional[float],
+        output_size: int):
+        """
+        Initializes the object.
+        @param index Position of the command in the history.
+        @param command Name of the command/executable that was run.
+        @param backend Information about the backend that ran the command.
+        @param exit_code Exit code of the command.
+        @param success Whether the command succeeded.
+        @param cached Whether the result was reused from a previous run.
+        @param timed_out Whether the command exceeded its timeout.
+        @param limit_exceeded Whether the command exceeded a resource limit.
+        @param duration Time taken by the command, in seconds.
+        @param spawn_duration Time taken to start the command's process, in
+          seconds, if the backend measured it.
+        @param cpu_time User and system CPU time used by the command's process,
+          in seconds, if the backend collected it.
+        @param output_size Size of the command's output, in bytes. Text output
+          is measured as the length of the output encoded as UTF-8.
+        """
+        self._index = index
+        self._command = command
+        self._backend = backend
+        self._exit_code = exit_code
+        self._success = success
+        self._cached = cached
+        self._timed_out = timed_out
+        self._limit_exceeded = limit_exceeded
+        self._duration = duration
+        self._spawn_duration = spawn_duration
+        self._cpu_time = cpu_time
+        self._output_size = output_size
+
+
+    @property
+    def index(self) -> int:
+        """
+        Position of the command in the history.
+        """
+        return self._index
+
+
+    @property
+    def command(self) -> str:
+        """
+        Name of the command/executable that was run.
+        """
+        return self._command
+
+
+    @property
+    def backend(self) -> Optional[str]:
+        """
+        Information about the backend that ran the command.
+        """
+        return self._backend
+
+
+    @property
+    def exit_code(self) -> int:
+        """
+        Exit code of the command.
+        """
+        return self._exit_code
+
+
+    @property
+    def success(self) -> bool:
+        """
+        Whether the command succeeded.
+        """
+        return self._success
+
+
+    @property
+    def cached(self) -> bool:
+        """
+        Whether the result was reused from a previous run of the command.
+        """
+        return self._cached
+
+
+    @property
+    def timed_out(self) -> bool:
+        """
+        Whether the command was stopped because it exceeded its timeout.
+        """
+        return self._timed_out
+
+
+    @property
+    def limit_exceeded(self) -> bool:
+        """
+        Whether the command was stopped because it exceeded a resource limit.
+        """
+        return self._limit_exceeded
+
+
+    @property
+    def duration(self) -> float:
+        """
+        Time taken by the command, in seconds.
+        """
+        return self._duration
+
+
+    @property
+    def spawn_duration(self) -> Optional[float]:
+        """
+        Time taken to start the command's process, in seconds.
+        Will be `None` if the backend didn't measure it.
+        """
+        return self._spawn_duration
+
+
+    @property
+    def cpu_time(self) -> Optional[float]:
+        """
+        User and system CPU time used by the command's process, in seconds.
+        Will be `None` if the backend didn't collect resource usage.
+        """
+        return self._cpu_time
+
+
+    @property
+    def output_size(self) -> int:
+        """
+        Size of the command's output, in bytes.
+        Text output is measured as the length of the output encoded as UTF-8.
+        """
+        return self._output_size
+
+
+    def __repr__(self) -> str:
+        """
+        Returns a string representation of the entry.
+        """
+        return f"HistoryEntry({self._index}, {self._command!r}, " \
+            f"exit_code={self._exit_code}, duration={self._duration:.3f})"
@@ -1,11 +1,15 @@
 import os
 from pathlib import Path
+from pyshell.core.executable_index import ExecutableIndex
 import platform
 
 class PlatformStatics:
     """
     Defines static methods that abstract away platform-specific functionality.
     """
+    # Process-wide index used to resolve executables on the PATH
+    _executable_index = ExecutableIndex()
+
     @staticmethod
     def is_linux() -> bool:
         """
@@ -28,20 +32,36 @@ class PlatformStatics:
     def resolve_using_path(filename: str) -> Path:
         """
         Finds the path of the specified file using the system path.
+        Lookups use a process-wide index of the PATH directories, which is
+          rebuilt whenever the PATH changes and updated when a PATH directory
+          is modified.
         @param filename The filename to resolve.
         @throws FileNotFoundError if the file could not be found.
         @return The absolute path to the specified file.
         """
-        for path in os.environ["PATH"].split(os.pathsep):
-            exe_path = Path(path).joinpath(filename)
-            if os.path.isfile(exe_path):
-                return exe_path
+        exe_path = PlatformStatics._executable_index.resolve(
+            filename,
+            os.environ["PATH"]
+        )
+        if exe_path is not None:
+            return exe_path
 
         raise FileNotFoundError(
             f"Could not find a file with name '{filename}' on the PATH."
         )
 
 
+    @staticmethod
+    def invalidate_path_cache() -> None:
+        """
+        Discards the index used to resolve executables on the PATH.
+        The index detects changes to the PATH and to PATH directories on its
+          own, so this is only needed if executables are replaced in a way that
+          doesn't update the modification time of their directory.
+        """
+        PlatformStatics._executable_index.invalidate()
+
+
     @staticmethod
     def to_executable_name(name: str) -> str:
         """
@@ -1,10 +1,23 @@
 from __future__ import annotations
+from concurrent.futures import FIRST_COMPLETED, FIRST_EXCEPTION, Future, \
+    ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from contextvars import ContextVar
 from datetime import datetime
 from pathlib import Path
+from pyshell.backends.async_backend import IAsyncBackend
 from pyshell.backends.backend import IBackend
 from pyshell.backends.native_backend import NativeBackend
+from pyshell.backends.pipeline_backend import IPipelineBackend
+from pyshell.commands.command_flags import CommandFlags
 from pyshell.commands.command_metadata import CommandMetadata
+from pyshell.commands.command_phase import CommandPhase
 from pyshell.commands.command_result import CommandResult
+from pyshell.commands.command_timings import CommandTimings
+from pyshell.commands.pipeline_result import PipelineResult
+from pyshell.core.command_history import CommandHistory
+from pyshell.core.command_stream import CommandStream
+from pyshell.core.pyshell_component import IPyShellComponent
 from pyshell.core.pyshell_events import PyShellEvents
 from pyshell.core.pyshell_options import PyShellOptions
 from pyshell.error.abort_on_failure import AbortOnFailure
@@ -12,9 +25,20 @@ from pyshell.error.error_handler import IErrorHandler
 from pyshell.events.event_handler import EventHandler
 from pyshell.executors.executor import IExecutor
 from pyshell.executors.allow_all import AllowAll
+from pyshell.executors.result_cache import IResultCache
+from pyshell.logging.buffered_command_logger import BufferedCommandLogger
+from pyshell.logging.command_logger import ICommandLogger
 from pyshell.logging.console_logger import ConsoleLogger
 from pyshell.logging.logger import ILogger
-from typing import Optional
+from pyshell.logging.streaming_command_logger import StreamingCommandLogger
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, \
+    Sequence, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from pyshell.commands.command import ICommand
+    from pyshell.commands.command_graph import CommandGraph
 
 class PyShell:
     """
@@ -31,7 +55,9 @@ class PyShell:
         error_handler: IErrorHandler = AbortOnFailure(),
         options: PyShellOptions = PyShellOptions(),
         cwd: str | Path | None = None,
-        set_as_active_instance: bool = True):
+        set_as_active_instance: bool = True,
+        history: Optional[CommandHistory] = None,
+        components: Sequence[IPyShellComponent] = ()):
         """
         Initializes the PyShell script.
         @param backend The backend to use to execute commands.
@@ -44,12 +70,18 @@ class PyShell:
           used.
         @param set_as_active_instance Whether to set this instance as the
           currently active PyShell instance.
+        @param history History to record each command that's run in. If not
+          specified, no history is kept.
+        @param components Additional components that observe the commands run
+          by this instance, such as metrics exporters.
         """
         self._backend = backend
         self._executor = executor
         self._logger = logger
         self._options = options
         self._error_handler = error_handler
+        self._history = history
+        self._components = list(components)
 
         # Initialize the events
         # Note that the event handlers are stored in this class instead of the
@@ -65,11 +97,14 @@ class PyShell:
             EventHandler()
         self._on_command_failed: EventHandler[PyShellEvents, CommandResult] = \
             EventHandler()
+        self._on_command_timed: EventHandler[PyShellEvents, CommandResult] = \
+            EventHandler()
         self._events = PyShellEvents(
             self._on_command_started,
             self._on_command_skipped,
             self._on_command_finished,
-            self._on_command_failed
+            self._on_command_failed,
+            self._on_command_timed
         )
 
         # Initialize each component
@@ -77,6 +112,23 @@ class PyShell:
         self._logger.initialize(self._events)
         self._executor.initialize(self._events)
         self._error_handler.initialize(self._events)
+        if self._history is not None:
+            self._history.initialize(self._events)
+        for component in self._components:
+            component.initialize(self._events)
+
+        # State used to run commands in parallel
+        # Whether command output should be buffered is tracked per context
+        #   since commands run in parallel are run on worker threads or as
+        #   separate asyncio tasks.
+        self._buffer_output: ContextVar[bool] = \
+            ContextVar("buffer_output", default=False)
+        self._log_lock = threading.Lock()
+
+        # Callback that each line of output is passed to while a command is
+        #   being streamed via `stream()`
+        self._stream_output: ContextVar[Optional[Callable[[str], Any]]] = \
+            ContextVar("stream_output", default=None)
 
         # Initialize the cwd
         if cwd:
@@ -133,6 +185,24 @@ class PyShell:
         return self._options
 
 
+    @property
+    def events(self) -> PyShellEvents:
+        """
+        Events broadcast by this PyShell instance.
+        Scripts can bind to these events directly to observe commands without
+          implementing a PyShell component.
+        """
+        return self._events
+
+
+    @property
+    def history(self) -> Optional[CommandHistory]:
+        """
+        History that records each command run by this PyShell instance, if any.
+        """
+        return self._history
+
+
     def cd(self, value: str | Path) -> None:
         """
         Changes the current working directory for this PyShell instance.
@@ -151,76 +221,562 @@ class PyShell:
         cwd: str | Path | None) -> CommandResult:
         """
         Runs the specified command on the backend.
+        If the executor caches results (`IResultCache`) and has a cached result
+          for the command, the command isn't run and the cached output is
+          replayed to the command's logger instead.
         @param metadata The metadata for the command.
         @param cwd The current working directory to use when running the
           command. If not specified, the current working directory of this
           PyShell instance will be used.
         @return The output of the command.
         """
-        # Determine what cwd to use for the command
+        cwd = self._resolve_cwd(cwd)
+        timings = CommandTimings()
+
+        # Determine whether to run the command
+        timings.mark()
+        should_run = self._executor.should_run(metadata)
+        timings.lap(CommandPhase.EXECUTOR)
+        if not should_run:
+            return self._skip_command(metadata, cwd, timings)
+
+        # Run the command
+        metadata = self._apply_default_limits(metadata)
+        logger = self._construct_logger(metadata, cwd)
+        timings.lap(CommandPhase.LOGGER)
+        self._on_command_started.broadcast(self._events, metadata)
+        timings.lap(CommandPhase.STARTED_EVENT)
+        cache_key, result = self._lookup_cached_result(metadata, cwd, logger)
+        timings.lap(CommandPhase.CACHE)
+        if result is None:
+            result = self._backend.run(metadata, cwd, logger)
+            timings.lap(CommandPhase.BACKEND)
+            self._store_cached_result(cache_key, metadata, result)
+            timings.lap(CommandPhase.CACHE)
+        return self._finish_command(metadata, logger, result, timings)
+
+
+    async def run_async(self,
+        metadata: CommandMetadata,
+        cwd: str | Path | None) -> CommandResult:
+        """
+        Runs the specified command on the backend without blocking the event
+          loop.
+        If the backend implements `IAsyncBackend`, the command is run directly
+          from the event loop. Otherwise, the command is run on a worker
+          thread. The command's output is streamed to the logger as it
+          arrives, so the output of commands awaited concurrently may be
+          interleaved unless `buffered_output()` is used.
+        @param metadata The metadata for the command.
+        @param cwd The current working directory to use when running the
+          command. If not specified, the current working directory of this
+          PyShell instance will be used.
+        @return The output of the command.
+        """
+        cwd = self._resolve_cwd(cwd)
+        timings = CommandTimings()
+
+        # Determine whether to run the command
+        timings.mark()
+        should_run = self._executor.should_run(metadata)
+        timings.lap(CommandPhase.EXECUTOR)
+        if not should_run:
+            return self._skip_command(metadata, cwd, timings)
+
+        # Run the command
+        # Note that the backend phase includes time spent waiting for the event
+        #   loop to resume this task after the command exits.
+        metadata = self._apply_default_limits(metadata)
+        logger = self._construct_logger(metadata, cwd)
+        timings.lap(CommandPhase.LOGGER)
+        self._on_command_started.broadcast(self._events, metadata)
+        timings.lap(CommandPhase.STARTED_EVENT)
+        cache_key, result = self._lookup_cached_result(metadata, cwd, logger)
+        timings.lap(CommandPhase.CACHE)
+        if result is None:
+            if isinstance(self._backend, IAsyncBackend):
+                result = await self._backend.run_async(metadata, cwd, logger)
+            else:
+                import asyncio
+                result = await asyncio.get_running_loop().run_in_executor(
+                    None,
+                    self._backend.run,
+                    metadata,
+                    cwd,
+                    logger
+                )
+            timings.lap(CommandPhase.BACKEND)
+            self._store_cached_result(cache_key, metadata, result)
+            timings.lap(CommandPhase.CACHE)
+        return self._finish_command(metadata, logger, result, timings)
+
+
+    def run_pipeline(self,
+        metadata: Sequence[CommandMetadata],
+        cwd: str | Path | None) -> PipelineResult:
+        """
+        Runs the specified commands as a pipeline on the backend.
+        The stdout of each command is connected to the stdin of the next
+          command. Each command is logged, reported via events and passed to
+          the error handler just like a command run via `run()`. If the
+          executor decides not to run any of the commands, the whole pipeline
+          is skipped.
+        If the error handler throws for a failed command, the remaining
+          commands are still logged and reported before the exception is
+          rethrown.
+        @param metadata The metadata for each command in the pipeline, in order.
+        @param cwd The current working directory to use when running the
+          commands. If not specified, the current working directory of this
+          PyShell instance will be used.
+        @throws RuntimeError If the backend doesn't support pipelines.
+        @return The results of each command in the pipeline.
+        """
+        if not isinstance(self._backend, IPipelineBackend):
+            raise RuntimeError(
+                f"Backend '{type(self._backend).__name__}' does not support " +
+                "pipelines."
+            )
+        cwd = self._resolve_cwd(cwd)
+        timings = [CommandTimings() for _ in metadata]
+
+        # Determine whether to run the pipeline
+        should_run = True
+        for m, t in zip(metadata, timings):
+            t.mark()
+            should_run = self._executor.should_run(m)
+            t.lap(CommandPhase.EXECUTOR)
+            if not should_run:
+                break
+        if not should_run:
+            return PipelineResult([
+                self._skip_command(m, cwd, t)
+                for m, t in zip(metadata, timings)
+            ])
+
+        # Run the pipeline
+        metadata = [self._apply_default_limits(m) for m in metadata]
+        loggers: List[ICommandLogger] = []
+        for m, t in zip(metadata, timings):
+            t.mark()
+            loggers.append(self._construct_logger(m, cwd))
+            t.lap(CommandPhase.LOGGER)
+        for m, t in zip(metadata, timings):
+            t.mark()
+            self._on_command_started.broadcast(self._events, m)
+            t.lap(CommandPhase.STARTED_EVENT)
+
+        # Every command in the pipeline runs for the duration of the pipeline
+        start_ns = time.perf_counter_ns()
+        results = self._backend.run_pipeline(metadata, cwd, loggers)
+        backend_ns = time.perf_counter_ns() - start_ns
+        for t in timings:
+            t.record(CommandPhase.BACKEND, backend_ns)
+
+        # Finish every command before rethrowing the first error so that the
+        #   output of each command is always logged
+        exception: Optional[Exception] = None
+        for i, (m, logger) in enumerate(zip(metadata, loggers)):
+            try:
+                results[i] = self._finish_command(
+                    m,
+                    logger,
+                    results[i],
+                    timings[i]
+                )
+            except Exception as e:
+                if not exception:
+                    exception = e
+        if exception:
+            raise exception
+        return PipelineResult(results)
+
+
+    def run_parallel(self,
+        commands: Iterable[ICommand],
+        max_jobs: Optional[int] = None,
+        cwd: str | Path | None = None) -> List[CommandResult]:
+        """
+        Runs multiple commands at the same time.
+        Each command is run exactly as if it had been invoked on its own, so
+          the executor, error handler, and events are used for each command.
+          Each command's output is held back until the command finishes and is
+          then logged in a single block, so the output of commands never gets
+          interleaved.
+        If the error handler throws for a failed command, commands that have
+          not started yet will not be run. The exception is rethrown once all
+          commands that were already running have finished.
+        @param commands The commands to run.
+        @param max_jobs Maximum number of commands to run at the same time. If
+          not specified, the `max_jobs` option of this instance will be used.
+        @param cwd The current working directory to use for the commands. If
+          not specified, the current working directory of this PyShell
+          instance will be used.
+        @throws ValueError If `max_jobs` is less than 1.
+        @return The results of each command, in the same order as `commands`.
+        """
+        if max_jobs is None:
+            max_jobs = self._options.max_jobs
+        if max_jobs < 1:
+            raise ValueError("max_jobs must be at least 1.")
+
+        with ThreadPoolExecutor(max_workers=max_jobs) as pool:
+            futures: List[Future[CommandResult]] = [
+                pool.submit(self._run_buffered, command, cwd)
+                for command in commands
+            ]
+
+            # Wait for the first error, if any, so that any commands that
+            #   haven't started yet can be cancelled
+            done, _ = wait(futures, return_when=FIRST_EXCEPTION)
+            if any(f.exception() for f in done):
+                for future in futures:
+                    future.cancel()
+
+        # Rethrow the first exception raised while running the commands
+        for future in futures:
+            if future.cancelled():
+                continue
+            exception = future.exception()
+            if exception:
+                raise exception
+        return [f.result() for f in futures]
+
+
+    def run_graph(self,
+        graph: CommandGraph,
+        max_jobs: Optional[int] = None,
+        cwd: str | Path | None = None) -> List[CommandResult]:
+        """
+        Runs a graph of commands with as much parallelism as the graph allows.
+        Each command is started as soon as all of its dependencies have
+          finished, regardless of whether the dependencies succeeded or were
+          skipped. Each command is run exactly as if it had been invoked on its
+          own, so the executor, error handler, and events are used for each
+          command, and each command's output is logged in a single block.
+        If the error handler throws for a failed command, the graph keeps
+          running cleanup commands (i.e. commands with `CommandFlags.CLEANUP`)
+          once their dependencies have finished, while all other commands that
+          have not started yet are skipped. The exception is rethrown once all
+          cleanup commands have finished.
+        @param graph The graph of commands to run.
+        @param max_jobs Maximum number of commands to run at the same time. If
+          not specified, the `max_jobs` option of this instance will be used.
+        @param cwd The current working directory to use for the commands. If
+          not specified, the current working directory of this PyShell
+          instance will be used.
+        @throws ValueError If `max_jobs` is less than 1.
+        @return The results of each command, in the order that the commands
+          were added to the graph.
+        """
+        if max_jobs is None:
+            max_jobs = self._options.max_jobs
+        if max_jobs < 1:
+            raise ValueError("max_jobs must be at least 1.")
+
+        results: Dict[ICommand, CommandResult] = {}
+        remaining = {c: len(graph.dependencies(c)) for c in graph.commands}
+        ready = [c for c in graph.commands if not remaining[c]]
+        running: Dict[Future[CommandResult], ICommand] = {}
+        exception: Optional[Exception] = None
+
+        def on_command_done(command: ICommand) -> None:
+            # Mark each dependent command as ready once all of its
+            #   dependencies are done
+            for dependent in graph.dependents(command):
+                remaining[dependent] -= 1
+                if not remaining[dependent]:
+                    ready.append(dependent)
+
+        with ThreadPoolExecutor(max_workers=max_jobs) as pool:
+            while ready or running:
+                # Start each command whose dependencies are done
+                # Commands are only handed to the pool once a worker is free.
+                #   Commands queued in the pool would start even if another
+                #   command failed in the meantime, while commands that are
+                #   still waiting here can be skipped.
+                index = 0
+                while index < len(ready):
+                    command = ready[index]
+                    if exception and not command.metadata.is_cleanup:
+                        ready.pop(index)
+                        results[command] = self._skip_command(
+                            command.metadata,
+                            self._resolve_cwd(cwd)
+                        )
+                        on_command_done(command)
+                    elif len(running) < max_jobs:
+                        ready.pop(index)
+                        future = pool.submit(self._run_buffered, command, cwd)
+                        running[future] = command
+                    else:
+                        index += 1
+                if not running:
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    command = running.pop(future)
+                    try:
+                        results[command] = future.result()
+                    except Exception as e:
+                        # Remember the first error so that it can be rethrown
+                        #   once all cleanup commands have been run
+                        if not exception:
+                            exception = e
+                    on_command_done(command)
+
+        if exception:
+            raise exception
+        return [results[c] for c in graph.commands]
+
+
+    def stream(self,
+        command: ICommand,
+        cwd: str | Path | None = None,
+        max_buffered_lines: int = CommandStream.DEFAULT_MAX_BUFFERED_LINES) \
+        -> CommandStream:
+        """
+        Runs a command while yielding each line of its output as it's written.
+        The command is started once the returned stream is iterated over and
+          runs on a worker thread. Its output is still logged as usual. If the
+          caller stops consuming lines, the command is blocked from writing
+          more output once `max_buffered_lines` lines are waiting.
+        @param command The command to run.
+        @param cwd The current working directory to use for the command. If
+          not specified, the current working directory of this PyShell
+          instance will be used.
+        @param max_buffered_lines Maximum number of lines that may be waiting
+          to be consumed before the command is blocked.
+        @return A stream that yields each line of the command's output and
+          provides the command's result once iteration ends.
+        """
+        def run(on_line: Callable[[str], Any]) -> CommandResult:
+            token = self._stream_output.set(on_line)
+            try:
+                return command(self, cwd)
+            finally:
+                self._stream_output.reset(token)
+        return CommandStream(run, max_buffered_lines)
+
+
+    @contextmanager
+    def buffered_output(self) -> Iterator[None]:
+        """
+        Buffers the output of commands run by the calling thread or task.
+        While the returned context is active, the output of each command run
+          from the calling thread is held back until the command finishes and
+          is then logged in a single block. This is used to keep the output of
+          commands that run at the same time from being interleaved. asyncio
+          tasks created while the context is active inherit this behavior.
+        """
+        token = self._buffer_output.set(True)
+        try:
+            yield
+        finally:
+            self._buffer_output.reset(token)
+
+
+    def is_active_instance(self) -> bool:
+        """
+        Whether this instance is the currently active PyShell instance.
+        @returns True if this instance is the currently active PyShell instance.
+        """
+        return PyShell._active_instance is self
+
+
+    def set_as_active_instance(self) -> None:
+        """
+        Sets this instance as the currently active PyShell instance.
+        PyShell commands that do not have a PyShell command explicitly
+          specified as a target will use the currently active PyShell instance.
+        """
+        PyShell._active_instance = self
+
+
+    def _resolve_cwd(self, cwd: str | Path | None) -> Path:
+        """
+        Determines the cwd to use for a command.
+        @param cwd The cwd passed in for the command, if any.
+        @return The absolute path to run the command in.
+        """
         if not cwd:
             cwd = self._cwd
         cwd = Path(cwd)
 
         if not cwd.is_absolute():
             cwd = self._cwd.joinpath(cwd)
-        cwd = cwd.resolve()
+        return cwd.resolve()
 
-        # Determine whether to run the command
-        if not self._executor.should_run(metadata):
-            self._on_command_skipped.broadcast(self._events, metadata)
-            return CommandResult(
-                metadata.command,
-                metadata.args,
-                str(cwd),
-                "",
-                0,
-                True,
-                datetime.now(),
-                datetime.now()
-            )
 
-        # Run the command
-        logger = self._logger.construct_logger(
-            metadata,
-            self._options.logger_options,
-            cwd
+    def _skip_command(self,
+        metadata: CommandMetadata,
+        cwd: Path,
+        timings: Optional[CommandTimings] = None) -> CommandResult:
+        """
+        Handles a command that the executor decided not to run.
+        @param metadata The metadata for the command.
+        @param cwd The current working directory of the command.
+        @param timings Time spent deciding whether to run the command, if it
+          was measured.
+        @return The result of the skipped command.
+        """
+        self._on_command_skipped.broadcast(self._events, metadata)
+        return CommandResult(
+            metadata.command,
+            metadata.args,
+            str(cwd),
+            "",
+            0,
+            True,
+            datetime.now(),
+            datetime.now(),
+            timings=timings
         )
-        self._on_command_started.broadcast(self._events, metadata)
-        result = self._backend.run(metadata, cwd, logger)
+
+
+    def _lookup_cached_result(self,
+        metadata: CommandMetadata,
+        cwd: Path,
+        logger: ICommandLogger) \
+        -> Tuple[Optional[str], Optional[CommandResult]]:
+        """
+        Looks up the cached result of a command if the executor caches results.
+        @param metadata The metadata for the command.
+        @param cwd The current working directory of the command.
+        @param logger The command logger to replay the cached output to.
+        @return The key that the command's result should be cached under (or
+          None if the result should not be cached) and the cached result of
+          the command (or None if the command must be run).
+        """
+        if not isinstance(self._executor, IResultCache):
+            return None, None
+        key = self._executor.compute_key(metadata, cwd, self._backend)
+        if key is None:
+            return None, None
+        return key, self._executor.lookup(key, metadata, cwd, logger)
+
+
+    def _store_cached_result(self,
+        key: Optional[str],
+        metadata: CommandMetadata,
+        result: CommandResult) -> None:
+        """
+        Stores the result of a command if the executor caches results.
+        @param key The key returned by `_lookup_cached_result()`.
+        @param metadata The metadata for the command.
+        @param result The result returned by the backend.
+        """
+        if key is not None and isinstance(self._executor, IResultCache):
+            self._executor.store(key, metadata, result)
+
+
+    def _finish_command(self,
+        metadata: CommandMetadata,
+        logger: ICommandLogger,
+        result: CommandResult,
+        timings: CommandTimings) -> CommandResult:
+        """
+        Handles a command that finished running on the backend.
+        @param metadata The metadata for the command.
+        @param logger The command logger used for the command.
+        @param result The result returned by the backend.
+        @param timings Time spent in each phase of running the command so far.
+        @return The result of the command.
+        """
+        # Backends don't know about declared outputs, but handlers of the
+        #   finished and failed events may need them to tell apart commands
+        #   with identical command lines
+        if metadata.outputs:
+            result = result.with_outputs(metadata.outputs)
 
         # Log the command output and result
+        timings.mark()
         if metadata.scanner:
             scanner_results = metadata.scanner.scan_for_errors(result)
         else:
             scanner_results = []
+        timings.lap(CommandPhase.SCAN)
         logger.log_results(result, scanner_results)
+        timings.lap(CommandPhase.LOG_RESULTS)
 
         # Handle post-command tasks
         if result.success:
             self._on_command_finished.broadcast(self._events, result)
         else:
             self._on_command_failed.broadcast(self._events, result)
+        timings.lap(CommandPhase.FINISHED_EVENT)
 
         # This must be done after broadcasting to events since error handlers
         #   could cause the script to abort
-        if not result.success:
-            self._error_handler.handle(result)
+        # The timings are reported even if the error handler aborts the script
+        try:
+            if not result.success:
+                self._error_handler.handle(result)
+        finally:
+            if not result.success:
+                timings.lap(CommandPhase.ERROR_HANDLER)
+            result.timings.update(timings)
+            self._on_command_timed.broadcast(self._events, result)
         return result
 
 
-    def is_active_instance(self) -> bool:
+    def _apply_default_limits(self,
+        metadata: CommandMetadata) -> CommandMetadata:
         """
-        Whether this instance is the currently active PyShell instance.
-        @returns True if this instance is the currently active PyShell instance.
+        Applies this instance's default limits to a command.
+        @param metadata The metadata for the command.
+        @return Metadata for the command that includes the default limits for
+          any limit not set by the command.
         """
-        return PyShell._active_instance is self
+        defaults = self._options.command_limits
+        if not defaults:
+            return metadata
+        if metadata.limits:
+            return metadata.with_limits(metadata.limits.merge(defaults))
+        return metadata.with_limits(defaults)
 
 
-    def set_as_active_instance(self) -> None:
+    def _construct_logger(self,
+        metadata: CommandMetadata,
+        cwd: Path) -> ICommandLogger:
         """
-        Sets this instance as the currently active PyShell instance.
-        PyShell commands that do not have a PyShell command explicitly
-          specified as a target will use the currently active PyShell instance.
+        Constructs the command logger to use for a command.
+        @param metadata The metadata for the command.
+        @param cwd The current working directory of the command.
+        @return The command logger to use for the command.
         """
-        PyShell._active_instance = self
+        def construct_logger() -> ICommandLogger:
+            return self._logger.construct_logger(
+                metadata,
+                self._options.logger_options,
+                cwd
+            )
+
+        logger: ICommandLogger
+        if self._buffer_output.get():
+            logger = BufferedCommandLogger(
+                construct_logger,
+                self._log_lock,
+                self._options.logger_options.output_memory_limit,
+                bool(metadata.flags & CommandFlags.BINARY_OUTPUT)
+            )
+        else:
+            logger = construct_logger()
+
+        on_line = self._stream_output.get()
+        if on_line:
+            logger = StreamingCommandLogger(logger, on_line)
+        return logger
+
+
+    def _run_buffered(self,
+        command: ICommand,
+        cwd: str | Path | None) -> CommandResult:
+        """
+        Runs a command with its output buffered.
+        @param command The command to run.
+        @param cwd The current working directory to use for the command.
+        @return The result of the command.
+        """
+        with self.buffered_output():
+            return command(self, cwd)
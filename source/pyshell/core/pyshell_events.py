@@ -3,6 +3,7 @@ from pyshell.commands.command_metadata import CommandMetadata
 from pyshell.commands.command_result import CommandResult
 from pyshell.events.event import Event
 from pyshell.events.event_handler import EventHandler
+from typing import Optional
 
 
 class PyShellEvents:
@@ -16,7 +17,9 @@ class PyShellEvents:
         on_command_started: EventHandler[PyShellEvents, CommandMetadata],
         on_command_skipped: EventHandler[PyShellEvents, CommandMetadata],
         on_command_finished: EventHandler[PyShellEvents, CommandResult],
-        on_command_failed: EventHandler[PyShellEvents, CommandResult]):
+        on_command_failed: EventHandler[PyShellEvents, CommandResult],
+        on_command_timed: Optional[
+            EventHandler[PyShellEvents, CommandResult]] = None):
         """
         Initializes the object.
         The objects this class wraps should be created by the PyShell class.
@@ -24,8 +27,16 @@ class PyShellEvents:
         @param on_command_skipped Event handler for the command_skipped event.
         @param on_command_finished Event handler for the command_finished event.
         @param on_command_failed Event handler for the command_failed event.
+        @param on_command_timed Event handler for the command_timed event. If
+          not specified, a handler that nothing broadcasts to is used.
         """
         self.on_command_started = Event(on_command_started)
         self.on_command_skipped = Event(on_command_skipped)
         self.on_command_finished = Event(on_command_finished)
         self.on_command_failed = Event(on_command_failed)
+
+        # Broadcast once every phase of a command that was run has been timed,
+        #   including the error handler. The result's `timings` are complete.
+        if on_command_timed is None:
+            on_command_timed = EventHandler()
+        self.on_command_timed = Event(on_command_timed)
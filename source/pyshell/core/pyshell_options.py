@@ -1,4 +1,7 @@
+import os
+from pyshell.commands.command_limits import CommandLimits
 from pyshell.logging.logger_options import LoggerOptions
+from typing import Optional
 
 class PyShellOptions:
     """
@@ -8,14 +11,29 @@ class PyShellOptions:
     """
     def __init__(self,
         verbose: bool = False,
-        logger_options: LoggerOptions = LoggerOptions()):
+        logger_options: LoggerOptions = LoggerOptions(),
+        max_jobs: Optional[int] = None,
+        command_limits: Optional[CommandLimits] = None):
         """
         Initializes the object.
         @param verbose Whether verbose mode is enabled.
         @param logger_options Options used to control logger output formatting.
+        @param max_jobs Maximum number of commands that may be run at the same
+          time when commands are run in parallel. If not specified, the number
+          of CPUs on the system will be used.
+        @param command_limits Default limits for each command run via the
+          PyShell instance. Limits set on a command take precedence over these
+          limits. The PyShell instance's backend must support limits (see
+          `CommandLimits`).
+        @throws ValueError If `max_jobs` is less than 1.
         """
+        if max_jobs is not None and max_jobs < 1:
+            raise ValueError("max_jobs must be at least 1.")
+
         self._verbose = verbose
         self._logger_options = logger_options
+        self._max_jobs = max_jobs if max_jobs else (os.cpu_count() or 1)
+        self._command_limits = command_limits
 
 
     @property
@@ -32,3 +50,20 @@ class PyShellOptions:
         Options used to control logger output formatting.
         """
         return self._logger_options
+
+
+    @property
+    def max_jobs(self) -> int:
+        """
+        Maximum number of commands that may be run at the same time when
+          commands are run in parallel.
+        """
+        return self._max_jobs
+
+
+    @property
+    def command_limits(self) -> Optional[CommandLimits]:
+        """
+        Default limits for each command run via the PyShell instance.
+        """
+        return self._command_limits
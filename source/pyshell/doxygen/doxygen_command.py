@@ -4,7 +4,7 @@ from pyshell.commands.external_command import ExternalCommand
 from pyshell.core.platform_statics import PlatformStatics
 from pyshell.doxygen.doxygen_scanner import DoxygenScanner
 from pyshell.scanners.scanner import IScanner
-from typing import Optional
+from typing import Optional, Sequence
 
 class DoxygenCommand(ExternalCommand):
     """
@@ -14,13 +14,18 @@ class DoxygenCommand(ExternalCommand):
     """
     def __init__(self,
         doxyfile_path: str | Path,
-        cmd_flags: int = CommandFlags.STANDARD):
+        cmd_flags: int = CommandFlags.STANDARD,
+        inputs: Sequence[str | Path] | None = None,
+        outputs: Sequence[str | Path] | None = None):
         """
         Initializes the command.
         @param doxyfile_path The path to the doxyfile to use. Can be a relative
           or absolute path. If the path is relative, it will be resolved
           relative to the script's current working directory.
         @param cmd_flags The flags to set for the command.
+        @param inputs Files and directories that doxygen reads, in addition to
+          the doxyfile, which is always treated as an input.
+        @param outputs Files and directories that doxygen generates.
         """
         # Verify that doxygen can be found
         doxygen_exe_path = PlatformStatics.resolve_using_path(
@@ -36,7 +41,9 @@ class DoxygenCommand(ExternalCommand):
         super().__init__(
             doxygen_exe_path,
             doxyfile_path,
-            cmd_flags=cmd_flags
+            cmd_flags=cmd_flags,
+            inputs=[doxyfile_path] + list(inputs if inputs else []),
+            outputs=outputs
         )
 
 
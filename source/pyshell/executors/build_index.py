@@ -0,0 +1,242 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+from pyshell.executors.file_hasher import FileHasher
+import tempfile
+import threading
+from typing import Dict, List, Optional, Sequence
+
+class BuildIndex:
+    """
+    Persistent record of the files that commands read and produced.
+    For each command, the index stores the size, modification time and digest
+      of every input and output file as of the command's last successful run.
+      A command is up to date if none of those files changed since then.
+      Files whose size and modification time match the index aren't read, so
+      checking whether a command is up to date normally only costs a `stat()`
+      call per file. Files that were touched without being modified are hashed
+      once and then have their new modification time recorded.
+    The index is stored as a JSON file that is replaced atomically whenever
+      the index changes.
+    This class is thread-safe.
+    @ingroup executors
+    """
+    ## Version of the on-disk index format.
+    # Indexes written with a different version are discarded.
+    FORMAT_VERSION = 1
+
+    def __init__(self, path: str | Path, hasher: Optional[FileHasher] = None):
+        """
+        Initializes the index, loading it from disk if it exists.
+        @param path Path of the file to store the index in. Its parent
+          directory will be created if it doesn't exist.
+        @param hasher Hasher used to compute digests of files. If not
+          specified, a new hasher is created.
+        """
+        self._path = Path(path).absolute()
+        self._hasher = hasher if hasher else FileHasher()
+        self._lock = threading.Lock()
+
+        # Maps command keys to the recorded state of the command's inputs and
+        #   outputs. Each file's state is stored as `[size, mtime_ns, digest]`.
+        self._entries: Dict[str, Dict[str, Dict[str, List]]] = self._load()
+
+
+    @property
+    def path(self) -> Path:
+        """
+        Path of the file that the index is stored in.
+        """
+        return self._path
+
+
+    @staticmethod
+    def compute_key(
+        command: str,
+        args: Sequence[str],
+        outputs: Sequence[Path]) -> str:
+        """
+        Computes the key that identifies a command in the index.
+        @param command The command being run.
+        @param args The arguments passed to the command.
+        @param outputs The outputs declared by the command.
+        @return The key for the command.
+        """
+        return hashlib.sha256(json.dumps([
+            command,
+            list(args),
+            sorted(str(p) for p in outputs)
+        ]).encode("utf-8")).hexdigest()
+
+
+    def snapshot(self, paths: Sequence[Path]) -> Optional[Dict[str, List]]:
+        """
+        Captures the current state of a set of files.
+        @param paths The files and directories to capture. Directories are
+          expanded to every file under the directory.
+        @return The state of each file, or None if any of the paths doesn't
+          exist.
+        """
+        files: Dict[str, List] = {}
+        for path in paths:
+            if not path.exists():
+                return None
+            for file_path in FileHasher.list_files(path):
+                try:
+                    stat = file_path.stat()
+                except OSError:
+                    return None
+                digest = self._hasher.hash_file(file_path, stat)
+                if digest is None:
+                    return None
+                files[str(file_path)] = [stat.st_size, stat.st_mtime_ns, digest]
+        return files
+
+
+    def is_up_to_date(self,
+        key: str,
+        inputs: Sequence[Path],
+        outputs: Sequence[Path]) -> bool:
+        """
+        Checks whether a command's inputs and outputs are unchanged since the
+          command was last recorded.
+        @param key The key returned by `compute_key()` for the command.
+        @param inputs The inputs declared by the command.
+        @param outputs The outputs declared by the command.
+        @return True if the command's inputs and outputs match the index.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if not entry:
+                return False
+
+            touched = False
+            for paths, recorded in ((inputs, entry["inputs"]),
+                (outputs, entry["outputs"])):
+                matches = self._matches(paths, recorded)
+                if matches is None:
+                    return False
+                touched |= matches
+
+            # Record the new modification times of files that were touched
+            #   without being modified so they aren't hashed again next time
+            if touched:
+                self._save()
+            return True
+
+
+    def record(self,
+        key: str,
+        inputs: Dict[str, List],
+        outputs: Sequence[Path]) -> None:
+        """
+        Records that a command produced its outputs from a set of inputs.
+        @param key The key returned by `compute_key()` for the command.
+        @param inputs The state of the command's inputs when it was started,
+          as returned by `snapshot()`.
+        @param outputs The outputs declared by the command. If any of them
+          doesn't exist, the command is removed from the index instead.
+        """
+        output_files = self.snapshot(outputs)
+        with self._lock:
+            if output_files is None:
+                self._entries.pop(key, None)
+            else:
+                self._entries[key] = {
+                    "inputs": inputs,
+                    "outputs": output_files
+                }
+            self._save()
+
+
+    def remove(self, key: str) -> None:
+        """
+        Removes a command from the index so that it's no longer up to date.
+        @param key The key returned by `compute_key()` for the command.
+        """
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self._save()
+
+
+    def _matches(self,
+        paths: Sequence[Path],
+        recorded: Dict[str, List]) -> Optional[bool]:
+        """
+        Checks whether a set of files matches their recorded state.
+        Must be called with the lock held.
+        @param paths The files and directories to check.
+        @param recorded The recorded state of the files.
+        @return None if any file changed, or whether any file was touched
+          without being modified, in which case its recorded modification time
+          has been updated.
+        """
+        files: List[Path] = []
+        for path in paths:
+            if not path.exists():
+                return None
+            files.extend(FileHasher.list_files(path))
+        if len(files) != len(recorded) or \
+            any(str(f) not in recorded for f in files):
+            return None
+
+        touched = False
+        for file_path in files:
+            state = recorded[str(file_path)]
+            try:
+                stat = file_path.stat()
+            except OSError:
+                return None
+            if stat.st_size != state[0]:
+                return None
+            if stat.st_mtime_ns == state[1]:
+                continue
+            if self._hasher.hash_file(file_path, stat) != state[2]:
+                return None
+            state[1] = stat.st_mtime_ns
+            touched = True
+        return touched
+
+
+    def _load(self) -> Dict[str, Dict[str, Dict[str, List]]]:
+        """
+        Loads the index from disk.
+        @return The entries stored in the index. Empty if the index doesn't
+          exist, can't be read or was written with a different format.
+        """
+        try:
+            with open(self._path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict) or \
+            data.get("version") != self.FORMAT_VERSION:
+            return {}
+        return data.get("entries", {})
+
+
+    def _save(self) -> None:
+        """
+        Writes the index to disk.
+        Must be called with the lock held. Errors are ignored since a stale
+          index only causes commands to be run again.
+        """
+        try:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(
+                dir=self._path.parent,
+                prefix=".tmp-"
+            )
+        except OSError:
+            return
+
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({
+                    "version": self.FORMAT_VERSION,
+                    "entries": self._entries
+                }, f)
+            os.replace(temp_path, self._path)
+        except OSError:
+            os.unlink(temp_path)
@@ -0,0 +1,302 @@
+from datetime import datetime
+import hashlib
+import json
+import locale
+import os
+from pathlib import Path
+from pyshell.backends.backend import IBackend
+from pyshell.backends.output_pump import OutputPump
+from pyshell.backends.output_stream import OutputStream
+from pyshell.commands.command_flags import CommandFlags
+from pyshell.commands.command_metadata import CommandMetadata
+from pyshell.commands.command_result import CommandResult
+from pyshell.core.pyshell_events import PyShellEvents
+from pyshell.executors.allow_all import AllowAll
+from pyshell.executors.executor import IExecutor
+from pyshell.executors.file_hasher import FileHasher
+from pyshell.executors.result_cache import IResultCache
+from pyshell.logging.command_logger import ICommandLogger
+import tempfile
+from typing import Iterator, Optional, Sequence, Tuple
+
+class CachingExecutor(IExecutor, IResultCache):
+    """
+    Executor that reuses the results of cacheable commands.
+    Commands marked with `CommandFlags.CACHEABLE` are identified by a key that
+      covers the command line, the working directory, the values of selected
+      environment variables and the contents of the command's declared input
+      files. If a result for the same key was stored by a previous run, the
+      command is skipped and its stored output and exit code are replayed
+      instead, which makes re-running an unchanged cacheable step (e.g.
+      generating documentation) nearly instant. Replaying a result doesn't
+      recreate the command's files, so a result is only reused if each of the
+      command's declared outputs still has the contents it had when the result
+      was stored; otherwise, the command is run again.
+    Results are stored on disk under the cache directory, so they are reused
+      across script runs. Entries are written atomically, so a script that is
+      interrupted while storing a result never leaves a partial entry behind.
+    Whether a command is run at all is still decided by the wrapped executor.
+    Commands that read non-file input from stdin are never cached, and neither
+      are pipelines.
+    @ingroup executors
+    """
+    ## Version of the on-disk cache format.
+    # Incrementing this invalidates all previously cached results.
+    FORMAT_VERSION = 1
+
+    # Number of bytes to read from a file at once
+    _READ_SIZE = 64 * 1024
+
+    def __init__(self,
+        cache_dir: str | Path,
+        executor: Optional[IExecutor] = None,
+        env_vars: Sequence[str] = (),
+        cache_failures: bool = False):
+        """
+        Initializes the object.
+        @param cache_dir Directory to store cached results in. Will be created
+          if it doesn't exist.
+        @param executor Executor that determines whether commands are run. If
+          not specified, `AllowAll` is used.
+        @param env_vars Names of environment variables whose values affect the
+          output of cacheable commands. A cached result is only reused if these
+          have the same values as when the result was stored.
+        @param cache_failures Whether to cache the results of commands that
+          failed. Commands that timed out or exceeded a resource limit are
+          never cached.
+        """
+        self._cache_dir = Path(cache_dir).absolute()
+        self._executor = executor if executor else AllowAll()
+        self._env_vars = list(env_vars)
+        self._cache_failures = cache_failures
+
+        # Avoids re-reading input files that haven't changed when a script runs
+        #   several commands that share inputs
+        self._hasher = FileHasher()
+
+
+    @property
+    def cache_dir(self) -> Path:
+        """
+        Directory that cached results are stored in.
+        """
+        return self._cache_dir
+
+
+    @property
+    def executor(self) -> IExecutor:
+        """
+        Executor that determines whether commands are run.
+        """
+        return self._executor
+
+
+    def initialize(self, events: PyShellEvents) -> None:
+        """
+        Initializes the executor.
+        @param events `PyShellEvents` instance for the pyshell instance that
+          the executor is being used with.
+        """
+        self._executor.initialize(events)
+
+
+    def should_run(self, metadata: CommandMetadata) -> bool:
+        """
+        Determines whether a command should be run.
+        @param metadata Metadata for the command about to be run.
+        @returns True if the command should be allowed to run. False if the
+          command should be skipped.
+        """
+        return self._executor.should_run(metadata)
+
+
+    def compute_key(self,
+        metadata: CommandMetadata,
+        cwd: Path,
+        backend: IBackend) -> Optional[str]:
+        """
+        Computes the key that identifies a command's cached result.
+        @param metadata Metadata for the command about to be run.
+        @param cwd The working directory that the command will be run in. Will
+          always be an absolute path.
+        @param backend The backend that the command will be run on.
+        @return The key for the command's result, or None if the command's
+          result must not be cached.
+        """
+        if not metadata.is_cacheable:
+            return None
+
+        # Input that isn't read from a file can't be fingerprinted without
+        #   consuming it
+        inputs = list(metadata.inputs)
+        stdin = metadata.stdin
+        if stdin:
+            if not stdin.path:
+                return None
+            inputs.append(stdin.path.absolute())
+
+        key = {
+            "version": self.FORMAT_VERSION,
+            "backend": type(backend).__name__,
+            "command": metadata.command,
+            "executable": metadata.executable,
+            "args": list(metadata.args),
+            "cwd": str(cwd),
+            "binary": bool(metadata.flags & CommandFlags.BINARY_OUTPUT),
+            "stdin": str(stdin.path) if stdin else None,
+            "env": {name: os.environ.get(name) for name in self._env_vars},
+            "inputs": [[str(p), self._hasher.hash_path(p)] for p in inputs],
+        }
+        return hashlib.sha256(
+            json.dumps(key, sort_keys=True).encode("utf-8")
+        ).hexdigest()
+
+
+    def lookup(self,
+        key: str,
+        metadata: CommandMetadata,
+        cwd: Path,
+        logger: ICommandLogger) -> Optional[CommandResult]:
+        """
+        Looks up the cached result of a command.
+        @param key The key returned by `compute_key()` for the command.
+        @param metadata Metadata for the command about to be run.
+        @param cwd The working directory that the command will be run in.
+        @param logger The logger to use for the command. If a cached result is
+          found, its output will have been forwarded to the logger.
+        @return The cached result of the command, or None if the command must
+          be run.
+        """
+        entry_path, output_path = self._get_entry_paths(key)
+        try:
+            with open(entry_path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            output_file = open(output_path, "rb")
+        except (OSError, ValueError):
+            return None
+
+        # The command's outputs must be regenerated if they were deleted or
+        #   modified since the result was stored
+        outputs = entry.get("outputs", {})
+        if not isinstance(outputs, dict) or any(
+            outputs.get(str(p)) != self._hasher.hash_path(p)
+            for p in metadata.outputs):
+            output_file.close()
+            return None
+
+        # Replay the output through the same decoding and dispatching logic
+        #   that's used for commands that are run. The streams were merged when
+        #   the output was stored, so all output is replayed as stdout.
+        start_time = datetime.utcnow()
+        with output_file:
+            pump = OutputPump(
+                logger,
+                binary=bool(metadata.flags & CommandFlags.BINARY_OUTPUT)
+            )
+            while True:
+                data = output_file.read(self._READ_SIZE)
+                if not data:
+                    break
+                pump.feed(data, OutputStream.STDOUT)
+            pump.feed(b"", OutputStream.STDOUT)
+
+        # Make sure the returned output always ends with a newline
+        output = logger.output_buffer
+        if not output.endswith("\n"):
+            output.append("\n")
+
+        backend = entry.get("backend")
+        return CommandResult(
+            command=metadata.command,
+            args=metadata.args,
+            cwd=str(cwd),
+            output=output,
+            exit_code=entry["exit_code"],
+            skipped=False,
+            start_time=start_time,
+            end_time=datetime.utcnow(),
+            backend=f"{backend} (cached)" if backend else "Cache",
+            cached=True
+        )
+
+
+    def store(self,
+        key: str,
+        metadata: CommandMetadata,
+        result: CommandResult) -> None:
+        """
+        Stores the result of a command that was run on the backend.
+        @param key The key returned by `compute_key()` for the command.
+        @param metadata Metadata for the command that was run.
+        @param result The result returned by the backend.
+        """
+        if result.skipped or result.cached or result.timed_out or \
+            result.limit_exceeded:
+            return
+        if not result.success and not self._cache_failures:
+            return
+
+        # A result is only valid while the command's outputs are unchanged. If
+        #   the command didn't create one of its outputs, it must be run again
+        #   anyway.
+        outputs = {str(p): self._hasher.hash_path(p) for p in metadata.outputs}
+        if None in outputs.values():
+            return
+
+        # Text output is stored in the encoding that the replayed output will
+        #   be decoded with. Output that can't be represented in that encoding
+        #   (e.g. from an emulated command) isn't cached.
+        output: Iterator[bytes]
+        if result.output_buffer.binary:
+            output = result.output_buffer.iter_bytes()
+        else:
+            encoding = locale.getpreferredencoding(False)
+            output = (c.encode(encoding) for c in \
+                result.output_buffer.iter_chunks())
+
+        # Failing to store a result shouldn't fail the command, so errors are
+        #   ignored and the command is simply run again next time
+        entry_path, output_path = self._get_entry_paths(key)
+        try:
+            entry_path.parent.mkdir(parents=True, exist_ok=True)
+
+            # The output is written before the entry since a result is only
+            #   considered cached once its entry exists
+            self._write_atomic(output_path, output)
+            self._write_atomic(entry_path, iter([json.dumps({
+                "command": metadata.full_command,
+                "exit_code": result.exit_code,
+                "backend": result.backend,
+                "outputs": outputs,
+            }).encode("utf-8")]))
+        except (OSError, UnicodeEncodeError):
+            return
+
+
+    def _get_entry_paths(self, key: str) -> Tuple[Path, Path]:
+        """
+        Gets the paths of the files that store a cached result.
+        @param key The key of the cached result.
+        @return The path to the file storing the result's exit code and other
+          information, and the path to the file storing the result's output.
+        """
+        # Entries are spread across subdirectories to avoid large directories
+        entry_dir = self._cache_dir / key[:2]
+        return entry_dir / f"{key}.json", entry_dir / f"{key}.out"
+
+
+    def _write_atomic(self, path: Path, data: Iterator[bytes]) -> None:
+        """
+        Writes a file such that readers see either the old or the new file.
+        @param path The path of the file to write.
+        @param data The data to write to the file.
+        """
+        fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for chunk in data:
+                    f.write(chunk)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
@@ -0,0 +1,104 @@
+import hashlib
+import os
+from pathlib import Path
+import threading
+from typing import Dict, List, Optional, Tuple
+
+class FileHasher:
+    """
+    Computes digests of file contents, reusing digests of unchanged files.
+    Each digest is remembered along with the size, modification time and inode
+      of the file at the time it was hashed. As long as those don't change,
+      the file is not read again, so checking a large set of inputs only costs
+      a `stat()` call per file.
+    This class is thread-safe.
+    @ingroup executors
+    """
+    # Number of bytes to read from a file at once
+    _READ_SIZE = 64 * 1024
+
+    def __init__(self):
+        """
+        Initializes the object.
+        """
+        self._digests: Dict[Path, Tuple[Tuple[int, int, int], str]] = {}
+        self._lock = threading.Lock()
+
+
+    @staticmethod
+    def list_files(path: Path) -> List[Path]:
+        """
+        Gets the files that a path refers to.
+        @param path The path of a file or directory.
+        @return The path itself if it's not a directory, or every file under
+          the directory in a stable order.
+        """
+        if not path.is_dir():
+            return [path]
+
+        files: List[Path] = []
+        for root, dirs, names in os.walk(path):
+            # Walk the directory in a stable order
+            dirs.sort()
+            files.extend(Path(root, name) for name in sorted(names))
+        return files
+
+
+    def hash_file(self,
+        path: Path,
+        stat: Optional[os.stat_result] = None) -> Optional[str]:
+        """
+        Computes a digest of a file's contents.
+        @param path The path of the file.
+        @param stat The result of `stat()` for the file, if the caller already
+          has it.
+        @return The digest of the file's contents, or None if the file doesn't
+          exist or can't be read.
+        """
+        if stat is None:
+            try:
+                stat = path.stat()
+            except OSError:
+                return None
+
+        signature = (stat.st_size, stat.st_mtime_ns, stat.st_ino)
+        with self._lock:
+            cached = self._digests.get(path)
+        if cached and cached[0] == signature:
+            return cached[1]
+
+        digest = hashlib.sha256()
+        try:
+            with open(path, "rb") as f:
+                while True:
+                    data = f.read(self._READ_SIZE)
+                    if not data:
+                        break
+                    digest.update(data)
+        except OSError:
+            return None
+
+        with self._lock:
+            self._digests[path] = (signature, digest.hexdigest())
+        return digest.hexdigest()
+
+
+    def hash_path(self, path: Path) -> Optional[str]:
+        """
+        Computes a digest of a file's or directory's contents.
+        @param path The path of the file or directory.
+        @return A digest covering the contents of the file, or the names and
+          contents of every file under the directory. None if the path doesn't
+          exist.
+        """
+        if not path.is_dir():
+            return self.hash_file(path)
+
+        digest = hashlib.sha256()
+        for file_path in self.list_files(path):
+            file_digest = self.hash_file(file_path) or ""
+            digest.update(
+                str(file_path.relative_to(path)).encode("utf-8") + b"\0"
+            )
+            digest.update(file_digest.encode("utf-8") + b"\0")
+        return digest.hexdigest()
@@ -0,0 +1,193 @@
+from pathlib import Path
+from pyshell.commands.command_metadata import CommandMetadata
+from pyshell.commands.command_result import CommandResult
+from pyshell.core.pyshell_events import PyShellEvents
+from pyshell.executors.allow_all import AllowAll
+from pyshell.executors.build_index import BuildIndex
+from pyshell.executors.executor import IExecutor
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+class IncrementalExecutor(IExecutor):
+    """
+    Executor that skips commands whose outputs are up to date.
+    Commands that declare outputs are only run if one of their outputs is
+      missing, or if one of their inputs or outputs changed since the command
+      last ran successfully, similar to a make rule. This turns a script that
+      builds files into an incremental build. Commands that don't declare any
+      outputs are always run.
+    The state of each command's inputs and outputs is recorded in a persistent
+      `BuildIndex`, so whether a command is up to date is determined without
+      reading files that haven't changed. Inputs are recorded as of when the
+      command started, so an input that is modified while the command is
+      running causes the command to be run again next time.
+    Whether a command is run at all is still decided by the wrapped executor.
+    @ingroup executors
+    """
+    def __init__(self,
+        index_path: str | Path,
+        executor: Optional[IExecutor] = None):
+        """
+        Initializes the object.
+        @param index_path Path of the file to store the build index in.
+        @param executor Executor that determines whether commands are run. If
+          not specified, `AllowAll` is used.
+        """
+        self._index = BuildIndex(index_path)
+        self._executor = executor if executor else AllowAll()
+
+        # Commands that are running, keyed by their index key. Each entry holds
+        #   the state of the command's inputs when it was started and its
+        #   declared outputs. Commands with the same key (e.g. the same command
+        #   run in parallel) are recorded in the order they were started.
+        self._running: Dict[str,
+            List[Tuple[Optional[Dict[str, List]], Sequence[Path]]]] = {}
+        self._running_lock = threading.Lock()
+
+
+    @property
+    def index(self) -> BuildIndex:
+        """
+        Index that records the inputs and outputs of commands.
+        """
+        return self._index
+
+
+    @property
+    def executor(self) -> IExecutor:
+        """
+        Executor that determines whether commands are run.
+        """
+        return self._executor
+
+
+    def initialize(self, events: PyShellEvents) -> None:
+        """
+        Initializes the executor.
+        @param events `PyShellEvents` instance for the pyshell instance that
+          the executor is being used with.
+        """
+        self._executor.initialize(events)
+        events.on_command_started += self._on_started
+        events.on_command_finished += self._on_finished
+        events.on_command_failed += self._on_failure
+
+
+    def should_run(self, metadata: CommandMetadata) -> bool:
+        """
+        Determines whether a command should be run.
+        @param metadata Metadata for the command about to be run.
+        @returns True if the command should be allowed to run. False if the
+          command should be skipped.
+        """
+        if not self._executor.should_run(metadata):
+            return False
+        if not metadata.outputs:
+            return True
+        return not self._index.is_up_to_date(
+            self._get_key(metadata),
+            self._get_inputs(metadata),
+            metadata.outputs
+        )
+
+
+    @staticmethod
+    def _get_key(metadata: CommandMetadata) -> str:
+        """
+        Gets the key that identifies a command in the index.
+        @param metadata Metadata for the command.
+        @return The key for the command.
+        """
+        return BuildIndex.compute_key(
+            metadata.command,
+            metadata.args,
+            metadata.outputs
+        )
+
+
+    @staticmethod
+    def _get_inputs(metadata: CommandMetadata) -> List[Path]:
+        """
+        Gets the inputs of a command.
+        @param metadata Metadata for the command.
+        @return The inputs declared by the command, including the file used as
+          the command's stdin, if any.
+        """
+        inputs = list(metadata.inputs)
+        if metadata.stdin and metadata.stdin.path:
+            inputs.append(metadata.stdin.path.absolute())
+        return inputs
+
+
+    def _on_started(self,
+        sender: PyShellEvents,
+        metadata: CommandMetadata) -> None:
+        """
+        Callback bound to the on_command_started event.
+        @param sender Sender of the event.
+        @param metadata Metadata for the command that was started.
+        """
+        if not metadata.outputs:
+            return
+        inputs = self._index.snapshot(self._get_inputs(metadata))
+        with self._running_lock:
+            self._running.setdefault(self._get_key(metadata), []).append(
+                (inputs, metadata.outputs)
+            )
+
+
+    def _on_finished(self,
+        sender: PyShellEvents,
+        result: CommandResult) -> None:
+        """
+        Callback bound to the on_command_finished event.
+        @param sender Sender of the event.
+        @param result Result of the command that finished.
+        """
+        running = self._pop_running(result)
+        if not running:
+            return
+
+        # Commands whose inputs were missing when they started can't be
+        #   considered up to date later on
+        key, inputs, outputs = running
+        if inputs is None:
+            self._index.remove(key)
+        else:
+            self._index.record(key, inputs, outputs)
+
+
+    def _on_failure(self, sender: PyShellEvents, result: CommandResult) -> None:
+        """
+        Callback bound to the on_command_failed event.
+        @param sender Sender of the event.
+        @param result Result of the command that failed.
+        """
+        running = self._pop_running(result)
+        if running:
+            self._index.remove(running[0])
+
+
+    def _pop_running(self, result: CommandResult) \
+        -> Optional[Tuple[str, Optional[Dict[str, List]], Sequence[Path]]]:
+        """
+        Removes a command that finished running from the running commands.
+        @param result Result of the command that finished.
+        @return The command's index key and the information recorded when the
+          command started, or None if the command doesn't declare any outputs.
+        """
+        if not result.outputs:
+            return None
+        key = BuildIndex.compute_key(
+            result.command,
+            result.args,
+            result.outputs
+        )
+        with self._running_lock:
+            running = self._running.get(key)
+            if not running:
+                return None
+            inputs, outputs = running.pop(0)
+            if not running:
+                del self._running[key]
+        return key, inputs, outputs
@@ -0,0 +1,75 @@
+from abc import abstractmethod
+from pathlib import Path
+from pyshell.backends.backend import IBackend
+from pyshell.commands.command_metadata import CommandMetadata
+from pyshell.commands.command_result import CommandResult
+from pyshell.core.pyshell_component import IPyShellComponent
+from pyshell.logging.command_logger import ICommandLogger
+from typing import Optional
+
+class IResultCache(IPyShellComponent):
+    """
+    Represents an executor that can reuse the results of previous commands.
+    Executors that implement this interface are checked by `PyShell.run()`
+      before a command is run on the backend. If a result is found, the
+      command is not run; the cached output is replayed through the command's
+      logger instead so that the command is logged the same way as if it had
+      been run.
+    @ingroup executors
+    """
+    @abstractmethod
+    def compute_key(self,
+        metadata: CommandMetadata,
+        cwd: Path,
+        backend: IBackend) -> Optional[str]:
+        """
+        Computes the key that identifies a command's cached result.
+        The key is computed before the command is run and is later passed to
+          `store()`, so changes that the command makes to its own inputs don't
+          affect the key that its result is stored under.
+        @param metadata Metadata for the command about to be run.
+        @param cwd The working directory that the command will be run in. Will
+          always be an absolute path.
+        @param backend The backend that the command will be run on.
+        @return The key for the command's result, or None if the command's
+          result must not be cached.
+        """
+        raise NotImplementedError()
+
+
+    @abstractmethod
+    def lookup(self,
+        key: str,
+        metadata: CommandMetadata,
+        cwd: Path,
+        logger: ICommandLogger) -> Optional[CommandResult]:
+        """
+        Looks up the cached result of a command.
+        @param key The key returned by `compute_key()` for the command.
+        @param metadata Metadata for the command about to be run.
+        @param cwd The working directory that the command will be run in. Will
+          always be an absolute path.
+        @param logger The logger to use for the command. If a cached result is
+          found, its output will have been forwarded to the logger via
+          `logger.log()` (or `logger.log_bytes()`). `logger.log_results()`
+          will not be invoked.
+        @return The cached result of the command, or None if the command must
+          be run.
+        """
+        raise NotImplementedError()
+
+
+    @abstractmethod
+    def store(self,
+        key: str,
+        metadata: CommandMetadata,
+        result: CommandResult) -> None:
+        """
+        Stores the result of a command that was run on the backend.
+        Implementations decide whether the result should be cached (e.g. only
+          if the command was successful).
+        @param key The key returned by `compute_key()` for the command.
+        @param metadata Metadata for the command that was run.
+        @param result The result returned by the backend.
+        """
+        raise NotImplementedError()
@@ -0,0 +1,248 @@
+from array import array
+import codecs
+from io import IncrementalNewlineDecoder, StringIO
+import locale
+from pyshell.commands.command_result import CommandResult
+from pyshell.commands.output_buffer import OutputBuffer
+from pyshell.logging.command_logger import ICommandLogger
+from pyshell.logging.stream_config import StreamConfig
+from pyshell.scanners.entry import Entry
+from threading import Lock
+from typing import Callable, Dict, List, IO, Iterator, Optional, Tuple
+
+class BufferedCommandLogger(ICommandLogger):
+    """
+    Command logger that holds back a command's output until it finishes.
+    This logger is used when multiple commands run at the same time. Rather
+      than letting each command write to the console or to log files as its
+      output arrives, which would interleave the output of all running
+      commands, the output is buffered and then replayed to the real command
+      logger in a single block once the command has finished.
+    @ingroup logging
+    """
+    def __init__(self,
+        construct_logger: Callable[[], ICommandLogger],
+        lock: Lock,
+        output_memory_limit: Optional[int] = \
+            OutputBuffer.DEFAULT_MEMORY_LIMIT,
+        binary: bool = False) -> None:
+        """
+        Initializes the logger.
+        @param construct_logger Functor that constructs the command logger to
+          replay the command's output to. The functor is invoked once the
+          command has finished so that anything the logger writes when it's
+          constructed (e.g. command headers) is kept together with the
+          command's output.
+        @param lock Lock that is held while the output is replayed. All
+          buffered loggers whose output must not be interleaved must share the
+          same lock.
+        @param output_memory_limit Maximum number of characters of output to
+          hold in memory before the output is moved to a temporary file. If
+          `None`, the output is always held in memory.
+        @param binary Whether the command captures binary output.
+        """
+        self._construct_logger = construct_logger
+        self._lock = lock
+
+        # Stores all output from the command (both stdout and stderr) in the
+        #   order it was received
+        self._output = OutputBuffer(output_memory_limit, binary=binary)
+
+        # Length of each run of consecutive output written to the same stream,
+        #   in the units used by the output buffer. Runs of stderr output are
+        #   stored as negative lengths. Only the runs are held in memory, so
+        #   the output itself can be moved to the buffer's temporary file.
+        self._runs = array("q")
+
+
+    @property
+    def output(self) -> str:
+        """
+        Returns the output of the command.
+        This string must include both stdout and stderr output.
+        """
+        return self._output.getvalue()
+
+
+    @property
+    def output_buffer(self) -> OutputBuffer:
+        """
+        Returns the output of the command without building a single string.
+        """
+        return self._output
+
+
+    @property
+    def stream_config(self) -> StreamConfig:
+        """
+        Returns the stream configuration the logger wants.
+        Streams are always kept separate so that the output can be replayed to
+          loggers that want split streams. If the replayed-to logger wants
+          merged streams, the chunks are merged in the order they were read.
+        """
+        return StreamConfig.SPLIT_STREAMS
+
+
+    @property
+    def accepts_bytes(self) -> bool:
+        """
+        Returns whether the logger can receive raw output via `log_bytes()`.
+        """
+        return self._output.binary
+
+
+    def log(self,
+        stdout: IO[str],
+        stderr: Optional[IO[str]]) -> None:
+        """
+        Handles logging for a command being executed.
+        This method will be invoked repeatedly until the command finishes and
+          all output has been sent to the logger. Each invocation receives
+          only the output that the command wrote since the previous invocation.
+        @param stdout The stdout stream of the command.
+        @param stderr The stderr stream of the command. If the logger requests
+          that the stderr stream be merged with the stdout stream, this will be
+          `None`.
+        """
+        stdout_contents = stdout.read()
+        stderr_contents = stderr.read() if stderr is not None else ""
+
+        self._append(stdout_contents, False)
+        self._append(stderr_contents, True)
+
+
+    def log_bytes(self,
+        stdout: bytes,
+        stderr: Optional[bytes]) -> None:
+        """
+        Handles logging for a command that captures binary output.
+        @param stdout The output that the command wrote to stdout.
+        @param stderr The output that the command wrote to stderr. If the
+          logger requests that the stderr stream be merged with the stdout
+          stream, this will be `None`.
+        """
+        self._append(stdout, False)
+        if stderr:
+            self._append(stderr, True)
+
+
+    def log_results(self,
+        result: CommandResult,
+        scanner_output: List[Entry]) -> None:
+        """
+        Logs the results of a command that finished executing.
+        This method is guaranteed to be executed for every command. Command
+          loggers should handle any cleanup in this method.
+        @param result The result of the command that finished executing.
+        @param scanner_output The output of the scanner assigned to the command,
+          if any.
+        """
+        with self._lock:
+            logger = self._construct_logger()
+            merge_streams = logger.stream_config == StreamConfig.MERGE_STREAMS
+            decoders: Dict[bool, IncrementalNewlineDecoder] = {}
+            for is_stderr, chunk in self._iter_runs():
+                if isinstance(chunk, bytes):
+                    if logger.accepts_bytes:
+                        self._replay_bytes(
+                            logger,
+                            merge_streams,
+                            is_stderr,
+                            chunk
+                        )
+                        continue
+
+                    # Each stream gets its own decoder since a multi-byte
+                    #   character may be split across two chunks
+                    if is_stderr not in decoders:
+                        decoders[is_stderr] = IncrementalNewlineDecoder(
+                            codecs.getincrementaldecoder(
+                                locale.getpreferredencoding(False)
+                            )("replace"),
+                            translate=True
+                        )
+                    chunk = decoders[is_stderr].decode(chunk)
+
+                if merge_streams:
+                    logger.log(StringIO(chunk), None)
+                elif is_stderr:
+                    logger.log(StringIO(), StringIO(chunk))
+                else:
+                    logger.log(StringIO(chunk), StringIO())
+            logger.log_results(result, scanner_output)
+
+        # The output is kept in the buffer for the command's result, but the
+        #   runs are no longer needed
+        self._runs = array("q")
+
+
+    def _append(self, data: str | bytes, is_stderr: bool) -> None:
+        """
+        Appends output to the buffer and records which stream it came from.
+        @param data The output to append.
+        @param is_stderr Whether the output was written to stderr.
+        """
+        if not data:
+            return
+
+        # Strings appended to binary buffers are encoded, so the length is
+        #   taken from the buffer rather than from the data
+        start = len(self._output)
+        self._output.append(data)
+        length = len(self._output) - start
+        if self._runs and (self._runs[-1] < 0) == is_stderr:
+            self._runs[-1] += -length if is_stderr else length
+        else:
+            self._runs.append(-length if is_stderr else length)
+
+
+    def _iter_runs(self) -> Iterator[Tuple[bool, str | bytes]]:
+        """
+        Reads the buffered output back one stream at a time.
+        @return An iterator yielding whether each piece of output was written
+          to stderr and the piece of output. Binary buffers yield raw bytes.
+          Consecutive pieces may belong to the same stream.
+        """
+        chunks: Iterator[str | bytes] = self._output.iter_bytes() \
+            if self._output.binary else self._output.iter_chunks()
+        runs = iter(self._runs)
+        is_stderr = False
+        remaining = 0
+        for chunk in chunks:
+            start = 0
+            while start < len(chunk):
+                if not remaining:
+                    # Output appended to the buffer directly (e.g. the newline
+                    #   that backends add to output that doesn't end with one)
+                    #   wasn't logged by the command, so it isn't replayed. The
+                    #   buffer is still read to the end since it restores the
+                    #   position of its temporary file once it's done.
+                    run = next(runs, None)
+                    if run is None:
+                        break
+                    is_stderr = run < 0
+                    remaining = abs(run)
+                end = min(start + remaining, len(chunk))
+                yield is_stderr, chunk[start:end]
+                remaining -= end - start
+                start = end
+
+
+    @staticmethod
+    def _replay_bytes(logger: ICommandLogger,
+        merge_streams: bool,
+        is_stderr: bool,
+        chunk: bytes) -> None:
+        """
+        Replays a chunk of raw output to a logger that accepts bytes.
+        @param logger The logger to replay the chunk to.
+        @param merge_streams Whether the logger wants merged streams.
+        @param is_stderr Whether the chunk was written to stderr.
+        @param chunk The chunk to replay.
+        """
+        if merge_streams:
+            logger.log_bytes(chunk, None)
+        elif is_stderr:
+            logger.log_bytes(b"", chunk)
+        else:
+            logger.log_bytes(chunk, b"")
@@ -0,0 +1,258 @@
+from bisect import bisect_left
+import json
+from pathlib import Path
+from pyshell.commands.command_metadata import CommandMetadata
+from pyshell.commands.command_phase import CommandPhase
+from pyshell.commands.command_result import CommandResult
+from pyshell.core.pyshell_events import PyShellEvents
+from pyshell.logging.command_logger import ICommandLogger
+from pyshell.logging.console_logger import ConsoleLogger
+from pyshell.logging.logger import ILogger
+from pyshell.logging.logger_options import LoggerOptions
+import threading
+import time
+from typing import Any, Dict, IO, List, Optional, Tuple
+
+class ChromeTraceLogger(ILogger):
+    """
+    Logger that writes a timeline of every command to a trace file.
+    The trace file uses the Chrome Trace Event format, which can be opened
+      with Perfetto (https://ui.perfetto.dev) or `chrome://tracing`. Each
+      command that runs is shown as a span that contains a nested span for
+      each phase of running the command (e.g. spawning the process, pumping
+      its output and scanning the output). Commands are grouped by backend,
+      and commands that overlap in time are placed on separate tracks, so the
+      critical path and idle cores of parallel scripts are easy to see.
+    Command output is logged by a wrapped logger. Events are appended to the
+      trace file as each command finishes, so the trace can be viewed while
+      the script is still running, or if the script is killed; the closing
+      bracket of the trace is optional and is only written by `close()`.
+    @ingroup logging
+    """
+    def __init__(self,
+        file_path: str | Path,
+        logger: Optional[ILogger] = None):
+        """
+        Initializes the object.
+        @param file_path Path to write the trace to. Can be a relative or
+          absolute path. If the path is a relative path, it will be
+          interpreted relative to the directory that the PyShell script is run
+          from. Any existing file will be overwritten.
+        @param logger Logger used to log each command's output. If not
+          specified, `ConsoleLogger` is used.
+        """
+        self._file_path = Path(file_path).absolute().resolve()
+        self._logger = logger if logger else ConsoleLogger()
+        self._lock = threading.Lock()
+
+        # Timestamps in the trace are relative to when the logger was created
+        self._origin_ns = time.perf_counter_ns()
+
+        # Process ID assigned to each backend in the trace
+        self._pids: Dict[Optional[str], int] = {}
+
+        # Spans placed on each track, per process. The start and end times of
+        #   the spans on each track are kept in separate sorted lists.
+        self._tracks: Dict[int, List[Tuple[List[int], List[int]]]] = {}
+
+        self._file_path.parent.mkdir(parents=True, exist_ok=True)
+        self._file: Optional[IO[str]] = open(self._file_path, "w")
+        self._file.write("[")
+        self._event_count = 0
+
+
+    @property
+    def file_path(self) -> Path:
+        """
+        Path that the trace is written to. Will always be an absolute path.
+        """
+        return self._file_path
+
+
+    @property
+    def logger(self) -> ILogger:
+        """
+        Logger used to log each command's output.
+        """
+        return self._logger
+
+
+    def initialize(self, events: PyShellEvents) -> None:
+        """
+        Initializes the logger.
+        @param events `PyShellEvents` instance for the pyshell instance that
+          the logger is being used with.
+        """
+        self._logger.initialize(events)
+        events.on_command_timed += self._on_timed
+
+
+    def construct_logger(self,
+        metadata: CommandMetadata,
+        options: LoggerOptions,
+        cwd: Path) -> ICommandLogger:
+        """
+        Constructs a new command logger.
+        @param metadata The metadata of the command that will the command logger
+          will be used for.
+        @param options The options for the command logger.
+        @param cwd The current working directory of the command that will the
+          command logger will be used for.
+        @return A new command logger instance.
+        """
+        return self._logger.construct_logger(metadata, options, cwd)
+
+
+    def close(self) -> None:
+        """
+        Finishes the trace file.
+        Commands that finish after the trace file is closed aren't traced.
+        """
+        with self._lock:
+            if self._file:
+                self._file.write("\n]\n")
+                self._file.close()
+                self._file = None
+
+
+    def _on_timed(self,
+        sender: PyShellEvents,
+        result: CommandResult) -> None:
+        """
+        Callback bound to the on_command_timed event.
+        @param sender Sender of the event.
+        @param result Result of the command whose timings are complete.
+        """
+        # Every phase has finished by the time the event is broadcast, so the
+        #   spans are laid out backwards from the current time
+        end_ns = time.perf_counter_ns() - self._origin_ns
+        timings = result.timings
+        start_ns = end_ns - timings.total_ns
+
+        with self._lock:
+            if not self._file:
+                return
+            pid = self._get_pid(result.backend)
+            tid = self._get_track(pid, start_ns, end_ns)
+            self._write_event({
+                "name": result.command,
+                "cat": "command",
+                "ph": "X",
+                "ts": start_ns / 1000,
+                "dur": timings.total_ns / 1000,
+                "pid": pid,
+                "tid": tid,
+                "args": {
+                    "args": list(result.args),
+                    "cwd": result.cwd,
+                    "backend": result.backend,
+                    "exit_code": result.exit_code,
+                    "cached": result.cached
+                }
+            })
+
+            phase_start_ns = start_ns
+            for name, duration_ns in self._get_spans(result):
+                self._write_event({
+                    "name": name,
+                    "cat": "phase",
+                    "ph": "X",
+                    "ts": phase_start_ns / 1000,
+                    "dur": duration_ns / 1000,
+                    "pid": pid,
+                    "tid": tid
+                })
+                phase_start_ns += duration_ns
+            self._file.flush()
+
+
+    @staticmethod
+    def _get_spans(result: CommandResult) -> List[Tuple[str, int]]:
+        """
+        Gets the nested spans to show for a command.
+        @param result The result of the command.
+        @return The name and duration in nanoseconds of each span, in order.
+        """
+        spans: List[Tuple[str, int]] = []
+        for phase, duration_ns in result.timings:
+            if phase != CommandPhase.BACKEND:
+                spans.append((phase.name.lower(), duration_ns))
+                continue
+
+            # Split the backend phase into starting the process and pumping
+            #   its output until it exits, if the backend measured the former
+            spawn_duration = result.spawn_duration_seconds
+            if spawn_duration is None:
+                spans.append(("backend", duration_ns))
+            else:
+                spawn_ns = min(int(spawn_duration * 10**9), duration_ns)
+                spans.append(("spawn", spawn_ns))
+                spans.append(("pump", duration_ns - spawn_ns))
+        return spans
+
+
+    def _get_pid(self, backend: Optional[str]) -> int:
+        """
+        Gets the process ID used for commands run by a backend.
+        Must be called with the lock held.
+        @param backend Information about the backend.
+        @return The process ID to use in the trace.
+        """
+        pid = self._pids.get(backend)
+        if pid is None:
+            pid = len(self._pids) + 1
+            self._pids[backend] = pid
+            self._tracks[pid] = []
+            self._write_event({
+                "name": "process_name",
+                "ph": "M",
+                "pid": pid,
+                "args": {"name": backend if backend else "Unknown backend"}
+            })
+        return pid
+
+
+    def _get_track(self, pid: int, start_ns: int, end_ns: int) -> int:
+        """
+        Finds a track that has no spans overlapping a command.
+        Must be called with the lock held.
+        @param pid The process ID that the command's span belongs to.
+        @param start_ns Start time of the command.
+        @param end_ns End time of the command.
+        @return The thread ID of the track to place the command on.
+        """
+        tracks = self._tracks[pid]
+        for tid, (starts, ends) in enumerate(tracks, 1):
+            # Spans on a track never overlap, so the only spans that can
+            #   overlap the command are the neighbors of its insertion point
+            i = bisect_left(starts, start_ns)
+            if i > 0 and ends[i - 1] > start_ns:
+                continue
+            if i < len(starts) and starts[i] < end_ns:
+                continue
+            starts.insert(i, start_ns)
+            ends.insert(i, end_ns)
+            return tid
+
+        tracks.append(([start_ns], [end_ns]))
+        tid = len(tracks)
+        self._write_event({
+            "name": "thread_name",
+            "ph": "M",
+            "pid": pid,
+            "tid": tid,
+            "args": {"name": f"Track {tid}"}
+        })
+        return tid
+
+
+    def _write_event(self, event: Dict[str, Any]) -> None:
+        """
+        Appends an event to the trace file.
+        Must be called with the lock held.
+        @param event The event to write.
+        """
+        assert self._file
+        separator = ",\n" if self._event_count else "\n"
+        self._file.write(separator + json.dumps(event))
+        self._event_count += 1
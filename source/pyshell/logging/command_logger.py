@@ -1,5 +1,7 @@
 from abc import ABC, abstractmethod
+from pyshell.backends.output_chunk import OutputChunk
 from pyshell.commands.command_result import CommandResult
+from pyshell.commands.output_buffer import OutputBuffer
 from pyshell.logging.stream_config import StreamConfig
 from pyshell.scanners.entry import Entry
 from typing import List, IO, Optional
@@ -30,6 +32,35 @@ class ICommandLogger(ABC):
         raise NotImplementedError()
 
 
+    @property
+    def output_buffer(self) -> OutputBuffer:
+        """
+        Returns the output of the command without building a single string.
+        Loggers that store their output in an `OutputBuffer` should return the
+          buffer directly. By default, the buffer is created from `output`.
+        """
+        return OutputBuffer(None, self.output)
+
+
+    @property
+    def accepts_bytes(self) -> bool:
+        """
+        Returns whether the logger can receive raw output via `log_bytes()`.
+        If this is false, output from commands that capture binary output is
+          decoded before it's passed to `log()`.
+        """
+        return False
+
+
+    @property
+    def accepts_chunks(self) -> bool:
+        """
+        Returns whether the logger wants to receive each chunk of output along
+          with its metadata via `log_chunk()`.
+        """
+        return False
+
+
     @abstractmethod
     def log(self,
         stdout: IO[str],
@@ -37,7 +68,8 @@ class ICommandLogger(ABC):
         """
         Handles logging for a command being executed.
         This method will be invoked repeatedly until the command finishes and
-          all output has been sent to the logger.
+          all output has been sent to the logger. Each invocation receives
+          only the output that the command wrote since the previous invocation.
         @param stdout The stdout stream of the command.
         @param stderr The stderr stream of the command. If the logger requests
           that the stderr stream be merged with the stdout stream, this will be
@@ -46,6 +78,37 @@ class ICommandLogger(ABC):
         raise NotImplementedError()
 
 
+    def log_bytes(self,
+        stdout: bytes,
+        stderr: Optional[bytes]) -> None:
+        """
+        Handles logging for a command that captures binary output.
+        This is only invoked if `accepts_bytes` is true. Like `log()`, this
+          method will be invoked repeatedly until the command finishes, and each
+          invocation receives only the output written since the previous
+          invocation. Output may be split at any byte, including in the middle
+          of a multi-byte character.
+        @param stdout The output that the command wrote to stdout.
+        @param stderr The output that the command wrote to stderr. If the
+          logger requests that the stderr stream be merged with the stdout
+          stream, this will be `None`.
+        """
+        raise NotImplementedError()
+
+
+    def log_chunk(self, chunk: OutputChunk) -> None:
+        """
+        Receives a chunk of output along with the stream it was read from, its
+          sequence number and the time it was read at.
+        This is only invoked if `accepts_chunks` is true. The chunk's output is
+          passed to `log()` or `log_bytes()` as usual before this method is
+          invoked, so loggers only need to implement this method to make use
+          of the chunk's metadata (e.g. to timestamp each chunk of output).
+        @param chunk The chunk of output.
+        """
+        raise NotImplementedError()
+
+
     @abstractmethod
     def log_results(self,
         result: CommandResult,
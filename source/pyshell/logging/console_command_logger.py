@@ -1,7 +1,11 @@
+import codecs
+from io import IncrementalNewlineDecoder
+import locale
 from pathlib import Path
 from pyshell.commands.command_flags import CommandFlags
 from pyshell.commands.command_metadata import CommandMetadata
 from pyshell.commands.command_result import CommandResult
+from pyshell.commands.output_buffer import OutputBuffer
 from pyshell.logging.command_logger import ICommandLogger
 from pyshell.logging.logger_options import LoggerOptions
 from pyshell.logging.logger_statics import LoggerStatics
@@ -40,7 +44,14 @@ class ConsoleCommandLogger(ICommandLogger):
         self._print_cmd_footer = print_footer
 
         # Stores all output from the command
-        self._output = ""
+        self._output = OutputBuffer(
+            self._options.output_memory_limit,
+            binary=bool(metadata.flags & CommandFlags.BINARY_OUTPUT)
+        )
+
+        # Decoder for binary output, which is created once binary output needs
+        #   to be printed
+        self._decoder: Optional[IncrementalNewlineDecoder] = None
 
         # Check whether the command's output shouldn't be logged
         self._skip_logging = False
@@ -58,6 +69,14 @@ class ConsoleCommandLogger(ICommandLogger):
         Returns the output of the command.
         This string must include both stdout and stderr output.
         """
+        return self._output.getvalue()
+
+
+    @property
+    def output_buffer(self) -> OutputBuffer:
+        """
+        Returns the output of the command without building a single string.
+        """
         return self._output
 
 
@@ -69,6 +88,14 @@ class ConsoleCommandLogger(ICommandLogger):
         return StreamConfig.MERGE_STREAMS
 
 
+    @property
+    def accepts_bytes(self) -> bool:
+        """
+        Returns whether the logger can receive raw output via `log_bytes()`.
+        """
+        return True
+
+
     def log(self,
         stdout: IO[str],
         stderr: Optional[IO[str]]) -> None:
@@ -87,7 +114,7 @@ class ConsoleCommandLogger(ICommandLogger):
             return
 
         # Always update `self._output`
-        self._output += cmd_output
+        self._output.append(cmd_output)
 
         # Print the output if logging is enabled
         if self._skip_logging:
@@ -95,6 +122,38 @@ class ConsoleCommandLogger(ICommandLogger):
         self._print(cmd_output)
 
 
+    def log_bytes(self,
+        stdout: bytes,
+        stderr: Optional[bytes]) -> None:
+        """
+        Handles logging for a command that captures binary output.
+        The output is only decoded if it needs to be printed.
+        @param stdout The output that the command wrote to stdout.
+        @param stderr The output that the command wrote to stderr. If the
+          logger requests that the stderr stream be merged with the stdout
+          stream, this will be `None`.
+        """
+        if not stdout:
+            return
+
+        # Always update `self._output`
+        self._output.append(stdout)
+
+        # Print the output if logging is enabled
+        if self._skip_logging:
+            return
+        if not self._decoder:
+            self._decoder = IncrementalNewlineDecoder(
+                codecs.getincrementaldecoder(
+                    locale.getpreferredencoding(False)
+                )("replace"),
+                translate=True
+            )
+        cmd_output = self._decoder.decode(stdout)
+        if cmd_output:
+            self._print(cmd_output)
+
+
     def log_results(self,
         result: CommandResult,
         scanner_output: List[Entry]) -> None:
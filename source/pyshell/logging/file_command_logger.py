@@ -2,6 +2,7 @@ from pathlib import Path
 from pyshell.commands.command_flags import CommandFlags
 from pyshell.commands.command_metadata import CommandMetadata
 from pyshell.commands.command_result import CommandResult
+from pyshell.commands.output_buffer import OutputBuffer
 from pyshell.logging.command_logger import ICommandLogger
 from pyshell.logging.logger_options import LoggerOptions
 from pyshell.logging.logger_statics import LoggerStatics
@@ -41,7 +42,10 @@ class FileCommandLogger(ICommandLogger):
         self._add_footer = add_footer
 
         # Stores all output from the command
-        self._output = ""
+        self._output = OutputBuffer(
+            self._options.output_memory_limit,
+            binary=bool(metadata.flags & CommandFlags.BINARY_OUTPUT)
+        )
 
         # Make sure the path to the file exists
         if not self._file_path.parent.exists():
@@ -65,6 +69,14 @@ class FileCommandLogger(ICommandLogger):
         Returns the output of the command.
         This string must include both stdout and stderr output.
         """
+        return self._output.getvalue()
+
+
+    @property
+    def output_buffer(self) -> OutputBuffer:
+        """
+        Returns the output of the command without building a single string.
+        """
         return self._output
 
 
@@ -76,6 +88,14 @@ class FileCommandLogger(ICommandLogger):
         return StreamConfig.MERGE_STREAMS
 
 
+    @property
+    def accepts_bytes(self) -> bool:
+        """
+        Returns whether the logger can receive raw output via `log_bytes()`.
+        """
+        return True
+
+
     def log(self,
         stdout: IO[str],
         stderr: Optional[IO[str]]) -> None:
@@ -94,7 +114,7 @@ class FileCommandLogger(ICommandLogger):
             return
 
         # Always update `self._output`
-        self._output += cmd_output
+        self._output.append(cmd_output)
 
         # Write the output if logging is enabled
         if self._skip_logging:
@@ -102,6 +122,30 @@ class FileCommandLogger(ICommandLogger):
         self._file.write(cmd_output)
 
 
+    def log_bytes(self,
+        stdout: bytes,
+        stderr: Optional[bytes]) -> None:
+        """
+        Handles logging for a command that captures binary output.
+        The output is written to the file without being decoded.
+        @param stdout The output that the command wrote to stdout.
+        @param stderr The output that the command wrote to stderr. If the
+          logger requests that the stderr stream be merged with the stdout
+          stream, this will be `None`.
+        """
+        if not stdout:
+            return
+
+        # Always update `self._output`
+        self._output.append(stdout)
+
+        # Write the output if logging is enabled
+        if self._skip_logging:
+            return
+        self._file.flush()
+        self._file.buffer.write(stdout)
+
+
     def log_results(self,
         result: CommandResult,
         scanner_output: List[Entry]) -> None:
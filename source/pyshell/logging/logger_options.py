@@ -1,3 +1,6 @@
+from pyshell.commands.output_buffer import OutputBuffer
+from typing import Optional
+
 class LoggerOptions:
     """
     Defines options used to configure logger instances.
@@ -9,6 +12,7 @@ class LoggerOptions:
         print_exit_code: bool = True,
         print_timestamps: bool = True,
         print_duration: bool = True,
+        print_resource_usage: bool = False,
         add_newline_after_header: bool = True,
         add_newline_before_footer: bool = True,
         add_newline_after_footer: bool = True,
@@ -17,7 +21,8 @@ class LoggerOptions:
         cmd_header_banner_prefix: str = "[PyShell] ",
         cmd_footer_banner_char: str = "<",
         cmd_footer_banner_width: int = 40,
-        cmd_footer_banner_prefix: str = "[PyShell] "):
+        cmd_footer_banner_prefix: str = "[PyShell] ",
+        output_memory_limit: Optional[int] = OutputBuffer.DEFAULT_MEMORY_LIMIT):
         """
         Initializes the object.
         @param print_cmd Whether to print the command invocation.
@@ -29,6 +34,8 @@ class LoggerOptions:
         @param print_timestamps Whether to print the start and end timestamp
           for the command.
         @param print_duration Whether to print the command execution duration.
+        @param print_resource_usage Whether to print the resources used by the
+          command, if the backend collected them.
         @param add_newline_after_header Whether to add a newline after the
           command header.
         @param add_newline_before_footer Whether to add a newline before the
@@ -45,6 +52,9 @@ class LoggerOptions:
         @param cmd_footer_banner_width The width of the command footer banner.
         @param cmd_footer_banner_prefix The prefix to use for each line in the
           command footer banner.
+        @param output_memory_limit Maximum number of characters of a command's
+          output to hold in memory before the output is moved to a temporary
+          file. If `None`, the output is always held in memory.
         """
         self._print_cmd = print_cmd
         self._print_cwd = print_cwd
@@ -52,6 +62,7 @@ class LoggerOptions:
         self._print_exit_code = print_exit_code
         self._print_timestamps = print_timestamps
         self._print_duration = print_duration
+        self._print_resource_usage = print_resource_usage
         self._add_newline_after_header = add_newline_after_header
         self._add_newline_before_footer = add_newline_before_footer
         self._add_newline_after_footer = add_newline_after_footer
@@ -61,6 +72,7 @@ class LoggerOptions:
         self._cmd_footer_banner_char = cmd_footer_banner_char
         self._cmd_footer_banner_width = cmd_footer_banner_width
         self._cmd_footer_banner_prefix = cmd_footer_banner_prefix
+        self._output_memory_limit = output_memory_limit
 
     @property
     def print_cmd(self) -> bool:
@@ -110,6 +122,14 @@ class LoggerOptions:
         return self._print_duration
 
 
+    @property
+    def print_resource_usage(self) -> bool:
+        """
+        Whether to print the resources used by the command.
+        """
+        return self._print_resource_usage
+
+
     @property
     def add_newline_after_header(self) -> bool:
         """
@@ -196,3 +216,12 @@ class LoggerOptions:
         The prefix to use for each line in the command footer banner.
         """
         return self._cmd_footer_banner_prefix
+
+
+    @property
+    def output_memory_limit(self) -> Optional[int]:
+        """
+        Maximum number of characters of a command's output to hold in memory
+          before the output is moved to a temporary file.
+        """
+        return self._output_memory_limit
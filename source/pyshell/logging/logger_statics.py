@@ -81,6 +81,25 @@ class LoggerStatics:
                 lines.append(
                     f"[PyShell] Duration: {round(result.duration_minutes, 3)} min"
                 )
+        usage = result.resource_usage
+        if options.print_resource_usage and usage:
+            lines.append(
+                f"[PyShell] CPU time: {round(usage.user_time, 3)} s user, " +
+                f"{round(usage.system_time, 3)} s sys"
+            )
+            lines.append(
+                "[PyShell] Max RSS: " +
+                f"{round(usage.max_rss / (1024 * 1024), 1)} MiB"
+            )
+            lines.append(
+                f"[PyShell] Block I/O: {usage.block_inputs} in, " +
+                f"{usage.block_outputs} out"
+            )
+            lines.append(
+                "[PyShell] Context switches: " +
+                f"{usage.voluntary_context_switches} voluntary, " +
+                f"{usage.involuntary_context_switches} involuntary"
+            )
 
         # If no values should be written, skip writing the command footer
         if not lines:
@@ -36,6 +36,14 @@ class NullCommandLogger(ICommandLogger):
         return self._stream_config
 
 
+    @property
+    def accepts_bytes(self) -> bool:
+        """
+        Returns whether the logger can receive raw output via `log_bytes()`.
+        """
+        return True
+
+
     def log(self,
         stdout: IO[str],
         stderr: Optional[IO[str]]) -> None:
@@ -51,6 +59,19 @@ class NullCommandLogger(ICommandLogger):
         # Do nothing
 
 
+    def log_bytes(self,
+        stdout: bytes,
+        stderr: Optional[bytes]) -> None:
+        """
+        Handles logging for a command that captures binary output.
+        @param stdout The output that the command wrote to stdout.
+        @param stderr The output that the command wrote to stderr. If the
+          logger requests that the stderr stream be merged with the stdout
+          stream, this will be `None`.
+        """
+        # Do nothing
+
+
     def log_results(self,
         result: CommandResult,
         scanner_output: List[Entry]) -> None:
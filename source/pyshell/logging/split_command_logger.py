@@ -1,5 +1,6 @@
 from io import StringIO
 from pyshell.commands.command_result import CommandResult
+from pyshell.commands.output_buffer import OutputBuffer
 from pyshell.logging.command_logger import ICommandLogger
 from pyshell.logging.stream_config import StreamConfig
 from pyshell.scanners.entry import Entry
@@ -12,17 +13,25 @@ class SplitCommandLogger(ICommandLogger):
     """
     def __init__(self,
         stdout_logger: ICommandLogger,
-        stderr_logger: ICommandLogger) -> None:
+        stderr_logger: ICommandLogger,
+        output_memory_limit: Optional[int] = \
+            OutputBuffer.DEFAULT_MEMORY_LIMIT,
+        binary: bool = False) -> None:
         """
         Initializes the logger.
         @param stdout_logger The logger to use for stdout.
         @param stderr_logger The logger to use for stderr.
+        @param output_memory_limit Maximum number of characters of output to
+          hold in memory before the output is moved to a temporary file. If
+          `None`, the output is always held in memory.
+        @param binary Whether the command captures binary output. If set, the
+          logger accepts raw output as long as both stream loggers do.
         """
         self._stdout_logger = stdout_logger
         self._stderr_logger = stderr_logger
 
         # Stores all output from the command (both stdout and stderr)
-        self._output = ""
+        self._output = OutputBuffer(output_memory_limit, binary=binary)
 
 
     @property
@@ -31,6 +40,14 @@ class SplitCommandLogger(ICommandLogger):
         Returns the output of the command.
         This string must include both stdout and stderr output.
         """
+        return self._output.getvalue()
+
+
+    @property
+    def output_buffer(self) -> OutputBuffer:
+        """
+        Returns the output of the command without building a single string.
+        """
         return self._output
 
 
@@ -42,6 +59,15 @@ class SplitCommandLogger(ICommandLogger):
         return StreamConfig.SPLIT_STREAMS
 
 
+    @property
+    def accepts_bytes(self) -> bool:
+        """
+        Returns whether the logger can receive raw output via `log_bytes()`.
+        """
+        return self._output.binary and self._stdout_logger.accepts_bytes and \
+            self._stderr_logger.accepts_bytes
+
+
     def log(self,
         stdout: IO[str],
         stderr: Optional[IO[str]]) -> None:
@@ -63,13 +89,34 @@ class SplitCommandLogger(ICommandLogger):
         #   provided by `subprocess` are not seekable
         stdout_contents = stdout.read()
         stderr_contents = stderr.read()
-        self._output = stdout_contents + stderr_contents
+        self._output.append(stdout_contents)
+        self._output.append(stderr_contents)
 
         # Invoke each stream-specific logger
         self._stdout_logger.log(StringIO(stdout_contents), StringIO())
         self._stderr_logger.log(StringIO(stderr_contents), StringIO())
 
 
+    def log_bytes(self,
+        stdout: bytes,
+        stderr: Optional[bytes]) -> None:
+        """
+        Handles logging for a command that captures binary output.
+        @param stdout The output that the command wrote to stdout.
+        @param stderr The output that the command wrote to stderr. If the
+          logger requests that the stderr stream be merged with the stdout
+          stream, this will be `None`.
+        """
+        # This should never be None since the logger requests the streams to be
+        #   split
+        assert stderr is not None
+
+        self._output.append(stdout)
+        self._output.append(stderr)
+        self._stdout_logger.log_bytes(stdout, b"")
+        self._stderr_logger.log_bytes(stderr, b"")
+
+
     def log_results(self,
         result: CommandResult,
         scanner_output: List[Entry]) -> None:
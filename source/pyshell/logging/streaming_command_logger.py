@@ -0,0 +1,188 @@
+import codecs
+from io import IncrementalNewlineDecoder, StringIO
+import locale
+from pyshell.backends.output_chunk import OutputChunk
+from pyshell.commands.command_result import CommandResult
+from pyshell.commands.output_buffer import OutputBuffer
+from pyshell.logging.command_logger import ICommandLogger
+from pyshell.logging.stream_config import StreamConfig
+from pyshell.scanners.entry import Entry
+from typing import Any, Callable, Dict, List, IO, Optional
+
+class StreamingCommandLogger(ICommandLogger):
+    """
+    Command logger that passes each line of output to a callback.
+    All output is forwarded to another command logger as-is; this logger only
+      splits the output into lines as it arrives. If stdout and stderr are
+      split, each stream is split into lines separately so that a line from
+      one stream never contains output from the other stream.
+    The callback is invoked from the thread that runs the command, and the
+      backend doesn't read any more output from the command until the
+      callback returns. A callback that blocks therefore stops the command
+      once the command has filled its pipe.
+    @ingroup logging
+    """
+    def __init__(self,
+        logger: ICommandLogger,
+        on_line: Callable[[str], Any]) -> None:
+        """
+        Initializes the logger.
+        @param logger The logger to forward all output to.
+        @param on_line Callback invoked with each line of output. Each line
+          includes its trailing newline, except for a final line that the
+          command didn't terminate. Any return value will be ignored.
+        """
+        self._logger = logger
+        self._on_line = on_line
+
+        # Output that doesn't end with a newline yet, for each stream
+        self._partial_lines: Dict[bool, List[str]] = {False: [], True: []}
+
+        # Decoders for binary output, for each stream
+        self._decoders: Dict[bool, IncrementalNewlineDecoder] = {}
+
+
+    @property
+    def output(self) -> str:
+        """
+        Returns the output of the command.
+        This string must include both stdout and stderr output.
+        """
+        return self._logger.output
+
+
+    @property
+    def output_buffer(self) -> OutputBuffer:
+        """
+        Returns the output of the command without building a single string.
+        """
+        return self._logger.output_buffer
+
+
+    @property
+    def stream_config(self) -> StreamConfig:
+        """
+        Returns the stream configuration the logger wants.
+        """
+        return self._logger.stream_config
+
+
+    @property
+    def accepts_bytes(self) -> bool:
+        """
+        Returns whether the logger can receive raw output via `log_bytes()`.
+        """
+        return self._logger.accepts_bytes
+
+
+    @property
+    def accepts_chunks(self) -> bool:
+        """
+        Returns whether the logger wants to receive each chunk of output via
+          `log_chunk()`.
+        """
+        return self._logger.accepts_chunks
+
+
+    def log(self,
+        stdout: IO[str],
+        stderr: Optional[IO[str]]) -> None:
+        """
+        Handles logging for a command being executed.
+        This method will be invoked repeatedly until the command finishes and
+          all output has been sent to the logger.
+        @param stdout The stdout stream of the command.
+        @param stderr The stderr stream of the command. If the logger requests
+          that the stderr stream be merged with the stdout stream, this will be
+          `None`.
+        """
+        # The streams can only be read once, so copies are forwarded
+        stdout_contents = stdout.read()
+        stderr_contents = stderr.read() if stderr is not None else None
+        self._logger.log(
+            StringIO(stdout_contents),
+            StringIO(stderr_contents) if stderr_contents is not None else None
+        )
+
+        self._split_lines(stdout_contents, False)
+        if stderr_contents:
+            self._split_lines(stderr_contents, True)
+
+
+    def log_bytes(self,
+        stdout: bytes,
+        stderr: Optional[bytes]) -> None:
+        """
+        Handles logging for a command that captures binary output.
+        @param stdout The output that the command wrote to stdout.
+        @param stderr The output that the command wrote to stderr. If the
+          logger requests that the stderr stream be merged with the stdout
+          stream, this will be `None`.
+        """
+        self._logger.log_bytes(stdout, stderr)
+
+        for is_stderr, data in ((False, stdout), (True, stderr)):
+            if not data:
+                continue
+
+            # Each stream gets its own decoder since a multi-byte character may
+            #   be split across two chunks
+            decoder = self._decoders.get(is_stderr)
+            if decoder is None:
+                decoder = IncrementalNewlineDecoder(
+                    codecs.getincrementaldecoder(
+                        locale.getpreferredencoding(False)
+                    )("replace"),
+                    translate=True
+                )
+                self._decoders[is_stderr] = decoder
+            self._split_lines(decoder.decode(data), is_stderr)
+
+
+    def log_chunk(self, chunk: OutputChunk) -> None:
+        """
+        Forwards a chunk of output to the wrapped logger.
+        @param chunk The chunk of output.
+        """
+        self._logger.log_chunk(chunk)
+
+
+    def log_results(self,
+        result: CommandResult,
+        scanner_output: List[Entry]) -> None:
+        """
+        Logs the results of a command that finished executing.
+        Any output that wasn't terminated by a newline is passed to the
+          callback as a final line.
+        @param result The result of the command that finished executing.
+        @param scanner_output The output of the scanner assigned to the command,
+          if any.
+        """
+        for is_stderr, decoder in self._decoders.items():
+            self._split_lines(decoder.decode(b"", final=True), is_stderr)
+        for partial_line in self._partial_lines.values():
+            if partial_line:
+                self._on_line("".join(partial_line))
+                partial_line.clear()
+
+        self._logger.log_results(result, scanner_output)
+
+
+    def _split_lines(self, text: str, is_stderr: bool) -> None:
+        """
+        Passes each complete line in a chunk of output to the callback.
+        @param text The chunk of output.
+        @param is_stderr Whether the chunk was written to stderr.
+        """
+        partial_line = self._partial_lines[is_stderr]
+        start = 0
+        end = text.find("\n")
+        while end >= 0:
+            partial_line.append(text[start:end + 1])
+            line = "".join(partial_line)
+            partial_line.clear()
+            self._on_line(line)
+            start = end + 1
+            end = text.find("\n", start)
+        if start < len(text):
+            partial_line.append(text[start:])
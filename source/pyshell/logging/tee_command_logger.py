@@ -1,5 +1,7 @@
 from io import StringIO
+from pyshell.backends.output_chunk import OutputChunk
 from pyshell.commands.command_result import CommandResult
+from pyshell.commands.output_buffer import OutputBuffer
 from pyshell.logging.command_logger import ICommandLogger
 from pyshell.logging.stream_config import StreamConfig
 from pyshell.scanners.entry import Entry
@@ -54,6 +56,14 @@ class TeeCommandLogger(ICommandLogger):
         return self._loggers[0].output
 
 
+    @property
+    def output_buffer(self) -> OutputBuffer:
+        """
+        Returns the output of the command without building a single string.
+        """
+        return self._loggers[0].output_buffer
+
+
     @property
     def stream_config(self) -> StreamConfig:
         """
@@ -62,6 +72,25 @@ class TeeCommandLogger(ICommandLogger):
         return self._stream_config
 
 
+    @property
+    def accepts_bytes(self) -> bool:
+        """
+        Returns whether the logger can receive raw output via `log_bytes()`.
+        Raw output is only accepted if every logger accepts it.
+        """
+        return all(logger.accepts_bytes for logger in self._loggers)
+
+
+    @property
+    def accepts_chunks(self) -> bool:
+        """
+        Returns whether the logger wants to receive each chunk of output via
+          `log_chunk()`.
+        Chunks are accepted if any logger accepts them.
+        """
+        return any(logger.accepts_chunks for logger in self._loggers)
+
+
     def log(self,
         stdout: IO[str],
         stderr: Optional[IO[str]]) -> None:
@@ -99,6 +128,30 @@ class TeeCommandLogger(ICommandLogger):
             logger.log(logger_stdout, logger_stderr)
 
 
+    def log_bytes(self,
+        stdout: bytes,
+        stderr: Optional[bytes]) -> None:
+        """
+        Handles logging for a command that captures binary output.
+        @param stdout The output that the command wrote to stdout.
+        @param stderr The output that the command wrote to stderr. If the
+          logger requests that the stderr stream be merged with the stdout
+          stream, this will be `None`.
+        """
+        for logger in self._loggers:
+            logger.log_bytes(stdout, stderr)
+
+
+    def log_chunk(self, chunk: OutputChunk) -> None:
+        """
+        Forwards a chunk of output to each logger that accepts chunks.
+        @param chunk The chunk of output.
+        """
+        for logger in self._loggers:
+            if logger.accepts_chunks:
+                logger.log_chunk(chunk)
+
+
     def log_results(self,
         result: CommandResult,
         scanner_output: List[Entry]) -> None:
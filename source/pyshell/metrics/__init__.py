@@ -0,0 +1,5 @@
+## @package pyshell.metrics
+# Contains classes that export metrics about the commands PyShell runs.
+
+## @defgroup metrics Metrics
+# Classes that aggregate command results into metrics for monitoring systems.
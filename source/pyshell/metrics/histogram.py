@@ -0,0 +1,69 @@
+from bisect import bisect_left
+from typing import List, Sequence
+
+class Histogram:
+    """
+    Counts observed values in buckets with fixed upper bounds.
+    @ingroup metrics
+    """
+    def __init__(self, bounds: Sequence[float]):
+        """
+        Initializes the object.
+        @param bounds Upper bound of each bucket, in ascending order. Values
+          larger than every bound are only counted by the implicit `+Inf`
+          bucket.
+        @throws ValueError If the bounds aren't in ascending order.
+        """
+        if any(a >= b for a, b in zip(bounds, bounds[1:])):
+            raise ValueError("Histogram bounds must be in ascending order.")
+
+        self._bounds = list(bounds)
+        self._counts = [0] * (len(self._bounds) + 1)
+        self._sum = 0.0
+
+
+    @property
+    def bounds(self) -> Sequence[float]:
+        """
+        Upper bound of each bucket, excluding the `+Inf` bucket.
+        """
+        return self._bounds
+
+
+    @property
+    def count(self) -> int:
+        """
+        Number of values observed.
+        """
+        return sum(self._counts)
+
+
+    @property
+    def sum(self) -> float:
+        """
+        Sum of the values observed.
+        """
+        return self._sum
+
+
+    def observe(self, value: float) -> None:
+        """
+        Adds a value to the histogram.
+        @param value The value to add.
+        """
+        self._counts[bisect_left(self._bounds, value)] += 1
+        self._sum += value
+
+
+    def cumulative_counts(self) -> List[int]:
+        """
+        Gets the number of values less than or equal to each bucket's bound.
+        @return The cumulative count of each bucket, with the count of the
+          `+Inf` bucket last.
+        """
+        counts: List[int] = []
+        total = 0
+        for count in self._counts:
+            total += count
+            counts.append(total)
+        return counts
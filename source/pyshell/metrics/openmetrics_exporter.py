@@ -0,0 +1,276 @@
+import atexit
+import os
+from pathlib import Path
+from pyshell.commands.command_result import CommandResult
+from pyshell.core.pyshell_component import IPyShellComponent
+from pyshell.core.pyshell_events import PyShellEvents
+from pyshell.metrics.histogram import Histogram
+import tempfile
+import threading
+import time
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+class OpenMetricsExporter(IPyShellComponent):
+    """
+    Exports metrics about the commands run by a PyShell instance to a file.
+    The file uses the OpenMetrics text format and is written atomically, so it
+      can be collected by node_exporter's textfile collector (which requires
+      the file name to end in `.prom`) or any other collector that reads
+      metric files. The following metrics are exported:
+    - `<prefix>_command_duration_seconds`: Histogram of the time taken by
+      each command, labelled by command and backend.
+    - `<prefix>_commands_total`: Number of commands that finished, labelled
+      by command, backend and exit code.
+    - `<prefix>_command_output_bytes_total`: Amount of output written by
+      commands, labelled by command and backend. Text output is counted as
+      the length of the output encoded as UTF-8.
+    The file is rewritten when a command finishes if at least `flush_interval`
+      seconds have passed since the last write, and once more when the script
+      exits, so the metrics of short scripts are always written.
+    @ingroup metrics
+    """
+    ## Default upper bounds of the command duration histogram's buckets, in
+    #    seconds.
+    DEFAULT_BUCKETS = (
+        0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0, 3600.0
+    )
+
+    ## Default minimum number of seconds between writes of the metrics file.
+    DEFAULT_FLUSH_INTERVAL = 15.0
+
+    def __init__(self,
+        file_path: str | Path,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+        labels: Optional[Mapping[str, str]] = None,
+        prefix: str = "pyshell"):
+        """
+        Initializes the object.
+        @param file_path Path to write the metrics to. Can be a relative or
+          absolute path. If the path is a relative path, it will be
+          interpreted relative to the directory that the PyShell script is run
+          from.
+        @param flush_interval Minimum number of seconds between writes of the
+          metrics file. If 0, the file is written after every command.
+        @param buckets Upper bounds of the command duration histogram's
+          buckets, in seconds, in ascending order.
+        @param labels Labels added to every metric, e.g. the name of the
+          script, so that metrics from different scripts can be told apart.
+        @param prefix Prefix of each metric's name.
+        @throws ValueError If the buckets aren't in ascending order.
+        """
+        # Make sure the bounds are valid before any commands are run
+        Histogram(buckets)
+
+        self._file_path = Path(file_path).absolute().resolve()
+        self._flush_interval = flush_interval
+        self._buckets = list(buckets)
+        self._labels = dict(labels) if labels else {}
+        self._prefix = prefix
+        self._lock = threading.Lock()
+
+        # Metrics for each set of labels. Labels are stored in the same order
+        #   that they're written in.
+        self._durations: Dict[Tuple[str, str], Histogram] = {}
+        self._commands: Dict[Tuple[str, str, str], int] = {}
+        self._output_bytes: Dict[Tuple[str, str], int] = {}
+
+        # Whether metrics changed since the file was last written, and the
+        #   time it was last written at
+        self._dirty = False
+        self._last_flush = time.monotonic()
+
+        atexit.register(self.flush)
+
+
+    @property
+    def file_path(self) -> Path:
+        """
+        Path that the metrics are written to. Will always be an absolute path.
+        """
+        return self._file_path
+
+
+    def initialize(self, events: PyShellEvents) -> None:
+        """
+        Initializes the exporter.
+        @param events `PyShellEvents` instance for the pyshell instance that
+          the exporter exports metrics for.
+        """
+        events.on_command_finished += self._on_result
+        events.on_command_failed += self._on_result
+
+
+    def record(self, result: CommandResult) -> None:
+        """
+        Adds a command's result to the metrics.
+        @param result The result of the command.
+        """
+        backend = result.backend if result.backend else ""
+        with self._lock:
+            key = (result.command, backend)
+            histogram = self._durations.get(key)
+            if histogram is None:
+                histogram = Histogram(self._buckets)
+                self._durations[key] = histogram
+            histogram.observe(result.duration_seconds)
+
+            count_key = (result.command, backend, str(result.exit_code))
+            self._commands[count_key] = self._commands.get(count_key, 0) + 1
+            self._output_bytes[key] = self._output_bytes.get(key, 0) + \
+                result.output_buffer.byte_count
+            self._dirty = True
+
+            flush = time.monotonic() - self._last_flush >= self._flush_interval
+        if flush:
+            self.flush()
+
+
+    def flush(self) -> None:
+        """
+        Writes the metrics file if any metrics changed since it was last
+          written.
+        Errors writing the file are ignored so that a full or missing metrics
+          directory never causes the script to fail.
+        """
+        with self._lock:
+            if not self._dirty:
+                return
+            self._dirty = False
+            self._last_flush = time.monotonic()
+            text = self._render()
+            try:
+                self._write_atomic(text)
+            except OSError:
+                pass
+
+
+    def close(self) -> None:
+        """
+        Writes any pending metrics and stops writing metrics at exit.
+        """
+        self.flush()
+        atexit.unregister(self.flush)
+
+
+    def render(self) -> str:
+        """
+        Renders the current metrics in the OpenMetrics text format.
+        @return The contents of the metrics file.
+        """
+        with self._lock:
+            return self._render()
+
+
+    def _on_result(self,
+        sender: PyShellEvents,
+        result: CommandResult) -> None:
+        """
+        Callback bound to the on_command_finished and on_command_failed events.
+        @param sender Sender of the event.
+        @param result Result of the command that finished.
+        """
+        self.record(result)
+
+
+    def _render(self) -> str:
+        """
+        Renders the current metrics in the OpenMetrics text format.
+        Must be called with the lock held.
+        @return The contents of the metrics file.
+        """
+        lines: List[str] = []
+        name = f"{self._prefix}_command_duration_seconds"
+        lines.append(f"# TYPE {name} histogram")
+        lines.append(f"# UNIT {name} seconds")
+        lines.append(f"# HELP {name} Time taken by each command.")
+        for (command, backend), histogram in sorted(self._durations.items()):
+            labels = {"command": command, "backend": backend}
+            bounds = [repr(float(b)) for b in histogram.bounds] + ["+Inf"]
+            for bound, count in zip(bounds, histogram.cumulative_counts()):
+                lines.append(self._sample(
+                    f"{name}_bucket",
+                    {**labels, "le": bound},
+                    count
+                ))
+            lines.append(self._sample(f"{name}_count", labels, histogram.count))
+            lines.append(self._sample(f"{name}_sum", labels, histogram.sum))
+
+        name = f"{self._prefix}_commands"
+        lines.append(f"# TYPE {name} counter")
+        lines.append(f"# HELP {name} Number of commands that finished.")
+        for (command, backend, exit_code), count in \
+            sorted(self._commands.items()):
+            labels = {
+                "command": command,
+                "backend": backend,
+                "exit_code": exit_code
+            }
+            lines.append(self._sample(f"{name}_total", labels, count))
+
+        name = f"{self._prefix}_command_output_bytes"
+        lines.append(f"# TYPE {name} counter")
+        lines.append(f"# UNIT {name} bytes")
+        lines.append(f"# HELP {name} Amount of output written by commands.")
+        for (command, backend), size in sorted(self._output_bytes.items()):
+            lines.append(self._sample(
+                f"{name}_total",
+                {"command": command, "backend": backend},
+                size
+            ))
+
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+
+    def _sample(self,
+        name: str,
+        labels: Dict[str, str],
+        value: float) -> str:
+        """
+        Formats a single sample.
+        @param name Name of the sample.
+        @param labels Labels of the sample. The exporter's labels are added to
+          these.
+        @param value Value of the sample.
+        @return The line for the sample.
+        """
+        label_text = ",".join(
+            f'{k}="{self._escape(v)}"'
+            for k, v in {**self._labels, **labels}.items()
+        )
+        return f"{name}{{{label_text}}} {value}"
+
+
+    @staticmethod
+    def _escape(value: str) -> str:
+        """
+        Escapes a label value.
+        @param value The label value to escape.
+        @return The escaped value.
+        """
+        return value.replace("\\", "\\\\") \
+            .replace("\"", "\\\"") \
+            .replace("\n", "\\n")
+
+
+    def _write_atomic(self, text: str) -> None:
+        """
+        Writes the metrics file such that collectors see either the old or the
+          new file.
+        @param text The contents of the file.
+        """
+        fd, temp_path = tempfile.mkstemp(
+            dir=self._file_path.parent,
+            prefix=".tmp-"
+        )
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(text)
+            # Temporary files are only readable by their owner, but collectors
+            #   often run as a different user
+            os.chmod(temp_path, 0o644)
+            os.replace(temp_path, self._file_path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
@@ -1,7 +1,45 @@
 # pyright: reportUnusedImport=false
-from .docker import Docker
-from .doxygen import Doxygen
-from .shell import Shell
+import importlib
+from typing import Any, Dict, List, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .docker import Docker
+    from .doxygen import Doxygen
+    from .shell import Shell
+
+# Module that defines each module class. Classes are imported when they're
+#   first accessed, so using `Shell` doesn't import every docker command.
+_EXPORTS: Dict[str, str] = {
+    "Docker": ".docker",
+    "Doxygen": ".doxygen",
+    "Shell": ".shell",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    """
+    Imports a module class the first time it's accessed.
+    @param name The name being accessed.
+    @throws AttributeError If the name isn't exported by this package.
+    @return The module class.
+    """
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    """
+    Lists the names available in this package, including names that haven't
+      been imported yet.
+    """
+    return sorted(set(globals()) | set(__all__))
 
 ## @package pyshell.modules
 # Contains all built-in PyShell modules.
@@ -4,7 +4,7 @@ from pyshell.commands.command_result import CommandResult
 from pyshell.core.pyshell import PyShell
 from pyshell.doxygen.doxygen_command import DoxygenCommand
 from pyshell.modules.module import IModule
-from typing import Optional
+from typing import Optional, Sequence
 
 class Doxygen(IModule):
     """
@@ -16,7 +16,9 @@ class Doxygen(IModule):
     def generate_docs(
         doxyfile_path: str | Path,
         cmd_flags: int = CommandFlags.STANDARD,
-        pyshell: Optional[PyShell] = None) -> CommandResult:
+        pyshell: Optional[PyShell] = None,
+        inputs: Sequence[str | Path] | None = None,
+        outputs: Sequence[str | Path] | None = None) -> CommandResult:
         """
         Returns the results of running `doxygen` on the specified doxyfile.
         @param doxyfile_path The path to the doxyfile to use. Can be a relative
@@ -24,6 +26,13 @@ class Doxygen(IModule):
           relative to the script's current working directory.
         @param pyshell PyShell instance to execute the command via.
         @param cmd_flags The flags to set for the command.
+        @param inputs Files and directories that doxygen reads, in addition to
+          the doxyfile.
+        @param outputs Files and directories that doxygen generates. If these
+          are declared, executors such as `IncrementalExecutor` can skip
+          doxygen while its outputs are up to date.
         @return The results of running `doxygen` on the doxyfile.
         """
-        return DoxygenCommand(doxyfile_path, cmd_flags)(pyshell)
+        return DoxygenCommand(doxyfile_path, cmd_flags, inputs, outputs)(
+            pyshell
+        )
@@ -1,20 +1,26 @@
+import os
 from pathlib import Path
 from pyshell.commands.command_flags import CommandFlags
 from pyshell.commands.command_result import CommandResult
 from pyshell.commands.external_command import ExternalCommand
+from pyshell.commands.pipeline import Pipeline
+from pyshell.commands.pipeline_result import PipelineResult
+from pyshell.core.command_stream import CommandStream
 from pyshell.core.pyshell import PyShell
 from pyshell.modules.module import IModule
 from pyshell.shell.cp_command import CpCommand
 from pyshell.shell.echo_command import EchoCommand
 from pyshell.shell.ls_command import LsCommand
 from pyshell.shell.rm_command import RmCommand
-from typing import Optional, Sequence
+from typing import Iterable, Optional, Sequence
 
 class Shell(IModule):
     """
     Module that provides access to shell commands.
     Shell commands that are not supported by the native underlying shell will
-      be emulated.
+      be emulated. Commands that provide an emulator are also performed
+      in-process when the backend is configured to emulate commands (e.g.
+      `NativeBackend(emulate_commands=True)`).
     @ingroup modules
     @ingroup shell
     """
@@ -54,21 +60,75 @@ class Shell(IModule):
         return EchoCommand(message, cmd_flags)(pyshell)
 
 
+    @staticmethod
+    def pipe(
+        *commands: ExternalCommand,
+        pyshell: Optional[PyShell] = None) -> PipelineResult:
+        """
+        Runs commands with the stdout of each command piped to the next command.
+        The commands are connected via OS pipes, so the data passed between
+          them never goes through the PyShell process.
+        @param commands The commands to run, in pipeline order.
+        @param pyshell PyShell instance to execute the commands via.
+        @return The results of each command along with whether the pipeline as a
+          whole succeeded.
+        """
+        return Pipeline(*commands)(pyshell)
+
+
     @staticmethod
     def run(
         command: str,
         args: str | Path | Sequence[str | Path] | None = None,
         cmd_flags: int = CommandFlags.STANDARD,
-        pyshell: Optional[PyShell] = None) -> CommandResult:
+        pyshell: Optional[PyShell] = None,
+        stdin: bytes | str | os.PathLike | Iterable[bytes | str] | None = None,
+        inputs: Sequence[str | Path] | None = None,
+        outputs: Sequence[str | Path] | None = None) -> CommandResult:
         """
         Runs an arbitrary command via PyShell.
         @param command The command to run.
         @param args Arguments to pass to the command.
         @param pyshell PyShell instance to execute the command via.
         @param cmd_flags The flags to set for the command.
+        @param stdin Input to write to the command's stdin. May be bytes or a
+          string, a path to a file, or an iterable that yields chunks of bytes
+          or strings.
+        @param inputs Files and directories that the command reads. Used to
+          determine whether a cached result of a cacheable command is still
+          valid or whether the command's outputs are up to date.
+        @param outputs Files and directories that the command produces. Used to
+          determine whether the command's outputs are up to date.
         @return The results of running the command.
         """
-        return ExternalCommand(command, args, cmd_flags=cmd_flags)(pyshell)
+        return ExternalCommand(
+            command,
+            args,
+            cmd_flags=cmd_flags,
+            stdin=stdin,
+            inputs=inputs,
+            outputs=outputs
+        )(pyshell)
+
+
+    @staticmethod
+    def stream(
+        command: str,
+        args: str | Path | Sequence[str | Path] | None = None,
+        cmd_flags: int = CommandFlags.STANDARD,
+        pyshell: Optional[PyShell] = None) -> CommandStream:
+        """
+        Runs an arbitrary command while yielding each line of its output.
+        The command is started once the returned stream is iterated over.
+        @param command The command to run.
+        @param args Arguments to pass to the command.
+        @param pyshell PyShell instance to execute the command via.
+        @param cmd_flags The flags to set for the command.
+        @return A stream that yields each line of the command's output and
+          provides the command's result once iteration ends.
+        """
+        return ExternalCommand(command, args, cmd_flags=cmd_flags) \
+            .stream(pyshell)
 
 
     @staticmethod
@@ -1,6 +1,8 @@
 from pathlib import Path
+from pyshell.commands.command_emulator import ICommandEmulator
 from pyshell.commands.command_flags import CommandFlags
 from pyshell.commands.external_command import ExternalCommand
+from pyshell.shell.cp_emulator import CpEmulator
 from typing import List, Optional
 
 class CpCommand(ExternalCommand):
@@ -29,7 +31,8 @@ class CpCommand(ExternalCommand):
         # Determine what flags should be passed to the command
         flags: List[str] = []
 
-        if self._src.is_dir():
+        self._recursive = self._src.is_dir()
+        if self._recursive:
             flags.append("-r")
 
         # TODO: Make this cross platform
@@ -40,6 +43,16 @@ class CpCommand(ExternalCommand):
         )
 
 
+    @property
+    def emulator(self) -> Optional[ICommandEmulator]:
+        """
+        The emulator to use for the command.
+        @return The emulator that can perform the command in-process, or None
+          if the command can only be run via its executable.
+        """
+        return CpEmulator(self._src, self._dest, self._recursive)
+
+
     def _validate_args(self) -> Optional[str]:
         """
         Validates the arguments for the command.
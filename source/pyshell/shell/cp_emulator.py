@@ -0,0 +1,68 @@
+from pathlib import Path
+from pyshell.commands.command_emulator import ICommandEmulator
+import shutil
+from typing import TextIO
+
+class CpEmulator(ICommandEmulator):
+    """
+    Emulates `cp` using `shutil`.
+    @ingroup shell
+    """
+    def __init__(self, src: Path, dest: Path, recursive: bool):
+        """
+        Initializes the emulator.
+        @param src File or directory to copy.
+        @param dest Destination to copy the file or directory to.
+        @param recursive Whether directories should be copied, which mirrors
+          the `-r` flag.
+        """
+        self._src = src
+        self._dest = dest
+        self._recursive = recursive
+
+
+    def run(self, cwd: Path, stdout: TextIO, stderr: TextIO) -> int:
+        """
+        Performs the command's work.
+        @param cwd The working directory of the command. Relative paths used
+          by the command must be resolved relative to this directory. Will
+          always be an absolute path.
+        @param stdout Stream to write the command's standard output to.
+        @param stderr Stream to write the command's error output to. This may
+          be the same stream as `stdout`.
+        @return The exit code of the emulated command.
+        """
+        src = cwd / self._src
+        dest = cwd / self._dest
+
+        # Like `cp`, copying into an existing directory places the copy inside
+        #   of the directory
+        if dest.is_dir():
+            dest = dest / src.name
+
+        try:
+            if src.is_dir():
+                if not self._recursive:
+                    stderr.write(
+                        f"cp: -r not specified; omitting directory '{src}'\n"
+                    )
+                    return 1
+
+                # `cp -r` merges into existing directories and copies symlinks
+                #   as symlinks
+                shutil.copytree(
+                    src,
+                    dest,
+                    symlinks=True,
+                    copy_function=shutil.copy,
+                    dirs_exist_ok=True
+                )
+            else:
+                shutil.copy(src, dest)
+        except OSError as e:
+            if e.strerror:
+                stderr.write(f"cp: cannot copy '{src}': {e.strerror}\n")
+            else:
+                stderr.write(f"cp: {e}\n")
+            return 1
+        return 0
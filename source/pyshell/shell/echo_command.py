@@ -1,5 +1,7 @@
+from pyshell.commands.command_emulator import ICommandEmulator
 from pyshell.commands.command_flags import CommandFlags
 from pyshell.commands.external_command import ExternalCommand
+from pyshell.shell.echo_emulator import EchoEmulator
 from typing import Optional
 
 class EchoCommand(ExternalCommand):
@@ -16,8 +18,19 @@ class EchoCommand(ExternalCommand):
         @param message The message to write to stdout.
         @param cmd_flags The flags to set for the command.
         """
+        self._message = message
         super().__init__(
             "echo",
             message,
             cmd_flags=cmd_flags
         )
+
+
+    @property
+    def emulator(self) -> Optional[ICommandEmulator]:
+        """
+        The emulator to use for the command.
+        @return The emulator that can perform the command in-process, or None
+          if the command can only be run via its executable.
+        """
+        return EchoEmulator(self._message)
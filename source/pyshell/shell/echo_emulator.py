@@ -0,0 +1,30 @@
+from pathlib import Path
+from pyshell.commands.command_emulator import ICommandEmulator
+from typing import Optional, TextIO
+
+class EchoEmulator(ICommandEmulator):
+    """
+    Emulates `echo` by writing the message directly to stdout.
+    @ingroup shell
+    """
+    def __init__(self, message: Optional[str]):
+        """
+        Initializes the emulator.
+        @param message The message to write to stdout.
+        """
+        self._message = message
+
+
+    def run(self, cwd: Path, stdout: TextIO, stderr: TextIO) -> int:
+        """
+        Performs the command's work.
+        @param cwd The working directory of the command. Relative paths used
+          by the command must be resolved relative to this directory. Will
+          always be an absolute path.
+        @param stdout Stream to write the command's standard output to.
+        @param stderr Stream to write the command's error output to. This may
+          be the same stream as `stdout`.
+        @return The exit code of the emulated command.
+        """
+        stdout.write((self._message or "") + "\n")
+        return 0
@@ -1,6 +1,9 @@
 from pathlib import Path
+from pyshell.commands.command_emulator import ICommandEmulator
 from pyshell.commands.command_flags import CommandFlags
 from pyshell.commands.external_command import ExternalCommand
+from pyshell.shell.ls_emulator import LsEmulator
+from typing import Optional
 
 class LsCommand(ExternalCommand):
     """
@@ -16,8 +19,19 @@ class LsCommand(ExternalCommand):
         @param target_path The path to list the contents of.
         @param cmd_flags The flags to set for the command.
         """
+        self._target_path = Path(target_path) if target_path else None
         super().__init__(
             "ls",
             target_path,
             cmd_flags=cmd_flags
         )
+
+
+    @property
+    def emulator(self) -> Optional[ICommandEmulator]:
+        """
+        The emulator to use for the command.
+        @return The emulator that can perform the command in-process, or None
+          if the command can only be run via its executable.
+        """
+        return LsEmulator(self._target_path)
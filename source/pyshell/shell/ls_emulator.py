@@ -0,0 +1,58 @@
+import os
+from pathlib import Path
+from pyshell.commands.command_emulator import ICommandEmulator
+from typing import Optional, TextIO
+
+class LsEmulator(ICommandEmulator):
+    """
+    Emulates `ls` using `os.scandir()`.
+    Entries are written one per line and sorted by name, which matches the
+      output of `ls` when its output is not written to a terminal.
+    @ingroup shell
+    """
+    def __init__(self, target_path: Optional[Path]):
+        """
+        Initializes the emulator.
+        @param target_path The path to list the contents of. If this is None,
+          the contents of the working directory will be listed.
+        """
+        self._target_path = target_path
+
+
+    def run(self, cwd: Path, stdout: TextIO, stderr: TextIO) -> int:
+        """
+        Performs the command's work.
+        @param cwd The working directory of the command. Relative paths used
+          by the command must be resolved relative to this directory. Will
+          always be an absolute path.
+        @param stdout Stream to write the command's standard output to.
+        @param stderr Stream to write the command's error output to. This may
+          be the same stream as `stdout`.
+        @return The exit code of the emulated command.
+        """
+        if self._target_path is None:
+            path = cwd
+        else:
+            path = cwd / self._target_path
+
+        try:
+            if path.is_dir():
+                with os.scandir(path) as it:
+                    names = sorted(
+                        e.name for e in it if not e.name.startswith(".")
+                    )
+                for name in names:
+                    stdout.write(name + "\n")
+            elif os.path.lexists(path):
+                # `ls` prints non-directory paths exactly as they were given
+                stdout.write(f"{self._target_path}\n")
+            else:
+                stderr.write(
+                    f"ls: cannot access '{self._target_path}': " +
+                    "No such file or directory\n"
+                )
+                return 2
+        except OSError as e:
+            stderr.write(f"ls: cannot open directory '{path}': {e.strerror}\n")
+            return 2
+        return 0
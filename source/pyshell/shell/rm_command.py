@@ -1,7 +1,9 @@
 from pathlib import Path
+from pyshell.commands.command_emulator import ICommandEmulator
 from pyshell.commands.command_flags import CommandFlags
 from pyshell.commands.external_command import ExternalCommand
-from typing import List
+from pyshell.shell.rm_emulator import RmEmulator
+from typing import List, Optional
 
 class RmCommand(ExternalCommand):
     """
@@ -26,8 +28,21 @@ class RmCommand(ExternalCommand):
         if force:
             flags.append("-f")
 
-        if Path(path).is_dir():
+        self._path = Path(path)
+        self._force = force
+        self._recursive = self._path.is_dir()
+        if self._recursive:
             flags.append("-r")
 
         # TODO: Make this cross platform
         super().__init__("rm", flags + [path], cmd_flags=cmd_flags)
+
+
+    @property
+    def emulator(self) -> Optional[ICommandEmulator]:
+        """
+        The emulator to use for the command.
+        @return The emulator that can perform the command in-process, or None
+          if the command can only be run via its executable.
+        """
+        return RmEmulator(self._path, self._force, self._recursive)
@@ -0,0 +1,58 @@
+from pathlib import Path
+from pyshell.commands.command_emulator import ICommandEmulator
+import shutil
+from typing import TextIO
+
+class RmEmulator(ICommandEmulator):
+    """
+    Emulates `rm` using `os` and `shutil`.
+    @ingroup shell
+    """
+    def __init__(self, path: Path, force: bool, recursive: bool):
+        """
+        Initializes the emulator.
+        @param path Path to remove.
+        @param force Whether a missing path should be ignored, which mirrors
+          the `-f` flag.
+        @param recursive Whether directories should be removed, which mirrors
+          the `-r` flag.
+        """
+        self._path = path
+        self._force = force
+        self._recursive = recursive
+
+
+    def run(self, cwd: Path, stdout: TextIO, stderr: TextIO) -> int:
+        """
+        Performs the command's work.
+        @param cwd The working directory of the command. Relative paths used
+          by the command must be resolved relative to this directory. Will
+          always be an absolute path.
+        @param stdout Stream to write the command's standard output to.
+        @param stderr Stream to write the command's error output to. This may
+          be the same stream as `stdout`.
+        @return The exit code of the emulated command.
+        """
+        path = cwd / self._path
+        try:
+            # Symlinks to directories are removed like files, not followed
+            if path.is_dir() and not path.is_symlink():
+                if not self._recursive:
+                    stderr.write(
+                        f"rm: cannot remove '{self._path}': Is a directory\n"
+                    )
+                    return 1
+                shutil.rmtree(path)
+            else:
+                path.unlink()
+        except FileNotFoundError:
+            if self._force:
+                return 0
+            stderr.write(
+                f"rm: cannot remove '{self._path}': No such file or directory\n"
+            )
+            return 1
+        except OSError as e:
+            stderr.write(f"rm: cannot remove '{self._path}': {e.strerror}\n")
+            return 1
+        return 0
@@ -1,12 +1,31 @@
 from __future__ import annotations
-import inspect
 import os
 from pathlib import Path
+import sys
+from types import CodeType, FrameType
+from typing import Dict, Optional
 
 class CallerInfo:
     """
     Helper class that captures caller information for a method.
+    Capturing a stack frame only records the frame's code object and line
+      number. The absolute path of the code's file is resolved the first time
+      it's requested, and resolved paths are cached per file, so capturing the
+      location of thousands of commands doesn't require any filesystem access.
     """
+    # Whether `closest_external_frame()` captures stack frames
+    _capture_enabled = True
+
+    # Absolute paths of source files, keyed by the filename of the code object
+    _resolved_paths: Dict[str, Path] = {}
+
+    # Whether each source file is part of PyShell, keyed by the filename of the
+    #   code object
+    _internal_files: Dict[str, bool] = {}
+
+    # Shared instance returned when stack frames aren't captured
+    _unknown: Optional[CallerInfo] = None
+
     def __init__(self, file_path: Path | str, line_number: int):
         """
         Initializes the object.
@@ -20,24 +39,65 @@ class CallerInfo:
         if not file_path.is_absolute():
             raise ValueError("file_path must be an absolute path.")
 
-        self._file_path = file_path
+        self._file_path: Optional[Path] = file_path
         self._line_number = line_number
 
+        # Code object whose file path hasn't been resolved yet
+        self._code: Optional[CodeType] = None
+
+
+    @staticmethod
+    def capture_enabled() -> bool:
+        """
+        Gets whether commands capture the location that they were created at.
+        """
+        return CallerInfo._capture_enabled
+
+
+    @staticmethod
+    def set_capture_enabled(enabled: bool) -> None:
+        """
+        Sets whether commands capture the location that they were created at.
+        Scripts that create very large numbers of commands can disable capture
+          to avoid walking the stack for each command. While capture is
+          disabled, `closest_external_frame()` returns `CallerInfo.unknown()`.
+        @param enabled Whether to capture caller locations.
+        """
+        CallerInfo._capture_enabled = enabled
+
+
+    @staticmethod
+    def unknown() -> CallerInfo:
+        """
+        Gets the caller info used when the caller's location wasn't captured.
+        @returns A caller info instance whose `is_known` property is False.
+        """
+        if CallerInfo._unknown is None:
+            unknown = CallerInfo.__new__(CallerInfo)
+            unknown._file_path = Path("<unknown>")
+            unknown._line_number = 0
+            unknown._code = None
+            CallerInfo._unknown = unknown
+        return CallerInfo._unknown
+
 
     @staticmethod
     def closest_external_frame() -> CallerInfo:
         """
         Creates a `CallerInfo` instance for the closest non-pymake stack frame.
         @returns A `CallerInfo` instance that captures the data for the closest
-          non-pymake stack frame.
+          non-pymake stack frame, or `CallerInfo.unknown()` if capture is
+          disabled.
         """
-        i = 1
-        caller_info = CallerInfo.from_stack_frame(i)
-        sep = os.path.sep
-        while f"{sep}pyshell{sep}" in str(caller_info.file_path):
-            i += 1
-            caller_info = CallerInfo.from_stack_frame(i)
-        return caller_info
+        if not CallerInfo._capture_enabled:
+            return CallerInfo.unknown()
+
+        frame: Optional[FrameType] = sys._getframe(1)
+        while frame and CallerInfo._is_internal(frame.f_code.co_filename):
+            frame = frame.f_back
+        if not frame:
+            return CallerInfo.unknown()
+        return CallerInfo._from_frame(frame)
 
 
     @staticmethod
@@ -51,30 +111,20 @@ class CallerInfo:
         # Get the frame for the caller whose information should be captured
         # Note that 1 is added to the offset passed to this method to account
         #   for this method's stack frame.
-        frame = inspect.currentframe()
-        for _ in range(0, offset + 1):
-            assert frame
-            frame = frame.f_back
-
-        # Make sure that a stack frame exists at the target level
-        assert frame
-
-        # Capture the information so that it can be used later
-        # Note that `frame` must not be stored and used to get the values later.
-        #   Attempting to do so will return values correct at the point that
-        #   the frame's values are accessed, not the time when the frame was
-        #   constructed.
-        file_path = Path(frame.f_code.co_filename).absolute().resolve()
-        line_number = frame.f_lineno
-        return CallerInfo(file_path, line_number)
+        return CallerInfo._from_frame(sys._getframe(offset + 1))
 
 
     @property
     def file_path(self) -> Path:
         """
         Gets the file path of the caller's code.
-        @invariant This will always be an absolute path.
+        @invariant This will always be an absolute path unless the caller's
+          location is unknown.
         """
+        if self._file_path is None:
+            assert self._code
+            self._file_path = CallerInfo._resolve(self._code.co_filename)
+            self._code = None
         return self._file_path
 
 
@@ -86,12 +136,20 @@ class CallerInfo:
         return self._line_number
 
 
+    @property
+    def is_known(self) -> bool:
+        """
+        Gets whether the caller's location was captured.
+        """
+        return self is not CallerInfo._unknown
+
+
     def __hash__(self) -> int:
         """
         Generates the hash of the object.
         @returns The hash of the object.
         """
-        return hash((self._file_path, self._line_number))
+        return hash((self.file_path, self._line_number))
 
 
     def __eq__(self, other: object) -> bool:
@@ -102,10 +160,77 @@ class CallerInfo:
         """
         if isinstance(other, CallerInfo):
             return (
-                self._file_path,
+                self.file_path,
                 self._line_number
             ) == (
                 other.file_path,
                 other.line_number
             )
         return False
+
+
+    @staticmethod
+    def _from_frame(frame: FrameType) -> CallerInfo:
+        """
+        Captures the location of a stack frame.
+        @param frame The stack frame to capture.
+        @returns A caller info instance for the frame.
+        """
+        # Capture the information so that it can be used later
+        # Note that `frame` must not be stored and used to get the values later.
+        #   Attempting to do so will return values correct at the point that
+        #   the frame's values are accessed, not the time when the frame was
+        #   constructed.
+        caller_info = CallerInfo.__new__(CallerInfo)
+        caller_info._line_number = frame.f_lineno
+
+        # Relative filenames depend on the current working directory, so they
+        #   must be resolved before the working directory changes
+        filename = frame.f_code.co_filename
+        if os.path.isabs(filename):
+            caller_info._file_path = None
+            caller_info._code = frame.f_code
+        else:
+            caller_info._file_path = Path(filename).absolute().resolve()
+            caller_info._code = None
+        return caller_info
+
+
+    @staticmethod
+    def _resolve(filename: str) -> Path:
+        """
+        Resolves the absolute path of a source file.
+        @param filename The filename of a code object. Must be an absolute path.
+        @returns The resolved path of the file.
+        """
+        file_path = CallerInfo._resolved_paths.get(filename)
+        if file_path is None:
+            file_path = Path(filename).resolve()
+            CallerInfo._resolved_paths[filename] = file_path
+        return file_path
+
+
+    @staticmethod
+    def _is_internal(filename: str) -> bool:
+        """
+        Checks whether a source file is part of PyShell.
+        @param filename The filename of a code object.
+        @returns True if the file is part of PyShell.
+        """
+        internal = CallerInfo._internal_files.get(filename)
+        if internal is not None:
+            return internal
+
+        absolute = os.path.isabs(filename)
+        if absolute:
+            file_path = CallerInfo._resolve(filename)
+        else:
+            file_path = Path(filename).absolute().resolve()
+        sep = os.path.sep
+        internal = f"{sep}pyshell{sep}" in str(file_path)
+
+        # Relative filenames may refer to a different file once the current
+        #   working directory changes, so they aren't cached
+        if absolute:
+            CallerInfo._internal_files[filename] = internal
+        return internal
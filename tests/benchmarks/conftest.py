@@ -0,0 +1,122 @@
+import json
+import os
+from pathlib import Path
+import pytest
+from typing import Any, Dict, Iterator
+
+# File that stores the baseline result of each benchmark metric
+DEFAULT_BASELINES_PATH = Path(__file__).parent / "baselines.json"
+
+# Factor by which a metric may be worse than its baseline before the benchmark
+#   fails. Benchmarks are noisy, so this is deliberately loose; it's meant to
+#   catch changes that make PyShell significantly slower.
+DEFAULT_THRESHOLD = 1.5
+
+
+class BenchmarkBaselines:
+    """
+    Compares benchmark metrics against stored baselines.
+    Metrics should be measured relative to a reference that's measured in the
+      same run (e.g. as a ratio to running the same command via `subprocess`)
+      rather than as absolute times or throughputs, so that the stored
+      baselines hold on any machine.
+    The following environment variables control how metrics are checked:
+    - `PYSHELL_BENCHMARK_BASELINES`: Path of the baselines file to use instead
+      of `baselines.json`, e.g. to keep baselines for a specific machine.
+    - `PYSHELL_BENCHMARK_THRESHOLD`: Factor by which a metric may be worse
+      than its baseline before the benchmark fails.
+    - `PYSHELL_UPDATE_BASELINES`: If set to `1`, metrics aren't checked and the
+      baselines file is rewritten with the measured values instead.
+    """
+    def __init__(self, path: Path, threshold: float, update: bool):
+        """
+        Initializes the object.
+        @param path Path of the baselines file.
+        @param threshold Factor by which a metric may be worse than its
+          baseline.
+        @param update Whether to record metrics as the new baselines.
+        """
+        self._path = path
+        self._threshold = threshold
+        self._update = update
+        if path.exists():
+            self._baselines: Dict[str, Dict[str, Any]] = \
+                json.loads(path.read_text())
+        else:
+            self._baselines = {}
+
+
+    def check(self,
+        name: str,
+        value: float,
+        unit: str,
+        higher_is_better: bool,
+        noise_floor: float = 0.0) -> None:
+        """
+        Checks a metric against its baseline.
+        Metrics without a baseline always pass.
+        @param name Unique name of the metric.
+        @param value The measured value of the metric.
+        @param unit Unit of the metric, which is only used for reporting.
+        @param higher_is_better Whether larger values are better (e.g.
+          throughput) or worse (e.g. latency).
+        @param noise_floor Differences from the baseline that are smaller than
+          this are never treated as regressions. This is used for metrics
+          whose baseline is close to zero, where the threshold alone would
+          fail on measurement noise.
+        """
+        baseline = self._baselines.get(name)
+        if baseline is not None:
+            print(f"{name}: {value:.4g} {unit} " +
+                f"(baseline: {baseline['value']:.4g} {unit})")
+        else:
+            print(f"{name}: {value:.4g} {unit} (no baseline)")
+
+        if self._update:
+            self._baselines[name] = {
+                "value": value,
+                "unit": unit,
+                "higher_is_better": higher_is_better
+            }
+            return
+        if baseline is None:
+            return
+
+        if higher_is_better:
+            regressed = value * self._threshold < baseline["value"]
+        else:
+            regressed = value > baseline["value"] * self._threshold
+        if abs(value - baseline["value"]) < noise_floor:
+            regressed = False
+        assert not regressed, f"{name} regressed: {value:.4g} {unit} vs " + \
+            f"baseline {baseline['value']:.4g} {unit}"
+
+
+    def save(self) -> None:
+        """
+        Writes the baselines file if baselines are being updated.
+        """
+        if not self._update:
+            return
+        self._path.write_text(
+            json.dumps(self._baselines, indent=4, sort_keys=True) + "\n")
+
+
+@pytest.fixture(scope="session")
+def baselines() -> Iterator[BenchmarkBaselines]:
+    """
+    Provides the baselines that benchmark metrics are checked against.
+    """
+    path = Path(os.environ.get(
+        "PYSHELL_BENCHMARK_BASELINES",
+        DEFAULT_BASELINES_PATH
+    ))
+    threshold = float(os.environ.get(
+        "PYSHELL_BENCHMARK_THRESHOLD",
+        DEFAULT_THRESHOLD
+    ))
+    update = os.environ.get("PYSHELL_UPDATE_BASELINES") == "1"
+
+    baselines = BenchmarkBaselines(path, threshold, update)
+    yield baselines
+    baselines.save()
@@ -0,0 +1,71 @@
+from datetime import datetime
+from io import StringIO
+from pyshell.commands.command_result import CommandResult
+from pyshell.logging.buffered_command_logger import BufferedCommandLogger
+from pyshell.logging.null_command_logger import NullCommandLogger
+from pyshell.logging.stream_config import StreamConfig
+from threading import Lock
+import time
+import tracemalloc
+
+# Total amount of output to log, in bytes
+OUTPUT_SIZE = 256 * 1024 * 1024
+
+# Size of each chunk logged. This matches the size of the chunks read by the
+#   output pump.
+CHUNK_SIZE = 64 * 1024
+
+# Memory limit used by the logger's output buffer
+MEMORY_LIMIT = 4 * 1024 * 1024
+
+
+def test_buffered_output_memory_usage(baselines):
+    """
+    Verifies that buffering a large amount of output for a command that runs
+      in parallel with other commands does not hold the output in memory.
+    """
+    chunk = ("x" * 79 + "\n") * (CHUNK_SIZE // 80)
+    logger = BufferedCommandLogger(
+        lambda: NullCommandLogger(StreamConfig.SPLIT_STREAMS),
+        Lock(),
+        MEMORY_LIMIT
+    )
+    result = CommandResult(
+        "command",
+        [],
+        "/tmp",
+        "",
+        0,
+        False,
+        datetime.now(),
+        datetime.now()
+    )
+
+    # Alternate between the streams so that the logger has to track where
+    #   each stream's output starts
+    tracemalloc.start()
+    try:
+        start_time = time.perf_counter()
+        for i in range(OUTPUT_SIZE // len(chunk)):
+            if i % 2:
+                logger.log(StringIO(), StringIO(chunk))
+            else:
+                logger.log(StringIO(chunk), StringIO())
+        logger.log_results(result, [])
+        duration = time.perf_counter() - start_time
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    logger.output_buffer.close()
+
+    print(
+        f"Buffered and replayed {OUTPUT_SIZE / (1024 * 1024):.0f} MiB in " +
+        f"{duration:.3f} s; peak memory was " +
+        f"{peak_memory / (1024 * 1024):.1f} MiB"
+    )
+    baselines.check(
+        "buffered_logger_peak_memory_vs_limit",
+        peak_memory / MEMORY_LIMIT,
+        "x",
+        higher_is_better=False
+    )
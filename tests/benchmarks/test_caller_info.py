@@ -0,0 +1,74 @@
+from __future__ import annotations
+import inspect
+import os
+from pathlib import Path
+from pyshell.commands.external_command import ExternalCommand
+from pyshell.tracing.caller_info import CallerInfo
+import time
+from typing import Callable
+
+# Number of commands to create for each measurement
+COMMAND_COUNT = 5000
+
+
+def _eager_closest_external_frame() -> Path:
+    """
+    Finds the closest non-PyShell stack frame the way that `CallerInfo` did
+      before it captured frames lazily, resolving the path of every frame.
+    @returns The path of the closest non-PyShell stack frame.
+    """
+    frame = inspect.currentframe()
+    sep = os.path.sep
+    while True:
+        assert frame
+        frame = frame.f_back
+        assert frame
+        file_path = Path(frame.f_code.co_filename).absolute().resolve()
+        if f"{sep}pyshell{sep}" not in str(file_path):
+            return file_path
+
+
+def _time_per_call(func: Callable[[], object]) -> float:
+    """
+    Measures the average time taken by a function.
+    @param func The function to measure.
+    @returns The average time taken per call, in seconds.
+    """
+    start_time = time.perf_counter()
+    for _ in range(COMMAND_COUNT):
+        func()
+    return (time.perf_counter() - start_time) / COMMAND_COUNT
+
+
+def test_capture_cost(baselines):
+    """
+    Compares the cost of capturing a command's origin lazily to resolving the
+      path of every stack frame, and to not capturing the origin at all.
+    """
+    eager = _time_per_call(_eager_closest_external_frame)
+    lazy = _time_per_call(CallerInfo.closest_external_frame)
+    create_command = lambda: ExternalCommand("true", locate_executable=False)
+    with_capture = _time_per_call(create_command)
+    CallerInfo.set_capture_enabled(False)
+    try:
+        without_capture = _time_per_call(create_command)
+    finally:
+        CallerInfo.set_capture_enabled(True)
+
+    print(f"Eager capture: {eager * 10**6:.2f} us")
+    print(f"Lazy capture: {lazy * 10**6:.2f} us")
+    print(f"Command with capture: {with_capture * 10**6:.2f} us")
+    print(f"Command without capture: {without_capture * 10**6:.2f} us")
+
+    baselines.check(
+        "lazy_capture_vs_eager",
+        lazy / eager,
+        "x",
+        higher_is_better=False
+    )
+    baselines.check(
+        "command_creation_with_capture_vs_without",
+        with_capture / without_capture,
+        "x",
+        higher_is_better=False
+    )
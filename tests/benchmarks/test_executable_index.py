@@ -0,0 +1,74 @@
+import os
+from pathlib import Path
+from pyshell.core.platform_statics import PlatformStatics
+import pytest
+import time
+from typing import Callable, List
+
+# Number of directories on the simulated PATH
+PATH_DIR_COUNT = 48
+
+# Number of files in each PATH directory
+FILES_PER_DIR = 200
+
+# Number of lookups to time
+LOOKUP_COUNT = 2000
+
+
+def _search_path(filename: str) -> Path:
+    """
+    Resolves a file by checking every PATH directory, which is how
+      `PlatformStatics.resolve_using_path()` worked before it used an index.
+    @param filename The filename to resolve.
+    @returns The path to the file.
+    """
+    for path in os.environ["PATH"].split(os.pathsep):
+        exe_path = Path(path).joinpath(filename)
+        if os.path.isfile(exe_path):
+            return exe_path
+    raise FileNotFoundError(filename)
+
+
+def _time_lookups(resolve: Callable[[str], Path], names: List[str]) -> float:
+    """
+    Measures the average time taken to resolve a file.
+    @param resolve The function used to resolve files.
+    @param names The filenames to resolve, in turn.
+    @returns The average time taken per lookup, in seconds.
+    """
+    start_time = time.perf_counter()
+    for i in range(LOOKUP_COUNT):
+        resolve(names[i % len(names)])
+    return (time.perf_counter() - start_time) / LOOKUP_COUNT
+
+
+def test_resolve_with_long_path(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    baselines):
+    """
+    Compares resolving executables via the index to searching each PATH
+      directory on a PATH as long as those used by nix or conda environments.
+    """
+    dirs = [tmp_path / f"bin{i}" for i in range(PATH_DIR_COUNT)]
+    for i, d in enumerate(dirs):
+        d.mkdir()
+        for j in range(FILES_PER_DIR):
+            (d / f"tool{i}_{j}").touch()
+    monkeypatch.setenv("PATH", os.pathsep.join(str(d) for d in dirs))
+
+    # Look up tools spread across the PATH, as a script would
+    names = [f"tool{i}_0" for i in range(0, PATH_DIR_COUNT, 4)]
+    PlatformStatics.resolve_using_path(names[0])
+
+    search_latency = _time_lookups(_search_path, names)
+    index_latency = _time_lookups(PlatformStatics.resolve_using_path, names)
+    print(f"PATH search: {search_latency * 10**6:.1f} us per lookup")
+    print(f"Indexed: {index_latency * 10**6:.1f} us per lookup")
+
+    baselines.check(
+        "indexed_lookup_vs_path_search",
+        index_latency / search_latency,
+        "x",
+        higher_is_better=False
+    )
@@ -0,0 +1,61 @@
+import subprocess
+import sys
+import time
+
+# Number of times each import is timed. The fastest run is used since it's the
+#   least affected by other processes.
+RUN_COUNT = 10
+
+
+def _time_statement(statement: str) -> float:
+    """
+    Measures the time taken to run a statement in a fresh interpreter.
+    @param statement The Python statement to run.
+    @returns The fastest time taken to start the interpreter and run the
+      statement, in seconds.
+    """
+    fastest = float("inf")
+    for _ in range(RUN_COUNT):
+        start_time = time.perf_counter()
+        subprocess.run([sys.executable, "-c", statement], check=True)
+        fastest = min(fastest, time.perf_counter() - start_time)
+    return fastest
+
+
+def test_import_time(baselines):
+    """
+    Compares the time taken to start a script that uses PyShell to the time
+      taken to start an empty script, and to a script that loads every
+      export eagerly.
+    """
+    bare = _time_statement("pass")
+    package = _time_statement("import pyshell")
+    shell = _time_statement(
+        "from pyshell import PyShell; from pyshell.modules import Shell")
+    eager = _time_statement(
+        "import pyshell, pyshell.modules; "
+        "[getattr(m, n) for m in (pyshell, pyshell.modules) for n in m.__all__]"
+    )
+    print(f"Interpreter: {bare * 1000:.1f} ms")
+    print(f"import pyshell: {package * 1000:.1f} ms")
+    print(f"PyShell + Shell: {shell * 1000:.1f} ms")
+    print(f"All exports: {eager * 1000:.1f} ms")
+
+    baselines.check(
+        "import_package_vs_interpreter",
+        package / bare,
+        "x",
+        higher_is_better=False
+    )
+    baselines.check(
+        "import_shell_vs_all_exports",
+        shell / eager,
+        "x",
+        higher_is_better=False
+    )
+    baselines.check(
+        "import_time_vs_interpreter",
+        shell / bare,
+        "x",
+        higher_is_better=False
+    )
@@ -0,0 +1,81 @@
+from datetime import datetime
+from pyshell.commands.command_result import CommandResult
+from pyshell.scanners.entry import Entry
+from pyshell.scanners.line_scanner import ILineScanner
+from pyshell.scanners.severity import ESeverity
+import time
+from typing import List, Optional
+
+# Number of lines of output to scan
+LINE_COUNT = 50000
+
+# Every this many lines of output contain an error
+ERROR_INTERVAL = 1000
+
+
+class ErrorScanner(ILineScanner):
+    """
+    Scanner that reports each line starting with `error:`, which is the
+      typical shape of a scanner for a compiler or linter.
+    """
+    def _process_command_line(self,
+        result: CommandResult,
+        line: str,
+        next_lines: List[str],
+        line_number: int) -> Optional[Entry]:
+        if not line.startswith("error:"):
+            return None
+        return Entry(
+            ESeverity.ERROR,
+            line,
+            line_number,
+            line_number,
+            "Compilation failed."
+        )
+
+
+def _scan_directly(output: str) -> List[Entry]:
+    """
+    Finds the same errors as `ErrorScanner` without the scanner framework,
+      which is the least work that scanning the output requires.
+    @param output The output to scan.
+    @returns An entry for each error.
+    """
+    return [
+        Entry(ESeverity.ERROR, line, i, i, "Compilation failed.")
+        for i, line in enumerate(output.splitlines())
+        if line.startswith("error:")
+    ]
+
+
+def test_line_scanner_throughput(baselines):
+    """
+    Measures how quickly an `ILineScanner` processes a large command output,
+      relative to scanning the output with a plain loop.
+    """
+    lines = []
+    for i in range(LINE_COUNT):
+        if i % ERROR_INTERVAL == 0:
+            lines.append(f"error: failed to compile src/file{i}.c")
+        else:
+            lines.append(f"  CC src/file{i}.c -o build/file{i}.o")
+    output = "\n".join(lines) + "\n"
+    start = datetime.utcnow()
+    result = CommandResult("make", [], "/", output, 1, False, start, start)
+
+    start_time = time.perf_counter()
+    expected = _scan_directly(output)
+    direct_elapsed = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    entries = ErrorScanner().scan_for_errors(result)
+    elapsed = time.perf_counter() - start_time
+
+    assert len(entries) == len(expected) == LINE_COUNT // ERROR_INTERVAL
+    print(f"ILineScanner: {len(output) / elapsed / 10**6:.2f} MB/s")
+    baselines.check(
+        "line_scanner_time_vs_loop",
+        elapsed / direct_elapsed,
+        "x",
+        higher_is_better=False
+    )
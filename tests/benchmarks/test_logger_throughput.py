@@ -0,0 +1,121 @@
+from contextlib import redirect_stdout
+from datetime import datetime
+from io import StringIO
+import os
+from pathlib import Path
+from pyshell.commands.command_metadata import CommandMetadata
+from pyshell.commands.command_result import CommandResult
+from pyshell.logging.command_logger import ICommandLogger
+from pyshell.logging.console_command_logger import ConsoleCommandLogger
+from pyshell.logging.console_logger import ConsoleLogger
+from pyshell.logging.file_command_logger import FileCommandLogger
+from pyshell.logging.logger_options import LoggerOptions
+from pyshell.logging.multi_file_logger import MultiFileLogger
+from pyshell.logging.single_file_logger import SingleFileLogger
+from pyshell.logging.stream_config import StreamConfig
+from pyshell.logging.tee_command_logger import TeeCommandLogger
+import pytest
+import time
+from typing import Callable, Dict
+
+# Amount of output logged by each benchmark
+OUTPUT_BYTES = 32 * 1024 * 1024
+
+# Size of each chunk of output passed to the logger, which matches the size of
+#   the chunks that the native backend reads from a pipe
+CHUNK_BYTES = 64 * 1024
+
+# Metadata of the command whose output is logged
+METADATA = CommandMetadata("command", ["arg1", "arg2"])
+
+
+def _construct_tee_logger(tmp_path: Path) -> ICommandLogger:
+    """
+    Creates a tee logger that writes output to the console and a file.
+    @param tmp_path Directory to write the log file to.
+    @returns The command logger.
+    """
+    return TeeCommandLogger(
+        StreamConfig.MERGE_STREAMS,
+        [
+            ConsoleCommandLogger(METADATA, LoggerOptions(), tmp_path),
+            FileCommandLogger(
+                METADATA,
+                LoggerOptions(),
+                tmp_path,
+                tmp_path / "tee.log",
+                append=False,
+                add_header=False,
+                add_footer=False
+            )
+        ]
+    )
+
+
+# Functions that create a command logger for each logger being measured
+LOGGERS: Dict[str, Callable[[Path], ICommandLogger]] = {
+    "console": lambda tmp_path: ConsoleLogger().construct_logger(
+        METADATA, LoggerOptions(), tmp_path),
+    "single_file": lambda tmp_path: SingleFileLogger(
+        tmp_path / "output.log").construct_logger(
+            METADATA, LoggerOptions(), tmp_path),
+    "multi_file": lambda tmp_path: MultiFileLogger(
+        tmp_path / "logs").construct_logger(
+            METADATA, LoggerOptions(), tmp_path),
+    "tee": _construct_tee_logger,
+}
+
+
+def _time_file_write(path: Path, chunk: str, chunk_count: int) -> float:
+    """
+    Measures the time taken to write output directly to a file, which is the
+      least work that a logger writing the output anywhere has to do.
+    @param path The path of the file to write.
+    @param chunk The chunk of output to write.
+    @param chunk_count The number of times to write the chunk.
+    @returns The time taken to write the output, in seconds.
+    """
+    start_time = time.perf_counter()
+    with open(path, "w") as f:
+        for _ in range(chunk_count):
+            f.write(chunk)
+    return time.perf_counter() - start_time
+
+
+@pytest.mark.parametrize("name", LOGGERS)
+def test_logger_throughput(tmp_path: Path, name: str, baselines):
+    """
+    Measures how quickly each logger can log a command's output, relative to
+      writing the output directly to a file.
+    """
+    line = "x" * 79 + "\n"
+    chunk = line * (CHUNK_BYTES // len(line))
+    chunk_count = OUTPUT_BYTES // len(chunk)
+    write_elapsed = _time_file_write(tmp_path / "raw.log", chunk, chunk_count)
+
+    # Console output is discarded so that the terminal isn't measured
+    with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+        start_time = time.perf_counter()
+        logger = LOGGERS[name](tmp_path)
+        for _ in range(chunk_count):
+            logger.log(StringIO(chunk), None)
+        start = datetime.utcnow()
+        logger.log_results(CommandResult(
+            METADATA.command,
+            METADATA.args,
+            str(tmp_path),
+            logger.output_buffer,
+            0,
+            False,
+            start,
+            start
+        ), [])
+        elapsed = time.perf_counter() - start_time
+
+    print(f"{name}: {len(chunk) * chunk_count / elapsed / 10**6:.0f} MB/s")
+    baselines.check(
+        f"logger_time_vs_file_write[{name}]",
+        elapsed / write_elapsed,
+        "x",
+        higher_is_better=False
+    )
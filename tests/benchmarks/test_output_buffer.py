@@ -0,0 +1,49 @@
+from pyshell.commands.output_buffer import OutputBuffer
+import time
+import tracemalloc
+
+# Total amount of output to append to the buffer, in bytes
+OUTPUT_SIZE = 256 * 1024 * 1024
+
+# Size of each chunk appended to the buffer. This matches the size of the
+#   chunks read by the output pump.
+CHUNK_SIZE = 64 * 1024
+
+# Memory limit used by the buffer
+MEMORY_LIMIT = 4 * 1024 * 1024
+
+
+def test_large_output_memory_usage(baselines):
+    """
+    Verifies that storing a large amount of output in a buffer does not hold
+      the output in memory.
+    """
+    data = (b"x" * 79 + b"\n") * (CHUNK_SIZE // 80)
+    buffer = OutputBuffer(MEMORY_LIMIT)
+
+    # Each chunk is decoded separately, like the output pump does, so that
+    #   each chunk is a new string that the buffer would have to keep alive
+    tracemalloc.start()
+    try:
+        start_time = time.perf_counter()
+        for _ in range(OUTPUT_SIZE // len(data)):
+            buffer.append(data.decode())
+        tail = buffer.tail(1)
+        duration = time.perf_counter() - start_time
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    buffer.close()
+
+    print(
+        f"Buffered {OUTPUT_SIZE / (1024 * 1024):.0f} MiB in " +
+        f"{duration:.3f} s ({OUTPUT_SIZE / (1024 * 1024) / duration:.0f} " +
+        f"MiB/s); peak memory was {peak_memory / (1024 * 1024):.1f} MiB"
+    )
+    assert tail == ["x" * 79 + "\n"]
+    baselines.check(
+        "output_buffer_peak_memory_vs_limit",
+        peak_memory / MEMORY_LIMIT,
+        "x",
+        higher_is_better=False
+    )
@@ -0,0 +1,46 @@
+from pathlib import Path
+from pyshell.backends.native_backend import NativeBackend
+from pyshell.commands.command_metadata import CommandMetadata
+from pyshell.logging.null_command_logger import NullCommandLogger
+import resource
+
+# Time that the idle child process runs for, in seconds
+IDLE_SECONDS = 1
+
+# Fraction of the idle time that PyShell may spend on the CPU beyond its
+#   baseline before the benchmark fails. The baseline is close to zero, so
+#   relative changes are dominated by noise.
+IDLE_CPU_NOISE_FLOOR = 0.05
+
+
+def _cpu_seconds() -> float:
+    """
+    Gets the amount of CPU time used by this process so far.
+    @returns The user and system CPU time used by this process, in seconds.
+    """
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+
+def test_idle_child_cpu_time(baselines):
+    """
+    Verifies that waiting on a child process that produces no output does not
+      consume CPU time in the PyShell process.
+    """
+    backend = NativeBackend()
+    metadata = CommandMetadata("sleep", [str(IDLE_SECONDS)])
+
+    start_cpu_seconds = _cpu_seconds()
+    result = backend.run(metadata, Path.cwd(), NullCommandLogger())
+    cpu_seconds = _cpu_seconds() - start_cpu_seconds
+
+    print(f"CPU time used while waiting on `sleep {IDLE_SECONDS}`: " +
+        f"{cpu_seconds:.4f} s")
+    assert result.success
+    baselines.check(
+        "idle_child_cpu_fraction",
+        cpu_seconds / IDLE_SECONDS,
+        "x",
+        higher_is_better=False,
+        noise_floor=IDLE_CPU_NOISE_FLOOR
+    )
@@ -0,0 +1,46 @@
+from pyshell.commands.command_metadata import CommandMetadata
+from pyshell.core.platform_statics import PlatformStatics
+from pyshell.core.pyshell import PyShell
+from pyshell.logging.null_logger import NullLogger
+import subprocess
+import time
+
+# Number of commands to run with each method
+RUN_COUNT = 200
+
+
+def test_run_overhead(baselines):
+    """
+    Compares the time taken to run a trivial command via `PyShell.run()` to the
+      time taken to run it via `subprocess.run()`.
+    """
+    true_path = str(PlatformStatics.resolve_using_path("true"))
+    pyshell = PyShell(logger=NullLogger(), set_as_active_instance=False)
+    metadata = CommandMetadata("true", [])
+
+    # Warm up both paths so that one-time setup isn't measured
+    subprocess.run([true_path], stdout=subprocess.PIPE)
+    pyshell.run(metadata, None)
+
+    start_time = time.perf_counter()
+    for _ in range(RUN_COUNT):
+        subprocess.run(
+            [true_path],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT
+        )
+    subprocess_latency = (time.perf_counter() - start_time) / RUN_COUNT
+
+    start_time = time.perf_counter()
+    for _ in range(RUN_COUNT):
+        assert pyshell.run(metadata, None).success
+    pyshell_latency = (time.perf_counter() - start_time) / RUN_COUNT
+
+    print(f"subprocess.run: {subprocess_latency * 10**6:.1f} us per command")
+    print(f"PyShell.run: {pyshell_latency * 10**6:.1f} us per command")
+    baselines.check(
+        "run_latency_vs_subprocess",
+        pyshell_latency / subprocess_latency,
+        "x",
+        higher_is_better=False
+    )
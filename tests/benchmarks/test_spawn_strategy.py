@@ -0,0 +1,66 @@
+from pathlib import Path
+from pyshell.backends.native_backend import NativeBackend
+from pyshell.backends.popen_spawn_strategy import PopenSpawnStrategy
+from pyshell.backends.posix_spawn_strategy import PosixSpawnStrategy
+from pyshell.backends.spawn_strategy import ISpawnStrategy
+from pyshell.commands.command_metadata import CommandMetadata
+from pyshell.core.platform_statics import PlatformStatics
+from pyshell.logging.null_command_logger import NullCommandLogger
+import time
+from typing import Dict
+
+# Amount of memory the parent process touches before spawning commands
+PARENT_RSS_BYTES = 512 * 1024 * 1024
+
+# Number of commands to spawn with each strategy
+SPAWN_COUNT = 200
+
+
+def _time_strategy(strategy: ISpawnStrategy) -> float:
+    """
+    Measures the average time taken to run a trivial command.
+    @param strategy The spawn strategy to measure.
+    @returns The average time taken per command, in seconds.
+    """
+    backend = NativeBackend(spawn_strategy=strategy)
+    metadata = CommandMetadata(
+        "true",
+        [],
+        executable=str(PlatformStatics.resolve_using_path("true"))
+    )
+    logger = NullCommandLogger()
+
+    start_time = time.perf_counter()
+    for _ in range(SPAWN_COUNT):
+        assert backend.run(metadata, Path.cwd(), logger).success
+    return (time.perf_counter() - start_time) / SPAWN_COUNT
+
+
+def test_spawn_latency_with_large_parent(baselines):
+    """
+    Compares the latency of each spawn strategy when the PyShell process uses a
+      large amount of memory.
+    Strategies that copy the parent's page tables when starting a process get
+      slower as the parent's memory use grows, while `posix_spawn()` should
+      not.
+    """
+    # Touch every page so that the memory counts towards the process's RSS
+    ballast = b"x" * PARENT_RSS_BYTES
+
+    latencies: Dict[str, float] = {
+        "popen": _time_strategy(PopenSpawnStrategy()),
+        "popen (close_fds=False)":
+            _time_strategy(PopenSpawnStrategy(close_fds=False)),
+        "posix_spawn": _time_strategy(PosixSpawnStrategy())
+    }
+    for name, latency in latencies.items():
+        print(f"{name}: {latency * 1000:.3f} ms per command")
+
+    assert len(ballast) == PARENT_RSS_BYTES
+    for name in ("popen (close_fds=False)", "posix_spawn"):
+        baselines.check(
+            f"spawn_latency_vs_popen[{name}]",
+            latencies[name] / latencies["popen"],
+            "x",
+            higher_is_better=False
+        )
@@ -2,6 +2,7 @@ import os
 from pathlib import Path
 from pyshell.backends.docker_backend import DockerBackend
 from pyshell.core.pyshell import PyShell
+from pyshell.commands.command_limits import CommandLimits
 from pyshell.commands.command_metadata import CommandMetadata
 from pyshell.error.keep_going import KeepGoing
 from pyshell.logging.console_command_logger import ConsoleCommandLogger
@@ -255,3 +256,32 @@ class TestDocker:
         assert result.backend
         assert "Docker container" in result.backend
         assert container_name in result.backend
+
+
+    def test_command_with_limits_is_rejected(self):
+        # Set up the backend
+        host_pyshell = PyShell()
+        backend = DockerBackend(
+            host_pyshell,
+            "ubuntu:jammy",
+            use_sudo=self.use_sudo
+        )
+
+        # Set up the command to run
+        metadata = CommandMetadata(
+            "echo",
+            ["foo"],
+            limits=CommandLimits(timeout=10)
+        )
+        cwd = Path("/tmp")
+
+        # Run the test
+        try:
+            with pytest.raises(ValueError):
+                backend.run(
+                    metadata,
+                    cwd,
+                    ConsoleCommandLogger(metadata, LoggerOptions(), cwd)
+                )
+        finally:
+            backend.stop()
@@ -2,6 +2,7 @@ from pathlib import Path
 from pyshell import PyShell, PyShellOptions, AbortOnFailure, AllowAll, \
     KeepGoing, NativeBackend, NullLogger, ConsoleLogger
 from pyshell.commands.external_command import ExternalCommand
+from pyshell.core.platform_statics import PlatformStatics
 from unit.tracing.get_caller_line_number import get_caller_line_number
 
 def test_run_external_executable_on_path():
@@ -155,3 +156,14 @@ def test_command_captures_origin():
 
     assert cmd.origin.file_path == Path(__file__)
     assert cmd.origin.line_number == expected_line_number
+
+
+def test_executable_is_resolved_before_running():
+    pyshell = PyShell(logger=NullLogger())
+    cmd = ExternalCommand("echo", "foo")
+    assert cmd.metadata.executable is None
+
+    result = cmd(pyshell)
+    assert result.success
+    assert cmd.metadata.executable == \
+        str(PlatformStatics.resolve_using_path("echo"))
@@ -1,10 +1,36 @@
+import asyncio
+import json
 from pathlib import Path
+from pyshell.backends.backend import IBackend
+from pyshell.backends.dry_run_backend import DryRunBackend
+from pyshell.commands.command_flags import CommandFlags
+from pyshell.commands.command_graph import CommandGraph
+from pyshell.commands.command_limits import CommandLimits
+from pyshell.commands.command_metadata import CommandMetadata
+from pyshell.commands.command_phase import CommandPhase
+from pyshell.commands.command_result import CommandResult
+from pyshell.commands.external_command import ExternalCommand
+from pyshell.core.command_history import CommandHistory
 from pyshell.core.pyshell import PyShell
+from pyshell.core.pyshell_options import PyShellOptions
+from pyshell.error.abort_on_failure import AbortOnFailure
+from pyshell.error.error_handler import IErrorHandler
 from pyshell.error.keep_going import KeepGoing
+from pyshell.executors.caching_executor import CachingExecutor
+from pyshell.executors.incremental_executor import IncrementalExecutor
 from pyshell.executors.permit_cleanup import PermitCleanup
+from pyshell.logging.chrome_trace_logger import ChromeTraceLogger
+from pyshell.logging.command_logger import ICommandLogger
+from pyshell.logging.console_command_logger import ConsoleCommandLogger
+from pyshell.logging.logger import ILogger
+from pyshell.logging.logger_options import LoggerOptions
+from pyshell.logging.null_logger import NullLogger
+from pyshell.metrics.openmetrics_exporter import OpenMetricsExporter
 from pyshell.modules.shell import Shell
 from pyshell.shell.ls_command import LsCommand
-from typing import Any
+import pytest
+import time
+from typing import Any, List
 
 def test_run_in_custom_absolute_cwd():
     pyshell = PyShell()
@@ -47,3 +73,695 @@ def test_skip_cmd_via_executor(tmp_path: Any):
     # This command should be skipped by the executor
     result = Shell.ls()
     assert result.skipped
+
+
+def test_run_commands_in_parallel():
+    pyshell = PyShell(logger=NullLogger())
+    commands = [ExternalCommand("sleep", "0.5") for _ in range(4)]
+
+    start_time = time.monotonic()
+    results = pyshell.run_parallel(commands, max_jobs=4)
+    duration = time.monotonic() - start_time
+
+    assert len(results) == 4
+    assert all(r.success for r in results)
+    assert duration < 1.5
+
+
+def test_parallel_results_are_in_command_order():
+    pyshell = PyShell(logger=NullLogger())
+    commands = [
+        ExternalCommand("bash", ["-c", "sleep 0.3; echo foo"]),
+        ExternalCommand("echo", "bar")
+    ]
+    results = pyshell.run_parallel(commands)
+
+    assert results[0].output == "foo\n"
+    assert results[1].output == "bar\n"
+
+
+def test_parallel_output_is_not_interleaved():
+    output = ""
+    def on_print(x: str) -> None:
+        nonlocal output
+        output += x
+
+    class TestLogger(ILogger):
+        def construct_logger(self,
+            metadata: CommandMetadata,
+            options: LoggerOptions,
+            cwd: Path) -> ICommandLogger:
+            return ConsoleCommandLogger(metadata, options, cwd, on_print)
+
+    pyshell = PyShell(logger=TestLogger())
+    script = "for i in 1 2 3; do echo {0}$i; sleep 0.1; done"
+    pyshell.run_parallel([
+        ExternalCommand("bash", ["-c", script.format("a")]),
+        ExternalCommand("bash", ["-c", script.format("b")])
+    ])
+
+    assert output in ("a1\na2\na3\nb1\nb2\nb3\n", "b1\nb2\nb3\na1\na2\na3\n")
+
+
+def test_parallel_commands_use_executor_and_error_handler():
+    pyshell = PyShell(
+        logger=NullLogger(),
+        executor=PermitCleanup(),
+        error_handler=KeepGoing()
+    )
+    results = pyshell.run_parallel([
+        ExternalCommand("false"),
+        ExternalCommand("true", cmd_flags=CommandFlags.INACTIVE)
+    ])
+
+    assert not results[0].success
+    assert results[1].skipped
+
+
+def test_parallel_error_handler_exception_is_rethrown():
+    pyshell = PyShell(logger=NullLogger(), error_handler=AbortOnFailure())
+    with pytest.raises(RuntimeError):
+        pyshell.run_parallel([
+            ExternalCommand("false"),
+            ExternalCommand("true")
+        ], max_jobs=1)
+
+
+def test_run_command_async():
+    pyshell = PyShell(logger=NullLogger())
+    result = asyncio.run(ExternalCommand("true").run_async(pyshell))
+
+    assert result.success
+    assert result.command == "true"
+
+
+def test_run_async_commands_concurrently():
+    pyshell = PyShell(logger=NullLogger())
+
+    async def run() -> List[CommandResult]:
+        return await asyncio.gather(*[
+            ExternalCommand("sleep", "0.5").run_async(pyshell)
+            for _ in range(20)
+        ])
+
+    start_time = time.monotonic()
+    results = asyncio.run(run())
+    duration = time.monotonic() - start_time
+
+    assert all(r.success for r in results)
+    assert duration < 2
+
+
+def test_run_async_with_synchronous_backend():
+    pyshell = PyShell(backend=DryRunBackend(), logger=NullLogger())
+    result = asyncio.run(ExternalCommand("false").run_async(pyshell))
+
+    assert result.success
+    assert result.backend == "Dry Run backend"
+
+
+def test_run_async_uses_executor_and_error_handler():
+    pyshell = PyShell(logger=NullLogger(), executor=PermitCleanup())
+    result = asyncio.run(ExternalCommand(
+        "false",
+        cmd_flags=CommandFlags.INACTIVE
+    ).run_async(pyshell))
+    assert result.skipped
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(ExternalCommand("false").run_async(pyshell))
+
+
+def test_run_async_with_missing_executable():
+    pyshell = PyShell(logger=NullLogger())
+    result = asyncio.run(ExternalCommand(
+        "/does/not/exist",
+        locate_executable=False
+    ).run_async(pyshell))
+    assert not result.success
+
+
+def test_buffered_async_output_is_not_interleaved():
+    output = ""
+    def on_print(x: str) -> None:
+        nonlocal output
+        output += x
+
+    class TestLogger(ILogger):
+        def construct_logger(self,
+            metadata: CommandMetadata,
+            options: LoggerOptions,
+            cwd: Path) -> ICommandLogger:
+            return ConsoleCommandLogger(metadata, options, cwd, on_print)
+
+    pyshell = PyShell(logger=TestLogger())
+    script = "for i in 1 2 3; do echo {0}$i; sleep 0.1; done"
+
+    async def run() -> None:
+        with pyshell.buffered_output():
+            await asyncio.gather(
+                ExternalCommand("bash", ["-c", script.format("a")]) \
+                    .run_async(pyshell),
+                ExternalCommand("bash", ["-c", script.format("b")]) \
+                    .run_async(pyshell)
+            )
+    asyncio.run(run())
+
+    assert output in ("a1\na2\na3\nb1\nb2\nb3\n", "b1\nb2\nb3\na1\na2\na3\n")
+
+
+def test_graph_runs_dependencies_first(tmp_path: Path):
+    pyshell = PyShell(logger=NullLogger())
+    path = tmp_path / "log.txt"
+    def append(value: str, sleep: float = 0) -> ExternalCommand:
+        return ExternalCommand(
+            "bash",
+            ["-c", f"sleep {sleep}; echo {value} >> {path}"]
+        )
+
+    graph = CommandGraph()
+    build = graph.add(append("build", 0.3))
+    test = graph.add(append("test"), after=[build])
+    graph.add(append("package"), after=[test])
+    results = pyshell.run_graph(graph)
+
+    assert all(r.success for r in results)
+    assert path.read_text() == "build\ntest\npackage\n"
+
+
+def test_graph_runs_independent_commands_in_parallel():
+    pyshell = PyShell(logger=NullLogger())
+    graph = CommandGraph()
+    first = graph.add(ExternalCommand("sleep", "0.5"))
+    second = graph.add(ExternalCommand("sleep", "0.5"))
+    graph.add(ExternalCommand("sleep", "0.5"), after=[first, second])
+
+    start_time = time.monotonic()
+    results = pyshell.run_graph(graph, max_jobs=2)
+    duration = time.monotonic() - start_time
+
+    assert all(r.success for r in results)
+    assert duration < 1.4
+
+
+def test_graph_runs_cleanup_commands_after_failure(tmp_path: Path):
+    pyshell = PyShell(logger=NullLogger(), error_handler=AbortOnFailure())
+    graph = CommandGraph()
+    setup = graph.add(ExternalCommand("true"))
+    failure = graph.add(ExternalCommand("false"), after=[setup])
+    skipped = graph.add(
+        ExternalCommand("touch", str(tmp_path / "skipped")),
+        after=[failure]
+    )
+    graph.add(
+        ExternalCommand(
+            "touch",
+            str(tmp_path / "cleanup"),
+            cmd_flags=CommandFlags.CLEANUP
+        ),
+        after=[skipped]
+    )
+
+    with pytest.raises(RuntimeError):
+        pyshell.run_graph(graph)
+    assert not (tmp_path / "skipped").exists()
+    assert (tmp_path / "cleanup").exists()
+
+
+def test_graph_skips_queued_commands_after_failure(tmp_path: Path):
+    pyshell = PyShell(logger=NullLogger(), error_handler=AbortOnFailure())
+    graph = CommandGraph()
+    graph.add(ExternalCommand("false"))
+    for i in range(5):
+        graph.add(ExternalCommand("touch", str(tmp_path / f"skipped{i}")))
+    graph.add(ExternalCommand(
+        "touch",
+        str(tmp_path / "cleanup"),
+        cmd_flags=CommandFlags.CLEANUP
+    ))
+
+    with pytest.raises(RuntimeError):
+        pyshell.run_graph(graph, max_jobs=1)
+    assert not list(tmp_path.glob("skipped*"))
+    assert (tmp_path / "cleanup").exists()
+
+
+def test_graph_honors_inactive_commands():
+    pyshell = PyShell(logger=NullLogger())
+    graph = CommandGraph()
+    inactive = graph.add(
+        ExternalCommand("false", cmd_flags=CommandFlags.INACTIVE)
+    )
+    graph.add(ExternalCommand("true"), after=[inactive])
+    results = pyshell.run_graph(graph)
+
+    assert results[0].skipped
+    assert results[1].success
+    assert not results[1].skipped
+
+
+def test_default_command_limits_are_applied():
+    pyshell = PyShell(
+        logger=NullLogger(),
+        error_handler=KeepGoing(),
+        options=PyShellOptions(command_limits=CommandLimits(timeout=0.2))
+    )
+    result = ExternalCommand("sleep", ["10"])(pyshell)
+
+    assert result.timed_out
+    assert not result.success
+
+
+def test_command_limits_override_default_limits():
+    pyshell = PyShell(
+        logger=NullLogger(),
+        error_handler=KeepGoing(),
+        options=PyShellOptions(command_limits=CommandLimits(timeout=0.2))
+    )
+    result = ExternalCommand(
+        "sleep",
+        ["0.5"],
+        limits=CommandLimits(timeout=10)
+    )(pyshell)
+
+    assert not result.timed_out
+    assert result.success
+
+
+def test_stream_yields_lines_before_command_exits():
+    pyshell = PyShell()
+    stream = ExternalCommand(
+        "bash",
+        ["-c", "echo foo; sleep 1; echo bar"]
+    ).stream(pyshell)
+
+    start = time.monotonic()
+    assert next(stream) == "foo\n"
+    assert time.monotonic() - start < 0.9
+    assert list(stream) == ["bar\n"]
+    assert stream.result.success
+    assert stream.result.output == "foo\nbar\n"
+
+
+def test_stream_applies_backpressure(tmp_path: Path):
+    pyshell = PyShell(logger=NullLogger())
+    marker = tmp_path / "done"
+    stream = ExternalCommand(
+        "bash",
+        ["-c", f"seq 1000000; touch {marker}"]
+    ).stream(pyshell, max_buffered_lines=16)
+
+    # The command can't finish while the stream is full, since the pipe fills
+    #   up once the pump stops reading from it
+    assert next(stream) == "1\n"
+    time.sleep(0.5)
+    assert not marker.exists()
+
+    stream.close()
+    assert marker.exists()
+    assert stream.result.success
+
+
+def test_stream_via_shell_module():
+    pyshell = PyShell(logger=NullLogger())
+    stream = Shell.stream("seq", ["3"], pyshell=pyshell)
+    assert list(stream) == ["1\n", "2\n", "3\n"]
+    assert stream.result.exit_code == 0
+
+
+def test_stream_raises_error_handler_exceptions():
+    pyshell = PyShell(logger=NullLogger(), error_handler=AbortOnFailure())
+    stream = Shell.stream("bash", ["-c", "echo foo; exit 1"], pyshell=pyshell)
+
+    assert next(stream) == "foo\n"
+    with pytest.raises(Exception):
+        next(stream)
+
+
+def test_pipe_commands():
+    pyshell = PyShell()
+    result = Shell.pipe(
+        ExternalCommand("seq", ["1000"]),
+        ExternalCommand("grep", ["7"]),
+        ExternalCommand("wc", ["-l"]),
+        pyshell=pyshell
+    )
+    assert result.success
+    assert len(result.results) == 3
+    assert result.output.strip() == "271"
+
+
+class _RecordingErrorHandler(IErrorHandler):
+    def __init__(self):
+        self.results: List[CommandResult] = []
+
+    def handle(self, result: CommandResult) -> None:
+        self.results.append(result)
+
+
+def test_pipe_uses_error_handler_for_each_command():
+    error_handler = _RecordingErrorHandler()
+    pyshell = PyShell(error_handler=error_handler)
+    result = Shell.pipe(
+        ExternalCommand("bash", ["-c", "echo foo; exit 2"]),
+        ExternalCommand("cat"),
+        pyshell=pyshell
+    )
+    assert not result.success
+    assert result.exit_code == 2
+    assert result.output == "foo\n"
+    assert [r.command for r in error_handler.results] == ["bash"]
+
+    pyshell = PyShell(logger=NullLogger(), error_handler=AbortOnFailure())
+    with pytest.raises(Exception):
+        Shell.pipe(
+            ExternalCommand("false"),
+            ExternalCommand("cat"),
+            pyshell=pyshell
+        )
+
+
+def test_pipe_with_missing_executable():
+    pyshell = PyShell(logger=NullLogger())
+    result = Shell.pipe(
+        ExternalCommand("echo", ["foo"]),
+        ExternalCommand("/does/not/exist", locate_executable=False),
+        pyshell=pyshell
+    )
+    assert not result.success
+    assert result[0].skipped
+    assert result[1].error
+
+
+class _SingleCommandBackend(IBackend):
+    def run(self,
+        metadata: CommandMetadata,
+        cwd: Path,
+        logger: ICommandLogger) -> CommandResult:
+        raise NotImplementedError()
+
+
+def test_pipe_with_unsupported_backend():
+    pyshell = PyShell(backend=_SingleCommandBackend(), logger=NullLogger())
+    with pytest.raises(RuntimeError):
+        Shell.pipe(
+            ExternalCommand("echo"),
+            ExternalCommand("cat"),
+            pyshell=pyshell
+        )
+
+
+def test_pipe_with_dry_run_backend():
+    pyshell = PyShell(backend=DryRunBackend(), logger=NullLogger())
+    result = Shell.pipe(
+        ExternalCommand("echo"),
+        ExternalCommand("cat"),
+        pyshell=pyshell
+    )
+    assert result.success
+    assert [r.backend for r in result.results] == ["Dry Run backend"] * 2
+
+
+def test_run_with_input():
+    pyshell = PyShell()
+    result = Shell.run("wc", ["-l"], stdin="foo\nbar\n", pyshell=pyshell)
+    assert result.output.strip() == "2"
+
+
+def test_run_with_missing_input_file(tmp_path: Path):
+    pyshell = PyShell(logger=NullLogger())
+    result = ExternalCommand("cat", stdin=tmp_path / "missing.txt")(pyshell)
+    assert not result.success
+    assert "not found" in result.output
+
+
+def _run_counted(
+    pyshell: PyShell,
+    tmp_path: Path,
+    cmd_flags: int = CommandFlags.CACHEABLE) -> CommandResult:
+    # Each time the command actually runs, it appends a line to `runs.txt`
+    return Shell.run(
+        "sh",
+        ["-c", f"echo run >> {tmp_path / 'runs.txt'}; cat input.txt"],
+        cmd_flags=cmd_flags,
+        pyshell=pyshell,
+        inputs=[tmp_path / "input.txt"]
+    )
+
+
+def test_cached_command_is_not_run_again(tmp_path: Path):
+    (tmp_path / "input.txt").write_text("foo\n")
+    pyshell = PyShell(executor=CachingExecutor(tmp_path / "cache"))
+    pyshell.cd(tmp_path)
+
+    first = _run_counted(pyshell, tmp_path)
+    second = _run_counted(pyshell, tmp_path)
+    assert not first.cached
+    assert second.cached
+    assert second.success
+    assert second.output == first.output == "foo\n"
+    assert (tmp_path / "runs.txt").read_text() == "run\n"
+
+
+def test_cached_command_runs_again_after_input_changes(tmp_path: Path):
+    (tmp_path / "input.txt").write_text("foo\n")
+    pyshell = PyShell(executor=CachingExecutor(tmp_path / "cache"))
+    pyshell.cd(tmp_path)
+
+    _run_counted(pyshell, tmp_path)
+    (tmp_path / "input.txt").write_text("bar\n")
+    result = _run_counted(pyshell, tmp_path)
+    assert not result.cached
+    assert result.output == "bar\n"
+    assert (tmp_path / "runs.txt").read_text() == "run\nrun\n"
+
+
+def test_non_cacheable_command_is_always_run(tmp_path: Path):
+    (tmp_path / "input.txt").write_text("foo\n")
+    pyshell = PyShell(executor=CachingExecutor(tmp_path / "cache"))
+    pyshell.cd(tmp_path)
+
+    _run_counted(pyshell, tmp_path, CommandFlags.STANDARD)
+    result = _run_counted(pyshell, tmp_path, CommandFlags.STANDARD)
+    assert not result.cached
+    assert (tmp_path / "runs.txt").read_text() == "run\nrun\n"
+
+
+def test_cached_failure_is_passed_to_error_handler(tmp_path: Path):
+    error_handler = _RecordingErrorHandler()
+    pyshell = PyShell(
+        logger=NullLogger(),
+        executor=CachingExecutor(tmp_path / "cache", cache_failures=True),
+        error_handler=error_handler
+    )
+
+    command = ExternalCommand(
+        "sh",
+        ["-c", "exit 3"],
+        cmd_flags=CommandFlags.CACHEABLE
+    )
+    command(pyshell)
+    result = command(pyshell)
+    assert result.cached
+    assert result.exit_code == 3
+    assert len(error_handler.results) == 2
+
+
+def test_cached_command_async(tmp_path: Path):
+    (tmp_path / "input.txt").write_text("foo\n")
+    pyshell = PyShell(executor=CachingExecutor(tmp_path / "cache"))
+    pyshell.cd(tmp_path)
+
+    async def run() -> CommandResult:
+        command = ExternalCommand(
+            "sh",
+            ["-c", f"echo run >> {tmp_path / 'runs.txt'}; cat input.txt"],
+            cmd_flags=CommandFlags.CACHEABLE,
+            inputs=[tmp_path / "input.txt"]
+        )
+        return await command.run_async(pyshell)
+
+    asyncio.run(run())
+    result = asyncio.run(run())
+    assert result.cached
+    assert result.output == "foo\n"
+    assert (tmp_path / "runs.txt").read_text() == "run\n"
+
+
+def test_cached_command_regenerates_deleted_outputs(tmp_path: Path):
+    (tmp_path / "input.txt").write_text("foo\n")
+    pyshell = PyShell(executor=CachingExecutor(tmp_path / "cache"))
+    pyshell.cd(tmp_path)
+
+    def run() -> CommandResult:
+        return Shell.run(
+            "cp",
+            ["input.txt", "output.txt"],
+            cmd_flags=CommandFlags.CACHEABLE,
+            pyshell=pyshell,
+            inputs=[tmp_path / "input.txt"],
+            outputs=[tmp_path / "output.txt"]
+        )
+
+    assert not run().cached
+    assert run().cached
+
+    (tmp_path / "output.txt").unlink()
+    assert not run().cached
+    assert (tmp_path / "output.txt").read_text() == "foo\n"
+
+
+def _run_build(pyshell: PyShell, tmp_path: Path) -> CommandResult:
+    return Shell.run(
+        "cp",
+        ["input.txt", "output.txt"],
+        pyshell=pyshell,
+        inputs=[tmp_path / "input.txt"],
+        outputs=[tmp_path / "output.txt"]
+    )
+
+
+def test_up_to_date_command_is_skipped(tmp_path: Path):
+    (tmp_path / "input.txt").write_text("foo\n")
+    pyshell = PyShell(executor=IncrementalExecutor(tmp_path / "index.json"))
+    pyshell.cd(tmp_path)
+
+    assert not _run_build(pyshell, tmp_path).skipped
+    assert _run_build(pyshell, tmp_path).skipped
+
+    # Changing the input makes the output out of date
+    (tmp_path / "input.txt").write_text("bar\n")
+    assert not _run_build(pyshell, tmp_path).skipped
+    assert (tmp_path / "output.txt").read_text() == "bar\n"
+
+    # Deleting the output makes the command run again, even from a new script
+    (tmp_path / "output.txt").unlink()
+    pyshell = PyShell(executor=IncrementalExecutor(tmp_path / "index.json"))
+    pyshell.cd(tmp_path)
+    assert not _run_build(pyshell, tmp_path).skipped
+    assert _run_build(pyshell, tmp_path).skipped
+
+
+def test_parallel_commands_with_identical_command_lines(tmp_path: Path):
+    (tmp_path / "input.txt").write_text("foo\n")
+    pyshell = PyShell(executor=IncrementalExecutor(tmp_path / "index.json"))
+    pyshell.cd(tmp_path)
+
+    # Both commands write both files but each declares a different output
+    def commands() -> List[ExternalCommand]:
+        return [
+            ExternalCommand(
+                "bash",
+                ["-c", "sleep 0.2; cp input.txt a.txt; cp input.txt b.txt"],
+                inputs=[tmp_path / "input.txt"],
+                outputs=[tmp_path / name]
+            )
+            for name in ("a.txt", "b.txt")
+        ]
+
+    results = pyshell.run_parallel(commands(), max_jobs=2)
+    assert not any(r.skipped for r in results)
+    results = pyshell.run_parallel(commands(), max_jobs=2)
+    assert all(r.skipped for r in results)
+
+
+def test_history_records_commands():
+    pyshell = PyShell(
+        logger=NullLogger(),
+        executor=PermitCleanup(),
+        error_handler=KeepGoing(),
+        history=CommandHistory()
+    )
+    ExternalCommand("true")(pyshell)
+    ExternalCommand("false")(pyshell)
+    ExternalCommand("true")(pyshell)
+
+    # Skipped commands aren't recorded
+    history = pyshell.history
+    assert history is not None
+    assert [e.command for e in history] == ["true", "false"]
+    assert history.failure_rate() == 0.5
+    assert history[0].backend == "Host"
+
+
+def test_run_records_phase_timings():
+    pyshell = PyShell(logger=NullLogger())
+    timed: List[CommandResult] = []
+    pyshell.events.on_command_timed += lambda _, r: timed.append(r)
+
+    result = ExternalCommand("true")(pyshell)
+    assert timed == [result]
+    for phase in (
+        CommandPhase.EXECUTOR,
+        CommandPhase.LOGGER,
+        CommandPhase.STARTED_EVENT,
+        CommandPhase.BACKEND,
+        CommandPhase.SCAN,
+        CommandPhase.LOG_RESULTS,
+        CommandPhase.FINISHED_EVENT):
+        assert phase in result.timings
+    assert CommandPhase.ERROR_HANDLER not in result.timings
+    assert result.timings.overhead_ns < result.timings.total_ns
+
+
+def test_timings_are_reported_when_error_handler_aborts():
+    pyshell = PyShell(logger=NullLogger())
+    timed: List[CommandResult] = []
+    pyshell.events.on_command_timed += lambda _, r: timed.append(r)
+
+    with pytest.raises(Exception):
+        ExternalCommand("false")(pyshell)
+    assert len(timed) == 1
+    assert CommandPhase.ERROR_HANDLER in timed[0].timings
+
+
+def test_skipped_command_records_executor_time():
+    pyshell = PyShell(logger=NullLogger())
+    result = ExternalCommand("true", cmd_flags=CommandFlags.INACTIVE)(pyshell)
+    assert result.skipped
+    assert list(p for p, _ in result.timings) == [CommandPhase.EXECUTOR]
+
+
+def test_pipeline_records_phase_timings():
+    pyshell = PyShell(logger=NullLogger())
+    results = pyshell.run_pipeline(
+        [CommandMetadata("echo", ["foo"]), CommandMetadata("cat", [])],
+        None
+    )
+    for result in results:
+        assert CommandPhase.BACKEND in result.timings
+        assert CommandPhase.LOG_RESULTS in result.timings
+
+
+def test_trace_parallel_commands(tmp_path: Path):
+    trace_logger = ChromeTraceLogger(tmp_path / "trace.json", NullLogger())
+    pyshell = PyShell(logger=trace_logger)
+    pyshell.run_parallel(
+        [ExternalCommand("sleep", ["0.2"]) for _ in range(2)],
+        max_jobs=2
+    )
+    trace_logger.close()
+
+    events = json.loads((tmp_path / "trace.json").read_text())
+    commands = [e for e in events if e.get("cat") == "command"]
+    assert [e["name"] for e in commands] == ["sleep", "sleep"]
+    assert commands[0]["tid"] != commands[1]["tid"]
+    assert {"spawn", "pump"} <= {e["name"] for e in events}
+
+
+def test_export_metrics(tmp_path: Path):
+    exporter = OpenMetricsExporter(tmp_path / "metrics.prom")
+    pyshell = PyShell(
+        logger=NullLogger(),
+        error_handler=KeepGoing(),
+        components=[exporter]
+    )
+    ExternalCommand("true")(pyshell)
+    ExternalCommand("false")(pyshell)
+    exporter.close()
+
+    text = (tmp_path / "metrics.prom").read_text()
+    assert 'pyshell_commands_total{command="true",backend="Host",' + \
+        'exit_code="0"} 1' in text
+    assert 'pyshell_commands_total{command="false",backend="Host",' + \
+        'exit_code="1"} 1' in text
@@ -0,0 +1,193 @@
+from pathlib import Path
+from pyshell import PyShell, PyShellOptions, AbortOnFailure, AllowAll, \
+    KeepGoing, NativeBackend, ConsoleLogger
+from pyshell.commands.command_flags import CommandFlags
+from pyshell.executors.permit_cleanup import PermitCleanup
+from pyshell.modules.shell import Shell
+import pytest
+import subprocess
+from typing import Any
+
+@pytest.fixture
+def pyshell(monkeypatch: Any) -> PyShell:
+    # Emulated commands must never start a process
+    def fail(*args: Any, **kwargs: Any) -> None:
+        raise AssertionError("A process was started for an emulated command.")
+    monkeypatch.setattr(subprocess, "Popen", fail)
+
+    return PyShell(
+        NativeBackend(emulate_commands=True),
+        ConsoleLogger(),
+        AllowAll(),
+        KeepGoing(),
+        PyShellOptions()
+    )
+
+
+def test_emulated_echo(pyshell: PyShell):
+    result = Shell.echo("foo", pyshell=pyshell)
+    assert result.success
+    assert result.output == "foo\n"
+    assert result.backend == "Host"
+
+
+def test_emulated_echo_without_message(pyshell: PyShell):
+    result = Shell.echo(pyshell=pyshell)
+    assert result.success
+    assert result.output == "\n"
+
+
+def test_emulated_ls(pyshell: PyShell, tmp_path: Path):
+    tmp_path.joinpath("b.txt").write_text("b")
+    tmp_path.joinpath("a.txt").write_text("a")
+    tmp_path.joinpath(".hidden").write_text("hidden")
+    tmp_path.joinpath("c").mkdir()
+
+    result = Shell.ls(tmp_path, pyshell=pyshell)
+    assert result.success
+    assert result.output == "a.txt\nb.txt\nc\n"
+
+
+def test_emulated_ls_in_cwd(pyshell: PyShell, tmp_path: Path):
+    tmp_path.joinpath("foo.txt").write_text("foo")
+    pyshell.cd(tmp_path)
+
+    result = Shell.ls(pyshell=pyshell)
+    assert result.success
+    assert result.output == "foo.txt\n"
+
+
+def test_emulated_ls_on_non_existent_dir(pyshell: PyShell):
+    result = Shell.ls("/foo", pyshell=pyshell)
+    assert not result.success
+    assert result.exit_code == 2
+
+
+def test_emulated_cp_file(pyshell: PyShell, tmp_path: Path):
+    src_path = tmp_path / "foo.txt"
+    src_path.write_text("foo")
+    dest_path = tmp_path / "bar.txt"
+
+    result = Shell.cp(src_path, dest_path, pyshell=pyshell)
+    assert result.success
+    assert dest_path.read_text() == "foo"
+
+
+def test_emulated_cp_file_into_dir(pyshell: PyShell, tmp_path: Path):
+    src_path = tmp_path / "foo.txt"
+    src_path.write_text("foo")
+    dest_path = tmp_path / "bar"
+    dest_path.mkdir()
+
+    result = Shell.cp(src_path, dest_path, pyshell=pyshell)
+    assert result.success
+    assert dest_path.joinpath("foo.txt").read_text() == "foo"
+
+
+def test_emulated_cp_non_empty_dir(pyshell: PyShell, tmp_path: Path):
+    src_path = tmp_path / "foo"
+    src_path.mkdir()
+    src_path.joinpath("bar.txt").write_text("bar")
+    dest_path = tmp_path / "bar"
+
+    result = Shell.cp(src_path, dest_path, pyshell=pyshell)
+    assert result.success
+    assert dest_path.joinpath("bar.txt").read_text() == "bar"
+
+
+def test_emulated_cp_file_to_non_existing_dir(
+    pyshell: PyShell,
+    tmp_path: Path):
+    src_path = tmp_path / "foo.txt"
+    src_path.write_text("foo")
+
+    result = Shell.cp(src_path, tmp_path / "bar" / "baz.txt", pyshell=pyshell)
+    assert not result.success
+    assert "cp:" in result.output
+
+
+def test_emulated_rm_file(pyshell: PyShell, tmp_path: Path):
+    file_path = tmp_path / "foo.txt"
+    file_path.write_text("foo")
+
+    result = Shell.rm(file_path, pyshell=pyshell)
+    assert result.success
+    assert not file_path.exists()
+
+
+def test_emulated_rm_non_empty_dir(pyshell: PyShell, tmp_path: Path):
+    dir_path = tmp_path / "foo"
+    dir_path.mkdir()
+    dir_path.joinpath("bar.txt").write_text("bar")
+
+    result = Shell.rm(dir_path, pyshell=pyshell)
+    assert result.success
+    assert not dir_path.exists()
+
+
+def test_emulated_rm_non_existent_file(pyshell: PyShell, tmp_path: Path):
+    result = Shell.rm(tmp_path / "foo.txt", pyshell=pyshell)
+    assert not result.success
+    assert result.exit_code == 1
+
+
+def test_emulated_force_remove_non_existent_file(
+    pyshell: PyShell,
+    tmp_path: Path):
+    result = Shell.rm(tmp_path / "foo.txt", force=True, pyshell=pyshell)
+    assert result.success
+
+
+def test_emulated_commands_use_executor(monkeypatch: Any, tmp_path: Path):
+    pyshell = PyShell(
+        NativeBackend(emulate_commands=True),
+        ConsoleLogger(),
+        PermitCleanup(),
+        KeepGoing(),
+        PyShellOptions()
+    )
+    file_path = tmp_path / "foo.txt"
+    file_path.write_text("foo")
+
+    result = Shell.rm(tmp_path / "bar.txt", pyshell=pyshell)
+    assert not result.success
+
+    # Only cleanup commands may run after a failure
+    result = Shell.rm(file_path, pyshell=pyshell)
+    assert result.skipped
+    assert file_path.exists()
+
+    result = Shell.rm(file_path, cmd_flags=CommandFlags.CLEANUP, pyshell=pyshell)
+    assert result.success
+    assert not file_path.exists()
+
+
+def test_emulated_commands_use_error_handler(tmp_path: Path):
+    pyshell = PyShell(
+        NativeBackend(emulate_commands=True),
+        ConsoleLogger(),
+        AllowAll(),
+        AbortOnFailure(),
+        PyShellOptions()
+    )
+    with pytest.raises(RuntimeError):
+        Shell.rm(tmp_path / "foo.txt", pyshell=pyshell)
+
+
+@pytest.mark.parametrize("emulate_commands", [False, True])
+def test_emulated_output_matches_executable(
+    emulate_commands: bool,
+    tmp_path: Path):
+    pyshell = PyShell(
+        NativeBackend(emulate_commands=emulate_commands),
+        ConsoleLogger(),
+        AllowAll(),
+        KeepGoing(),
+        PyShellOptions()
+    )
+    for name in ("foo", "bar", "baz.txt"):
+        tmp_path.joinpath(name).write_text(name)
+
+    assert Shell.ls(tmp_path, pyshell=pyshell).output == "bar\nbaz.txt\nfoo\n"
+    assert Shell.echo("foo bar", pyshell=pyshell).output == "foo bar\n"
+    assert Shell.rm(tmp_path / "foo", pyshell=pyshell).output == "\n"
@@ -0,0 +1,66 @@
+import os
+from pyshell.backends.input_feeder import InputFeeder
+from pyshell.commands.command_input import CommandInput
+from typing import Iterator
+
+def test_write_all_input():
+    read_fd, write_fd = os.pipe()
+    feeder = InputFeeder(write_fd, iter([b"foo", b"", b"bar"]))
+
+    assert feeder.write()
+    assert feeder.closed
+    with open(read_fd, "rb") as f:
+        assert f.read() == b"foobar"
+
+
+def test_write_stops_once_pipe_is_full():
+    read_fd, write_fd = os.pipe()
+    chunks_taken = 0
+    def generate() -> Iterator[bytes]:
+        nonlocal chunks_taken
+        while True:
+            chunks_taken += 1
+            yield b"x" * 1024 * 1024
+
+    feeder = InputFeeder(write_fd, generate())
+    assert not feeder.write()
+    assert not feeder.closed
+
+    # No more input is requested until the pending chunk has been written
+    assert chunks_taken == 1
+    assert not feeder.write()
+    assert chunks_taken == 1
+
+    feeder.close()
+    os.close(read_fd)
+
+
+def test_closed_pipe_discards_input():
+    read_fd, write_fd = os.pipe()
+    os.close(read_fd)
+    feeder = InputFeeder(write_fd, iter([b"foo"]))
+    assert feeder.write()
+    assert feeder.closed
+
+
+def test_open_without_input():
+    assert InputFeeder.open(None) == (None, None)
+
+
+def test_open_file_input(tmp_path):
+    path = tmp_path / "input.txt"
+    path.write_bytes(b"foo")
+    fd, feeder = InputFeeder.open(CommandInput(path))
+    assert fd is not None
+    assert feeder is None
+    with open(fd, "rb") as f:
+        assert f.read() == b"foo"
+
+
+def test_open_piped_input():
+    fd, feeder = InputFeeder.open(CommandInput(b"foo"))
+    assert fd is not None
+    assert feeder is not None
+    assert feeder.write()
+    with open(fd, "rb") as f:
+        assert f.read() == b"foo"
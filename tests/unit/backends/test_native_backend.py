@@ -1,11 +1,26 @@
+import asyncio
 import os
 from pathlib import Path
 from pyshell.backends.native_backend import NativeBackend
+from pyshell.backends.popen_spawn_strategy import PopenSpawnStrategy
+from pyshell.commands.command_emulator import ICommandEmulator
+from pyshell.commands.command_flags import CommandFlags
+from pyshell.commands.command_input import CommandInput
+from pyshell.commands.command_limits import CommandLimits
 from pyshell.commands.command_metadata import CommandMetadata
+from pyshell.commands.command_result import CommandResult
+from pyshell.logging.command_logger import ICommandLogger
 from pyshell.logging.console_command_logger import ConsoleCommandLogger
 from pyshell.logging.logger_options import LoggerOptions
 from pyshell.logging.null_command_logger import NullCommandLogger
 from pyshell.logging.split_command_logger import SplitCommandLogger
+from pyshell.logging.stream_config import StreamConfig
+from pyshell.scanners.entry import Entry
+import pytest
+import signal
+import sys
+import time
+from typing import IO, List, Optional, TextIO
 
 def test_run_echo():
     cmd = ["echo", "foo"]
@@ -115,3 +130,703 @@ def test_use_split_streams():
     assert result.success
     assert not stdout_output
     assert msg in stderr_output
+
+
+def test_split_streams_with_large_stderr_output():
+    # Write more data to stderr than fits in a pipe's buffer before writing
+    #   anything to stdout. This deadlocks if stdout is read to EOF before
+    #   stderr is read.
+    size = 1024 * 1024
+    cmd = ["bash", "-c", f"yes | head -c {size} >&2; echo foo"]
+    metadata = CommandMetadata(
+        cmd[0],
+        cmd[1:]
+    )
+
+    stdout_output = ""
+    def on_stdout(x: str) -> None:
+        nonlocal stdout_output
+        stdout_output += x
+
+    stderr_output = ""
+    def on_stderr(x: str) -> None:
+        nonlocal stderr_output
+        stderr_output += x
+
+    logger = SplitCommandLogger(
+        ConsoleCommandLogger(metadata, LoggerOptions(), Path.cwd(), on_stdout),
+        ConsoleCommandLogger(metadata, LoggerOptions(), Path.cwd(), on_stderr)
+    )
+    result = NativeBackend().run(metadata, Path.cwd(), logger)
+
+    assert result.success
+    assert stdout_output == "foo\n"
+    assert stderr_output == "y\n" * (size // 2)
+    assert result.output == "y\n" * (size // 2) + "foo\n"
+
+
+def test_run_echo_async():
+    cmd = ["echo", "foo"]
+    metadata = CommandMetadata(
+        cmd[0],
+        cmd[1:]
+    )
+
+    output = ""
+    def on_print(x: str) -> None:
+        nonlocal output
+        output += x
+
+    result = asyncio.run(NativeBackend().run_async(
+        metadata,
+        Path.cwd(),
+        ConsoleCommandLogger(metadata, LoggerOptions(), Path.cwd(), on_print)
+    ))
+    assert result.cwd == str(Path.cwd())
+    assert result.output == "foo\n"
+    assert result.exit_code == 0
+    assert output == "foo\n"
+
+
+def test_run_failing_command_async():
+    metadata = CommandMetadata("false", [])
+    result = asyncio.run(NativeBackend().run_async(
+        metadata,
+        Path.cwd(),
+        NullCommandLogger()
+    ))
+    assert not result.success
+
+
+def test_split_streams_with_large_stderr_output_async():
+    size = 1024 * 1024
+    cmd = ["bash", "-c", f"yes | head -c {size} >&2; echo foo"]
+    metadata = CommandMetadata(
+        cmd[0],
+        cmd[1:]
+    )
+
+    stdout_output = ""
+    def on_stdout(x: str) -> None:
+        nonlocal stdout_output
+        stdout_output += x
+
+    stderr_output = ""
+    def on_stderr(x: str) -> None:
+        nonlocal stderr_output
+        stderr_output += x
+
+    logger = SplitCommandLogger(
+        ConsoleCommandLogger(metadata, LoggerOptions(), Path.cwd(), on_stdout),
+        ConsoleCommandLogger(metadata, LoggerOptions(), Path.cwd(), on_stderr)
+    )
+    result = asyncio.run(NativeBackend().run_async(metadata, Path.cwd(), logger))
+
+    assert result.success
+    assert stdout_output == "foo\n"
+    assert stderr_output == "y\n" * (size // 2)
+
+
+def test_cancelled_async_command_is_killed():
+    metadata = CommandMetadata("sleep", ["10"])
+
+    async def run() -> None:
+        task = asyncio.create_task(NativeBackend().run_async(
+            metadata,
+            Path.cwd(),
+            NullCommandLogger()
+        ))
+        await asyncio.sleep(0.2)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        assert task.cancelled()
+
+    asyncio.run(asyncio.wait_for(run(), timeout=5))
+
+
+class _TestEmulator(ICommandEmulator):
+    def run(self, cwd: Path, stdout: TextIO, stderr: TextIO) -> int:
+        stdout.write(f"{cwd}\n")
+        stderr.write("error\n")
+        return 3
+
+
+def test_emulate_command():
+    metadata = CommandMetadata("does-not-exist", [], emulator=_TestEmulator())
+    logger = ConsoleCommandLogger(
+        metadata,
+        LoggerOptions(),
+        Path.cwd(),
+        lambda _: None
+    )
+    result = NativeBackend(emulate_commands=True).run(
+        metadata,
+        Path("/tmp"),
+        logger
+    )
+    assert result.output == "/tmp\nerror\n"
+    assert result.exit_code == 3
+
+
+def test_emulate_command_with_split_streams():
+    metadata = CommandMetadata("does-not-exist", [], emulator=_TestEmulator())
+
+    stdout_output = ""
+    def on_stdout(x: str) -> None:
+        nonlocal stdout_output
+        stdout_output += x
+
+    stderr_output = ""
+    def on_stderr(x: str) -> None:
+        nonlocal stderr_output
+        stderr_output += x
+
+    logger = SplitCommandLogger(
+        ConsoleCommandLogger(metadata, LoggerOptions(), Path.cwd(), on_stdout),
+        ConsoleCommandLogger(metadata, LoggerOptions(), Path.cwd(), on_stderr)
+    )
+    NativeBackend(emulate_commands=True).run(metadata, Path("/tmp"), logger)
+
+    assert stdout_output == "/tmp\n"
+    assert stderr_output == "error\n"
+
+
+def test_emulator_is_ignored_by_default():
+    metadata = CommandMetadata("echo", ["foo"], emulator=_TestEmulator())
+    result = NativeBackend().run(metadata, Path.cwd(), NullCommandLogger())
+    assert result.exit_code == 0
+
+
+def test_spawn_duration_is_recorded():
+    metadata = CommandMetadata("true", [])
+    result = NativeBackend().run(metadata, Path.cwd(), NullCommandLogger())
+
+    assert result.spawn_duration_seconds is not None
+    assert 0 < result.spawn_duration_seconds <= result.duration_seconds
+
+
+def test_popen_strategy_without_close_fds():
+    metadata = CommandMetadata("echo", ["foo"])
+    result = NativeBackend(
+        spawn_strategy=PopenSpawnStrategy(close_fds=False)
+    ).run(
+        metadata,
+        Path.cwd(),
+        ConsoleCommandLogger(
+            metadata,
+            LoggerOptions(),
+            Path.cwd(),
+            lambda _: None
+        )
+    )
+    assert result.output == "foo\n"
+
+
+def test_command_is_stopped_after_timeout():
+    metadata = CommandMetadata(
+        "sleep",
+        ["10"],
+        limits=CommandLimits(timeout=0.2)
+    )
+    start = time.monotonic()
+    result = NativeBackend().run(metadata, Path.cwd(), NullCommandLogger())
+
+    assert time.monotonic() - start < 5
+    assert result.timed_out
+    assert not result.limit_exceeded
+    assert result.exit_code == -signal.SIGTERM
+
+
+def test_command_within_timeout_is_not_stopped():
+    metadata = CommandMetadata(
+        "echo",
+        ["foo"],
+        limits=CommandLimits(timeout=10)
+    )
+    result = NativeBackend().run(metadata, Path.cwd(), NullCommandLogger())
+
+    assert not result.timed_out
+    assert result.success
+
+
+def test_timeout_stops_child_processes(tmp_path: Path):
+    # The child process would write to the file if it outlived the command
+    marker = tmp_path / "marker"
+    metadata = CommandMetadata(
+        "bash",
+        ["-c", f"(sleep 1; touch {marker}) & wait"],
+        limits=CommandLimits(timeout=0.2)
+    )
+    result = NativeBackend().run(metadata, Path.cwd(), NullCommandLogger())
+    time.sleep(1.5)
+
+    assert result.timed_out
+    assert not marker.exists()
+
+
+def test_command_ignoring_sigterm_is_killed():
+    metadata = CommandMetadata(
+        "bash",
+        ["-c", "trap '' TERM; sleep 10"],
+        limits=CommandLimits(timeout=0.2, kill_grace_period=0.2)
+    )
+    start = time.monotonic()
+    result = NativeBackend().run(metadata, Path.cwd(), NullCommandLogger())
+
+    assert time.monotonic() - start < 5
+    assert result.timed_out
+    assert result.exit_code == -signal.SIGKILL
+
+
+def test_output_written_before_timeout_is_kept():
+    metadata = CommandMetadata(
+        "bash",
+        ["-c", "echo foo; sleep 10"],
+        limits=CommandLimits(timeout=0.5)
+    )
+    result = NativeBackend().run(
+        metadata,
+        Path.cwd(),
+        ConsoleCommandLogger(
+            metadata,
+            LoggerOptions(),
+            Path.cwd(),
+            lambda _: None
+        )
+    )
+
+    assert result.timed_out
+    assert result.output == "foo\n"
+
+
+def test_command_exceeding_cpu_time_is_stopped():
+    metadata = CommandMetadata(
+        "bash",
+        ["-c", "while :; do :; done"],
+        limits=CommandLimits(timeout=10, cpu_time=1)
+    )
+    result = NativeBackend().run(metadata, Path.cwd(), NullCommandLogger())
+
+    assert not result.timed_out
+    assert result.limit_exceeded
+    assert not result.success
+
+
+def test_command_exceeding_address_space_fails():
+    metadata = CommandMetadata(
+        sys.executable,
+        ["-c", "bytearray(1024 * 1024 * 1024)"],
+        limits=CommandLimits(address_space=512 * 1024 * 1024)
+    )
+    result = NativeBackend().run(metadata, Path.cwd(), NullCommandLogger())
+
+    assert not result.success
+
+
+def test_command_is_stopped_after_timeout_async():
+    metadata = CommandMetadata(
+        "bash",
+        ["-c", "trap '' TERM; sleep 10"],
+        limits=CommandLimits(timeout=0.2, kill_grace_period=0.2)
+    )
+    start = time.monotonic()
+    result = asyncio.run(
+        NativeBackend().run_async(metadata, Path.cwd(), NullCommandLogger())
+    )
+
+    assert time.monotonic() - start < 5
+    assert result.timed_out
+    assert result.exit_code == -signal.SIGKILL
+
+
+def test_command_that_closes_its_pipes_is_stopped_after_timeout():
+    metadata = CommandMetadata(
+        "sh",
+        ["-c", "exec >&- 2>&-; sleep 4"],
+        limits=CommandLimits(timeout=0.2)
+    )
+    start = time.monotonic()
+    result = NativeBackend().run(metadata, Path.cwd(), NullCommandLogger())
+
+    assert time.monotonic() - start < 2
+    assert result.timed_out
+    assert result.exit_code == -signal.SIGTERM
+
+
+def test_command_that_closes_its_pipes_is_stopped_after_timeout_async():
+    metadata = CommandMetadata(
+        "sh",
+        ["-c", "exec >&- 2>&-; sleep 4"],
+        limits=CommandLimits(timeout=0.2)
+    )
+    start = time.monotonic()
+    result = asyncio.run(
+        NativeBackend().run_async(metadata, Path.cwd(), NullCommandLogger())
+    )
+
+    assert time.monotonic() - start < 2
+    assert result.timed_out
+    assert result.exit_code == -signal.SIGTERM
+
+
+def test_resource_usage_is_recorded():
+    # Allocate and touch 64 MiB so that the max RSS is clearly measurable
+    metadata = CommandMetadata(
+        sys.executable,
+        ["-c", "b = bytearray(64 * 1024 * 1024)"]
+    )
+    result = NativeBackend().run(metadata, Path.cwd(), NullCommandLogger())
+
+    assert result.resource_usage is not None
+    assert result.max_rss is not None
+    assert result.max_rss >= 64 * 1024 * 1024
+    assert result.user_time is not None and result.user_time >= 0
+
+
+def test_resource_usage_is_recorded_async():
+    metadata = CommandMetadata(
+        sys.executable,
+        ["-c", "b = bytearray(64 * 1024 * 1024)"]
+    )
+    result = asyncio.run(
+        NativeBackend().run_async(metadata, Path.cwd(), NullCommandLogger())
+    )
+
+    assert result.success
+    assert result.resource_usage is not None
+    assert result.max_rss is not None
+    assert result.max_rss >= 64 * 1024 * 1024
+    assert result.user_time is not None and result.user_time >= 0
+    assert result.system_time is not None and result.system_time >= 0
+
+
+def test_command_exceeding_cpu_time_is_stopped_async():
+    metadata = CommandMetadata(
+        "bash",
+        ["-c", "while :; do :; done"],
+        limits=CommandLimits(timeout=10, cpu_time=1)
+    )
+    result = asyncio.run(
+        NativeBackend().run_async(metadata, Path.cwd(), NullCommandLogger())
+    )
+
+    assert not result.timed_out
+    assert result.limit_exceeded
+    assert result.resource_usage is not None
+    assert result.resource_usage.cpu_time > 0.5
+
+
+def test_large_output_is_not_held_in_memory():
+    metadata = CommandMetadata("seq", ["100000"])
+    logger = ConsoleCommandLogger(
+        metadata,
+        LoggerOptions(output_memory_limit=64 * 1024),
+        Path.cwd(),
+        lambda _: None
+    )
+    result = NativeBackend().run(metadata, Path.cwd(), logger)
+
+    assert result.output_buffer.spilled
+    assert result.tail(2) == ["99999\n", "100000\n"]
+    assert next(result.iter_lines()) == "1\n"
+    assert len(result.output.splitlines()) == 100000
+
+
+def test_binary_output_with_invalid_utf8():
+    metadata = CommandMetadata(
+        "printf",
+        ["foo\\377\\n"],
+        CommandFlags.BINARY_OUTPUT
+    )
+    printed = []
+    result = NativeBackend().run(
+        metadata,
+        Path.cwd(),
+        ConsoleCommandLogger(
+            metadata,
+            LoggerOptions(),
+            Path.cwd(),
+            printed.append
+        )
+    )
+
+    assert result.success
+    assert result.output_bytes == b"foo\xff\n"
+    assert result.output == "foo�\n"
+    assert "".join(printed) == "foo�\n"
+
+
+class _TextOnlyLogger(ICommandLogger):
+    def __init__(self):
+        self._output = ""
+
+    @property
+    def output(self) -> str:
+        return self._output
+
+    @property
+    def stream_config(self) -> StreamConfig:
+        return StreamConfig.MERGE_STREAMS
+
+    def log(self, stdout: IO[str], stderr: Optional[IO[str]]) -> None:
+        self._output += stdout.read()
+
+    def log_results(self, result: CommandResult, scanner_output: List[Entry]):
+        pass
+
+
+def test_binary_output_with_text_logger():
+    metadata = CommandMetadata(
+        "printf",
+        ["foo\\377\\n"],
+        CommandFlags.BINARY_OUTPUT
+    )
+    logger = _TextOnlyLogger()
+    NativeBackend().run(metadata, Path.cwd(), logger)
+
+    assert logger.output == "foo�\n"
+
+
+def test_binary_output_async():
+    metadata = CommandMetadata(
+        "printf",
+        ["foo\\377\\n"],
+        CommandFlags.BINARY_OUTPUT
+    )
+    result = asyncio.run(
+        NativeBackend().run_async(
+            metadata,
+            Path.cwd(),
+            ConsoleCommandLogger(
+                metadata,
+                LoggerOptions(),
+                Path.cwd(),
+                lambda _: None
+            )
+        )
+    )
+
+    assert result.output_bytes == b"foo\xff\n"
+
+
+def _make_silent_logger(metadata: CommandMetadata) -> ConsoleCommandLogger:
+    return ConsoleCommandLogger(
+        metadata,
+        LoggerOptions(),
+        Path.cwd(),
+        lambda _: None
+    )
+
+
+def test_run_pipeline():
+    backend = NativeBackend()
+    metadata = [
+        CommandMetadata("bash", ["-c", "echo foo; echo bar; echo err >&2"]),
+        CommandMetadata("grep", ["bar"])
+    ]
+    results = backend.run_pipeline(
+        metadata,
+        Path.cwd(),
+        [_make_silent_logger(m) for m in metadata]
+    )
+
+    # Only the first command's stderr is logged for it since its stdout is
+    #   piped to the next command
+    assert [r.exit_code for r in results] == [0, 0]
+    assert results[0].output == "err\n"
+    assert results[1].output == "bar\n"
+
+
+def test_run_pipeline_with_large_output():
+    backend = NativeBackend()
+    metadata = [
+        CommandMetadata("head", ["-c", str(64 * 1024 * 1024), "/dev/zero"]),
+        CommandMetadata("wc", ["-c"])
+    ]
+    results = backend.run_pipeline(
+        metadata,
+        Path.cwd(),
+        [_make_silent_logger(m) for m in metadata]
+    )
+    assert results[1].output.strip() == str(64 * 1024 * 1024)
+
+
+def test_pipeline_reports_each_exit_code():
+    backend = NativeBackend()
+    metadata = [
+        CommandMetadata("bash", ["-c", "echo foo; exit 3"]),
+        CommandMetadata("cat", [])
+    ]
+    results = backend.run_pipeline(
+        metadata,
+        Path.cwd(),
+        [_make_silent_logger(m) for m in metadata]
+    )
+    assert [r.exit_code for r in results] == [3, 0]
+    assert results[1].output == "foo\n"
+
+
+def test_pipeline_requires_logger_for_each_command():
+    with pytest.raises(ValueError):
+        NativeBackend().run_pipeline(
+            [CommandMetadata("echo", []), CommandMetadata("cat", [])],
+            Path.cwd(),
+            [NullCommandLogger()]
+        )
+
+
+def test_pipeline_stops_started_commands_if_spawn_fails():
+    metadata = [
+        CommandMetadata("sleep", ["30"]),
+        CommandMetadata("/does/not/exist", [])
+    ]
+    start = time.monotonic()
+    with pytest.raises(OSError):
+        NativeBackend().run_pipeline(
+            metadata,
+            Path.cwd(),
+            [NullCommandLogger(), NullCommandLogger()]
+        )
+    assert time.monotonic() - start < 10
+
+
+def test_bytes_input():
+    metadata = CommandMetadata("cat", [], stdin=CommandInput(b"foo\nbar\n"))
+    result = NativeBackend().run(
+        metadata,
+        Path.cwd(),
+        _make_silent_logger(metadata)
+    )
+    assert result.output == "foo\nbar\n"
+
+
+def test_large_input_and_output_do_not_deadlock():
+    # Both pipes fill up many times over while the command is running
+    data = b"x" * (8 * 1024 * 1024)
+    metadata = CommandMetadata("cat", [], stdin=CommandInput(data))
+    result = NativeBackend().run(
+        metadata,
+        Path.cwd(),
+        _make_silent_logger(metadata)
+    )
+    assert result.success
+    assert len(result.output_buffer) == len(data) + 1
+
+
+def test_generator_input_is_consumed_lazily():
+    chunks_taken = 0
+    def generate():
+        nonlocal chunks_taken
+        while True:
+            chunks_taken += 1
+            yield b"x" * 1024 * 1024
+
+    # The command stops reading after the first byte, so only the chunks that
+    #   fit in the pipe may be taken from the generator
+    metadata = CommandMetadata(
+        "head",
+        ["-c", "1"],
+        stdin=CommandInput(generate())
+    )
+    result = NativeBackend().run(
+        metadata,
+        Path.cwd(),
+        _make_silent_logger(metadata)
+    )
+    assert result.output == "x\n"
+    assert chunks_taken <= 2
+
+
+def test_file_input(tmp_path: Path):
+    path = tmp_path / "input.txt"
+    path.write_text("foo\n")
+    metadata = CommandMetadata("cat", [], stdin=CommandInput(path))
+    result = NativeBackend().run(
+        metadata,
+        Path.cwd(),
+        _make_silent_logger(metadata)
+    )
+    assert result.output == "foo\n"
+
+
+def test_input_error_closes_stdin():
+    def generate():
+        yield b"foo\n"
+        raise RuntimeError("failed")
+
+    metadata = CommandMetadata("cat", [], stdin=CommandInput(generate()))
+    with pytest.raises(RuntimeError):
+        NativeBackend().run(
+            metadata,
+            Path.cwd(),
+            _make_silent_logger(metadata)
+        )
+
+
+def test_input_is_not_emulated():
+    metadata = CommandMetadata(
+        "cat",
+        [],
+        emulator=_TestEmulator(),
+        stdin=CommandInput(b"foo\n")
+    )
+    result = NativeBackend(emulate_commands=True).run(
+        metadata,
+        Path.cwd(),
+        _make_silent_logger(metadata)
+    )
+    assert result.output == "foo\n"
+
+
+def test_input_async():
+    def generate():
+        for i in range(10000):
+            yield f"{i}\n"
+
+    metadata = CommandMetadata("wc", ["-l"], stdin=CommandInput(generate()))
+    result = asyncio.run(NativeBackend().run_async(
+        metadata,
+        Path.cwd(),
+        _make_silent_logger(metadata)
+    ))
+    assert result.output.strip() == "10000"
+
+
+def test_large_input_and_output_async():
+    # The input and output are both larger than a pipe can hold, so the input
+    #   must be written while the output is being read
+    data = b"x" * 79 + b"\n"
+    metadata = CommandMetadata(
+        "cat",
+        [],
+        stdin=CommandInput(data * 16384)
+    )
+    result = asyncio.run(NativeBackend().run_async(
+        metadata,
+        Path.cwd(),
+        _make_silent_logger(metadata)
+    ))
+
+    assert result.success
+    assert result.output == data.decode() * 16384
+
+
+def test_pipeline_input():
+    metadata = [
+        CommandMetadata("cat", [], stdin=CommandInput(b"foo\nbar\n")),
+        CommandMetadata("grep", ["bar"])
+    ]
+    results = NativeBackend().run_pipeline(
+        metadata,
+        Path.cwd(),
+        [_make_silent_logger(m) for m in metadata]
+    )
+    assert results[1].output == "bar\n"
+
+    metadata.reverse()
+    with pytest.raises(ValueError):
+        NativeBackend().run_pipeline(
+            metadata,
+            Path.cwd(),
+            [_make_silent_logger(m) for m in metadata]
+        )
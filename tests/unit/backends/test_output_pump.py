@@ -0,0 +1,218 @@
+import os
+from pathlib import Path
+from pyshell.backends.output_chunk import OutputChunk
+from pyshell.backends.output_pump import OutputPump
+from pyshell.backends.output_stream import OutputStream
+from pyshell.commands.command_metadata import CommandMetadata
+from pyshell.logging.console_command_logger import ConsoleCommandLogger
+from pyshell.logging.logger_options import LoggerOptions
+from pyshell.logging.null_command_logger import NullCommandLogger
+from pyshell.logging.split_command_logger import SplitCommandLogger
+from pyshell.logging.stream_config import StreamConfig
+import pytest
+import subprocess
+import time
+from typing import List
+
+# Metadata instance passed to the loggers used by tests
+metadata = CommandMetadata("command", ["arg1", "arg2"])
+
+
+def test_pump_forwards_all_output():
+    read_fd, write_fd = os.pipe()
+    os.write(write_fd, b"foo\nbar\n")
+    os.close(write_fd)
+
+    output = ""
+    def on_print(x: str) -> None:
+        nonlocal output
+        output += x
+
+    logger = ConsoleCommandLogger(
+        metadata,
+        LoggerOptions(),
+        Path.cwd(),
+        on_print
+    )
+    OutputPump(logger).pump(read_fd, None)
+    os.close(read_fd)
+
+    assert output == "foo\nbar\n"
+    assert logger.output == "foo\nbar\n"
+
+
+def test_pump_translates_newlines():
+    read_fd, write_fd = os.pipe()
+    os.write(write_fd, b"foo\r\nbar\r")
+    os.close(write_fd)
+
+    logger = ConsoleCommandLogger(
+        metadata,
+        LoggerOptions(),
+        Path.cwd(),
+        lambda _: None
+    )
+    OutputPump(logger).pump(read_fd, None)
+    os.close(read_fd)
+
+    assert logger.output == "foo\nbar\n"
+
+
+def test_pump_handles_characters_split_across_reads():
+    read_fd, write_fd = os.pipe()
+    os.write(write_fd, "éé".encode("utf-8"))
+    os.close(write_fd)
+
+    logger = ConsoleCommandLogger(
+        metadata,
+        LoggerOptions(),
+        Path.cwd(),
+        lambda _: None
+    )
+    # Reading a single byte at a time guarantees that each character is split
+    #   across two reads
+    OutputPump(logger, chunk_size=1).pump(read_fd, None)
+    os.close(read_fd)
+
+    assert logger.output == "éé"
+
+
+def test_pump_forwards_split_streams():
+    stdout_read_fd, stdout_write_fd = os.pipe()
+    stderr_read_fd, stderr_write_fd = os.pipe()
+    os.write(stdout_write_fd, b"foo")
+    os.write(stderr_write_fd, b"bar")
+    os.close(stdout_write_fd)
+    os.close(stderr_write_fd)
+
+    stdout_output = ""
+    def on_stdout(x: str) -> None:
+        nonlocal stdout_output
+        stdout_output += x
+
+    stderr_output = ""
+    def on_stderr(x: str) -> None:
+        nonlocal stderr_output
+        stderr_output += x
+
+    logger = SplitCommandLogger(
+        ConsoleCommandLogger(metadata, LoggerOptions(), Path.cwd(), on_stdout),
+        ConsoleCommandLogger(metadata, LoggerOptions(), Path.cwd(), on_stderr)
+    )
+    OutputPump(logger).pump(stdout_read_fd, stderr_read_fd)
+    os.close(stdout_read_fd)
+    os.close(stderr_read_fd)
+
+    assert stdout_output == "foo"
+    assert stderr_output == "bar"
+    assert "foo" in logger.output
+    assert "bar" in logger.output
+
+
+def test_output_is_forwarded_before_process_exits():
+    # Record the time at which each chunk of output is received
+    timestamps: List[float] = []
+    logger = ConsoleCommandLogger(
+        metadata,
+        LoggerOptions(),
+        Path.cwd(),
+        lambda _: timestamps.append(time.monotonic())
+    )
+
+    with subprocess.Popen(
+        ["bash", "-c", "echo foo; sleep 0.5; echo bar"],
+        stdout=subprocess.PIPE
+    ) as process:
+        assert process.stdout
+        OutputPump(logger).pump(process.stdout.fileno(), None)
+    end_time = time.monotonic()
+
+    assert logger.output == "foo\nbar\n"
+    assert len(timestamps) == 2
+    assert end_time - timestamps[0] > 0.25
+
+
+def test_pump_drains_output_for_null_logger():
+    # If the pump did not read from the pipe, the child would block once the
+    #   pipe's buffer was full and the pump would never return
+    with subprocess.Popen(
+        ["head", "-c", "1000000", "/dev/zero"],
+        stdout=subprocess.PIPE
+    ) as process:
+        assert process.stdout
+        OutputPump(NullCommandLogger()).pump(process.stdout.fileno(), None)
+    assert process.returncode == 0
+
+
+def test_chunks_have_ordering_metadata():
+    chunks: List[OutputChunk] = []
+    logger = SplitCommandLogger(
+        NullCommandLogger(StreamConfig.MERGE_STREAMS),
+        NullCommandLogger(StreamConfig.MERGE_STREAMS)
+    )
+
+    with subprocess.Popen(
+        ["bash", "-c", "echo foo; sleep 0.1; echo bar >&2; sleep 0.1; echo baz"],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE
+    ) as process:
+        assert process.stdout
+        assert process.stderr
+        pump = OutputPump(logger, on_chunk=chunks.append)
+        pump.pump(process.stdout.fileno(), process.stderr.fileno())
+
+    assert pump.chunk_count == 3
+    assert [c.sequence for c in chunks] == [0, 1, 2]
+    assert [c.stream for c in chunks] == [
+        OutputStream.STDOUT,
+        OutputStream.STDERR,
+        OutputStream.STDOUT
+    ]
+    assert [c.text for c in chunks] == ["foo\n", "bar\n", "baz\n"]
+    assert chunks[0].timestamp_ns < chunks[1].timestamp_ns < \
+        chunks[2].timestamp_ns
+    assert logger.output == "foo\nbar\nbaz\n"
+
+
+class _ChunkLogger(NullCommandLogger):
+    """
+    Logger that records the chunks of output that it receives.
+    """
+    def __init__(self):
+        super().__init__(StreamConfig.SPLIT_STREAMS)
+        self.chunks: List[OutputChunk] = []
+
+
+    @property
+    def accepts_chunks(self) -> bool:
+        return True
+
+
+    def log_chunk(self, chunk: OutputChunk) -> None:
+        self.chunks.append(chunk)
+
+
+def test_chunks_are_passed_to_loggers_that_accept_them():
+    read_fd, write_fd = os.pipe()
+    os.write(write_fd, b"foo\n")
+    os.close(write_fd)
+
+    logger = _ChunkLogger()
+    OutputPump(logger).pump(None, read_fd)
+    os.close(read_fd)
+
+    assert [(c.stream, c.text) for c in logger.chunks] == [
+        (OutputStream.STDERR, "foo\n")
+    ]
+
+
+def test_chunks_are_not_built_without_a_subscriber(
+    monkeypatch: pytest.MonkeyPatch):
+    def fail(*args: object) -> None:
+        raise AssertionError("Chunk was built without a subscriber.")
+    monkeypatch.setattr("pyshell.backends.output_pump.OutputChunk", fail)
+
+    pump = OutputPump(NullCommandLogger())
+    pump.feed(b"foo\n", OutputStream.STDOUT)
+    pump.feed(b"", OutputStream.STDOUT)
+    assert pump.chunk_count == 1
@@ -0,0 +1,259 @@
+import os
+from pathlib import Path
+from pyshell.backends.backend import IBackend
+from pyshell.backends.native_backend import NativeBackend
+from pyshell.backends.persistent_shell_backend import PersistentShellBackend
+from pyshell.commands.command_input import CommandInput
+from pyshell.commands.command_limits import CommandLimits
+from pyshell.commands.command_metadata import CommandMetadata
+from pyshell.commands.command_result import CommandResult
+from pyshell.logging.console_command_logger import ConsoleCommandLogger
+from pyshell.logging.logger_options import LoggerOptions
+from pyshell.logging.split_command_logger import SplitCommandLogger
+import pytest
+import signal
+import time
+from typing import Iterator, List
+
+@pytest.fixture
+def backend() -> Iterator[PersistentShellBackend]:
+    backend = PersistentShellBackend()
+    yield backend
+    backend.stop()
+
+
+def _run(backend: PersistentShellBackend,
+    cmd: str,
+    args: List[str],
+    cwd: Path = Path.cwd()):
+    metadata = CommandMetadata(cmd, args)
+    return backend.run(
+        metadata,
+        cwd,
+        ConsoleCommandLogger(metadata, LoggerOptions(), cwd, lambda _: None)
+    )
+
+
+def test_run_echo(backend: PersistentShellBackend):
+    result = _run(backend, "echo", ["foo"])
+    assert result.success
+    assert result.output == "foo\n"
+    assert result.cwd == str(Path.cwd())
+    assert result.backend == "Host"
+
+
+def test_exit_code(backend: PersistentShellBackend):
+    result = _run(backend, "bash", ["-c", "exit 3"])
+    assert result.exit_code == 3
+
+
+def test_args_are_quoted(backend: PersistentShellBackend):
+    result = _run(backend, "echo", ["foo  bar", "$HOME", "'baz'", ";", "*"])
+    assert result.output == "foo  bar $HOME 'baz' ; *\n"
+
+
+def test_output_without_trailing_newline(backend: PersistentShellBackend):
+    result = _run(backend, "printf", ["foo"])
+    assert result.output == "foo\n"
+
+    # The next command's output must not be affected
+    result = _run(backend, "echo", ["bar"])
+    assert result.output == "bar\n"
+
+
+def test_large_output(backend: PersistentShellBackend):
+    size = 1024 * 1024
+    result = _run(backend, "bash", ["-c", f"yes | head -c {size}"])
+    assert result.output == "y\n" * (size // 2)
+
+
+def test_commands_reuse_shell_process(backend: PersistentShellBackend):
+    # Commands are exec'd from a subshell, so their parent is the shell
+    first = _run(backend, "bash", ["-c", "echo $PPID"])
+    second = _run(backend, "bash", ["-c", "echo $PPID"])
+    assert first.output == second.output
+    assert first.output == f"{backend.shell_pid}\n"
+
+
+def test_run_in_different_cwd(backend: PersistentShellBackend):
+    cwd = Path.cwd().parent
+    result = _run(backend, "pwd", [], cwd)
+    assert result.output == f"{cwd}\n"
+
+    # Changing the cwd must not affect later commands
+    result = _run(backend, "pwd", [])
+    assert result.output == f"{Path.cwd()}\n"
+
+
+def _run_metadata(backend: IBackend,
+    metadata: CommandMetadata) -> CommandResult:
+    return backend.run(
+        metadata,
+        Path.cwd(),
+        ConsoleCommandLogger(
+            metadata,
+            LoggerOptions(),
+            Path.cwd(),
+            lambda _: None
+        )
+    )
+
+
+@pytest.mark.parametrize("cwd", [Path("/does/not/exist"), Path(__file__)])
+def test_run_in_invalid_cwd_matches_native_backend(
+    backend: PersistentShellBackend,
+    cwd: Path):
+    with pytest.raises(OSError) as expected:
+        _run(NativeBackend(), "pwd", [], cwd)
+    with pytest.raises(OSError) as actual:
+        _run(backend, "pwd", [], cwd)
+
+    assert type(actual.value) is type(expected.value)
+    assert actual.value.errno == expected.value.errno
+    assert actual.value.filename == expected.value.filename
+
+
+def test_signal_exit_code_matches_native_backend(
+    backend: PersistentShellBackend):
+    metadata = CommandMetadata("bash", ["-c", "kill -TERM $$"])
+    expected = _run_metadata(NativeBackend(), metadata)
+    actual = _run_metadata(backend, metadata)
+
+    assert expected.exit_code == -signal.SIGTERM
+    assert actual.exit_code == expected.exit_code
+
+
+def test_executable_matches_native_backend(backend: PersistentShellBackend):
+    metadata = CommandMetadata(
+        "custom-name",
+        ["-c", "echo $0"],
+        executable="/bin/bash"
+    )
+    expected = _run_metadata(NativeBackend(), metadata)
+    actual = _run_metadata(backend, metadata)
+
+    assert expected.output == "custom-name\n"
+    assert actual.output == expected.output
+
+
+@pytest.mark.parametrize("script, grace_period, exit_code", [
+    ("echo foo; sleep 10", 5.0, -signal.SIGTERM),
+    ("echo foo; trap '' TERM; sleep 10", 0.2, -signal.SIGKILL)
+])
+def test_timeout_matches_native_backend(
+    backend: PersistentShellBackend,
+    script: str,
+    grace_period: float,
+    exit_code: int):
+    metadata = CommandMetadata(
+        "bash",
+        ["-c", script],
+        limits=CommandLimits(timeout=0.5, kill_grace_period=grace_period)
+    )
+    expected = _run_metadata(NativeBackend(), metadata)
+    start = time.monotonic()
+    actual = _run_metadata(backend, metadata)
+
+    assert time.monotonic() - start < 5
+    assert expected.timed_out and actual.timed_out
+    assert expected.exit_code == exit_code
+    assert actual.exit_code == expected.exit_code
+    assert actual.output == expected.output
+
+    # The shell must be restarted for the next command
+    result = _run(backend, "echo", ["bar"])
+    assert result.output == "bar\n"
+
+
+def test_cpu_time_limit_matches_native_backend(
+    backend: PersistentShellBackend):
+    metadata = CommandMetadata(
+        "bash",
+        ["-c", "while :; do :; done"],
+        limits=CommandLimits(timeout=10, cpu_time=1)
+    )
+    expected = _run_metadata(NativeBackend(), metadata)
+    actual = _run_metadata(backend, metadata)
+
+    assert expected.limit_exceeded and actual.limit_exceeded
+    assert not expected.timed_out and not actual.timed_out
+    assert actual.exit_code == expected.exit_code
+
+    # Limits must not affect later commands
+    result = _run(backend, "bash", ["-c", "ulimit -t"])
+    assert result.output == "unlimited\n"
+
+
+def test_environment_changes_are_applied(
+    backend: PersistentShellBackend,
+    monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv("PYSHELL_TEST_REMOVED", "foo")
+    _run(backend, "true", [])
+
+    monkeypatch.setenv("PYSHELL_TEST_ADDED", "bar baz")
+    monkeypatch.delenv("PYSHELL_TEST_REMOVED")
+    result = _run(
+        backend,
+        "bash",
+        ["-c", "echo ${PYSHELL_TEST_ADDED}:${PYSHELL_TEST_REMOVED-unset}"]
+    )
+    assert result.output == "bar baz:unset\n"
+
+
+def test_split_streams(backend: PersistentShellBackend):
+    metadata = CommandMetadata("bash", ["-c", "echo foo; echo bar >&2"])
+
+    stdout_output = ""
+    def on_stdout(x: str) -> None:
+        nonlocal stdout_output
+        stdout_output += x
+
+    stderr_output = ""
+    def on_stderr(x: str) -> None:
+        nonlocal stderr_output
+        stderr_output += x
+
+    logger = SplitCommandLogger(
+        ConsoleCommandLogger(metadata, LoggerOptions(), Path.cwd(), on_stdout),
+        ConsoleCommandLogger(metadata, LoggerOptions(), Path.cwd(), on_stderr)
+    )
+    result = backend.run(metadata, Path(os.getcwd()), logger)
+
+    assert result.success
+    assert stdout_output == "foo\n"
+    assert stderr_output == "bar\n"
+
+
+def test_commands_do_not_read_shell_stdin(backend: PersistentShellBackend):
+    result = _run(backend, "cat", [])
+    assert result.success
+    assert result.output == "\n"
+
+    result = _run(backend, "echo", ["foo"])
+    assert result.output == "foo\n"
+
+
+def test_restart_after_stop(backend: PersistentShellBackend):
+    _run(backend, "true", [])
+    pid = backend.shell_pid
+    backend.stop()
+    assert backend.shell_pid is None
+
+    result = _run(backend, "echo", ["foo"])
+    assert result.output == "foo\n"
+    assert backend.shell_pid != pid
+
+
+def test_input_is_not_supported(backend: PersistentShellBackend):
+    metadata = CommandMetadata("cat", [], stdin=CommandInput(b"foo"))
+    with pytest.raises(ValueError):
+        backend.run(
+            metadata,
+            Path.cwd(),
+            ConsoleCommandLogger(
+                metadata,
+                LoggerOptions(),
+                Path.cwd(),
+                lambda _: None
+            )
+        )
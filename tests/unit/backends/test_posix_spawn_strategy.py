@@ -0,0 +1,169 @@
+import os
+from pathlib import Path
+from pyshell.backends.native_backend import NativeBackend
+from pyshell.backends.popen_spawn_strategy import PopenSpawnStrategy
+from pyshell.backends.posix_spawn_strategy import PosixSpawnStrategy
+from pyshell.backends.spawn_strategy import ISpawnStrategy
+from pyshell.commands.command_limits import CommandLimits
+from pyshell.commands.command_metadata import CommandMetadata
+from pyshell.core.platform_statics import PlatformStatics
+from pyshell.logging.console_command_logger import ConsoleCommandLogger
+from pyshell.logging.logger_options import LoggerOptions
+from pyshell.logging.null_command_logger import NullCommandLogger
+from pyshell.logging.split_command_logger import SplitCommandLogger
+import pytest
+from typing import List
+
+def test_spawn_with_merged_streams():
+    metadata = CommandMetadata("bash", ["-c", "echo foo; echo bar >&2"])
+    process = PosixSpawnStrategy().spawn(metadata, Path.cwd(), True)
+
+    assert process.stderr is None
+    output = process.stdout.read()
+    assert process.wait() == 0
+    assert output == b"foo\nbar\n"
+    assert process.spawn_duration > 0
+
+
+def test_spawn_with_split_streams():
+    metadata = CommandMetadata("bash", ["-c", "echo foo; echo bar >&2"])
+    process = PosixSpawnStrategy().spawn(metadata, Path.cwd(), False)
+
+    assert process.stderr is not None
+    assert process.stdout.read() == b"foo\n"
+    assert process.stderr.read() == b"bar\n"
+    assert process.wait() == 0
+
+
+def test_spawn_pre_resolved_executable():
+    # The command name is passed to the process as argv[0] but the executable
+    #   is what actually gets run
+    metadata = CommandMetadata(
+        "foo",
+        ["-c", "echo $0"],
+        executable=str(PlatformStatics.resolve_using_path("bash"))
+    )
+    process = PosixSpawnStrategy().spawn(metadata, Path.cwd(), True)
+
+    assert process.stdout.read() == b"foo\n"
+    assert process.wait() == 0
+
+
+def test_exit_code_of_process():
+    metadata = CommandMetadata("bash", ["-c", "exit 3"])
+    process = PosixSpawnStrategy().spawn(metadata, Path.cwd(), True)
+    assert process.wait() == 3
+    assert process.exit_code == 3
+
+
+def test_spawn_missing_executable_throws():
+    metadata = CommandMetadata("not_a_real_command", [])
+    with pytest.raises(FileNotFoundError):
+        PosixSpawnStrategy().spawn(metadata, Path.cwd(), True)
+
+
+def test_spawn_in_different_cwd():
+    cwd = Path.cwd().parent
+    metadata = CommandMetadata("pwd", [])
+    process = PosixSpawnStrategy().spawn(metadata, cwd, True)
+
+    assert process.stdout.read().decode() == f"{cwd}\n"
+    assert process.wait() == 0
+
+
+def test_native_backend_with_posix_spawn():
+    msg = "foo"
+    metadata = CommandMetadata("bash", ["-c", f"echo {msg} >&2"])
+
+    stderr_output = ""
+    def on_stderr(x: str) -> None:
+        nonlocal stderr_output
+        stderr_output += x
+
+    logger = SplitCommandLogger(
+        ConsoleCommandLogger(
+            metadata,
+            LoggerOptions(),
+            Path.cwd(),
+            lambda _: None
+        ),
+        ConsoleCommandLogger(metadata, LoggerOptions(), Path.cwd(), on_stderr)
+    )
+    backend = NativeBackend(spawn_strategy=PosixSpawnStrategy())
+    result = backend.run(metadata, Path(os.getcwd()), logger)
+
+    assert result.success
+    assert stderr_output == "foo\n"
+    assert result.spawn_duration_seconds is not None
+
+
+def test_no_file_descriptors_are_leaked():
+    fd_dir = Path("/proc/self/fd")
+    if not fd_dir.exists():
+        pytest.skip("Open file descriptors can't be listed on this platform.")
+    fd_count = len(list(fd_dir.iterdir()))
+
+    backend = NativeBackend(spawn_strategy=PosixSpawnStrategy())
+    for _ in range(10):
+        backend.run(CommandMetadata("true", []), Path.cwd(), NullCommandLogger())
+
+    assert len(list(fd_dir.iterdir())) == fd_count
+
+
+def test_spawn_with_stdin_and_stdout_descriptors():
+    stdin_read, stdin_write = os.pipe()
+    stdout_read, stdout_write = os.pipe()
+    os.write(stdin_write, b"foo\n")
+    os.close(stdin_write)
+
+    metadata = CommandMetadata("bash", ["-c", "cat; echo bar >&2"])
+    process = PosixSpawnStrategy().spawn(
+        metadata,
+        Path.cwd(),
+        True,
+        stdin_read,
+        stdout_write
+    )
+    os.close(stdin_read)
+    os.close(stdout_write)
+
+    # Stderr always gets its own pipe when stdout is redirected
+    assert process.stdout is None
+    assert process.stderr is not None
+    assert process.stderr.read() == b"bar\n"
+    assert process.wait() == 0
+    with open(stdout_read, "rb") as f:
+        assert f.read() == b"foo\n"
+
+
+@pytest.mark.parametrize("strategy", [
+    PosixSpawnStrategy(),
+    PopenSpawnStrategy()
+])
+def test_process_is_stopped_if_limits_cannot_be_applied(
+    strategy: ISpawnStrategy,
+    monkeypatch: pytest.MonkeyPatch):
+    fd_dir = Path("/proc/self/fd")
+    if not fd_dir.exists():
+        pytest.skip("Open file descriptors can't be listed on this platform.")
+    fd_count = len(list(fd_dir.iterdir()))
+
+    pids: List[int] = []
+    def apply(_: CommandLimits, pid: int) -> None:
+        pids.append(pid)
+        raise PermissionError("Limits can't be applied.")
+    monkeypatch.setattr(CommandLimits, "apply", apply)
+
+    metadata = CommandMetadata(
+        "sleep",
+        ["10"],
+        limits=CommandLimits(cpu_time=1)
+    )
+    with pytest.raises(PermissionError):
+        strategy.spawn(metadata, Path.cwd(), False)
+
+    # The process must have been reaped and its pipes must have been closed
+    assert len(pids) == 1
+    with pytest.raises(ChildProcessError):
+        os.waitpid(pids[0], os.WNOHANG)
+    assert len(list(fd_dir.iterdir())) == fd_count
@@ -0,0 +1,38 @@
+from pyshell.commands.command_graph import CommandGraph
+from pyshell.commands.external_command import ExternalCommand
+import pytest
+
+def test_commands_are_stored_in_order():
+    graph = CommandGraph()
+    first = graph.add(ExternalCommand("echo"))
+    second = graph.add(ExternalCommand("echo"))
+
+    assert len(graph) == 2
+    assert list(graph.commands) == [first, second]
+    assert first in graph
+
+
+def test_dependencies_and_dependents():
+    graph = CommandGraph()
+    build = graph.add(ExternalCommand("echo", "build"))
+    test = graph.add(ExternalCommand("echo", "test"), after=[build])
+    docs = graph.add(ExternalCommand("echo", "docs"), after=[build])
+    package = graph.add(ExternalCommand("echo", "package"), after=[test, docs])
+
+    assert not graph.dependencies(build)
+    assert list(graph.dependencies(package)) == [test, docs]
+    assert list(graph.dependents(build)) == [test, docs]
+    assert not graph.dependents(package)
+
+
+def test_add_command_twice_throws():
+    graph = CommandGraph()
+    cmd = graph.add(ExternalCommand("echo"))
+    with pytest.raises(ValueError):
+        graph.add(cmd)
+
+
+def test_dependency_not_in_graph_throws():
+    graph = CommandGraph()
+    with pytest.raises(ValueError):
+        graph.add(ExternalCommand("echo"), after=[ExternalCommand("echo")])
@@ -0,0 +1,38 @@
+import locale
+from pathlib import Path
+from pyshell.commands.command_input import CommandInput
+import pytest
+
+def test_bytes_input():
+    command_input = CommandInput(b"foo")
+    assert command_input.path is None
+    assert list(command_input.iter_chunks()) == [b"foo"]
+
+
+def test_string_input_is_encoded():
+    command_input = CommandInput("café")
+    assert list(command_input.iter_chunks()) == [
+        "café".encode(locale.getpreferredencoding(False))
+    ]
+
+
+def test_file_input(tmp_path: Path):
+    command_input = CommandInput(tmp_path / "input.txt")
+    assert command_input.path == tmp_path / "input.txt"
+    with pytest.raises(ValueError):
+        list(command_input.iter_chunks())
+
+
+def test_iterable_input():
+    def generate():
+        yield b"foo"
+        yield "bar"
+
+    command_input = CommandInput(generate())
+    assert command_input.path is None
+    assert list(command_input.iter_chunks()) == [b"foo", b"bar"]
+
+
+def test_unsupported_input():
+    with pytest.raises(TypeError):
+        CommandInput(42) # type: ignore
@@ -0,0 +1,54 @@
+from pyshell.commands.command_limits import CommandLimits
+import pytest
+
+def test_limits_default_to_none():
+    limits = CommandLimits()
+    assert limits.timeout is None
+    assert limits.cpu_time is None
+    assert limits.address_space is None
+    assert not limits.has_resource_limits
+
+
+def test_properties_match_ctor_args():
+    limits = CommandLimits(
+        timeout=1.5,
+        cpu_time=2,
+        address_space=1024,
+        kill_grace_period=0.5
+    )
+    assert limits.timeout == 1.5
+    assert limits.cpu_time == 2
+    assert limits.address_space == 1024
+    assert limits.kill_grace_period == 0.5
+    assert limits.has_resource_limits
+
+
+def test_kill_grace_period_uses_default_if_not_set():
+    limits = CommandLimits(timeout=1)
+    assert limits.kill_grace_period == CommandLimits.DEFAULT_KILL_GRACE_PERIOD
+
+
+@pytest.mark.parametrize("arg", [
+    "timeout",
+    "cpu_time",
+    "address_space",
+    "kill_grace_period"
+])
+def test_ctor_throws_if_limit_is_not_positive(arg: str):
+    with pytest.raises(ValueError):
+        CommandLimits(**{arg: 0})
+
+
+def test_merge_prefers_own_limits():
+    limits = CommandLimits(timeout=1).merge(
+        CommandLimits(timeout=2, cpu_time=3, kill_grace_period=4)
+    )
+    assert limits.timeout == 1
+    assert limits.cpu_time == 3
+    assert limits.address_space is None
+    assert limits.kill_grace_period == 4
+
+
+def test_merge_without_defaults():
+    limits = CommandLimits(timeout=1)
+    assert limits.merge(None) is limits
@@ -43,3 +43,9 @@ def test_cleanup_command():
     assert not cmd.is_standard
     assert not cmd.is_inactive
     assert cmd.is_cleanup
+
+
+def test_pre_resolved_executable():
+    cmd = CommandMetadata("foo", [], executable="/usr/bin/foo")
+    assert cmd.executable == "/usr/bin/foo"
+    assert CommandMetadata("foo", []).executable is None
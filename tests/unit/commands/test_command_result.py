@@ -1,6 +1,9 @@
 from datetime import datetime, timedelta
 from dateutil import tz
+from pathlib import Path
 from pyshell.commands.command_result import CommandResult
+from pyshell.commands.output_buffer import OutputBuffer
+from pyshell.commands.resource_usage import ResourceUsage
 import pytest
 
 def test_success_error_properties_on_successful_command():
@@ -223,3 +226,165 @@ def test_backend_property():
     )
 
     assert result.backend == backend
+
+
+def test_command_spawn_duration():
+    result = CommandResult(
+        "foo",
+        ["bar"],
+        "/foo/bar",
+        "baz",
+        0,
+        False,
+        datetime.now(),
+        datetime.now(),
+        spawn_duration=0.5
+    )
+
+    assert result.spawn_duration_seconds == 0.5
+    assert result.spawn_duration_milliseconds == 500
+
+
+def test_command_spawn_duration_not_measured():
+    result = CommandResult(
+        "foo",
+        ["bar"],
+        "/foo/bar",
+        "baz",
+        0,
+        False,
+        datetime.now(),
+        datetime.now()
+    )
+
+    assert result.spawn_duration_seconds is None
+    assert result.spawn_duration_milliseconds is None
+
+
+def test_command_not_stopped_by_default():
+    result = CommandResult(
+        "foo",
+        ["bar"],
+        "/foo/bar",
+        "baz",
+        0,
+        False,
+        datetime.now(),
+        datetime.now()
+    )
+
+    assert not result.timed_out
+    assert not result.limit_exceeded
+
+
+def test_command_stopped_by_limits():
+    result = CommandResult(
+        "foo",
+        ["bar"],
+        "/foo/bar",
+        "baz",
+        -9,
+        False,
+        datetime.now(),
+        datetime.now(),
+        timed_out=True,
+        limit_exceeded=True
+    )
+
+    assert result.timed_out
+    assert result.limit_exceeded
+    assert not result.success
+
+
+def test_command_resource_usage():
+    usage = ResourceUsage(1.5, 0.5, 2048, 1, 2, 3, 4)
+    result = CommandResult(
+        "foo",
+        ["bar"],
+        "/foo/bar",
+        "baz",
+        0,
+        False,
+        datetime.now(),
+        datetime.now(),
+        resource_usage=usage
+    )
+
+    assert result.resource_usage is usage
+    assert result.user_time == 1.5
+    assert result.system_time == 0.5
+    assert result.max_rss == 2048
+
+
+def test_command_resource_usage_not_collected():
+    result = CommandResult(
+        "foo",
+        ["bar"],
+        "/foo/bar",
+        "baz",
+        0,
+        False,
+        datetime.now(),
+        datetime.now()
+    )
+
+    assert result.resource_usage is None
+    assert result.user_time is None
+    assert result.system_time is None
+    assert result.max_rss is None
+
+
+def test_command_output_from_buffer():
+    buffer = OutputBuffer(4)
+    buffer.append("foo\n")
+    buffer.append("bar\n")
+    result = CommandResult(
+        "foo",
+        ["bar"],
+        "/foo/bar",
+        buffer,
+        0,
+        False,
+        datetime.now(),
+        datetime.now()
+    )
+
+    assert result.output_buffer is buffer
+    assert result.tail(1) == ["bar\n"]
+    assert list(result.iter_lines()) == ["foo\n", "bar\n"]
+    assert result.output == "foo\nbar\n"
+
+
+def test_command_output_lines_from_string():
+    result = CommandResult(
+        "foo",
+        ["bar"],
+        "/foo/bar",
+        "foo\nbar\n",
+        0,
+        False,
+        datetime.now(),
+        datetime.now()
+    )
+
+    assert list(result.iter_lines()) == ["foo\n", "bar\n"]
+    assert result.tail(1) == ["bar\n"]
+
+
+def test_with_outputs():
+    result = CommandResult(
+        "foo",
+        ["bar"],
+        "/foo/bar",
+        "baz",
+        0,
+        False,
+        datetime.now(),
+        datetime.now()
+    )
+    copy = result.with_outputs([Path("/foo/out")])
+
+    assert result.outputs == ()
+    assert copy.outputs == [Path("/foo/out")]
+    assert copy.output == "baz"
+    assert copy.timings is result.timings
@@ -0,0 +1,51 @@
+from pyshell.commands.command_phase import CommandPhase
+from pyshell.commands.command_timings import CommandTimings
+
+def test_empty_timings():
+    timings = CommandTimings()
+    assert timings.total_ns == 0
+    assert timings.overhead_ns == 0
+    assert timings.get_ns(CommandPhase.BACKEND) == 0
+    assert CommandPhase.BACKEND not in timings
+    assert list(timings) == []
+
+
+def test_record_phases():
+    timings = CommandTimings()
+    timings.record(CommandPhase.BACKEND, 100)
+    timings.record(CommandPhase.EXECUTOR, 5)
+    timings.record(CommandPhase.BACKEND, 20)
+
+    assert timings.get_ns(CommandPhase.BACKEND) == 120
+    assert CommandPhase.BACKEND in timings
+    assert timings.total_ns == 125
+    assert timings.overhead_ns == 5
+
+    # Phases are iterated in the order that they occur
+    assert list(timings) == [
+        (CommandPhase.EXECUTOR, 5),
+        (CommandPhase.BACKEND, 120)
+    ]
+
+
+def test_lap_records_time_since_last_lap():
+    timings = CommandTimings()
+    timings.mark()
+    timings.lap(CommandPhase.EXECUTOR)
+    timings.lap(CommandPhase.LOGGER)
+    assert CommandPhase.EXECUTOR in timings
+    assert CommandPhase.LOGGER in timings
+    assert timings.get_ns(CommandPhase.EXECUTOR) >= 0
+
+
+def test_update():
+    timings = CommandTimings()
+    timings.record(CommandPhase.BACKEND, 10)
+    other = CommandTimings()
+    other.record(CommandPhase.BACKEND, 5)
+    other.record(CommandPhase.SCAN, 1)
+    timings.update(other)
+    assert list(timings) == [
+        (CommandPhase.BACKEND, 15),
+        (CommandPhase.SCAN, 1)
+    ]
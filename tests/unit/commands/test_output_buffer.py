@@ -0,0 +1,151 @@
+from pyshell.commands.output_buffer import OutputBuffer
+import pytest
+
+def test_empty_buffer():
+    buffer = OutputBuffer()
+    assert len(buffer) == 0
+    assert buffer.getvalue() == ""
+    assert list(buffer.iter_lines()) == []
+    assert buffer.tail(3) == []
+    assert not buffer.endswith("\n")
+    assert not buffer.spilled
+
+
+def test_initial_value():
+    buffer = OutputBuffer(initial_value="foo\n")
+    assert buffer.getvalue() == "foo\n"
+    assert len(buffer) == 4
+
+
+def test_ctor_throws_if_memory_limit_is_invalid():
+    with pytest.raises(ValueError):
+        OutputBuffer(0)
+
+
+def test_append_keeps_output_in_memory_below_limit():
+    buffer = OutputBuffer(100)
+    buffer.append("foo\n")
+    buffer.append("bar\n")
+
+    assert not buffer.spilled
+    assert buffer.getvalue() == "foo\nbar\n"
+    assert str(buffer) == "foo\nbar\n"
+
+
+def test_append_spills_to_disk_above_limit():
+    buffer = OutputBuffer(4)
+    buffer.append("foo\n")
+    assert not buffer.spilled
+    buffer.append("bar\n")
+    assert buffer.spilled
+    buffer.append("baz")
+
+    assert buffer.getvalue() == "foo\nbar\nbaz"
+    assert len(buffer) == 11
+    buffer.close()
+
+
+def test_unlimited_buffer_never_spills():
+    buffer = OutputBuffer(None)
+    buffer.append("x" * 1024 * 1024)
+    assert not buffer.spilled
+
+
+@pytest.mark.parametrize("memory_limit", [None, 1, 5])
+def test_iter_lines(memory_limit):
+    buffer = OutputBuffer(memory_limit)
+    for chunk in ["fo", "o\nb", "ar\n", "\n", "baz"]:
+        buffer.append(chunk)
+
+    assert list(buffer.iter_lines()) == ["foo\n", "bar\n", "\n", "baz"]
+
+
+@pytest.mark.parametrize("memory_limit", [None, 1, 5])
+def test_tail(memory_limit):
+    buffer = OutputBuffer(memory_limit)
+    for chunk in ["foo\n", "bar\nb", "az\n"]:
+        buffer.append(chunk)
+
+    assert buffer.tail(1) == ["baz\n"]
+    assert buffer.tail(2) == ["bar\n", "baz\n"]
+    assert buffer.tail(10) == ["foo\n", "bar\n", "baz\n"]
+    assert buffer.tail(0) == []
+
+
+def test_tail_without_trailing_newline():
+    buffer = OutputBuffer(2)
+    buffer.append("foo\nbar")
+    assert buffer.tail(1) == ["bar"]
+    assert buffer.tail(2) == ["foo\n", "bar"]
+
+
+def test_tail_chars():
+    buffer = OutputBuffer(2)
+    buffer.append("foo\n")
+    buffer.append("ba")
+    assert buffer.tail_chars(3) == "\nba"
+    assert buffer.tail_chars(10) == "foo\nba"
+    assert buffer.endswith("ba")
+    assert not buffer.endswith("\n")
+
+
+def test_non_ascii_output_survives_spilling():
+    text = "é中\U0001f600\udcff\n" * 10
+    buffer = OutputBuffer(3)
+    for char in text:
+        buffer.append(char)
+
+    assert buffer.getvalue() == text
+    assert buffer.tail(1) == ["é中\U0001f600\udcff\n"]
+    assert buffer.tail_chars(2) == "\udcff\n"
+
+
+def test_byte_count():
+    buffer = OutputBuffer(3)
+    buffer.append("foo\n")
+    buffer.append("é中\n")
+    assert len(buffer) == 7
+    assert buffer.byte_count == len(buffer.getbytes()) == 10
+
+    buffer = OutputBuffer(binary=True, encoding="utf-8")
+    buffer.append(b"\xff\r\n")
+    assert buffer.byte_count == 3
+
+
+def test_binary_buffer_stores_raw_bytes():
+    buffer = OutputBuffer(binary=True, encoding="utf-8")
+    buffer.append(b"foo\r\n\xff")
+    buffer.append(b"bar\n")
+
+    assert buffer.binary
+    assert len(buffer) == 10
+    assert buffer.getbytes() == b"foo\r\n\xffbar\n"
+    assert buffer.getvalue() == "foo\n�bar\n"
+
+
+@pytest.mark.parametrize("memory_limit", [None, 1, 3])
+def test_binary_buffer_decodes_characters_split_across_chunks(memory_limit):
+    buffer = OutputBuffer(memory_limit, binary=True, encoding="utf-8")
+    data = "é中\n".encode()
+    for i in range(len(data)):
+        buffer.append(data[i:i + 1])
+
+    assert buffer.getvalue() == "é中\n"
+    assert list(buffer.iter_lines()) == ["é中\n"]
+    assert buffer.tail(1) == ["é中\n"]
+    assert buffer.getbytes() == data
+
+
+def test_binary_buffer_accepts_strings():
+    buffer = OutputBuffer(binary=True, encoding="utf-8")
+    buffer.append(b"foo")
+    buffer.append("\n")
+
+    assert buffer.getbytes() == b"foo\n"
+    assert buffer.endswith("\n")
+
+
+def test_text_buffer_rejects_bytes():
+    buffer = OutputBuffer()
+    with pytest.raises(TypeError):
+        buffer.append(b"foo")
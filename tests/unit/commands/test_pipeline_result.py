@@ -0,0 +1,55 @@
+from datetime import datetime
+from pyshell.commands.command_result import CommandResult
+from pyshell.commands.pipeline_result import PipelineResult
+import pytest
+
+def _make_result(exit_code: int, output: str = "", skipped: bool = False) \
+    -> CommandResult:
+    return CommandResult(
+        "command",
+        [],
+        "/tmp",
+        output,
+        exit_code,
+        skipped,
+        datetime.now(),
+        datetime.now()
+    )
+
+
+def test_successful_pipeline():
+    result = PipelineResult([_make_result(0), _make_result(0, "foo\n")])
+    assert result.success
+    assert result
+    assert not result.error
+    assert result.exit_code == 0
+    assert result.output == "foo\n"
+    assert len(result) == 2
+
+
+def test_pipeline_fails_if_any_command_fails():
+    result = PipelineResult([_make_result(2), _make_result(0)])
+    assert not result.success
+    assert not result
+    assert result.error
+    assert result.exit_code == 2
+    assert result[0].exit_code == 2
+
+
+def test_exit_code_of_last_failed_command_is_used():
+    result = PipelineResult([_make_result(2), _make_result(3), _make_result(0)])
+    assert result.exit_code == 3
+
+
+def test_skipped_pipeline():
+    result = PipelineResult([_make_result(0, skipped=True)] * 2)
+    assert result.skipped
+    assert not result.success
+    assert not result.error
+    with pytest.raises(RuntimeError):
+        result.exit_code
+
+
+def test_empty_pipeline():
+    with pytest.raises(ValueError):
+        PipelineResult([])
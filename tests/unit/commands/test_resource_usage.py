@@ -0,0 +1,26 @@
+from pyshell.commands.resource_usage import ResourceUsage
+import resource
+import sys
+
+def test_properties_match_ctor_args():
+    usage = ResourceUsage(1.5, 0.5, 2048, 1, 2, 3, 4)
+    assert usage.user_time == 1.5
+    assert usage.system_time == 0.5
+    assert usage.cpu_time == 2.0
+    assert usage.max_rss == 2048
+    assert usage.block_inputs == 1
+    assert usage.block_outputs == 2
+    assert usage.voluntary_context_switches == 3
+    assert usage.involuntary_context_switches == 4
+
+
+def test_from_rusage_reports_max_rss_in_bytes():
+    rusage = resource.getrusage(resource.RUSAGE_SELF)
+    usage = ResourceUsage.from_rusage(rusage)
+
+    assert usage.user_time == rusage.ru_utime
+    assert usage.system_time == rusage.ru_stime
+    if sys.platform == "darwin":
+        assert usage.max_rss == rusage.ru_maxrss
+    else:
+        assert usage.max_rss == rusage.ru_maxrss * 1024
@@ -0,0 +1,162 @@
+from datetime import datetime, timedelta
+from pyshell.commands.command_result import CommandResult
+from pyshell.commands.resource_usage import ResourceUsage
+from pyshell.core.command_history import CommandHistory
+import pytest
+
+def _result(command: str,
+    duration: float,
+    exit_code: int = 0,
+    backend: str = "Host",
+    output: str = "") -> CommandResult:
+    start_time = datetime(2024, 1, 1)
+    return CommandResult(
+        command,
+        [],
+        "/",
+        output,
+        exit_code,
+        False,
+        start_time,
+        start_time + timedelta(seconds=duration),
+        backend=backend
+    )
+
+
+def test_empty_history():
+    history = CommandHistory()
+    assert len(history) == 0
+    assert history.slowest(3) == []
+    assert history.failure_rate() == 0.0
+    assert history.total_duration() == 0.0
+    assert history.duration_by_command() == {}
+
+
+def test_record_result():
+    history = CommandHistory()
+    start_time = datetime(2024, 1, 1)
+    history.record(CommandResult(
+        "foo",
+        ["bar"],
+        "/",
+        "output\n",
+        3,
+        False,
+        start_time,
+        start_time + timedelta(seconds=2),
+        backend="Host",
+        spawn_duration=0.5,
+        timed_out=True,
+        resource_usage=ResourceUsage(1.0, 0.25, 1024, 0, 0, 0, 0),
+        cached=True
+    ))
+
+    entry = history[0]
+    assert entry.index == 0
+    assert entry.command == "foo"
+    assert entry.backend == "Host"
+    assert entry.exit_code == 3
+    assert not entry.success
+    assert entry.cached
+    assert entry.timed_out
+    assert not entry.limit_exceeded
+    assert entry.duration == 2.0
+    assert entry.spawn_duration == 0.5
+    assert entry.cpu_time == 1.25
+    assert entry.output_size == len("output\n")
+
+
+def test_output_size_is_counted_in_bytes():
+    history = CommandHistory()
+    history.record(_result("foo", 1.0, output="é中\n"))
+    assert history[0].output_size == len("é中\n".encode()) == 6
+
+
+def test_unmeasured_values_are_none():
+    history = CommandHistory()
+    history.record(_result("foo", 1.0, backend=None)) # type: ignore
+    entry = history[-1]
+    assert entry.backend is None
+    assert entry.spawn_duration is None
+    assert entry.cpu_time is None
+
+
+def test_index_out_of_range():
+    history = CommandHistory()
+    history.record(_result("foo", 1.0))
+    with pytest.raises(IndexError):
+        history[1]
+    with pytest.raises(IndexError):
+        history[-2]
+
+
+def test_slowest():
+    history = CommandHistory()
+    for i, duration in enumerate([3.0, 1.0, 5.0, 2.0]):
+        history.record(_result(f"cmd{i}", duration))
+
+    slowest = history.slowest(2)
+    assert [e.command for e in slowest] == ["cmd2", "cmd0"]
+    assert [e.index for e in slowest] == [2, 0]
+    assert len(history.slowest(10)) == 4
+
+
+def test_failures():
+    history = CommandHistory()
+    history.record(_result("foo", 1.0))
+    history.record(_result("bar", 1.0, exit_code=1))
+    history.record(_result("foo", 1.0, exit_code=2))
+    history.record(_result("foo", 1.0))
+
+    assert [e.index for e in history.failures()] == [1, 2]
+    assert history.failure_rate() == 0.5
+    assert history.failure_rate("foo") == pytest.approx(1 / 3)
+    assert history.failure_rate("bar") == 1.0
+    assert history.failure_rate("baz") == 0.0
+
+
+def test_aggregates():
+    history = CommandHistory()
+    history.record(_result("foo", 1.0, backend="Host"))
+    history.record(_result("bar", 2.0, backend="Docker"))
+    history.record(_result("foo", 4.0, backend="Docker"))
+
+    assert history.total_duration() == 7.0
+    assert history.duration_by_command() == {"foo": 5.0, "bar": 2.0}
+    assert history.duration_by_backend() == {"Host": 1.0, "Docker": 6.0}
+    assert history.count_by_command() == {"foo": 2, "bar": 1}
+
+
+def test_iterate_history():
+    history = CommandHistory()
+    history.record(_result("foo", 1.0))
+    history.record(_result("bar", 1.0))
+    assert [e.command for e in history] == ["foo", "bar"]
+
+
+def test_iteration_is_not_affected_by_clear():
+    history = CommandHistory()
+    history.record(_result("foo", 1.0))
+    history.record(_result("bar", 1.0))
+
+    commands = []
+    for entry in history:
+        commands.append(entry.command)
+        history.clear()
+    assert commands == ["foo", "bar"]
+
+
+def test_clear():
+    history = CommandHistory()
+    history.record(_result("foo", 1.0))
+    history.clear()
+    assert len(history) == 0
+    assert history.memory_usage == 0
+
+
+def test_memory_usage_is_compact():
+    history = CommandHistory()
+    result = _result("foo", 1.0, output="x" * 10000)
+    for _ in range(1000):
+        history.record(result)
+    assert history.memory_usage < 1000 * 64
@@ -0,0 +1,108 @@
+from datetime import datetime
+from pyshell.commands.command_result import CommandResult
+from pyshell.core.command_stream import CommandStream
+import pytest
+import threading
+from typing import Any, Callable, List
+
+def _make_result() -> CommandResult:
+    return CommandResult(
+        "command",
+        [],
+        "/tmp",
+        "",
+        0,
+        False,
+        datetime.now(),
+        datetime.now()
+    )
+
+
+def test_yields_each_line_and_result():
+    result = _make_result()
+    def run(on_line: Callable[[str], Any]) -> CommandResult:
+        on_line("foo\n")
+        on_line("bar\n")
+        return result
+
+    stream = CommandStream(run)
+    assert list(stream) == ["foo\n", "bar\n"]
+    assert stream.result is result
+
+
+def test_command_is_not_started_until_iterated():
+    started = threading.Event()
+    def run(on_line: Callable[[str], Any]) -> CommandResult:
+        started.set()
+        return _make_result()
+
+    stream = CommandStream(run)
+    assert not started.is_set()
+    stream.result
+    assert started.is_set()
+
+
+def test_result_consumes_remaining_lines():
+    def run(on_line: Callable[[str], Any]) -> CommandResult:
+        for i in range(10):
+            on_line(f"{i}\n")
+        return _make_result()
+
+    stream = CommandStream(run, max_buffered_lines=1)
+    assert next(stream) == "0\n"
+    assert stream.result.success
+    assert list(stream) == []
+
+
+def test_producer_blocks_while_queue_is_full():
+    produced: List[int] = []
+    def run(on_line: Callable[[str], Any]) -> CommandResult:
+        for i in range(10):
+            on_line(f"{i}\n")
+            produced.append(i)
+        return _make_result()
+
+    stream = CommandStream(run, max_buffered_lines=2)
+    assert next(stream) == "0\n"
+
+    # Wait for the producer to fill the queue; it must not get further than
+    #   one line past the queue's capacity
+    for _ in range(100):
+        if len(produced) >= 2:
+            break
+        threading.Event().wait(0.01)
+    threading.Event().wait(0.1)
+    assert len(produced) <= 3
+
+    stream.close()
+    assert stream.result.success
+
+
+def test_exception_is_raised_after_output():
+    def run(on_line: Callable[[str], Any]) -> CommandResult:
+        on_line("foo\n")
+        raise RuntimeError("failed")
+
+    stream = CommandStream(run)
+    assert next(stream) == "foo\n"
+    with pytest.raises(RuntimeError):
+        next(stream)
+    with pytest.raises(RuntimeError):
+        stream.result
+
+
+def test_close_discards_output():
+    def run(on_line: Callable[[str], Any]) -> CommandResult:
+        for i in range(100):
+            on_line(f"{i}\n")
+        return _make_result()
+
+    with CommandStream(run, max_buffered_lines=1) as stream:
+        assert next(stream) == "0\n"
+    assert list(stream) == []
+    assert stream.result.success
+
+
+def test_invalid_max_buffered_lines():
+    with pytest.raises(ValueError):
+        CommandStream(lambda _: _make_result(), max_buffered_lines=0)
@@ -0,0 +1,116 @@
+import os
+from pathlib import Path
+from pyshell.core.executable_index import ExecutableIndex
+import pytest
+from typing import List
+
+def _make_dirs(tmp_path: Path, count: int) -> List[Path]:
+    dirs = [tmp_path / f"bin{i}" for i in range(count)]
+    for d in dirs:
+        d.mkdir()
+    return dirs
+
+
+def _path_var(dirs: List[Path]) -> str:
+    return os.pathsep.join(str(d) for d in dirs)
+
+
+def test_resolve_first_match_in_path_order(tmp_path: Path):
+    dirs = _make_dirs(tmp_path, 3)
+    (dirs[1] / "tool").touch()
+    (dirs[2] / "tool").touch()
+
+    index = ExecutableIndex()
+    assert index.resolve("tool", _path_var(dirs)) == dirs[1] / "tool"
+
+
+def test_resolve_missing_file(tmp_path: Path):
+    dirs = _make_dirs(tmp_path, 2)
+    index = ExecutableIndex()
+    assert index.resolve("tool", _path_var(dirs)) is None
+
+
+def test_resolve_file_added_after_indexing(tmp_path: Path):
+    dirs = _make_dirs(tmp_path, 2)
+    index = ExecutableIndex()
+    assert index.resolve("tool", _path_var(dirs)) is None
+
+    (dirs[1] / "tool").touch()
+    assert index.resolve("tool", _path_var(dirs)) == dirs[1] / "tool"
+
+
+def test_resolve_skips_removed_files(tmp_path: Path):
+    dirs = _make_dirs(tmp_path, 2)
+    (dirs[0] / "tool").touch()
+    (dirs[1] / "tool").touch()
+    index = ExecutableIndex()
+    assert index.resolve("tool", _path_var(dirs)) == dirs[0] / "tool"
+
+    (dirs[0] / "tool").unlink()
+    assert index.resolve("tool", _path_var(dirs)) == dirs[1] / "tool"
+
+
+def test_resolve_skips_directories(tmp_path: Path):
+    dirs = _make_dirs(tmp_path, 2)
+    (dirs[0] / "tool").mkdir()
+    (dirs[1] / "tool").touch()
+    index = ExecutableIndex()
+    assert index.resolve("tool", _path_var(dirs)) == dirs[1] / "tool"
+
+
+def test_resolve_after_path_changes(tmp_path: Path):
+    dirs = _make_dirs(tmp_path, 2)
+    (dirs[0] / "tool").touch()
+    (dirs[1] / "tool").touch()
+    index = ExecutableIndex()
+    assert index.resolve("tool", _path_var(dirs)) == dirs[0] / "tool"
+    assert index.resolve("tool", _path_var(dirs[1:])) == dirs[1] / "tool"
+
+
+def test_resolve_detects_shadowing_files(tmp_path: Path):
+    dirs = _make_dirs(tmp_path, 2)
+    (dirs[1] / "tool").touch()
+    index = ExecutableIndex(check_interval=0)
+    assert index.resolve("tool", _path_var(dirs)) == dirs[1] / "tool"
+
+    # A file earlier on the PATH takes precedence once it's been added
+    (dirs[0] / "tool").touch()
+    assert index.resolve("tool", _path_var(dirs)) == dirs[0] / "tool"
+
+
+def test_resolve_with_relative_path_entries(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch):
+    dirs = _make_dirs(tmp_path, 2)
+    (dirs[1] / "tool").touch()
+    monkeypatch.chdir(tmp_path)
+
+    index = ExecutableIndex()
+    path_var = os.pathsep.join(["bin0", str(dirs[1])])
+    assert index.resolve("tool", path_var) == dirs[1] / "tool"
+
+    (dirs[0] / "tool").touch()
+    assert index.resolve("tool", path_var) == Path("bin0", "tool")
+
+
+def test_resolve_filename_in_subdirectory(tmp_path: Path):
+    dirs = _make_dirs(tmp_path, 1)
+    (dirs[0] / "sub").mkdir()
+    (dirs[0] / "sub" / "tool").touch()
+    index = ExecutableIndex()
+    assert index.resolve(os.path.join("sub", "tool"), _path_var(dirs)) == \
+        dirs[0] / "sub" / "tool"
+
+
+def test_invalidate(tmp_path: Path):
+    dirs = _make_dirs(tmp_path, 2)
+    (dirs[1] / "tool").touch()
+    index = ExecutableIndex(check_interval=60)
+    assert index.resolve("tool", _path_var(dirs)) == dirs[1] / "tool"
+
+    # Lookups that find a file don't check for new files until the check
+    #   interval has passed, unless the index is discarded
+    (dirs[0] / "tool").touch()
+    assert index.resolve("tool", _path_var(dirs)) == dirs[1] / "tool"
+    index.invalidate()
+    assert index.resolve("tool", _path_var(dirs)) == dirs[0] / "tool"
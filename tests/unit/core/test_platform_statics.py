@@ -1,4 +1,5 @@
 from pyshell.core.platform_statics import PlatformStatics
+import os
 import pytest
 import sys
 
@@ -21,3 +22,13 @@ def test_find_executable_not_on_path():
     exe_name = PlatformStatics.to_executable_name("not_a_real_command")
     with pytest.raises(FileNotFoundError):
         PlatformStatics.resolve_using_path(exe_name)
+
+
+def test_find_executable_after_path_changes(tmp_path, monkeypatch):
+    exe_name = PlatformStatics.to_executable_name("pyshell_test_tool")
+    (tmp_path / exe_name).touch()
+    with pytest.raises(FileNotFoundError):
+        PlatformStatics.resolve_using_path(exe_name)
+
+    monkeypatch.setenv("PATH", str(tmp_path) + os.pathsep + os.environ["PATH"])
+    assert PlatformStatics.resolve_using_path(exe_name) == tmp_path / exe_name
@@ -1,5 +1,34 @@
+import os
+from pyshell.commands.command_limits import CommandLimits
 from pyshell.core.pyshell_options import PyShellOptions
+import pytest
 
 def test_properties_match_ctor_args():
     options = PyShellOptions(verbose=True)
     assert options.verbose
+
+
+def test_max_jobs_defaults_to_cpu_count():
+    options = PyShellOptions()
+    assert options.max_jobs == (os.cpu_count() or 1)
+
+
+def test_explicitly_set_max_jobs():
+    options = PyShellOptions(max_jobs=3)
+    assert options.max_jobs == 3
+
+
+def test_ctor_throws_if_max_jobs_is_invalid():
+    with pytest.raises(ValueError):
+        PyShellOptions(max_jobs=0)
+
+
+def test_command_limits_default_to_none():
+    options = PyShellOptions()
+    assert options.command_limits is None
+
+
+def test_explicitly_set_command_limits():
+    limits = CommandLimits(timeout=1)
+    options = PyShellOptions(command_limits=limits)
+    assert options.command_limits is limits
@@ -0,0 +1,145 @@
+import os
+from pathlib import Path
+from pyshell.executors.build_index import BuildIndex
+from pyshell.executors.file_hasher import FileHasher
+
+class CountingHasher(FileHasher):
+    def __init__(self):
+        super().__init__()
+        self.hashed: list[Path] = []
+
+    def hash_file(self, path: Path, stat=None):
+        self.hashed.append(path)
+        return super().hash_file(path, stat)
+
+
+def _make_files(tmp_path: Path) -> tuple[Path, Path]:
+    input_file = tmp_path / "input.txt"
+    input_file.write_text("foo")
+    output_file = tmp_path / "output.txt"
+    output_file.write_text("bar")
+    return input_file, output_file
+
+
+def test_unknown_command_is_not_up_to_date(tmp_path: Path):
+    input_file, output_file = _make_files(tmp_path)
+    index = BuildIndex(tmp_path / "index.json")
+    key = BuildIndex.compute_key("cmd", [], [output_file])
+    assert not index.is_up_to_date(key, [input_file], [output_file])
+
+
+def test_recorded_command_is_up_to_date(tmp_path: Path):
+    input_file, output_file = _make_files(tmp_path)
+    index = BuildIndex(tmp_path / "index.json")
+    key = BuildIndex.compute_key("cmd", [], [output_file])
+    inputs = index.snapshot([input_file])
+    assert inputs is not None
+    index.record(key, inputs, [output_file])
+    assert index.is_up_to_date(key, [input_file], [output_file])
+
+
+def test_index_persists(tmp_path: Path):
+    input_file, output_file = _make_files(tmp_path)
+    index = BuildIndex(tmp_path / "index.json")
+    key = BuildIndex.compute_key("cmd", [], [output_file])
+    inputs = index.snapshot([input_file])
+    assert inputs is not None
+    index.record(key, inputs, [output_file])
+
+    index = BuildIndex(tmp_path / "index.json")
+    assert index.is_up_to_date(key, [input_file], [output_file])
+
+
+def test_changed_files_are_not_up_to_date(tmp_path: Path):
+    input_file, output_file = _make_files(tmp_path)
+    index = BuildIndex(tmp_path / "index.json")
+    key = BuildIndex.compute_key("cmd", [], [output_file])
+    inputs = index.snapshot([input_file])
+    assert inputs is not None
+    index.record(key, inputs, [output_file])
+
+    input_file.write_text("foo2")
+    assert not index.is_up_to_date(key, [input_file], [output_file])
+    input_file.write_text("foo")
+    assert index.is_up_to_date(key, [input_file], [output_file])
+
+    output_file.unlink()
+    assert not index.is_up_to_date(key, [input_file], [output_file])
+
+
+def test_changed_directory_contents_are_not_up_to_date(tmp_path: Path):
+    input_dir = tmp_path / "inputs"
+    input_dir.mkdir()
+    (input_dir / "a.txt").write_text("foo")
+    output_file = tmp_path / "output.txt"
+    output_file.write_text("bar")
+    index = BuildIndex(tmp_path / "index.json")
+    key = BuildIndex.compute_key("cmd", [], [output_file])
+    inputs = index.snapshot([input_dir])
+    assert inputs is not None
+    index.record(key, inputs, [output_file])
+    assert index.is_up_to_date(key, [input_dir], [output_file])
+
+    (input_dir / "b.txt").write_text("")
+    assert not index.is_up_to_date(key, [input_dir], [output_file])
+
+
+def test_unchanged_files_are_not_hashed(tmp_path: Path):
+    input_file, output_file = _make_files(tmp_path)
+    hasher = CountingHasher()
+    index = BuildIndex(tmp_path / "index.json", hasher)
+    key = BuildIndex.compute_key("cmd", [], [output_file])
+    inputs = index.snapshot([input_file])
+    assert inputs is not None
+    index.record(key, inputs, [output_file])
+
+    hasher = CountingHasher()
+    index = BuildIndex(tmp_path / "index.json", hasher)
+    assert index.is_up_to_date(key, [input_file], [output_file])
+    assert hasher.hashed == []
+
+
+def test_touched_files_are_hashed_once(tmp_path: Path):
+    input_file, output_file = _make_files(tmp_path)
+    index = BuildIndex(tmp_path / "index.json")
+    key = BuildIndex.compute_key("cmd", [], [output_file])
+    inputs = index.snapshot([input_file])
+    assert inputs is not None
+    index.record(key, inputs, [output_file])
+
+    stat = input_file.stat()
+    os.utime(input_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    hasher = CountingHasher()
+    index = BuildIndex(tmp_path / "index.json", hasher)
+    assert index.is_up_to_date(key, [input_file], [output_file])
+    assert hasher.hashed == [input_file]
+
+    # The new modification time is recorded in the index on disk
+    hasher = CountingHasher()
+    index = BuildIndex(tmp_path / "index.json", hasher)
+    assert index.is_up_to_date(key, [input_file], [output_file])
+    assert hasher.hashed == []
+
+
+def test_removed_command_is_not_up_to_date(tmp_path: Path):
+    input_file, output_file = _make_files(tmp_path)
+    index = BuildIndex(tmp_path / "index.json")
+    key = BuildIndex.compute_key("cmd", [], [output_file])
+    inputs = index.snapshot([input_file])
+    assert inputs is not None
+    index.record(key, inputs, [output_file])
+    index.remove(key)
+    assert not index.is_up_to_date(key, [input_file], [output_file])
+
+
+def test_corrupt_index_is_ignored(tmp_path: Path):
+    (tmp_path / "index.json").write_text("{")
+    input_file, output_file = _make_files(tmp_path)
+    index = BuildIndex(tmp_path / "index.json")
+    key = BuildIndex.compute_key("cmd", [], [output_file])
+    assert not index.is_up_to_date(key, [input_file], [output_file])
+
+
+def test_snapshot_of_missing_file(tmp_path: Path):
+    index = BuildIndex(tmp_path / "index.json")
+    assert index.snapshot([tmp_path / "missing.txt"]) is None
@@ -0,0 +1,315 @@
+from datetime import datetime
+from pathlib import Path
+from pyshell.backends.dry_run_backend import DryRunBackend
+from pyshell.backends.native_backend import NativeBackend
+from pyshell.commands.command_flags import CommandFlags
+from pyshell.commands.command_input import CommandInput
+from pyshell.commands.command_metadata import CommandMetadata
+from pyshell.commands.command_result import CommandResult
+from pyshell.executors.caching_executor import CachingExecutor
+from pyshell.executors.permit_cleanup import PermitCleanup
+from pyshell.logging.console_command_logger import ConsoleCommandLogger
+from pyshell.logging.logger_options import LoggerOptions
+import pytest
+
+def _make_logger(metadata: CommandMetadata) -> ConsoleCommandLogger:
+    return ConsoleCommandLogger(
+        metadata,
+        LoggerOptions(),
+        Path.cwd(),
+        lambda _: None
+    )
+
+
+def _make_result(
+    metadata: CommandMetadata,
+    output: str | bytes,
+    exit_code: int = 0,
+    **kwargs) -> CommandResult:
+    logger = _make_logger(metadata)
+    logger.output_buffer.append(output)
+    return CommandResult(
+        metadata.command,
+        metadata.args,
+        str(Path.cwd()),
+        logger.output_buffer,
+        exit_code,
+        False,
+        datetime.now(),
+        datetime.now(),
+        backend="Host",
+        **kwargs
+    )
+
+
+def test_non_cacheable_commands_have_no_key(tmp_path: Path):
+    executor = CachingExecutor(tmp_path)
+    metadata = CommandMetadata("echo", ["foo"])
+    assert executor.compute_key(metadata, Path.cwd(), NativeBackend()) is None
+
+
+def test_key_is_stable(tmp_path: Path):
+    executor = CachingExecutor(tmp_path)
+    metadata = CommandMetadata("echo", ["foo"], CommandFlags.CACHEABLE)
+    key = executor.compute_key(metadata, Path.cwd(), NativeBackend())
+    assert key is not None
+    assert key == executor.compute_key(metadata, Path.cwd(), NativeBackend())
+    assert key == CachingExecutor(tmp_path).compute_key(
+        metadata,
+        Path.cwd(),
+        NativeBackend()
+    )
+
+
+def test_key_changes_with_command_line_cwd_and_backend(tmp_path: Path):
+    executor = CachingExecutor(tmp_path)
+    metadata = CommandMetadata("echo", ["foo"], CommandFlags.CACHEABLE)
+    key = executor.compute_key(metadata, Path.cwd(), NativeBackend())
+
+    other_args = CommandMetadata("echo", ["bar"], CommandFlags.CACHEABLE)
+    assert key != executor.compute_key(other_args, Path.cwd(), NativeBackend())
+    assert key != executor.compute_key(metadata, tmp_path, NativeBackend())
+    assert key != executor.compute_key(metadata, Path.cwd(), DryRunBackend())
+
+
+def test_key_changes_with_selected_env_vars(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch):
+    executor = CachingExecutor(tmp_path, env_vars=["PYSHELL_TEST_VAR"])
+    metadata = CommandMetadata("echo", ["foo"], CommandFlags.CACHEABLE)
+
+    monkeypatch.setenv("PYSHELL_TEST_VAR", "1")
+    key = executor.compute_key(metadata, Path.cwd(), NativeBackend())
+    monkeypatch.setenv("PYSHELL_TEST_VAR", "2")
+    assert key != executor.compute_key(metadata, Path.cwd(), NativeBackend())
+
+    # Variables that weren't selected don't affect the key
+    monkeypatch.setenv("PYSHELL_OTHER_VAR", "1")
+    key = executor.compute_key(metadata, Path.cwd(), NativeBackend())
+    monkeypatch.setenv("PYSHELL_OTHER_VAR", "2")
+    assert key == executor.compute_key(metadata, Path.cwd(), NativeBackend())
+
+
+def test_key_changes_with_input_file_contents(tmp_path: Path):
+    input_file = tmp_path / "input.txt"
+    input_file.write_text("foo")
+    executor = CachingExecutor(tmp_path / "cache")
+    metadata = CommandMetadata(
+        "cat",
+        [str(input_file)],
+        CommandFlags.CACHEABLE,
+        inputs=[input_file]
+    )
+    key = executor.compute_key(metadata, Path.cwd(), NativeBackend())
+
+    input_file.write_text("bar")
+    assert key != executor.compute_key(metadata, Path.cwd(), NativeBackend())
+    input_file.write_text("foo")
+    assert key == executor.compute_key(metadata, Path.cwd(), NativeBackend())
+
+    input_file.unlink()
+    assert key != executor.compute_key(metadata, Path.cwd(), NativeBackend())
+
+
+def test_key_changes_with_input_directory_contents(tmp_path: Path):
+    input_dir = tmp_path / "inputs"
+    (input_dir / "nested").mkdir(parents=True)
+    (input_dir / "nested" / "a.txt").write_text("foo")
+    executor = CachingExecutor(tmp_path / "cache")
+    metadata = CommandMetadata(
+        "ls",
+        [str(input_dir)],
+        CommandFlags.CACHEABLE,
+        inputs=[input_dir]
+    )
+    key = executor.compute_key(metadata, Path.cwd(), NativeBackend())
+
+    (input_dir / "nested" / "a.txt").write_text("bar")
+    changed_key = executor.compute_key(metadata, Path.cwd(), NativeBackend())
+    assert key != changed_key
+
+    (input_dir / "b.txt").write_text("")
+    assert changed_key != executor.compute_key(
+        metadata,
+        Path.cwd(),
+        NativeBackend()
+    )
+
+
+def test_stdin_file_is_an_input(tmp_path: Path):
+    input_file = tmp_path / "input.txt"
+    input_file.write_text("foo")
+    executor = CachingExecutor(tmp_path / "cache")
+    metadata = CommandMetadata(
+        "cat",
+        [],
+        CommandFlags.CACHEABLE,
+        stdin=CommandInput(input_file)
+    )
+    key = executor.compute_key(metadata, Path.cwd(), NativeBackend())
+    assert key is not None
+
+    input_file.write_text("bar")
+    assert key != executor.compute_key(metadata, Path.cwd(), NativeBackend())
+
+
+def test_commands_with_piped_input_have_no_key(tmp_path: Path):
+    executor = CachingExecutor(tmp_path)
+    metadata = CommandMetadata(
+        "cat",
+        [],
+        CommandFlags.CACHEABLE,
+        stdin=CommandInput(b"foo")
+    )
+    assert executor.compute_key(metadata, Path.cwd(), NativeBackend()) is None
+
+
+def test_lookup_without_stored_result(tmp_path: Path):
+    executor = CachingExecutor(tmp_path)
+    metadata = CommandMetadata("echo", ["foo"], CommandFlags.CACHEABLE)
+    key = executor.compute_key(metadata, Path.cwd(), NativeBackend())
+    assert key is not None
+    assert executor.lookup(
+        key,
+        metadata,
+        Path.cwd(),
+        _make_logger(metadata)
+    ) is None
+
+
+def test_store_and_replay_result(tmp_path: Path):
+    executor = CachingExecutor(tmp_path)
+    metadata = CommandMetadata("echo", ["foo"], CommandFlags.CACHEABLE)
+    key = executor.compute_key(metadata, Path.cwd(), NativeBackend())
+    assert key is not None
+    executor.store(key, metadata, _make_result(metadata, "foo\nbar\n"))
+
+    logger = _make_logger(metadata)
+    result = executor.lookup(key, metadata, Path.cwd(), logger)
+    assert result is not None
+    assert result.cached
+    assert result.output == "foo\nbar\n"
+    assert result.exit_code == 0
+    assert result.backend == "Host (cached)"
+    assert logger.output == "foo\nbar\n"
+
+    # Results are reused by other executor instances
+    result = CachingExecutor(tmp_path).lookup(
+        key,
+        metadata,
+        Path.cwd(),
+        _make_logger(metadata)
+    )
+    assert result is not None
+    assert result.output == "foo\nbar\n"
+
+
+def test_store_and_replay_binary_result(tmp_path: Path):
+    executor = CachingExecutor(tmp_path)
+    metadata = CommandMetadata(
+        "cat",
+        [],
+        CommandFlags.CACHEABLE | CommandFlags.BINARY_OUTPUT
+    )
+    key = executor.compute_key(metadata, Path.cwd(), NativeBackend())
+    assert key is not None
+    executor.store(key, metadata, _make_result(metadata, b"\x00\xff\n"))
+
+    result = executor.lookup(key, metadata, Path.cwd(), _make_logger(metadata))
+    assert result is not None
+    assert result.output_bytes == b"\x00\xff\n"
+
+
+def test_failed_results_are_not_stored_by_default(tmp_path: Path):
+    executor = CachingExecutor(tmp_path)
+    metadata = CommandMetadata("false", [], CommandFlags.CACHEABLE)
+    key = executor.compute_key(metadata, Path.cwd(), NativeBackend())
+    assert key is not None
+    executor.store(key, metadata, _make_result(metadata, "", 1))
+    assert executor.lookup(
+        key,
+        metadata,
+        Path.cwd(),
+        _make_logger(metadata)
+    ) is None
+
+
+def test_failed_results_are_stored_if_enabled(tmp_path: Path):
+    executor = CachingExecutor(tmp_path, cache_failures=True)
+    metadata = CommandMetadata("false", [], CommandFlags.CACHEABLE)
+    key = executor.compute_key(metadata, Path.cwd(), NativeBackend())
+    assert key is not None
+    executor.store(key, metadata, _make_result(metadata, "error\n", 1))
+
+    result = executor.lookup(key, metadata, Path.cwd(), _make_logger(metadata))
+    assert result is not None
+    assert result.exit_code == 1
+    assert not result.success
+
+
+def test_timed_out_results_are_never_stored(tmp_path: Path):
+    executor = CachingExecutor(tmp_path, cache_failures=True)
+    metadata = CommandMetadata("sleep", ["10"], CommandFlags.CACHEABLE)
+    key = executor.compute_key(metadata, Path.cwd(), NativeBackend())
+    assert key is not None
+    executor.store(key, metadata, _make_result(metadata, "", 1, timed_out=True))
+    assert executor.lookup(
+        key,
+        metadata,
+        Path.cwd(),
+        _make_logger(metadata)
+    ) is None
+
+
+def test_result_is_not_reused_if_outputs_changed(tmp_path: Path):
+    executor = CachingExecutor(tmp_path / "cache")
+    output = tmp_path / "out.txt"
+    output.write_text("foo\n")
+    metadata = CommandMetadata(
+        "cp",
+        ["in.txt", "out.txt"],
+        CommandFlags.CACHEABLE,
+        outputs=[output]
+    )
+    key = executor.compute_key(metadata, tmp_path, NativeBackend())
+    assert key is not None
+    executor.store(key, metadata, _make_result(metadata, ""))
+    assert executor.lookup(key, metadata, tmp_path, _make_logger(metadata))
+
+    # Replaying the result wouldn't recreate or restore the output
+    output.write_text("bar\n")
+    assert executor.lookup(
+        key,
+        metadata,
+        tmp_path,
+        _make_logger(metadata)
+    ) is None
+    output.unlink()
+    assert executor.lookup(
+        key,
+        metadata,
+        tmp_path,
+        _make_logger(metadata)
+    ) is None
+
+
+def test_results_without_outputs_are_not_stored(tmp_path: Path):
+    executor = CachingExecutor(tmp_path / "cache")
+    metadata = CommandMetadata(
+        "true",
+        [],
+        CommandFlags.CACHEABLE,
+        outputs=[tmp_path / "missing.txt"]
+    )
+    key = executor.compute_key(metadata, tmp_path, NativeBackend())
+    assert key is not None
+    executor.store(key, metadata, _make_result(metadata, ""))
+    assert not (tmp_path / "cache").exists()
+
+
+def test_wrapped_executor_decides_whether_commands_run(tmp_path: Path):
+    executor = CachingExecutor(tmp_path, PermitCleanup())
+    assert executor.should_run(CommandMetadata("foo", []))
+    assert not executor.should_run(
+        CommandMetadata("foo", [], CommandFlags.INACTIVE)
+    )
@@ -0,0 +1,175 @@
+from datetime import datetime
+from pathlib import Path
+from pyshell.commands.command_flags import CommandFlags
+from pyshell.commands.command_metadata import CommandMetadata
+from pyshell.commands.command_result import CommandResult
+from pyshell.core.pyshell_events import PyShellEvents
+from pyshell.events.event_handler import EventHandler
+from pyshell.executors.incremental_executor import IncrementalExecutor
+import pytest
+
+class IncrementalExecutorFixture:
+    def __init__(self, tmp_path: Path):
+        # Create the events that PyShell can broadcast to
+        self.on_command_started: EventHandler[PyShellEvents, CommandMetadata] = \
+            EventHandler()
+        self.on_command_skipped: EventHandler[PyShellEvents, CommandMetadata] = \
+            EventHandler()
+        self.on_command_finished: EventHandler[PyShellEvents, CommandResult] = \
+            EventHandler()
+        self.on_command_failed: EventHandler[PyShellEvents, CommandResult] = \
+            EventHandler()
+        self.events = PyShellEvents(
+            self.on_command_started,
+            self.on_command_skipped,
+            self.on_command_finished,
+            self.on_command_failed
+        )
+
+        # Create the command's input and output
+        self.input_file = tmp_path / "input.txt"
+        self.input_file.write_text("foo")
+        self.output_file = tmp_path / "output.txt"
+        self.metadata = CommandMetadata(
+            "build",
+            [],
+            inputs=[self.input_file],
+            outputs=[self.output_file]
+        )
+
+        # Initialize the executor
+        self.index_path = tmp_path / "index.json"
+        self.executor = IncrementalExecutor(self.index_path)
+        self.executor.initialize(self.events)
+
+
+    def run(self, exit_code: int = 0) -> None:
+        """
+        Simulates PyShell running the command.
+        """
+        self.on_command_started.broadcast(self.events, self.metadata)
+        self.output_file.write_text("bar")
+        result = CommandResult(
+            self.metadata.command,
+            self.metadata.args,
+            "/",
+            "",
+            exit_code,
+            False,
+            datetime.now(),
+            datetime.now(),
+            outputs=self.metadata.outputs
+        )
+        if exit_code == 0:
+            self.on_command_finished.broadcast(self.events, result)
+        else:
+            self.on_command_failed.broadcast(self.events, result)
+
+
+@pytest.fixture
+def fixture(tmp_path: Path):
+    return IncrementalExecutorFixture(tmp_path)
+
+
+def test_run_command_without_outputs(fixture: IncrementalExecutorFixture):
+    metadata = CommandMetadata("foo", [], inputs=[fixture.input_file])
+    assert fixture.executor.should_run(metadata)
+
+
+def test_run_command_that_never_ran(fixture: IncrementalExecutorFixture):
+    assert fixture.executor.should_run(fixture.metadata)
+
+
+def test_skip_up_to_date_command(fixture: IncrementalExecutorFixture):
+    fixture.run()
+    assert not fixture.executor.should_run(fixture.metadata)
+
+
+def test_up_to_date_state_persists(fixture: IncrementalExecutorFixture):
+    fixture.run()
+    executor = IncrementalExecutor(fixture.index_path)
+    assert not executor.should_run(fixture.metadata)
+
+
+def test_run_command_after_input_changes(fixture: IncrementalExecutorFixture):
+    fixture.run()
+    fixture.input_file.write_text("foo2")
+    assert fixture.executor.should_run(fixture.metadata)
+
+
+def test_run_command_after_output_is_deleted(
+    fixture: IncrementalExecutorFixture):
+    fixture.run()
+    fixture.output_file.unlink()
+    assert fixture.executor.should_run(fixture.metadata)
+
+
+def test_run_command_after_output_changes(
+    fixture: IncrementalExecutorFixture):
+    fixture.run()
+    fixture.output_file.write_text("modified")
+    assert fixture.executor.should_run(fixture.metadata)
+
+
+def test_run_command_after_arguments_change(
+    fixture: IncrementalExecutorFixture):
+    fixture.run()
+    metadata = CommandMetadata(
+        fixture.metadata.command,
+        ["--release"],
+        inputs=fixture.metadata.inputs,
+        outputs=fixture.metadata.outputs
+    )
+    assert fixture.executor.should_run(metadata)
+
+
+def test_run_command_after_failure(fixture: IncrementalExecutorFixture):
+    fixture.run()
+    fixture.input_file.write_text("foo2")
+    fixture.run(1)
+    assert fixture.executor.should_run(fixture.metadata)
+
+
+def test_wrapped_executor_decides_whether_commands_run(
+    fixture: IncrementalExecutorFixture):
+    metadata = CommandMetadata(
+        "build",
+        [],
+        CommandFlags.INACTIVE,
+        outputs=[fixture.output_file]
+    )
+    assert not fixture.executor.should_run(metadata)
+
+
+def test_identical_command_lines_with_different_outputs(
+    fixture: IncrementalExecutorFixture,
+    tmp_path: Path):
+    # Both commands are running at the same time and finish in the opposite
+    #   order that they were started in
+    metadata = [
+        CommandMetadata(
+            "build",
+            [],
+            inputs=[fixture.input_file],
+            outputs=[tmp_path / f"output{i}.txt"]
+        )
+        for i in range(2)
+    ]
+    for m in metadata:
+        fixture.on_command_started.broadcast(fixture.events, m)
+    for m in reversed(metadata):
+        m.outputs[0].write_text("bar")
+        fixture.on_command_finished.broadcast(fixture.events, CommandResult(
+            m.command,
+            m.args,
+            "/",
+            "",
+            0,
+            False,
+            datetime.now(),
+            datetime.now(),
+            outputs=m.outputs
+        ))
+
+    for m in metadata:
+        assert not fixture.executor.should_run(m)
@@ -0,0 +1,237 @@
+from datetime import datetime
+from io import StringIO
+from pathlib import Path
+from pyshell.commands.command_flags import CommandFlags
+from pyshell.commands.command_metadata import CommandMetadata
+from pyshell.commands.command_result import CommandResult
+from pyshell.logging.buffered_command_logger import BufferedCommandLogger
+from pyshell.logging.command_logger import ICommandLogger
+from pyshell.logging.console_command_logger import ConsoleCommandLogger
+from pyshell.logging.logger_options import LoggerOptions
+from pyshell.logging.split_command_logger import SplitCommandLogger
+from pyshell.logging.stream_config import StreamConfig
+from threading import Lock
+
+class TestBufferedCommandLogger:
+    # Metadata instance passed to the logger used by tests
+    metadata = CommandMetadata("command", ["arg1", "arg2"])
+
+    # Result instance passed to the logger used by tests
+    result = CommandResult(
+        "command",
+        ["arg1", "arg2"],
+        "/tmp",
+        "",
+        0,
+        False,
+        datetime.now(),
+        datetime.now()
+    )
+
+
+    def test_check_stream_config(self):
+        logger = BufferedCommandLogger(
+            lambda: ConsoleCommandLogger(
+                self.metadata,
+                LoggerOptions(),
+                Path.cwd()
+            ),
+            Lock()
+        )
+
+        # Streams must be kept separate so that the output can be replayed to
+        #   loggers that use either stream configuration
+        assert logger.stream_config == StreamConfig.SPLIT_STREAMS
+
+
+    def test_output_is_held_until_command_finishes(self):
+        output = ""
+        def on_print(x: str) -> None:
+            nonlocal output
+            output += x
+
+        logger = BufferedCommandLogger(
+            lambda: ConsoleCommandLogger(
+                self.metadata,
+                LoggerOptions(),
+                Path.cwd(),
+                on_print
+            ),
+            Lock()
+        )
+        logger.log(StringIO("foo"), StringIO("bar"))
+        assert not output
+        assert logger.output == "foobar"
+
+        logger.log_results(self.result, [])
+        assert output == "foobar"
+
+
+    def test_logger_is_constructed_when_command_finishes(self):
+        constructed = False
+        def construct_logger() -> ICommandLogger:
+            nonlocal constructed
+            constructed = True
+            return ConsoleCommandLogger(
+                self.metadata,
+                LoggerOptions(),
+                Path.cwd(),
+                lambda _: None
+            )
+
+        logger = BufferedCommandLogger(construct_logger, Lock())
+        logger.log(StringIO("foo"), StringIO())
+        assert not constructed
+
+        logger.log_results(self.result, [])
+        assert constructed
+
+
+    def test_merged_output_is_replayed_in_order(self):
+        output = ""
+        def on_print(x: str) -> None:
+            nonlocal output
+            output += x
+
+        logger = BufferedCommandLogger(
+            lambda: ConsoleCommandLogger(
+                self.metadata,
+                LoggerOptions(),
+                Path.cwd(),
+                on_print
+            ),
+            Lock()
+        )
+        logger.log(StringIO("foo"), StringIO())
+        logger.log(StringIO(), StringIO("bar"))
+        logger.log(StringIO("baz"), StringIO())
+        logger.log_results(self.result, [])
+
+        assert output == "foobarbaz"
+
+
+    def test_split_output_is_replayed_to_each_stream(self):
+        stdout_output = ""
+        def on_stdout(x: str) -> None:
+            nonlocal stdout_output
+            stdout_output += x
+
+        stderr_output = ""
+        def on_stderr(x: str) -> None:
+            nonlocal stderr_output
+            stderr_output += x
+
+        logger = BufferedCommandLogger(
+            lambda: SplitCommandLogger(
+                ConsoleCommandLogger(
+                    self.metadata,
+                    LoggerOptions(),
+                    Path.cwd(),
+                    on_stdout
+                ),
+                ConsoleCommandLogger(
+                    self.metadata,
+                    LoggerOptions(),
+                    Path.cwd(),
+                    on_stderr
+                )
+            ),
+            Lock()
+        )
+        logger.log(StringIO("foo"), StringIO())
+        logger.log(StringIO(), StringIO("bar"))
+        logger.log_results(self.result, [])
+
+        assert stdout_output == "foo"
+        assert stderr_output == "bar"
+
+
+    def test_spilled_output_is_replayed_to_each_stream(self):
+        stdout_output = ""
+        def on_stdout(x: str) -> None:
+            nonlocal stdout_output
+            stdout_output += x
+
+        stderr_output = ""
+        def on_stderr(x: str) -> None:
+            nonlocal stderr_output
+            stderr_output += x
+
+        logger = BufferedCommandLogger(
+            lambda: SplitCommandLogger(
+                ConsoleCommandLogger(
+                    self.metadata,
+                    LoggerOptions(),
+                    Path.cwd(),
+                    on_stdout
+                ),
+                ConsoleCommandLogger(
+                    self.metadata,
+                    LoggerOptions(),
+                    Path.cwd(),
+                    on_stderr
+                )
+            ),
+            Lock(),
+            output_memory_limit=4
+        )
+        for i in range(3):
+            logger.log(StringIO(f"fé{i}\n"), StringIO(f"bä{i}\n"))
+        logger.log(StringIO("baz\n"), StringIO())
+        assert logger.output_buffer.spilled
+        logger.log_results(self.result, [])
+
+        assert stdout_output == "fé0\nfé1\nfé2\nbaz\n"
+        assert stderr_output == "bä0\nbä1\nbä2\n"
+
+
+    def test_output_added_by_backend_is_not_replayed(self):
+        output = ""
+        def on_print(x: str) -> None:
+            nonlocal output
+            output += x
+
+        logger = BufferedCommandLogger(
+            lambda: ConsoleCommandLogger(
+                self.metadata,
+                LoggerOptions(),
+                Path.cwd(),
+                on_print
+            ),
+            Lock()
+        )
+        logger.log(StringIO("foo"), StringIO())
+
+        # Backends add a final newline to the result's output
+        logger.output_buffer.append("\n")
+        logger.log_results(self.result, [])
+
+        assert output == "foo"
+        assert logger.output == "foo\n"
+
+
+    def test_binary_output_is_replayed(self):
+        printed = ""
+        def on_print(x: str) -> None:
+            nonlocal printed
+            printed += x
+
+        metadata = CommandMetadata("command", [], CommandFlags.BINARY_OUTPUT)
+        logger = BufferedCommandLogger(
+            lambda: ConsoleCommandLogger(
+                metadata,
+                LoggerOptions(),
+                Path.cwd(),
+                on_print
+            ),
+            Lock(),
+            binary=True
+        )
+        assert logger.accepts_bytes
+        logger.log_bytes("fé".encode()[:2], b"")
+        logger.log_bytes("fé".encode()[2:] + b"\n", b"")
+        assert printed == ""
+
+        logger.log_results(self.result, [])
+        assert printed == "fé\n"
+        assert logger.output_buffer.getbytes() == "fé\n".encode()
@@ -0,0 +1,152 @@
+from datetime import datetime
+import json
+from pathlib import Path
+from pyshell.commands.command_metadata import CommandMetadata
+from pyshell.commands.command_phase import CommandPhase
+from pyshell.commands.command_result import CommandResult
+from pyshell.commands.command_timings import CommandTimings
+from pyshell.core.pyshell_events import PyShellEvents
+from pyshell.events.event_handler import EventHandler
+from pyshell.logging.chrome_trace_logger import ChromeTraceLogger
+from pyshell.logging.logger_options import LoggerOptions
+from pyshell.logging.null_command_logger import NullCommandLogger
+from pyshell.logging.null_logger import NullLogger
+import pytest
+from typing import Any, Dict, List, Optional
+
+class ChromeTraceLoggerFixture:
+    def __init__(self, tmp_path: Path):
+        self.on_command_timed: EventHandler[PyShellEvents, CommandResult] = \
+            EventHandler()
+        self.events = PyShellEvents(
+            EventHandler(),
+            EventHandler(),
+            EventHandler(),
+            EventHandler(),
+            self.on_command_timed
+        )
+        self.logger = ChromeTraceLogger(tmp_path / "trace.json", NullLogger())
+        self.logger.initialize(self.events)
+
+
+    def finish(self,
+        command: str,
+        backend: Optional[str] = "Host",
+        spawn_duration: Optional[float] = None) -> None:
+        timings = CommandTimings()
+        timings.record(CommandPhase.EXECUTOR, 1000)
+        timings.record(CommandPhase.BACKEND, 10**6)
+        timings.record(CommandPhase.SCAN, 2000)
+        start = datetime.utcnow()
+        result = CommandResult(
+            command,
+            ["arg"],
+            "/",
+            "",
+            0,
+            False,
+            start,
+            start,
+            backend=backend,
+            spawn_duration=spawn_duration,
+            timings=timings
+        )
+        self.on_command_timed.broadcast(self.events, result)
+
+
+    def read_events(self) -> List[Dict[str, Any]]:
+        self.logger.close()
+        return json.loads(self.logger.file_path.read_text())
+
+
+@pytest.fixture
+def fixture(tmp_path: Path):
+    return ChromeTraceLoggerFixture(tmp_path)
+
+
+def test_constructs_wrapped_logger(fixture: ChromeTraceLoggerFixture):
+    logger = fixture.logger.construct_logger(
+        CommandMetadata("foo", []),
+        LoggerOptions(),
+        Path.cwd()
+    )
+    assert isinstance(logger, NullCommandLogger)
+
+
+def test_empty_trace(fixture: ChromeTraceLoggerFixture):
+    assert fixture.read_events() == []
+
+
+def test_command_span(fixture: ChromeTraceLoggerFixture):
+    fixture.finish("foo", spawn_duration=0.0002)
+    events = fixture.read_events()
+
+    spans = [e for e in events if e["ph"] == "X"]
+    command = spans[0]
+    assert command["name"] == "foo"
+    assert command["cat"] == "command"
+    assert command["dur"] == pytest.approx(1003)
+    assert command["args"] == {
+        "args": ["arg"],
+        "cwd": "/",
+        "backend": "Host",
+        "exit_code": 0,
+        "cached": False
+    }
+
+    # Phases are nested within the command's span, in order
+    phases = [(s["name"], s["dur"]) for s in spans[1:]]
+    assert phases == [
+        ("executor", pytest.approx(1)),
+        ("spawn", pytest.approx(200)),
+        ("pump", pytest.approx(800)),
+        ("scan", pytest.approx(2))
+    ]
+    assert spans[1]["ts"] == pytest.approx(command["ts"])
+    assert spans[-1]["ts"] + spans[-1]["dur"] == \
+        pytest.approx(command["ts"] + command["dur"])
+
+
+def test_backend_without_spawn_duration(fixture: ChromeTraceLoggerFixture):
+    fixture.finish("foo")
+    names = [
+        e["name"] for e in fixture.read_events() if e.get("cat") == "phase"
+    ]
+    assert names == ["executor", "backend", "scan"]
+
+
+def test_backends_are_separate_processes(fixture: ChromeTraceLoggerFixture):
+    fixture.finish("foo", backend="Host")
+    fixture.finish("bar", backend="Docker")
+    events = fixture.read_events()
+
+    process_names = {
+        e["pid"]: e["args"]["name"]
+        for e in events if e["name"] == "process_name"
+    }
+    assert sorted(process_names.values()) == ["Docker", "Host"]
+    pids = {e["name"]: e["pid"] for e in events if e.get("cat") == "command"}
+    assert process_names[pids["foo"]] == "Host"
+    assert process_names[pids["bar"]] == "Docker"
+
+
+def test_overlapping_commands_use_separate_tracks(
+    fixture: ChromeTraceLoggerFixture):
+    # Both commands finish at almost the same time, so they overlap
+    fixture.finish("foo")
+    fixture.finish("bar")
+    commands = [e for e in fixture.read_events() if e.get("cat") == "command"]
+    assert commands[0]["tid"] != commands[1]["tid"]
+
+
+def test_unterminated_trace_is_readable(fixture: ChromeTraceLoggerFixture):
+    fixture.finish("foo")
+    text = fixture.logger.file_path.read_text()
+    assert not text.rstrip().endswith("]")
+    assert len(json.loads(text + "]")) > 0
+
+
+def test_commands_after_close_are_ignored(fixture: ChromeTraceLoggerFixture):
+    fixture.logger.close()
+    fixture.finish("foo")
+    assert json.loads(fixture.logger.file_path.read_text()) == []
@@ -335,3 +335,18 @@ class TestConsoleCommandLogger:
 
         # Validate results
         assert footer * length in output
+
+
+    def test_output_spills_to_disk_above_memory_limit(self):
+        logger = ConsoleCommandLogger(
+            self.metadata,
+            LoggerOptions(output_memory_limit=4),
+            Path.cwd(),
+            lambda _: None
+        )
+        for chunk in ["foo\n", "bar\n", "baz\n"]:
+            logger.log(StringIO(chunk), None)
+
+        assert logger.output_buffer.spilled
+        assert logger.output == "foo\nbar\nbaz\n"
+        assert logger.output_buffer.tail(1) == ["baz\n"]
@@ -454,3 +454,24 @@ class TestFileCommandLogger:
 
         # Validate results
         assert footer * length in log_file_path.read_text()
+
+
+    def test_binary_output_written_without_decoding(self, tmp_path: Any):
+        output_file = Path(tmp_path) / self.log_file_name
+        metadata = CommandMetadata("command", [], CommandFlags.BINARY_OUTPUT)
+        logger = FileCommandLogger(
+            metadata,
+            LoggerOptions(),
+            tmp_path,
+            output_file,
+            False,
+            False,
+            False
+        )
+        assert logger.accepts_bytes
+        logger.log_bytes(b"foo\xff", None)
+        logger.log_bytes(b"bar\n", None)
+        logger.log_results(self.result, [])
+
+        assert output_file.read_bytes() == b"foo\xffbar\n"
+        assert logger.output_buffer.getbytes() == b"foo\xffbar\n"
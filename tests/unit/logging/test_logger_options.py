@@ -9,6 +9,7 @@ def test_properties_match_ctor_args():
     print_exit_code = False
     print_timestamps = False
     print_duration = False
+    print_resource_usage = True
     add_newline_after_header = False
     add_newline_before_footer = False
     add_newline_after_footer = False
@@ -18,6 +19,7 @@ def test_properties_match_ctor_args():
     cmd_footer_banner_width = 10
     cmd_header_banner_prefix = "p"
     cmd_footer_banner_prefix = "q"
+    output_memory_limit = None
 
     # Set up the options instance
     logger_options = LoggerOptions(
@@ -27,6 +29,7 @@ def test_properties_match_ctor_args():
         print_exit_code=print_exit_code,
         print_timestamps=print_timestamps,
         print_duration=print_duration,
+        print_resource_usage=print_resource_usage,
         add_newline_after_header=add_newline_after_header,
         add_newline_before_footer=add_newline_before_footer,
         add_newline_after_footer=add_newline_after_footer,
@@ -35,7 +38,8 @@ def test_properties_match_ctor_args():
         cmd_footer_banner_char=cmd_footer_banner_char,
         cmd_footer_banner_width=cmd_footer_banner_width,
         cmd_header_banner_prefix=cmd_header_banner_prefix,
-        cmd_footer_banner_prefix=cmd_footer_banner_prefix
+        cmd_footer_banner_prefix=cmd_footer_banner_prefix,
+        output_memory_limit=output_memory_limit
     )
 
     # Validate the properties
@@ -45,6 +49,7 @@ def test_properties_match_ctor_args():
     assert logger_options.print_exit_code == print_exit_code
     assert logger_options.print_timestamps == print_timestamps
     assert logger_options.print_duration == print_duration
+    assert logger_options.print_resource_usage == print_resource_usage
     assert logger_options.add_newline_after_header == add_newline_after_header
     assert logger_options.add_newline_before_footer == add_newline_before_footer
     assert logger_options.add_newline_after_footer == add_newline_after_footer
@@ -54,6 +59,7 @@ def test_properties_match_ctor_args():
     assert logger_options.cmd_footer_banner_width == cmd_footer_banner_width
     assert logger_options.cmd_header_banner_prefix == cmd_header_banner_prefix
     assert logger_options.cmd_footer_banner_prefix == cmd_footer_banner_prefix
+    assert logger_options.output_memory_limit == output_memory_limit
 
 
 def test_header_banner():
@@ -3,6 +3,7 @@ import os
 from pathlib import Path
 from pyshell.commands.command_metadata import CommandMetadata
 from pyshell.commands.command_result import CommandResult
+from pyshell.commands.resource_usage import ResourceUsage
 from pyshell.logging.logger_options import LoggerOptions
 from pyshell.logging.logger_statics import LoggerStatics
 
@@ -540,6 +541,69 @@ def test_write_only_duration_in_footer():
     assert "Duration" in output
 
 
+def test_write_only_resource_usage_in_footer():
+    result = CommandResult(
+        "foo",
+        [],
+        os.getcwd(),
+        "",
+        0,
+        False,
+        datetime.now(),
+        datetime.now(),
+        resource_usage=ResourceUsage(1.5, 0.25, 64 * 1024 * 1024, 3, 4, 5, 6)
+    )
+
+    output = ""
+    def write_callback(data: str):
+        nonlocal output
+        output += data
+
+    options = LoggerOptions(
+        print_cmd=False,
+        print_cwd=False,
+        print_backend=False,
+        print_exit_code=False,
+        print_timestamps=False,
+        print_duration=False,
+        print_resource_usage=True,
+        add_newline_after_header=False,
+        add_newline_before_footer=False,
+        add_newline_after_footer=False
+    )
+    LoggerStatics.write_command_footer(result, write_callback, options)
+
+    assert not "Executed command" in output
+    assert not "Duration" in output
+    assert "CPU time: 1.5 s user, 0.25 s sys" in output
+    assert "Max RSS: 64.0 MiB" in output
+    assert "Block I/O: 3 in, 4 out" in output
+    assert "Context switches: 5 voluntary, 6 involuntary" in output
+
+
+def test_resource_usage_not_in_footer_by_default():
+    result = CommandResult(
+        "foo",
+        [],
+        os.getcwd(),
+        "",
+        0,
+        False,
+        datetime.now(),
+        datetime.now(),
+        resource_usage=ResourceUsage(1.5, 0.25, 1024, 3, 4, 5, 6)
+    )
+
+    output = ""
+    def write_callback(data: str):
+        nonlocal output
+        output += data
+
+    LoggerStatics.write_command_footer(result, write_callback)
+
+    assert not "CPU time" in output
+
+
 def test_write_custom_footer_banner():
     cmd = "foo"
     args = []
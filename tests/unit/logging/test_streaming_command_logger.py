@@ -0,0 +1,116 @@
+from datetime import datetime
+from io import StringIO
+from pathlib import Path
+from pyshell.commands.command_flags import CommandFlags
+from pyshell.commands.command_metadata import CommandMetadata
+from pyshell.commands.command_result import CommandResult
+from pyshell.logging.console_command_logger import ConsoleCommandLogger
+from pyshell.logging.logger_options import LoggerOptions
+from pyshell.logging.streaming_command_logger import StreamingCommandLogger
+from typing import List
+
+class TestStreamingCommandLogger:
+    # Metadata instance passed to the logger used by tests
+    metadata = CommandMetadata("command", ["arg1", "arg2"])
+
+    # Result instance passed to the logger used by tests
+    result = CommandResult(
+        "command",
+        ["arg1", "arg2"],
+        "/tmp",
+        "",
+        0,
+        False,
+        datetime.now(),
+        datetime.now()
+    )
+
+
+    def test_uses_stream_config_of_wrapped_logger(self):
+        console_logger = ConsoleCommandLogger(
+            self.metadata,
+            LoggerOptions(),
+            Path.cwd()
+        )
+        logger = StreamingCommandLogger(console_logger, lambda _: None)
+        assert logger.stream_config == console_logger.stream_config
+
+
+    def test_output_is_forwarded(self):
+        output = ""
+        def on_print(x: str) -> None:
+            nonlocal output
+            output += x
+
+        console_logger = ConsoleCommandLogger(
+            self.metadata,
+            LoggerOptions(),
+            Path.cwd(),
+            on_print
+        )
+        logger = StreamingCommandLogger(console_logger, lambda _: None)
+        logger.log(StringIO("foo\n"), None)
+
+        assert output == "foo\n"
+        assert logger.output == console_logger.output
+
+
+    def test_lines_split_across_chunks(self):
+        lines: List[str] = []
+        logger = StreamingCommandLogger(
+            ConsoleCommandLogger(
+                self.metadata,
+                LoggerOptions(),
+                Path.cwd(),
+                lambda _: None
+            ),
+            lines.append
+        )
+
+        logger.log(StringIO("fo"), StringIO())
+        assert lines == []
+        logger.log(StringIO("o\nbar\nb"), StringIO())
+        assert lines == ["foo\n", "bar\n"]
+        logger.log(StringIO("az"), StringIO())
+        logger.log_results(self.result, [])
+        assert lines == ["foo\n", "bar\n", "baz"]
+
+
+    def test_streams_are_split_into_lines_separately(self):
+        lines: List[str] = []
+        logger = StreamingCommandLogger(
+            ConsoleCommandLogger(
+                self.metadata,
+                LoggerOptions(),
+                Path.cwd(),
+                lambda _: None
+            ),
+            lines.append
+        )
+
+        # The console logger only uses stdout, but both streams are still split
+        #   into lines
+        logger.log(StringIO("out"), StringIO("err"))
+        logger.log(StringIO("put\n"), StringIO())
+        logger.log(StringIO(), StringIO("or\n"))
+        assert lines == ["output\n", "error\n"]
+
+
+    def test_binary_output_is_split_into_lines(self):
+        lines: List[str] = []
+        console_logger = ConsoleCommandLogger(
+            CommandMetadata("command", [], CommandFlags.BINARY_OUTPUT),
+            LoggerOptions(),
+            Path.cwd(),
+            lambda _: None
+        )
+        logger = StreamingCommandLogger(console_logger, lines.append)
+        assert logger.accepts_bytes
+
+        # The multi-byte character is split across two chunks
+        data = "café\r\nb".encode("utf-8")
+        logger.log_bytes(data[:4], None)
+        logger.log_bytes(data[4:], None)
+        logger.log_results(self.result, [])
+        assert lines == ["café\n", "b"]
+        assert console_logger.output_buffer.getbytes() == data
@@ -0,0 +1,26 @@
+from pyshell.metrics.histogram import Histogram
+import pytest
+
+def test_empty_histogram():
+    histogram = Histogram([1.0, 2.0])
+    assert histogram.count == 0
+    assert histogram.sum == 0.0
+    assert histogram.cumulative_counts() == [0, 0, 0]
+
+
+def test_observe():
+    histogram = Histogram([1.0, 2.0])
+    for value in (0.5, 1.0, 1.5, 3.0):
+        histogram.observe(value)
+
+    # Values equal to a bucket's bound are counted in that bucket
+    assert histogram.cumulative_counts() == [2, 3, 4]
+    assert histogram.count == 4
+    assert histogram.sum == 6.0
+
+
+def test_bounds_must_be_ascending():
+    with pytest.raises(ValueError):
+        Histogram([2.0, 1.0])
+    with pytest.raises(ValueError):
+        Histogram([1.0, 1.0])
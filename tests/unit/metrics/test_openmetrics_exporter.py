@@ -0,0 +1,109 @@
+from datetime import datetime, timedelta
+import os
+from pathlib import Path
+from pyshell.commands.command_result import CommandResult
+from pyshell.metrics.openmetrics_exporter import OpenMetricsExporter
+import pytest
+from typing import Iterator
+
+def _result(command: str,
+    duration: float,
+    exit_code: int = 0,
+    output: str = "") -> CommandResult:
+    start_time = datetime(2024, 1, 1)
+    return CommandResult(
+        command,
+        [],
+        "/",
+        output,
+        exit_code,
+        False,
+        start_time,
+        start_time + timedelta(seconds=duration),
+        backend="Host"
+    )
+
+
+@pytest.fixture
+def exporter(tmp_path: Path) -> Iterator[OpenMetricsExporter]:
+    exporter = OpenMetricsExporter(
+        tmp_path / "metrics.prom",
+        buckets=[1.0, 10.0]
+    )
+    yield exporter
+    exporter.close()
+
+
+def test_render_metrics(exporter: OpenMetricsExporter):
+    exporter.record(_result("make", 0.5, output="abc"))
+    exporter.record(_result("make", 5.0, exit_code=2, output="dé"))
+
+    lines = exporter.render().splitlines()
+    assert lines[:3] == [
+        "# TYPE pyshell_command_duration_seconds histogram",
+        "# UNIT pyshell_command_duration_seconds seconds",
+        "# HELP pyshell_command_duration_seconds Time taken by each command.",
+    ]
+    labels = 'command="make",backend="Host"'
+    assert f'pyshell_command_duration_seconds_bucket{{{labels},le="1.0"}} 1' \
+        in lines
+    assert f'pyshell_command_duration_seconds_bucket{{{labels},le="10.0"}} 2' \
+        in lines
+    assert f'pyshell_command_duration_seconds_bucket{{{labels},le="+Inf"}} 2' \
+        in lines
+    assert f"pyshell_command_duration_seconds_count{{{labels}}} 2" in lines
+    assert f"pyshell_command_duration_seconds_sum{{{labels}}} 5.5" in lines
+    assert f'pyshell_commands_total{{{labels},exit_code="0"}} 1' in lines
+    assert f'pyshell_commands_total{{{labels},exit_code="2"}} 1' in lines
+    assert f"pyshell_command_output_bytes_total{{{labels}}} 6" in lines
+    assert lines[-1] == "# EOF"
+
+
+def test_constant_labels_and_escaping(tmp_path: Path):
+    exporter = OpenMetricsExporter(
+        tmp_path / "metrics.prom",
+        labels={"script": "nightly"},
+        prefix="ci"
+    )
+    exporter.record(_result('say "hi"\\', 1.0))
+    exporter.close()
+    assert 'ci_commands_total{script="nightly",command="say \\"hi\\"\\\\",' \
+        in exporter.render()
+
+
+def test_flush_writes_file(exporter: OpenMetricsExporter):
+    exporter.flush()
+    assert not exporter.file_path.exists()
+
+    exporter.record(_result("make", 0.5))
+    exporter.flush()
+    assert exporter.file_path.read_text() == exporter.render()
+    assert os.stat(exporter.file_path).st_mode & 0o777 == 0o644
+
+    # Temporary files are never left behind
+    assert os.listdir(exporter.file_path.parent) == ["metrics.prom"]
+
+
+def test_flush_interval(tmp_path: Path):
+    exporter = OpenMetricsExporter(tmp_path / "a.prom", flush_interval=3600)
+    exporter.record(_result("make", 0.5))
+    assert not exporter.file_path.exists()
+    exporter.close()
+    assert exporter.file_path.exists()
+
+    exporter = OpenMetricsExporter(tmp_path / "b.prom", flush_interval=0)
+    exporter.record(_result("make", 0.5))
+    assert exporter.file_path.exists()
+    exporter.close()
+
+
+def test_write_errors_are_ignored(tmp_path: Path):
+    exporter = OpenMetricsExporter(tmp_path / "missing" / "metrics.prom")
+    exporter.record(_result("make", 0.5))
+    exporter.close()
+    assert not exporter.file_path.exists()
+
+
+def test_invalid_buckets(tmp_path: Path):
+    with pytest.raises(ValueError):
+        OpenMetricsExporter(tmp_path / "metrics.prom", buckets=[2.0, 1.0])
@@ -0,0 +1,52 @@
+import pyshell
+import pyshell.modules
+import pytest
+import subprocess
+import sys
+
+
+def _loaded_modules(statement: str) -> set[str]:
+    """
+    Gets the modules loaded by a statement in a fresh interpreter.
+    @param statement The Python statement to run.
+    @returns The names of all modules loaded after running the statement.
+    """
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            f"{statement}; import sys; print('\\n'.join(sys.modules))"
+        ],
+        stdout=subprocess.PIPE,
+        check=True,
+        text=True
+    )
+    return set(result.stdout.splitlines())
+
+
+@pytest.mark.parametrize("package", [pyshell, pyshell.modules])
+def test_all_exports_resolve(package):
+    for name in package.__all__:
+        assert getattr(package, name).__name__ == name
+        assert name in dir(package)
+
+
+@pytest.mark.parametrize("package", [pyshell, pyshell.modules])
+def test_unknown_attribute_raises(package):
+    with pytest.raises(AttributeError):
+        getattr(package, "DoesNotExist")
+
+
+def test_import_pyshell_is_lazy():
+    modules = _loaded_modules("import pyshell")
+    assert "pyshell.core.pyshell" not in modules
+    assert "pyshell.backends.docker_backend" not in modules
+
+
+def test_shell_module_does_not_load_unused_subsystems():
+    modules = _loaded_modules(
+        "from pyshell import PyShell; from pyshell.modules import Shell")
+    assert "asyncio" not in modules
+    assert "dateutil" not in modules
+    assert "pyshell.modules.docker" not in modules
+    assert "pyshell.modules.doxygen" not in modules
@@ -66,3 +66,24 @@ def test_get_caller_stack_frame_from_multiple_levels_down():
 
     assert command.origin.file_path == Path(__file__)
     assert command.origin.line_number == expected_line_number
+
+
+def test_capture_can_be_disabled():
+    assert CallerInfo.capture_enabled()
+    CallerInfo.set_capture_enabled(False)
+    try:
+        command = LsCommand()
+        assert not command.origin.is_known
+        assert command.origin is CallerInfo.unknown()
+    finally:
+        CallerInfo.set_capture_enabled(True)
+
+    command = LsCommand()
+    assert command.origin.is_known
+
+
+def test_captured_locations_compare_equal():
+    caller_infos = [CallerInfo.from_stack_frame(0) for _ in range(2)]
+    assert caller_infos[0] == caller_infos[1]
+    assert hash(caller_infos[0]) == hash(caller_infos[1])
+    assert caller_infos[0] == CallerInfo(__file__, caller_infos[0].line_number)